@@ -8,6 +8,7 @@ from odie.core.ActionLauncher import ActionLauncher, ActionParameterNotAvailable
 from odie.core.ConfigurationManager import SettingLoader
 
 from odie.core.Models.Action import Action
+from odie.core.Models.ActionExecution import ActionExecution
 
 
 class TestActionLauncher(unittest.TestCase):
@@ -64,6 +65,18 @@ class TestActionLauncher(unittest.TestCase):
 
             mock_launch_action_method.assert_called_with(action2_params)
             mock_launch_action_method.reset_mock()
+            # the action of the brain is not modified
+            self.assertEqual(action2.parameters, {'var2': 'val2', 'var3': "{{ var3 }}"})
+
+            # Assert the values of an execution are given to the action
+            action_execution = ActionExecution(action=action2, answer="yes", no_voice=True)
+            ActionLauncher.start_action(action=action_execution,
+                                        parameters_dict=params)
+            mock_launch_action_method.assert_called_with(Action(name='actione2',
+                                                                parameters={'var2': 'val2', 'var3': 'value3',
+                                                                            'answer': 'yes', 'is_api_call': False,
+                                                                            'no_voice': True}))
+            mock_launch_action_method.reset_mock()
 
             # Assert the Action is not started when missing args
             action3 = Action(name='actione3', parameters={'var3': 'val3', 'var4': '{{val4}}'})
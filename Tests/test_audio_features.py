@@ -0,0 +1,114 @@
+import os
+import unittest
+
+import numpy as np
+
+from odie_cloud.speech.AudioFeatures import AudioFeatures, create_filterbank, parse_duration, resample
+
+try:
+    import soundfile
+except ImportError:
+    soundfile = None
+
+# the "audio" etl configuration of Aeon of the speech model, see DataLoader.audio_config
+AUDIO_CONFIG = {
+    "type": "audio",
+    "sample_freq_hz": 16000,
+    "max_duration": "30 seconds",
+    "frame_length": "25 milliseconds",
+    "frame_stride": "10 milliseconds",
+    "feature_type": "mfsc",
+    "num_filters": 13
+}
+
+# edges of the 13 mel filters of a 400 points FFT at 16 kHz, from specgram::create_filterbank of Aeon:
+# floor((fftsz + 1) * mel_to_hz(min_mel + j * (max_mel - min_mel) / (num_filters + 1)) / sample_freq_hz)
+AEON_FILTERBANK_BINS = [0, 3, 7, 12, 18, 25, 34, 44, 56, 71, 88, 109, 134, 164, 200]
+
+
+class TestAudioFeatures(unittest.TestCase):
+    """
+    Class to test AudioFeatures
+    """
+
+    def setUp(self):
+        self.audio_features = AudioFeatures(AUDIO_CONFIG)
+        self.samples = np.random.RandomState(0).randn(16000) * 1000
+
+    def test_parse_duration(self):
+        self.assertEqual(parse_duration("30 seconds"), 30)
+        self.assertAlmostEqual(parse_duration("25 milliseconds"), 0.025)
+        with self.assertRaises(ValueError):
+            parse_duration("2 hours")
+
+    def test_filterbank(self):
+        filterbank = create_filterbank(13, 400, 16000)
+        self.assertEqual(filterbank.shape, (201, 13))
+        for j in range(13):
+            start, peak, end = AEON_FILTERBANK_BINS[j:j + 3]
+            # triangle between the edges of the filter, with its peak on the middle edge
+            self.assertEqual(filterbank[peak, j], 1)
+            self.assertFalse(filterbank[:start, j].any())
+            self.assertFalse(filterbank[end:, j].any())
+            self.assertTrue(np.all(np.diff(filterbank[start:peak + 1, j]) > 0))
+            self.assertTrue(np.all(np.diff(filterbank[peak:end, j]) < 0))
+
+    def test_compute(self):
+        self.assertEqual(self.audio_features.shape, (1, 13, 2998))
+        self.assertEqual((self.audio_features.frame_length, self.audio_features.frame_stride), (400, 160))
+
+        features, valid_percent = self.audio_features.compute(self.samples)
+        self.assertEqual(features.dtype, np.uint8)
+        self.assertEqual(features.shape, (13, 2998))
+        # 98 frames of 25 ms every 10 ms in one second
+        self.assertAlmostEqual(valid_percent, 100.0 * 98 / 2998)
+        valid_features = features[:, :98]
+        # min-max scaling of the valid frames, the padding is null
+        self.assertEqual((valid_features.min(), valid_features.max()), (0, 255))
+        self.assertFalse(features[:, 98:].any())
+
+        # the bands are flipped: the highest frequencies first
+        log_energies = self.audio_features.get_log_energies(np.asarray(self.samples, dtype=np.float32), 0, 98)
+        self.assertEqual(log_energies.shape, (98, 13))
+        scaled, _ = self.audio_features.scale(log_energies, log_energies.min(), log_energies.max())
+        np.testing.assert_array_equal(scaled, features)
+        self.assertEqual(np.argmax(log_energies[0]), 12 - np.argmax(features[:, 0]))
+
+        # the utterance is truncated to max_duration
+        _, valid_percent = self.audio_features.compute(np.zeros(31 * 16000))
+        self.assertEqual(valid_percent, 100)
+
+        # too short for a frame
+        features, valid_percent = self.audio_features.compute(np.zeros(100))
+        self.assertEqual(valid_percent, 0)
+        self.assertFalse(features.any())
+
+    def test_scale(self):
+        log_energies = self.audio_features.get_log_energies(np.asarray(self.samples, dtype=np.float32), 10, 20)
+        minimum, maximum = log_energies.min(), log_energies.max()
+        # the energies out of the range are clipped
+        features, valid_percent = self.audio_features.scale(log_energies, minimum + 1, maximum - 1)
+        self.assertEqual((features[:, :10].min(), features[:, :10].max()), (0, 255))
+        self.assertAlmostEqual(valid_percent, 100.0 * 10 / 2998)
+
+    def test_resample(self):
+        samples = np.sin(np.arange(44100) * 2 * np.pi * 440 / 44100)
+        resampled = resample(samples, 44100, 16000)
+        self.assertEqual(len(resampled), 16000)
+        # same frequency at the new rate
+        self.assertEqual(np.argmax(np.abs(np.fft.rfft(resampled))), 440)
+        self.assertIs(resample(samples, 16000, 16000), samples)
+
+    @unittest.skipIf(soundfile is None, "soundfile is not installed")
+    def test_get_features(self):
+        file_path = os.path.join(os.path.dirname(__file__), "files", "bonjour.wav")
+        features, valid_percent = self.audio_features.get_features(file_path)
+        self.assertEqual(features.shape, (13, 2998))
+        self.assertGreater(valid_percent, 0)
+
+        with self.assertRaises(ValueError):
+            self.audio_features.get_features(b"not an audio file")
+
+
+if __name__ == '__main__':
+    unittest.main()
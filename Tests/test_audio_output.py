@@ -0,0 +1,129 @@
+import os
+import shutil
+import tempfile
+import unittest
+import wave
+
+import mock
+
+from odie.core.AudioOutput import AudioOutput, CHUNK
+
+
+class FakeStream(object):
+    def __init__(self, stream_format):
+        self.stream_format = stream_format
+        self.data = b""
+        self.closed = False
+
+    def write(self, data):
+        self.data += data
+
+    def close(self):
+        self.closed = True
+
+
+class FakeOutput(AudioOutput):
+    def __init__(self, device=None):
+        self.streams = list()
+        super(FakeOutput, self).__init__(device=device)
+
+    def _open_stream(self, sample_width, channels, rate):
+        stream = FakeStream((sample_width, channels, rate))
+        self.streams.append(stream)
+        return stream
+
+
+class TestAudioOutput(unittest.TestCase):
+    """
+    Class to test AudioOutput
+    """
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+        AudioOutput._outputs = dict()
+
+    def _write_wav(self, name, frames, channels=1, rate=16000):
+        file_path = os.path.join(self.folder, name)
+        wave_file = wave.open(file_path, "wb")
+        wave_file.setsampwidth(2)
+        wave_file.setnchannels(channels)
+        wave_file.setframerate(rate)
+        wave_file.writeframes(frames)
+        wave_file.close()
+        return file_path
+
+    def test_get_output(self):
+        output = FakeOutput.get_output(device="default")
+        self.assertIs(FakeOutput.get_output(device="default"), output)
+        self.assertIsNot(FakeOutput.get_output(device="other"), output)
+
+        # an output that can not open a stream fails when created
+        with self.assertRaises(TypeError):
+            AudioOutput()
+
+    def test_play(self):
+        output = FakeOutput()
+        # files bigger than a chunk are streamed
+        frames1 = b"\x01\x00" * (CHUNK * 2 + 10)
+        frames2 = b"\x02\x00" * 10
+        file_path1 = self._write_wav("1.wav", frames1)
+        file_path2 = self._write_wav("2.wav", frames2)
+
+        # queued back to back in the same stream
+        play_request1 = output.play(file_path1, block=False)
+        output.play(file_path2)
+        self.assertTrue(play_request1.done.is_set())
+        self.assertEqual(len(output.streams), 1)
+        self.assertEqual(output.streams[0].data, frames1 + frames2)
+
+        # a file with another format opens a new stream
+        file_path3 = self._write_wav("3.wav", frames2, rate=8000)
+        output.play(file_path3)
+        self.assertEqual([(stream.stream_format, stream.closed) for stream in output.streams],
+                         [((2, 1, 16000), True), ((2, 1, 8000), False)])
+
+    def test_play_error(self):
+        output = FakeOutput()
+        with self.assertRaises(IOError):
+            output.play(os.path.join(self.folder, "not_existing.wav"))
+
+        # the next files are played
+        output.play(self._write_wav("1.wav", b"\x01\x00"))
+        self.assertEqual(output.streams[-1].data, b"\x01\x00")
+
+    def test_open_file(self):
+        # only the PCM wav files are read by default
+        file_path = os.path.join(self.folder, "1.flac")
+        with open(file_path, "wb") as flac_file:
+            flac_file.write(b"fLaC" + b"\x00" * 100)
+        output = FakeOutput()
+        with self.assertRaises(wave.Error):
+            output.play(file_path)
+
+        # the players read the other formats
+        class FakeReader(object):
+            format = (2, 2, 44100)
+
+            def __init__(self):
+                self.chunks = [b"\x01\x00\x02\x00", b""]
+                self.closed = False
+
+            def read_frames(self, number_of_frames):
+                return self.chunks.pop(0)
+
+            def close(self):
+                self.closed = True
+
+        reader = FakeReader()
+        with mock.patch.object(FakeOutput, "_open_file", return_value=reader):
+            output.play(file_path)
+        self.assertEqual(output.streams[-1].stream_format, (2, 2, 44100))
+        self.assertEqual(output.streams[-1].data, b"\x01\x00\x02\x00")
+        self.assertTrue(reader.closed)
+
+
+if __name__ == '__main__':
+    unittest.main()
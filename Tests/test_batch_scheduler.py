@@ -0,0 +1,109 @@
+import threading
+import time
+import unittest
+
+from odie_cloud.speech.BatchScheduler import BatchScheduler
+
+
+class TestBatchScheduler(unittest.TestCase):
+    """
+    Class to test BatchScheduler
+    """
+
+    def setUp(self):
+        # list of tuple (model, inputs) of each forward pass
+        self.batches = list()
+        self.scheduler = None
+
+    def tearDown(self):
+        if self.scheduler is not None:
+            self.scheduler.stop()
+
+    def _predict_batch(self, model, inputs):
+        self.batches.append((model, list(inputs)))
+        return [value * 10 for value in inputs]
+
+    def _submit_all(self, values):
+        """
+        Submit each value from its own thread
+        :return: dict value -> output given back to the caller of the value, and the threads
+        """
+        outputs = dict()
+
+        def submit(value):
+            outputs[value] = self.scheduler.submit(value)
+
+        threads = [threading.Thread(target=submit, args=(value,)) for value in values]
+        for thread in threads:
+            thread.start()
+        return outputs, threads
+
+    def _wait_queued(self, number_of_requests):
+        deadline = time.time() + 5
+        while self.scheduler._requests.qsize() < number_of_requests and time.time() < deadline:
+            time.sleep(0.001)
+
+    def test_max_batch_size(self):
+        self.scheduler = BatchScheduler(self._predict_batch, max_batch_size=3, window_second=0.05)
+        outputs, threads = self._submit_all(range(8))
+        # the requests are queued before the worker starts
+        self._wait_queued(8)
+        self.scheduler.start(["model"])
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual([len(inputs) for _, inputs in self.batches], [3, 3, 2])
+        # each caller gets its own output
+        self.assertEqual(outputs, dict((value, value * 10) for value in range(8)))
+
+        stats = self.scheduler.get_stats()
+        self.assertEqual((stats["requests"], stats["batches"]), (8, 3))
+        self.assertAlmostEqual(stats["mean_batch_size"], 8 / 3.0)
+        self.assertEqual(stats["latencies"]["request"]["count"], 8)
+        self.assertEqual(stats["latencies"]["batch"]["count"], 3)
+
+    def test_window(self):
+        self.scheduler = BatchScheduler(self._predict_batch, max_batch_size=8, window_second=0.3)
+        self.scheduler.start(["model"])
+
+        # the second request is received during the window of the first one
+        outputs, threads = self._submit_all([1])
+        time.sleep(0.05)
+        second_outputs, second_threads = self._submit_all([2])
+        for thread in threads + second_threads:
+            thread.join()
+        self.assertEqual(self.batches, [("model", [1, 2])])
+        self.assertEqual((outputs[1], second_outputs[2]), (10, 20))
+
+        # without window, a request is predicted alone
+        self.batches = list()
+        self.scheduler.window_second = 0
+        self.assertEqual(self.scheduler.submit(3), 30)
+        self.assertEqual(self.batches, [("model", [3])])
+
+    def test_replicas(self):
+        self.scheduler = BatchScheduler(self._predict_batch, max_batch_size=1, window_second=0)
+        outputs, threads = self._submit_all(range(4))
+        self._wait_queued(4)
+        self.scheduler.start(["model1", "model2"])
+        for thread in threads:
+            thread.join()
+        self.assertEqual(outputs, dict((value, value * 10) for value in range(4)))
+        self.assertEqual(len(self.batches), 4)
+        self.assertTrue(set(model for model, _ in self.batches) <= {"model1", "model2"})
+
+    def test_error(self):
+        def predict_batch(model, inputs):
+            raise ValueError("forward pass failed")
+
+        self.scheduler = BatchScheduler(predict_batch, max_batch_size=2, window_second=0)
+        self.scheduler.start(["model"])
+        with self.assertRaises(ValueError):
+            self.scheduler.submit(1)
+        # the worker is still running
+        self.scheduler.predict_batch = self._predict_batch
+        self.assertEqual(self.scheduler.submit(2), 20)
+
+
+if __name__ == '__main__':
+    unittest.main()
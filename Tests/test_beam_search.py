@@ -0,0 +1,111 @@
+import unittest
+
+import mock
+import numpy as np
+
+from odie_cloud.speech.BeamSearch import CtcBeamSearch, CtcPrefixBeamSearch
+from odie_cloud.speech.BrainVocabulary import BrainVocabulary
+from odie_cloud.speech.decoder import ArgMaxDecoder
+
+ALPHABET = "_'ABCDEFGHIJKLMNOPQRSTUVWXYZ "
+
+
+def get_probabilities(sentence, probability=0.9):
+    """
+    probs[t, c] matrix where each character of the sentence is followed by a blank
+    """
+    frames = list()
+    for char in sentence:
+        for index in (ALPHABET.index(char), 0):
+            frame = np.full(len(ALPHABET), (1 - probability) / (len(ALPHABET) - 1))
+            frame[index] = probability
+            frames.append(frame)
+    return np.array(frames)
+
+
+class TestCtcPrefixBeamSearch(unittest.TestCase):
+    """
+    Class to test CtcPrefixBeamSearch
+    """
+
+    def setUp(self):
+        self.decoder = CtcPrefixBeamSearch(ALPHABET, space_index=ALPHABET.index(" "), lm_path=None)
+
+    def test_decode(self):
+        self.assertEqual(self.decoder.decode(get_probabilities("HELLO WORLD")), "HELLO WORLD")
+        # a repeated character needs a blank in between
+        probabilities = get_probabilities("AB")
+        probabilities = np.concatenate([probabilities[:1], probabilities])
+        self.assertEqual(self.decoder.decode(probabilities), "AB")
+        # the decoder is reset by decode
+        self.assertEqual(self.decoder.decode(get_probabilities("ODIE")), "ODIE")
+
+    def test_advance(self):
+        probabilities = get_probabilities("TURN ON THE LIGHT")
+        expected_result = self.decoder.decode(probabilities)
+
+        # the chunks give the same transcription as the whole matrix
+        self.decoder.reset()
+        for start in range(0, len(probabilities), 5):
+            self.decoder.advance(probabilities[start:start + 5])
+        self.assertEqual(self.decoder.time_steps, len(probabilities))
+        self.assertEqual(self.decoder.finish(), expected_result)
+        # finish does not change the state
+        self.assertEqual(self.decoder.finish(), expected_result)
+
+    def test_partial(self):
+        probabilities = get_probabilities("TURN ON THE LIGHT")
+        self.decoder.reset()
+        self.decoder.advance(probabilities[:2 * len("TURN ON TH")])
+        self.assertEqual(self.decoder.get_partial(), "TURN ON TH")
+        # the stable words are shared by all the prefixes
+        self.assertTrue("TURN ON TH".startswith(self.decoder.get_stable()))
+        self.decoder.advance(probabilities[2 * len("TURN ON TH"):])
+        self.assertEqual(self.decoder.finish(), "TURN ON THE LIGHT")
+
+        # with a single prefix, only its completed words are stable
+        decoder = CtcPrefixBeamSearch(ALPHABET, space_index=ALPHABET.index(" "), lm_path=None, beam_width=1)
+        decoder.advance(probabilities[:2 * len("TURN ON TH")])
+        self.assertEqual(decoder.get_stable(), "TURN ON")
+
+    def test_vocabulary(self):
+        probabilities = get_probabilities("GOODBYE", probability=0.6)
+
+        # a strict vocabulary prunes the words out of the orders
+        vocabulary = BrainVocabulary(["hello world", "goodbye"], ALPHABET)
+        decoder = CtcPrefixBeamSearch(ALPHABET, space_index=ALPHABET.index(" "), lm_path=None, vocabulary=vocabulary)
+        self.assertEqual(decoder.decode(probabilities), "GOODBYE")
+        decoder = CtcPrefixBeamSearch(ALPHABET, space_index=ALPHABET.index(" "), lm_path=None,
+                                      vocabulary=BrainVocabulary(["hello world"], ALPHABET))
+        transcription = decoder.decode(probabilities)
+        self.assertNotEqual(transcription, "GOODBYE")
+        self.assertTrue(set(transcription.split()) <= {"HELLO", "WORLD"})
+
+        # an open vocabulary only boosts its words
+        decoder = CtcPrefixBeamSearch(ALPHABET, space_index=ALPHABET.index(" "), lm_path=None,
+                                      vocabulary=BrainVocabulary(["hello {{ name }}"], ALPHABET))
+        self.assertEqual(decoder.decode(probabilities), "GOODBYE")
+
+
+class TestDecoders(unittest.TestCase):
+    """
+    Class to test the decoders without language model
+    """
+
+    def test_ctc_beam_search(self):
+        decoder = CtcBeamSearch(ALPHABET, space_index=ALPHABET.index(" "), lm_path=None)
+        self.assertIsNone(decoder.LM)
+        self.assertEqual(decoder.decode(get_probabilities("HI THERE"), ALPHABET), "HI THERE")
+
+    def test_argmax_decoder(self):
+        decoder = ArgMaxDecoder(ALPHABET, space_index=ALPHABET.index(" "), lm_path=None)
+        probabilities = np.transpose(get_probabilities("HI THERE"), (1, 0))
+        # the words are corrected with autocorrect when installed
+        with mock.patch("odie_cloud.speech.decoder.spell", None):
+            self.assertEqual(decoder.decode(probabilities), "HI THERE")
+        with mock.patch("odie_cloud.speech.decoder.spell", side_effect=lambda word: word.lower()):
+            self.assertEqual(decoder.decode(probabilities), "hi there")
+
+
+if __name__ == '__main__':
+    unittest.main()
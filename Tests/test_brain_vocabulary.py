@@ -0,0 +1,49 @@
+import unittest
+
+from odie_cloud.speech.BrainVocabulary import BrainVocabulary
+
+ALPHABET = "_'ABCDEFGHIJKLMNOPQRSTUVWXYZ "
+
+
+class TestBrainVocabulary(unittest.TestCase):
+    """
+    Class to test BrainVocabulary
+    """
+
+    def _get_labels(self, word):
+        return [ALPHABET.index(char) for char in word]
+
+    def test_strict_vocabulary(self):
+        vocabulary = BrainVocabulary(["Turn on the light.", "turn off the light", "what's the time?"], ALPHABET,
+                                     boost=3.0)
+        self.assertTrue(vocabulary.strict)
+        # the words are counted once, the punctuation is removed
+        self.assertEqual(len(vocabulary), 7)
+
+        node = vocabulary.get_node(self._get_labels("LIGHT"))
+        self.assertEqual(vocabulary.get_word_boost(node), 3.0)
+        self.assertEqual(vocabulary.get_word_boost(vocabulary.get_node(self._get_labels("WHAT'S"))), 3.0)
+        # the beginning of a word is in the trie, but is not a word
+        node = vocabulary.get_node(self._get_labels("LIG"))
+        self.assertIsNotNone(node)
+        self.assertIsNone(vocabulary.get_word_boost(node))
+        # no word of the vocabulary starts with these characters
+        self.assertIsNone(vocabulary.get_node(self._get_labels("LAMP")))
+        self.assertIsNone(vocabulary.get_word_boost(None))
+
+    def test_open_vocabulary(self):
+        # an order with a parameter accepts any word
+        vocabulary = BrainVocabulary(["search {{ query }} on the web"], ALPHABET)
+        self.assertFalse(vocabulary.strict)
+        self.assertEqual(len(vocabulary), 4)
+        self.assertIsNone(vocabulary.get_node(self._get_labels("QUERY")))
+
+        # a word that can not be spelled with the alphabet is said with other words
+        vocabulary = BrainVocabulary(["set a timer of 5 minutes"], ALPHABET)
+        self.assertFalse(vocabulary.strict)
+        self.assertEqual(len(vocabulary), 5)
+        self.assertIsNotNone(vocabulary.get_word_boost(vocabulary.get_node(self._get_labels("MINUTES"))))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+
+from odie.core.Utils.LatencyHistogram import LatencyHistogram
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    """
+    Class to test LatencyHistogram
+    """
+
+    def test_add(self):
+        latency_histogram = LatencyHistogram(buckets=(10, 100))
+        latency_histogram.add("init->starting_wakeon", 0.005)
+        latency_histogram.add("init->starting_wakeon", 0.050)
+        latency_histogram.add("init->starting_wakeon", 0.100)
+        latency_histogram.add("init->starting_wakeon", 1.5)
+        latency_histogram.add("starting_wakeon->playing_ready_sound", 0.002)
+
+        stats = latency_histogram.get_stats()
+        self.assertEqual(stats["init->starting_wakeon"]["count"], 4)
+        self.assertAlmostEqual(stats["init->starting_wakeon"]["mean"], 413.75)
+        self.assertAlmostEqual(stats["init->starting_wakeon"]["max"], 1500)
+        self.assertEqual(stats["init->starting_wakeon"]["buckets"], {"10": 1, "100": 2, "+Inf": 1})
+        self.assertEqual(stats["starting_wakeon->playing_ready_sound"]["buckets"], {"10": 1, "100": 0, "+Inf": 0})
+
+    def test_percentiles(self):
+        latency_histogram = LatencyHistogram(buckets=(10, 100))
+        for _ in range(90):
+            latency_histogram.add("batch", 0.005)
+        for _ in range(10):
+            latency_histogram.add("batch", 0.050)
+
+        stats = latency_histogram.get_stats()
+        # the 50th latency is in the middle of the first bucket (0 - 10 ms)
+        self.assertAlmostEqual(stats["batch"]["p50"], 50 / 90.0 * 10)
+        # the percentiles are not greater than the max
+        self.assertAlmostEqual(stats["batch"]["p99"], 50)
+
+        # the last bucket ends with the max
+        latency_histogram.add("speech", 1.5)
+        self.assertAlmostEqual(latency_histogram.get_stats()["speech"]["p99"], 100 + 0.99 * 1400)
+
+    def test_clean(self):
+        latency_histogram = LatencyHistogram()
+        latency_histogram.add("init->starting_wakeon", 0.005)
+        latency_histogram.clean()
+        self.assertEqual(latency_histogram.get_stats(), dict())
+
+
+if __name__ == '__main__':
+    unittest.main()
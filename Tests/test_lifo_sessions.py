@@ -0,0 +1,105 @@
+import os
+import unittest
+
+import mock
+
+from odie.core import LIFOBuffer
+from odie.core.ConfigurationManager import BrainLoader
+from odie.core.LIFOBuffer import LIFO
+from odie.core.LIFOSessions import LIFOSessions
+from odie.core.Models import Singleton
+from odie.core.Models.MatchedNeuron import MatchedNeuron
+
+
+class TestLIFOSessions(unittest.TestCase):
+
+    def setUp(self):
+        # be sure the brain haven't been instantiated before
+        Singleton._instances = dict()
+
+        if "/Tests" in os.getcwd():
+            self.brain_to_test = os.getcwd() + os.sep + "brains/lifo_buffer_test_brain.yml"
+        else:
+            self.brain_to_test = os.getcwd() + os.sep + "Tests/brains/lifo_buffer_test_brain.yml"
+
+        BrainLoader(file_path=self.brain_to_test)
+        self.lifo_sessions = LIFOSessions(ttl=600)
+
+    def _start_neuron1(self, lifo_buffer):
+        neuron = BrainLoader().brain.get_neuron_by_name("neuron1")
+        order = "enter in neuron 1"
+        lifo_buffer.add_neuron_list_to_lifo([MatchedNeuron(matched_neuron=neuron,
+                                                           user_order=order,
+                                                           matched_order=order)])
+        return lifo_buffer.execute(is_api_call=True)
+
+    def test_session(self):
+        with self.lifo_sessions.session("session1") as lifo_buffer1:
+            # sessions do not use the LIFO of the voice loop
+            self.assertIsInstance(lifo_buffer1, LIFO)
+            self.assertIsNot(lifo_buffer1, LIFOBuffer())
+        with self.lifo_sessions.session("session1") as lifo_buffer:
+            self.assertIs(lifo_buffer, lifo_buffer1)
+        with self.lifo_sessions.session("session2") as lifo_buffer2:
+            self.assertIsNot(lifo_buffer2, lifo_buffer1)
+        self.assertEqual(len(self.lifo_sessions), 2)
+
+        self.lifo_sessions.remove("session1")
+        self.assertEqual(len(self.lifo_sessions), 1)
+
+    def test_session_expiration(self):
+        with mock.patch("odie.core.LIFOSessions.time.time", return_value=1000):
+            with self.lifo_sessions.session("session1"):
+                with mock.patch("odie.core.LIFOSessions.time.time", return_value=5000):
+                    # a session in use is kept
+                    with self.lifo_sessions.session("session2"):
+                        self.assertEqual(len(self.lifo_sessions), 2)
+
+        with mock.patch("odie.core.LIFOSessions.time.time", return_value=1500):
+            with self.lifo_sessions.session("session3"):
+                pass
+        with mock.patch("odie.core.LIFOSessions.time.time", return_value=5100):
+            with self.lifo_sessions.session("session4"):
+                pass
+        # session1 and session3 were not used for more than 600 seconds
+        self.assertEqual(sorted(self.lifo_sessions._sessions), ["session2", "session4"])
+
+    def test_waiting_for_answer_by_session(self):
+        with mock.patch("odie.core.TTS.TTSModule.generate_and_play"):
+            with self.lifo_sessions.session("session1") as lifo_buffer:
+                response = self._start_neuron1(lifo_buffer)
+                self.assertEqual(response["status"], "waiting_for_answer")
+            with self.lifo_sessions.session("session2") as lifo_buffer:
+                response = self._start_neuron1(lifo_buffer)
+                self.assertEqual(response["status"], "waiting_for_answer")
+
+            # the answer of session1 starts neuron2 in session1 only
+            with self.lifo_sessions.session("session1") as lifo_buffer:
+                response = lifo_buffer.execute(answer="answer neuron1", is_api_call=True)
+                self.assertEqual([neuron["neuron_name"] for neuron in response["matched_neurons"]],
+                                 ["neuron1", "neuron2"])
+            with self.lifo_sessions.session("session2") as lifo_buffer:
+                self.assertEqual(len(lifo_buffer.lifo_list), 1)
+                self.assertEqual(lifo_buffer.lifo_list[0][0].neuron.name, "neuron1")
+
+            self.assertEqual(LIFOBuffer().lifo_list, [])
+
+    def test_get_current(self):
+        # outside of an execution, the LIFO of the voice loop
+        self.assertIs(LIFO.get_current(), LIFOBuffer())
+
+        lifo_buffer = LIFO()
+        current_lifos = list()
+
+        def process_neuron_list(neuron_list):
+            current_lifos.append(LIFO.get_current())
+
+        with mock.patch.object(lifo_buffer, "_process_neuron_list", side_effect=process_neuron_list):
+            lifo_buffer.add_neuron_list_to_lifo([])
+            lifo_buffer.execute()
+        self.assertEqual(current_lifos, [lifo_buffer])
+        self.assertIs(LIFO.get_current(), LIFOBuffer())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import unittest
+
+from odie.core.ConfigurationManager import SettingLoader
+from odie.core.MicrophoneCapture import MicrophoneCapture
+from odie.core.Models import Singleton
+
+
+class FakeCapture(MicrophoneCapture):
+    def __init__(self, **kwargs):
+        self.opened_streams = 0
+        self.write_frames = None
+        super(FakeCapture, self).__init__(**kwargs)
+
+    def _open_stream(self, callback):
+        self.opened_streams += 1
+        self.write_frames = callback
+        return "stream"
+
+    def _close_stream(self, stream):
+        pass
+
+
+class TestMicrophoneCapture(unittest.TestCase):
+    """
+    Class to test MicrophoneCapture
+    """
+
+    def tearDown(self):
+        MicrophoneCapture._captures = dict()
+        Singleton._instances = dict()
+
+    def test_get_capture(self):
+        SettingLoader().settings.recognition_options.pre_roll_second = 0.5
+        capture = FakeCapture.get_capture()
+        self.assertEqual(capture.pre_roll_second, 0.5)
+        self.assertIs(FakeCapture.get_capture(), capture)
+        self.assertIsNot(FakeCapture.get_capture(rate=8000), capture)
+
+    def test_consumers(self):
+        capture = FakeCapture(rate=4, pre_roll_second=1)
+        consumer1 = capture.open_consumer(size=16)
+        consumer2 = capture.open_consumer(size=16)
+        # one stream shared by the consumers
+        self.assertEqual(capture.opened_streams, 1)
+
+        capture.write_frames(b"abcd")
+        self.assertEqual(consumer1.get(), b"abcd")
+        self.assertEqual(consumer2.get(), b"abcd")
+
+        capture.close_consumer(consumer1)
+        capture.write_frames(b"efgh")
+        self.assertEqual(consumer1.get(), b"")
+        self.assertEqual(consumer2.get(), b"efgh")
+        # the closed consumer is woken up
+        self.assertFalse(consumer1.wait(timeout=5))
+
+        capture.close_consumer(consumer2)
+        capture.open_consumer(size=16)
+        self.assertEqual(capture.opened_streams, 1)
+
+    def test_pre_roll(self):
+        # 1 second of pre roll, 8 bytes
+        capture = FakeCapture(rate=4, pre_roll_second=1)
+        wakeon_consumer = capture.open_consumer(size=16)
+        capture.write_frames(b"hotw")
+        capture.write_frames(b"ordr")
+        # the wakeon read the hotword, "ordr" is pending
+        wakeon_consumer.get(size=4)
+        capture.mark(pending=len(wakeon_consumer))
+
+        # the consumer opened with pre roll starts at the mark
+        stt_consumer = capture.open_consumer(size=16, pre_roll=True)
+        capture.write_frames(b"more")
+        self.assertEqual(stt_consumer.get(), b"ordrmore")
+
+        # the audio since the mark is given once
+        self.assertEqual(capture.open_consumer(size=16, pre_roll=True).get(), b"")
+
+        # the pre roll is limited to pre_roll_second
+        capture.mark()
+        capture.write_frames(b"1234")
+        capture.write_frames(b"5678")
+        capture.write_frames(b"9abc")
+        self.assertEqual(capture.open_consumer(size=16, pre_roll=True).get(), b"56789abc")
+
+    def test_no_pre_roll(self):
+        capture = FakeCapture(rate=4, pre_roll_second=0)
+        capture.open_consumer(size=16)
+        capture.mark()
+        capture.write_frames(b"ordr")
+        self.assertEqual(capture.open_consumer(size=16, pre_roll=True).get(), b"")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -8,6 +8,9 @@ from odie.core.Models.Wakeon import Wakeon
 from odie.core.Models.Cue import Cue
 from odie.core.Models.Stt import Stt
 from odie.core.Models.RecognitionOptions import RecognitionOptions
+from odie.core.Models.OrderMatching import OrderMatching
+from odie.core.Models.TtsCacheOptions import TtsCacheOptions
+from odie.core.Models.TranscodeCacheOptions import TranscodeCacheOptions
 from odie.core.Models.RestAPI import RestAPI
 
 from odie.core.Models.Dna import Dna
@@ -16,9 +19,12 @@ from odie.core import LIFOBuffer
 from odie.core.Models.Settings import Settings
 
 from odie.core.Models import Action, Neuron, Brain, Resources, Singleton
+from odie.core.Models.ActionExecution import ActionExecution
 
 from odie.core.Models.APIResponse import APIResponse
 from odie.core.Models.MatchedNeuron import MatchedNeuron
+from odie.core.Models.OrderIndex import OrderIndex
+from odie.core.Models.OrderTemplate import OrderTemplate
 
 
 class TestModels(unittest.TestCase):
@@ -93,6 +99,69 @@ class TestModels(unittest.TestCase):
         # test not equals
         self.assertFalse(self.brain_test1.__eq__(self.brain_test2))
 
+        # the order index does not change the equality
+        self.brain_test1.get_order_index()
+        self.assertTrue(self.brain_test1.__eq__(self.brain_test3))
+
+        # the index is rebuilt when the neuron list is replaced
+        order_index = self.brain_test2.get_order_index()
+        self.assertIs(order_index, self.brain_test2.get_order_index())
+        self.brain_test2.neurons = self.all_neuron_list1
+        self.assertIsNot(order_index, self.brain_test2.get_order_index())
+
+    def test_OrderTemplate(self):
+        order_template = OrderTemplate(order="This is the {{ sentence }} with multiple {{params}}")
+
+        self.assertEqual(order_template.static_words, ["this", "is", "the", "with", "multiple"])
+        self.assertEqual(order_template.word_counter["this"], 1)
+        self.assertTrue(order_template.has_brackets)
+        self.assertEqual(order_template.prefix, "this is the ")
+        self.assertEqual(order_template.slots, [OrderTemplate.Slot(position=3, name="sentence", stop_word="with"),
+                                                OrderTemplate.Slot(position=6, name="params", stop_word=None)])
+
+        self.assertEqual(order_template.get_parameters("this is the multiple values with multiple values as words"),
+                         {'sentence': 'multiple values', 'params': 'values as words'})
+
+        # the template is compiled once per cue, and again if the order changes
+        cue = Cue(name="order", parameters="this is the {{ sentence }}")
+        order_template = cue.get_order_template()
+        self.assertIs(order_template, cue.get_order_template())
+        self.assertTrue(cue.__eq__(Cue(name="order", parameters="this is the {{ sentence }}")))
+        cue.parameters = "this is another {{ sentence }}"
+        self.assertIsNot(order_template, cue.get_order_template())
+
+    def test_OrderIndex(self):
+        cue_bracket = Cue(name="order", parameters="say {{ text }} please")
+        cue_only_bracket = Cue(name="order", parameters="{{ query }}")
+        neuron_bracket = Neuron(name="Neuron4", actions=[], cues=[cue_bracket])
+        neuron_only_bracket = Neuron(name="Neuron5", actions=[], cues=[cue_only_bracket])
+
+        order_index = OrderIndex(neurons=[self.neuron1, self.neuron2, self.neuron3,
+                                          neuron_bracket, neuron_only_bracket])
+
+        # each order is posted once, under its rarest word
+        number_of_entries = sum(len(entries) for entries in order_index.postings.values())
+        self.assertEqual(number_of_entries, 4)
+        self.assertEqual(order_index.postings["second"][0].neuron, self.neuron2)
+
+        # orders without static word are kept apart
+        self.assertEqual(len(order_index.wildcard_entries), 1)
+        self.assertEqual(order_index.wildcard_entries[0].neuron, neuron_only_bracket)
+
+        # matching entries are returned in the brain order
+        entries = order_index.get_matching_entries("THIS is the second sentence")
+        self.assertEqual([entry.neuron for entry in entries], [self.neuron1, self.neuron2, neuron_only_bracket])
+
+        entries = order_index.get_matching_entries("say hello please")
+        self.assertEqual([entry.neuron for entry in entries], [neuron_bracket, neuron_only_bracket])
+        self.assertEqual(entries[0].order, "say {{ text }} please")
+
+        # words must be said at least as many times as in the order
+        order_index = OrderIndex(neurons=[Neuron(name="Neuron6", actions=[],
+                                                 cues=[Cue(name="order", parameters="go go go")])])
+        self.assertEqual(order_index.get_matching_entries("go go"), [])
+        self.assertEqual(len(order_index.get_matching_entries("go go go now")), 1)
+
     def test_Dna(self):
         # create DNA object
         dna1 = Dna(name="dna1", module_type="action", author="odie",
@@ -167,12 +236,27 @@ class TestModels(unittest.TestCase):
         self.assertTrue(matched_neuron1.__eq__(matched_neuron3))
         self.assertFalse(matched_neuron1.__eq__(matched_neuron2))
 
+        # the actions of the brain are shared, not the list
+        self.assertEqual(matched_neuron1.action_fifo_list, self.neuron1.actions)
+        self.assertIsNot(matched_neuron1.action_fifo_list, self.neuron1.actions)
+        self.assertIs(matched_neuron1.action_fifo_list[0], self.neuron1.actions[0])
+
         # test action parameter loader is called
         with mock.patch("odie.core.ActionParameterLoader.get_parameters") as mock_get_parameters:
 
             MatchedNeuron(matched_neuron=self.neuron1, matched_order=user_order, user_order=user_order)
             mock_get_parameters.assert_called_once_with(neuron_order=user_order,
-                                                        user_order=user_order)
+                                                        user_order=user_order,
+                                                        order_template=None)
+            mock_get_parameters.reset_mock()
+
+            # the compiled order is forwarded when known
+            order_template = OrderTemplate(order=user_order)
+            MatchedNeuron(matched_neuron=self.neuron1, matched_order=user_order, user_order=user_order,
+                          matched_order_template=order_template)
+            mock_get_parameters.assert_called_once_with(neuron_order=user_order,
+                                                        user_order=user_order,
+                                                        order_template=order_template)
             mock_get_parameters.reset_mock()
 
     def test_Action(self):
@@ -217,6 +301,37 @@ class TestModels(unittest.TestCase):
 
         self.assertDictEqual(ast.literal_eval(action.__str__()), ast.literal_eval(expected_result_str))
 
+    def test_ActionExecution(self):
+        action = Action(name="test", parameters={"key1": "val1", "password": "secret"})
+        action_execution1 = ActionExecution(action=action, answer="yes", is_api_call=True)
+        action_execution2 = ActionExecution(action=action, no_voice=True)
+        action_execution3 = ActionExecution(action=action, answer="yes", is_api_call=True)
+
+        expected_result_serialize = {
+            'name': 'test',
+            'parameters': {
+                'key1': 'val1',
+                'password': 'secret',
+                'answer': 'yes',
+                'is_api_call': True,
+                'no_voice': False
+            }
+        }
+        self.assertDictEqual(expected_result_serialize, action_execution1.serialize())
+        self.assertEqual(action_execution2.parameters,
+                         {'key1': 'val1', 'password': 'secret', 'is_api_call': False, 'no_voice': True})
+        self.assertEqual(ast.literal_eval(action_execution2.__str__())["parameters"]["password"], "*****")
+
+        # the action of the brain is not modified
+        self.assertEqual(action.parameters, {"key1": "val1", "password": "secret"})
+
+        self.assertTrue(action_execution1.__eq__(action_execution3))
+        self.assertFalse(action_execution1.__eq__(action_execution2))
+
+        # action without parameter
+        self.assertEqual(ActionExecution(action=Action(name="test", parameters=None)).parameters,
+                         {'is_api_call': False, 'no_voice': False})
+
     '''
     DEPRECATED
     def test_Order(self):
@@ -273,6 +388,7 @@ class TestModels(unittest.TestCase):
             'port': 5000,
             'active': True,
             'allowed_cors_origin': '*',
+            'session_ttl': 600,
             'password': 'password',
             'login': 'admin'
         }
@@ -291,6 +407,9 @@ class TestModels(unittest.TestCase):
                                 port=5000, allowed_cors_origin="*")
 
             recognition_options = RecognitionOptions()
+            order_matching = OrderMatching()
+            tts_cache = TtsCacheOptions()
+            transcode_cache = TranscodeCacheOptions()
 
             setting1 = Settings(default_tts_name="pico2wav",
                                 default_stt_name="google",
@@ -313,6 +432,9 @@ class TestModels(unittest.TestCase):
                                 postgres=None,
                                 alphabot=None,
                                 recognition_options=recognition_options,
+                                order_matching=order_matching,
+                                tts_cache=tts_cache,
+                                transcode_cache=transcode_cache,
                                 cloud=None)
             setting1.odie_version = "0.4.5"
 
@@ -336,6 +458,9 @@ class TestModels(unittest.TestCase):
                                 postgres=None,
                                 alphabot=None,
                                 recognition_options=recognition_options,
+                                order_matching=order_matching,
+                                tts_cache=tts_cache,
+                                transcode_cache=transcode_cache,
                                 cloud=None)
             setting2.odie_version = "0.4.5"
 
@@ -360,7 +485,10 @@ class TestModels(unittest.TestCase):
                                 postgres=None,
                                 alphabot=None,
                                 cloud=None,
-                                recognition_options=recognition_options)
+                                recognition_options=recognition_options,
+                                order_matching=order_matching,
+                                tts_cache=tts_cache,
+                                transcode_cache=transcode_cache)
             setting3.odie_version = "0.4.5"
 
             expected_result_serialize = {
@@ -384,7 +512,8 @@ class TestModels(unittest.TestCase):
                         'password': 'password',
                         'active': True,
                         'port': 5000,
-                        'allowed_cors_origin': '*'
+                        'allowed_cors_origin': '*',
+                        'session_ttl': 600
                     },
                 'cache_path': '/tmp/odie',
                 'default_neuron': 'default_neuron',
@@ -395,7 +524,11 @@ class TestModels(unittest.TestCase):
                 'rpi_settings': None,
                 'postgres': None,
                 'alphabot': None,
-                'recognition_options': {'energy_threshold': 4000, 'adjust_for_ambient_noise_second': 0},
+                'recognition_options': {'energy_threshold': 4000, 'adjust_for_ambient_noise_second': 0,
+                                        'pre_roll_second': 2, 'ambient_noise_refresh_second': 60},
+                'order_matching': {'engine': 'subset', 'top_k': None, 'threshold': None},
+                'tts_cache': {'max_size': 100, 'warm_up': True, 'warm_up_workers': 2},
+                'transcode_cache': {'max_size': 50, 'memory_size': 5, 'preload_sounds': True},
                 'cloud': None
             }
 
@@ -404,6 +537,38 @@ class TestModels(unittest.TestCase):
             self.assertTrue(setting1.__eq__(setting3))
             self.assertFalse(setting1.__eq__(setting2))
 
+    def test_TtsCacheOptions(self):
+        tts_cache1 = TtsCacheOptions()
+        tts_cache2 = TtsCacheOptions(max_size=10, warm_up=False, warm_up_workers=1)
+        tts_cache3 = TtsCacheOptions()
+
+        expected_result_serialize = {
+            'max_size': 100,
+            'warm_up': True,
+            'warm_up_workers': 2
+        }
+
+        self.assertDictEqual(expected_result_serialize, tts_cache1.serialize())
+
+        self.assertTrue(tts_cache1.__eq__(tts_cache3))
+        self.assertFalse(tts_cache1.__eq__(tts_cache2))
+
+    def test_TranscodeCacheOptions(self):
+        transcode_cache1 = TranscodeCacheOptions()
+        transcode_cache2 = TranscodeCacheOptions(max_size=10, memory_size=0, preload_sounds=False)
+        transcode_cache3 = TranscodeCacheOptions()
+
+        expected_result_serialize = {
+            'max_size': 50,
+            'memory_size': 5,
+            'preload_sounds': True
+        }
+
+        self.assertDictEqual(expected_result_serialize, transcode_cache1.serialize())
+
+        self.assertTrue(transcode_cache1.__eq__(transcode_cache3))
+        self.assertFalse(transcode_cache1.__eq__(transcode_cache2))
+
     def test_Stt(self):
         stt1 = Stt(name="stt1", parameters={"key1": "val1"})
         stt2 = Stt(name="stt2", parameters={"key2": "val2"})
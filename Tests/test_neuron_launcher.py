@@ -5,6 +5,7 @@ import mock
 from odie.core import LIFOBuffer
 from odie.core.Models import Brain, Cue, Singleton
 from odie.core.Models.MatchedNeuron import MatchedNeuron
+from odie.core.Models.OrderMatching import OrderMatching
 from odie.core.Models.Settings import Settings
 from odie.core.NeuronLauncher import NeuronLauncher, NeuronNameNotFound
 
@@ -124,6 +125,27 @@ class TestNeuronLauncher(unittest.TestCase):
             lifo_buffer = LIFOBuffer()
             self.assertEqual(expected_result, lifo_buffer.lifo_list)
 
+        # -------------------------
+        # test_match_default_neuron_ranked
+        # -------------------------
+        # clean LIFO
+        Singleton._instances = dict()
+        order_matching = OrderMatching(engine="bm25", top_k=1)
+        with mock.patch("odie.core.LIFOBuffer.execute"):
+            with mock.patch("odie.core.OrderAnalyser._get_order_matching", return_value=order_matching):
+                # only common words of the brain are said, no order reaches the threshold
+                order_to_match = "not the existing sentence"
+                should_be_created_matched_neuron = MatchedNeuron(matched_neuron=self.neuron3,
+                                                                   user_order=order_to_match,
+                                                                   matched_order=None)
+
+                expected_result = [[should_be_created_matched_neuron]]
+                NeuronLauncher.run_matching_neuron_from_order(order_to_match,
+                                                                brain=self.brain_test,
+                                                                settings=self.settings_test)
+                lifo_buffer = LIFOBuffer()
+                self.assertEqual(expected_result, lifo_buffer.lifo_list)
+
         # -------------------------
         # test_no_match_and_no_default_neuron
         # -------------------------
@@ -0,0 +1,71 @@
+import struct
+import unittest
+
+import mock
+
+from odie.core.MicrophoneCapture import MicrophoneCapture
+from odie.core.NoiseFloorEstimator import NoiseFloorEstimator, CHUNK, DYNAMIC_ENERGY_RATIO
+
+
+class FakeCapture(MicrophoneCapture):
+    def __init__(self, frames):
+        super(FakeCapture, self).__init__(rate=CHUNK, pre_roll_second=0)
+        self.frames = frames
+
+    def open_consumer(self, size=None, pre_roll=False):
+        ring_buffer = super(FakeCapture, self).open_consumer(size=len(self.frames), pre_roll=pre_roll)
+        ring_buffer.extend(self.frames)
+        return ring_buffer
+
+    def _open_stream(self, callback):
+        return "stream"
+
+    def _close_stream(self, stream):
+        pass
+
+
+def get_frames(amplitude, number_of_chunks):
+    # square wave, the rms is the amplitude
+    return b"".join(struct.pack("<h", amplitude if index % 2 else -amplitude)
+                    for index in range(CHUNK * number_of_chunks))
+
+
+class TestNoiseFloorEstimator(unittest.TestCase):
+    """
+    Class to test NoiseFloorEstimator
+    """
+
+    def test_measure(self):
+        # 1 second is one chunk
+        estimator = NoiseFloorEstimator(FakeCapture(get_frames(100, 2)), window_second=2)
+        estimator.set_idle(True)
+        self.assertEqual(estimator.measure(), 100 * DYNAMIC_ENERGY_RATIO)
+        # the consumer is closed after the measure
+        self.assertEqual(estimator.capture._consumers, [])
+
+        # the measure is dropped when odie is not idle
+        estimator.set_idle(False)
+        self.assertIsNone(estimator.measure())
+
+    def test_update(self):
+        estimator = NoiseFloorEstimator(FakeCapture(b""))
+        self.assertIsNone(estimator.get_energy_threshold())
+        estimator.update(300)
+        self.assertEqual(estimator.get_energy_threshold(), 300)
+        # smoothed
+        estimator.update(500)
+        self.assertEqual(estimator.get_energy_threshold(), 400)
+
+    def test_run(self):
+        estimator = NoiseFloorEstimator(FakeCapture(b""), refresh_second=60)
+        with mock.patch.object(estimator, "measure", side_effect=[None, 300]) as mock_measure:
+            with mock.patch.object(estimator._stop_event, "wait", side_effect=lambda timeout: estimator.stop()):
+                estimator.set_idle(True)
+                estimator.run()
+        # measured again when a measure is dropped
+        self.assertEqual(mock_measure.call_count, 2)
+        self.assertEqual(estimator.get_energy_threshold(), 300)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,5 @@
 import unittest
+import mock
 
 
 from odie.core.Models import Brain
@@ -6,6 +7,7 @@ from odie.core.Models import Action
 from odie.core.Models import Neuron
 from odie.core.Models.Cue import Cue
 from odie.core.Models.MatchedNeuron import MatchedNeuron
+from odie.core.Models.OrderMatching import OrderMatching
 from odie.core.OrderAnalyser import OrderAnalyser
 
 
@@ -60,6 +62,36 @@ class TestOrderAnalyser(unittest.TestCase):
         matched_neurons = OrderAnalyser.get_matching_neuron(order=spoken_order, brain=br)
         self.assertFalse(matched_neurons)
 
+    def test_get_matching_neuron_ranked(self):
+        cue1 = Cue(name="order", parameters="turn on the light")
+        cue2 = Cue(name="order", parameters="turn on the light in the kitchen")
+        neuron1 = Neuron(name="Neuron1", actions=[], cues=[cue1])
+        neuron2 = Neuron(name="Neuron2", actions=[], cues=[cue2])
+        br = Brain(neurons=[neuron1, neuron2])
+
+        spoken_order = "turn on the light in the kitchen"
+
+        # the subset engine fires both neurons
+        with mock.patch("odie.core.OrderAnalyser._get_order_matching", return_value=OrderMatching()):
+            matched_neurons = OrderAnalyser.get_matching_neuron(order=spoken_order, brain=br)
+            self.assertEqual([matched_neuron.neuron for matched_neuron in matched_neurons], [neuron1, neuron2])
+
+        # a ranking engine only fires the best one
+        order_matching = OrderMatching(engine="bm25", top_k=1)
+        with mock.patch("odie.core.OrderAnalyser._get_order_matching", return_value=order_matching):
+            matched_neurons = OrderAnalyser.get_matching_neuron(order=spoken_order, brain=br)
+            self.assertEqual([matched_neuron.neuron for matched_neuron in matched_neurons], [neuron2])
+
+        # nothing fires under the threshold
+        order_matching = OrderMatching(engine="tfidf", threshold=0.99)
+        with mock.patch("odie.core.OrderAnalyser._get_order_matching", return_value=order_matching):
+            self.assertFalse(OrderAnalyser.get_matching_neuron(order="the kitchen", brain=br))
+
+        # scores are returned with the orders
+        ranked_orders = OrderAnalyser.get_ranked_orders(order=spoken_order, brain=br, engine="tfidf")
+        self.assertEqual(ranked_orders[0].entry.neuron, neuron2)
+        self.assertAlmostEqual(ranked_orders[0].score, 1.0)
+
     def test_spelt_order_match_brain_order_via_table(self):
         order_to_test = "this is the order"
         sentence_to_test = "this is the order"
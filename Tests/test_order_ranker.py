@@ -0,0 +1,101 @@
+import unittest
+
+from odie.core.Models import Brain
+from odie.core.Models import Neuron
+from odie.core.Models.Cue import Cue
+from odie.core.Models.OrderIndex import OrderIndex
+from odie.core.OrderRanker import OrderRanker, OrderRankerNotFound, Bm25OrderRanker, TfidfOrderRanker
+
+
+class TestOrderRanker(unittest.TestCase):
+
+    """Test case for the OrderRanker Class"""
+
+    def setUp(self):
+        self.neuron1 = Neuron(name="Neuron1", actions=[], cues=[Cue(name="order", parameters="turn on the light")])
+        self.neuron2 = Neuron(name="Neuron2", actions=[],
+                              cues=[Cue(name="order", parameters="turn on the light in the kitchen")])
+        self.neuron3 = Neuron(name="Neuron3", actions=[], cues=[Cue(name="order", parameters="what time is it")])
+        self.neuron4 = Neuron(name="Neuron4", actions=[], cues=[Cue(name="order", parameters="{{ query }}")])
+
+        self.brain = Brain(neurons=[self.neuron1, self.neuron2, self.neuron3, self.neuron4])
+        self.order_index = OrderIndex(neurons=self.brain.neurons)
+
+    def test_get_ranker(self):
+        self.assertIsInstance(OrderRanker.get_ranker(engine="bm25", order_index=self.order_index), Bm25OrderRanker)
+        self.assertIsInstance(OrderRanker.get_ranker(engine="tfidf", order_index=self.order_index), TfidfOrderRanker)
+
+        with self.assertRaises(OrderRankerNotFound):
+            OrderRanker.get_ranker(engine="unknown", order_index=self.order_index)
+
+        # the ranker is created once per index
+        self.assertIs(self.order_index.get_ranker("bm25"), self.order_index.get_ranker("bm25"))
+
+        # the engines must weigh the words of the orders
+        with self.assertRaises(TypeError):
+            OrderRanker(order_index=self.order_index)
+
+    def test_rank_bm25(self):
+        ranker = self.order_index.get_ranker("bm25")
+
+        # the order with the same words comes first, the partial ones after, the wildcard last
+        ranked_orders = ranker.rank("turn on the light", threshold=0)
+        self.assertEqual([ranked_order.entry.neuron for ranked_order in ranked_orders],
+                         [self.neuron1, self.neuron2, self.neuron4])
+        self.assertGreater(ranked_orders[0].score, ranked_orders[1].score)
+        self.assertEqual(ranked_orders[2].score, 0)
+
+        ranked_orders = ranker.rank("turn on the light in the kitchen")
+        self.assertEqual(ranked_orders[0].entry.neuron, self.neuron2)
+
+        # top_k and threshold
+        ranked_orders = ranker.rank("turn on the light", top_k=1)
+        self.assertEqual([ranked_order.entry.neuron for ranked_order in ranked_orders], [self.neuron1])
+
+        ranked_orders = ranker.rank("turn on the light", threshold=0.1)
+        self.assertEqual([ranked_order.entry.neuron for ranked_order in ranked_orders],
+                         [self.neuron1, self.neuron2])
+
+        self.assertEqual(ranker.rank("unknown sentence", threshold=0.1), [])
+
+        # the default threshold drops the wildcard and the orders sharing only common words
+        ranked_orders = ranker.rank("turn on the light")
+        self.assertEqual([ranked_order.entry.neuron for ranked_order in ranked_orders],
+                         [self.neuron1, self.neuron2])
+        self.assertEqual(ranker.rank("the"), [])
+        # the exact order reaches any threshold
+        ranked_orders = ranker.rank("turn on the light in the kitchen", threshold=1)
+        self.assertEqual([ranked_order.entry.neuron for ranked_order in ranked_orders],
+                         [self.neuron2, self.neuron1])
+        self.assertEqual(ranker.rank("turn on", threshold=0.6), [])
+
+    def test_rank_small_brain(self):
+        # the threshold does not depend on the size of the brain
+        for orders in (["hello"], ["hello", "bye"], ["hello", "bye", "thank you"]):
+            neurons = [Neuron(name="Neuron%d" % index, actions=[], cues=[Cue(name="order", parameters=order)])
+                       for index, order in enumerate(orders)]
+            order_index = OrderIndex(neurons=neurons)
+            for engine in ("bm25", "tfidf"):
+                ranked_orders = order_index.get_ranker(engine).rank("hello")
+                self.assertEqual([ranked_order.entry.neuron for ranked_order in ranked_orders], [neurons[0]])
+                self.assertEqual(order_index.get_ranker(engine).rank("goodbye"), [])
+
+    def test_rank_tfidf(self):
+        ranker = self.order_index.get_ranker("tfidf")
+
+        ranked_orders = ranker.rank("TURN on the light")
+        self.assertEqual(ranked_orders[0].entry.neuron, self.neuron1)
+        self.assertAlmostEqual(ranked_orders[0].score, 1.0)
+        self.assertLess(ranked_orders[1].score, 1.0)
+
+        ranked_orders = ranker.rank("what time is it", top_k=1)
+        self.assertEqual(len(ranked_orders), 1)
+        self.assertEqual(ranked_orders[0].entry.neuron, self.neuron3)
+
+        # the words not in the brain lower the similarity
+        self.assertLess(ranker.rank("turn on the light please")[0].score, 1.0)
+        self.assertEqual(ranker.rank("please say the weather"), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import mock
+
+from odie.actions.say.say import Say
+from odie.core.Utils.PluginRegistry import PluginRegistry
+from odie.core.Utils.Utils import Utils, ModuleNotFoundError
+
+RESOURCE_ACTION = """
+class Say(object):
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+"""
+
+
+class TestPluginRegistry(unittest.TestCase):
+    """
+    Class to test PluginRegistry
+    """
+
+    def setUp(self):
+        PluginRegistry.clean()
+        self.resources_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        PluginRegistry.clean()
+        shutil.rmtree(self.resources_dir)
+
+    def test_get_class(self):
+        with mock.patch.object(PluginRegistry, "_resolve_class", wraps=PluginRegistry._resolve_class) as mock_resolve:
+            self.assertIs(PluginRegistry.get_class("actions", "Say"), Say)
+            self.assertIs(PluginRegistry.get_class("actions", "Say"), Say)
+            # resolved once by package, module and resources dir
+            mock_resolve.assert_called_once_with("actions", "Say", None)
+
+            PluginRegistry.get_class("actions", "Say", resources_dir=self.resources_dir)
+            self.assertEqual(mock_resolve.call_count, 2)
+
+            # resolved again after a clean
+            PluginRegistry.clean()
+            PluginRegistry.get_class("actions", "Say")
+            self.assertEqual(mock_resolve.call_count, 3)
+
+        # module not found errors are not kept
+        with self.assertRaises(ImportError):
+            PluginRegistry.get_class("actions", "Notexisting")
+        self.assertEqual(list(PluginRegistry._classes), [("actions", "Say", None)])
+
+    def test_get_class_from_resources_dir(self):
+        os.makedirs(os.path.join(self.resources_dir, "say"))
+        with open(os.path.join(self.resources_dir, "say", "say.py"), "w") as resource_file:
+            resource_file.write(RESOURCE_ACTION)
+
+        # the resources folder is checked first
+        klass = PluginRegistry.get_class("actions", "Say", resources_dir=self.resources_dir)
+        self.assertIsNot(klass, Say)
+        self.assertEqual(klass.__module__, "Say")
+        self.assertIs(PluginRegistry.get_class("actions", "Say", resources_dir=self.resources_dir), klass)
+
+    def test_instantiate(self):
+        with mock.patch.object(PluginRegistry, "get_class") as mock_get_class:
+            instance = Utils.get_dynamic_class_instantiation(package_name="actions",
+                                                             module_name="Say",
+                                                             parameters={"message": "hello"},
+                                                             resources_dir=self.resources_dir)
+            mock_get_class.assert_called_once_with("actions", "Say", resources_dir=self.resources_dir)
+            mock_get_class.return_value.assert_called_once_with(message="hello")
+            self.assertIs(instance, mock_get_class.return_value.return_value)
+
+            PluginRegistry.instantiate("actions", "Say")
+            mock_get_class.return_value.assert_called_with()
+            PluginRegistry.instantiate("actions", "Say", parameters="hello")
+            mock_get_class.return_value.assert_called_with("hello")
+
+        stats = PluginRegistry.get_stats()
+        self.assertEqual(list(stats), ["actions.say"])
+        self.assertEqual(stats["actions.say"]["instances"], 3)
+
+    def test_get_stats(self):
+        PluginRegistry.get_class("actions", "Say")
+        stats = PluginRegistry.get_stats()
+        self.assertGreaterEqual(stats["actions.say"]["resolve_time"], 0)
+        self.assertEqual(stats["actions.say"]["instances"], 0)
+
+        PluginRegistry.clean()
+        self.assertEqual(PluginRegistry.get_stats(), dict())
+
+    def test_module_not_found(self):
+        # a module of the resources folder without the class of the plugin
+        os.makedirs(os.path.join(self.resources_dir, "noclass"))
+        with open(os.path.join(self.resources_dir, "noclass", "noclass.py"), "w") as resource_file:
+            resource_file.write("")
+
+        with self.assertRaises(ModuleNotFoundError):
+            PluginRegistry.get_class("actions", "Noclass", resources_dir=self.resources_dir)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,13 @@
 import unittest
+import mock
+import psycopg2
 
-from odie.postgres.PostgreManager import PostgresManager
+from odie.core.Models import Brain
+from odie.core.Models import Neuron
+from odie.core.Models.Cue import Cue
+from odie.core.Models.Postgres import Postgres
+from odie.postgres.PostgreManager import PostgresManager, BrainTableSync
+from odie.postgres.PostgresPool import PostgresPool, PostgresPoolExhausted
 from odie.core.ConfigurationManager import SettingLoader
 from odie.core.ConfigurationManager import BrainLoader
 
@@ -71,6 +78,210 @@ class TestPostgreManager(unittest.TestCase):
         except:
             return False
 
+    def test_get_tsquery(self):
+        self.assertEqual(PostgresManager.get_tsquery("Hello World"), "hello | world")
+        # tsquery operators said by the user are not kept
+        self.assertEqual(PostgresManager.get_tsquery("what's up & down!"), "what | s | up | down")
+        self.assertEqual(PostgresManager.get_tsquery(" "), "")
+
+    def test_search_match_neuron(self):
+        connection = mock.MagicMock()
+        connection.cursor.return_value.fetchall.return_value = [("say-hello", "hello")]
+
+        self.assertEqual(PostgresManager.search_match_neuron(connection, "Hello you", limit=2),
+                         [("say-hello", "hello")])
+        # the prepared statement is executed with bound parameters
+        connection.cursor.return_value.execute.assert_called_once_with("EXECUTE search_match_neuron (%s, %s);",
+                                                                       ("hello | you", 2))
+
+        # a failing search returns an empty list and rolls back
+        connection.cursor.return_value.execute.side_effect = psycopg2.Error()
+        self.assertEqual(PostgresManager.search_match_neuron(connection, "hello"), list())
+        connection.rollback.assert_called_once_with()
+
+    def test_search_match_neuron_not_prepared(self):
+        class NotPreparedError(psycopg2.Error):
+            pgcode = "26000"
+
+        connection = mock.MagicMock()
+        connection.cursor.return_value.execute.side_effect = [NotPreparedError(), None, None]
+        connection.cursor.return_value.fetchall.return_value = [("say-hello", "hello")]
+        # the statement is prepared then executed again
+        self.assertEqual(PostgresManager.search_match_neuron(connection, "hello"), [("say-hello", "hello")])
+        self.assertEqual(connection.cursor.return_value.execute.call_count, 3)
+
+    def test_get_neuron_hash(self):
+        neuron1 = Neuron(name="Neuron1", actions=[], cues=[Cue(name="order", parameters="hello")])
+        neuron2 = Neuron(name="Neuron1", actions=[], cues=[Cue(name="order", parameters="hello")])
+        neuron3 = Neuron(name="Neuron1", actions=[], cues=[Cue(name="order", parameters="hello you")])
+
+        self.assertEqual(PostgresManager.get_neuron_hash(neuron1), PostgresManager.get_neuron_hash(neuron2))
+        self.assertNotEqual(PostgresManager.get_neuron_hash(neuron1), PostgresManager.get_neuron_hash(neuron3))
+
+    def test_sync_brain_rows(self):
+        neuron1 = Neuron(name="Neuron1", actions=[], cues=[Cue(name="order", parameters="hello")])
+        neuron2 = Neuron(name="Neuron2", actions=[], cues=[Cue(name="order", parameters="goodbye"),
+                                                          Cue(name="order", parameters="see you")])
+        neuron3 = Neuron(name="Neuron3", actions=[], cues=[Cue(name="order", parameters="what time is it")])
+        neuron4 = Neuron(name="Neuron4", actions=[], cues=[Cue(name="event", parameters={"hour": "8"})])
+        brain = Brain(neurons=[neuron1, neuron2, neuron3, neuron4])
+
+        saved_hashes = {
+            "Neuron1": PostgresManager.get_neuron_hash(neuron1),
+            "Neuron2": "old hash",
+            "Removed": "removed hash"
+        }
+        cursor = mock.MagicMock(rowcount=2)
+        with mock.patch("odie.postgres.PostgreManager.execute_values") as mock_execute_values:
+            brain_sync = PostgresManager._sync_brain_rows(cursor, brain, saved_hashes)
+
+            # neurons without order are not saved, the unchanged ones are not written again
+            self.assertEqual(brain_sync, BrainTableSync(added=1, updated=1, removed=1, unchanged=1,
+                                                        deleted_rows=2, inserted_rows=3))
+            cursor.execute.assert_called_once_with("DELETE FROM brain WHERE name = ANY(%s);",
+                                                   (["Neuron2", "Removed"],))
+            neuron2_hash = PostgresManager.get_neuron_hash(neuron2)
+            mock_execute_values.assert_called_once_with(
+                cursor, "INSERT INTO brain (name, cue, neuron_hash) VALUES %s;",
+                [("Neuron2", "goodbye", neuron2_hash),
+                 ("Neuron2", "see you", neuron2_hash),
+                 ("Neuron3", "what time is it", PostgresManager.get_neuron_hash(neuron3))])
+
+        # nothing to write
+        cursor.reset_mock()
+        with mock.patch("odie.postgres.PostgreManager.execute_values") as mock_execute_values:
+            saved_hashes = {neuron.name: PostgresManager.get_neuron_hash(neuron) for neuron in brain.neurons[:3]}
+            brain_sync = PostgresManager._sync_brain_rows(cursor, brain, saved_hashes)
+            self.assertEqual(brain_sync, BrainTableSync(added=0, updated=0, removed=0, unchanged=3,
+                                                        deleted_rows=0, inserted_rows=0))
+            cursor.execute.assert_not_called()
+            mock_execute_values.assert_not_called()
+
+    def test_save_brain_table(self):
+        pg = Postgres(database='odie', user='admin', password='secret')
+        neuron1 = Neuron(name="Neuron1", actions=[], cues=[Cue(name="order", parameters="hello")])
+        brain = Brain(neurons=[neuron1])
+
+        with mock.patch("odie.postgres.PostgreManager.PostgresManager.get_pool") as mock_get_pool:
+            cursor = mock_get_pool.return_value.connection.return_value.__enter__.return_value.cursor.return_value
+            executed = lambda: [call[0][0] for call in cursor.execute.call_args_list]
+
+            # incremental: the table is kept
+            cursor.fetchall.side_effect = [[("name",), ("cue",), ("neuron_hash",)], []]
+            with mock.patch("odie.postgres.PostgreManager.execute_values"):
+                brain_sync = PostgresManager.save_brain_table(pg=pg, brain=brain)
+            self.assertEqual(brain_sync.added, 1)
+            self.assertNotIn("DROP TABLE IF EXISTS brain;", executed())
+
+            # table created before the incremental save: recreated
+            cursor.reset_mock()
+            cursor.fetchall.side_effect = [[("name",), ("cue",)], []]
+            with mock.patch("odie.postgres.PostgreManager.execute_values"):
+                PostgresManager.save_brain_table(pg=pg, brain=brain)
+            self.assertIn("DROP TABLE IF EXISTS brain;", executed())
+
+            # replace mode
+            cursor.reset_mock()
+            cursor.fetchall.side_effect = [[]]
+            with mock.patch("odie.postgres.PostgreManager.execute_values"):
+                PostgresManager.save_brain_table(pg=pg, brain=brain, incremental=False)
+            self.assertIn("DROP TABLE IF EXISTS brain;", executed())
+
+            # failure
+            cursor.execute.side_effect = psycopg2.Error()
+            self.assertFalse(PostgresManager.save_brain_table(pg=pg, brain=brain))
+
+    def test_get_pool(self):
+        pg = Postgres(database='odie', user='admin', password='secret')
+        with mock.patch("odie.postgres.PostgreManager.PostgresPool") as mock_pool:
+            pool1 = PostgresManager.get_pool(pg)
+            pool2 = PostgresManager.get_pool(pg)
+            # one pool per settings
+            self.assertIs(pool1, pool2)
+            mock_pool.assert_called_once()
+            PostgresManager.close_pools()
+            pool1.close.assert_called_once_with()
+
+
+class TestPostgresPool(unittest.TestCase):
+    """
+    Class to test PostgresPool
+    """
+
+    def setUp(self):
+        self.pg = Postgres(database='odie', user='admin', password='secret',
+                           pool_min_size=1, pool_max_size=1, health_check_interval=0, connection_timeout=0)
+
+    def test_connection(self):
+        with mock.patch("psycopg2.pool.ThreadedConnectionPool") as mock_threaded_pool:
+            connection = mock.MagicMock(closed=0)
+            mock_threaded_pool.return_value.getconn.return_value = connection
+            pg_pool = PostgresPool(self.pg, prepared_statements={"statement": "PREPARE statement AS SELECT 1;"})
+            mock_threaded_pool.assert_called_once_with(minconn=1, maxconn=1, host='localhost', port=5432,
+                                                       dbname='odie', user='admin', password='secret')
+
+            # statements are prepared on new connections only
+            with pg_pool.connection() as con:
+                self.assertIs(con, connection)
+            connection.cursor.return_value.execute.assert_called_once_with("PREPARE statement AS SELECT 1;")
+            connection.commit.assert_called()
+            mock_threaded_pool.return_value.putconn.assert_called_once_with(connection, close=False)
+
+            # the idle connection is checked before being used again
+            connection.cursor.return_value.execute.reset_mock()
+            with pg_pool.connection():
+                pass
+            connection.cursor.return_value.execute.assert_called_once_with("SELECT 1;")
+
+            # the transaction is rolled back on error
+            with self.assertRaises(ValueError):
+                with pg_pool.connection():
+                    raise ValueError()
+            connection.rollback.assert_called()
+
+    def test_broken_connection(self):
+        with mock.patch("psycopg2.pool.ThreadedConnectionPool") as mock_threaded_pool:
+            broken_connection = mock.MagicMock(closed=0)
+            connection = mock.MagicMock(closed=0)
+            mock_threaded_pool.return_value.getconn.side_effect = [broken_connection, broken_connection, connection]
+            pg_pool = PostgresPool(self.pg)
+
+            with pg_pool.connection():
+                pass
+            # the server dropped the connection
+            broken_connection.closed = 1
+            with pg_pool.connection() as con:
+                self.assertIs(con, connection)
+            mock_threaded_pool.return_value.putconn.assert_any_call(broken_connection, close=True)
+
+    def test_connection_closed_by_pool(self):
+        with mock.patch("psycopg2.pool.ThreadedConnectionPool") as mock_threaded_pool:
+            closed_connection = mock.MagicMock(closed=0)
+            connection = mock.MagicMock(closed=0)
+            mock_threaded_pool.return_value.getconn.side_effect = [closed_connection, connection]
+
+            def putconn(con, close=False):
+                # connections above the minimum size are closed by the psycopg2 pool
+                con.closed = 1
+            mock_threaded_pool.return_value.putconn.side_effect = putconn
+            pg_pool = PostgresPool(self.pg, prepared_statements={"statement": "PREPARE statement AS SELECT 1;"})
+
+            with pg_pool.connection():
+                pass
+            self.assertNotIn(closed_connection, pg_pool._last_used)
+            # the new connection is prepared
+            with pg_pool.connection() as con:
+                self.assertIs(con, connection)
+            connection.cursor.return_value.execute.assert_called_once_with("PREPARE statement AS SELECT 1;")
+
+    def test_pool_exhausted(self):
+        with mock.patch("psycopg2.pool.ThreadedConnectionPool"):
+            pg_pool = PostgresPool(self.pg)
+            with pg_pool.connection():
+                with self.assertRaises(PostgresPoolExhausted):
+                    with pg_pool.connection():
+                        pass
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -11,7 +11,7 @@ from odie.core import LIFOBuffer
 from odie.core.ConfigurationManager import BrainLoader
 from odie.core.ConfigurationManager import SettingLoader
 from odie.core.Models import Singleton
-from odie.core.RestAPI.FlaskAPI import FlaskAPI
+from odie.core.RestAPI.FlaskAPI import FlaskAPI, AnalyserReturn
 
 
 class TestRestAPI(LiveServerTestCase):
@@ -333,6 +333,26 @@ class TestRestAPI(LiveServerTestCase):
         #         self.assertEqual(json.dumps(expected_content), json.dumps(json.loads(result.get_data())))
         #         self.assertEqual(result.status_code, 201)
 
+    def test_audio_analyser_callback(self):
+        analyser_return = AnalyserReturn()
+        with mock.patch("odie.core.NeuronLauncher.run_matching_neuron_from_order",
+                        return_value={"status": "complete"}) as mock_run_matching_neuron:
+            self.flask_api.audio_analyser_callback("bonjour", no_voice=True, lifo_buffer="lifo",
+                                                   analyser_return=analyser_return)
+            self.assertEqual(mock_run_matching_neuron.call_args[1]["lifo_buffer"], "lifo")
+            self.assertTrue(mock_run_matching_neuron.call_args[1]["no_voice"])
+            self.assertFalse(hasattr(self.flask_api, "no_voice"))
+        self.assertTrue(analyser_return.done.is_set())
+        self.assertEqual(analyser_return.api_response, {"status": "complete"})
+
+        # the main process is notified even if the order analyser fails
+        analyser_return = AnalyserReturn()
+        with mock.patch("odie.core.NeuronLauncher.run_matching_neuron_from_order", side_effect=ValueError()):
+            with self.assertRaises(ValueError):
+                self.flask_api.audio_analyser_callback("bonjour", analyser_return=analyser_return)
+        self.assertTrue(analyser_return.done.is_set())
+        self.assertIsNone(analyser_return.api_response)
+
     def test_convert_to_wav(self):
         """
         Test the api function to convert incoming sound file to wave.
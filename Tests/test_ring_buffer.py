@@ -0,0 +1,82 @@
+import threading
+import time
+import unittest
+
+from odie.core.RingBuffer import RingBuffer
+
+
+class TestRingBuffer(unittest.TestCase):
+    """
+    Class to test RingBuffer
+    """
+
+    def test_extend_get(self):
+        ring_buffer = RingBuffer(size=8)
+        self.assertEqual(ring_buffer.get(), b"")
+
+        ring_buffer.extend(b"abc")
+        ring_buffer.extend(b"de")
+        self.assertEqual(len(ring_buffer), 5)
+        self.assertEqual(ring_buffer.get(), b"abcde")
+        self.assertEqual(len(ring_buffer), 0)
+
+        # the data wraps around the end of the bytearray
+        ring_buffer.extend(b"abcdef")
+        ring_buffer.get()
+        ring_buffer.extend(b"ghijk")
+        self.assertEqual(ring_buffer.get(), b"ghijk")
+
+    def test_get_size_and_peek(self):
+        ring_buffer = RingBuffer(size=8)
+        ring_buffer.extend(b"abcdef")
+        self.assertEqual(ring_buffer.get(size=4), b"abcd")
+        ring_buffer.extend(b"ghijk")
+        # the last bytes are read without being removed
+        self.assertEqual(ring_buffer.peek(size=3), b"ijk")
+        self.assertEqual(ring_buffer.get(size=20), b"efghijk")
+
+    def test_wait_size(self):
+        ring_buffer = RingBuffer(size=8)
+        ring_buffer.extend(b"ab")
+        self.assertFalse(ring_buffer.wait(timeout=0.01, size=4))
+        writer = threading.Timer(0.05, ring_buffer.extend, args=(b"cd",))
+        writer.start()
+        self.assertTrue(ring_buffer.wait(timeout=5, size=4))
+        writer.join()
+
+    def test_overflow(self):
+        ring_buffer = RingBuffer(size=8)
+        ring_buffer.extend(b"abcdef")
+        # the oldest bytes are dropped
+        ring_buffer.extend(b"ghij")
+        self.assertEqual(ring_buffer.get(), b"cdefghij")
+
+        ring_buffer.extend(b"0123456789")
+        self.assertEqual(ring_buffer.get(), b"23456789")
+
+    def test_wait(self):
+        ring_buffer = RingBuffer(size=8)
+        self.assertFalse(ring_buffer.wait(timeout=0.01))
+
+        # the consumer is woken by the writer
+        writer = threading.Timer(0.05, ring_buffer.extend, args=(b"abc",))
+        writer.start()
+        self.assertTrue(ring_buffer.wait(timeout=5))
+        writer.join()
+        self.assertEqual(ring_buffer.get(), b"abc")
+
+        ring_buffer.extend(b"abc")
+        ring_buffer.clear()
+        self.assertFalse(ring_buffer.wait(timeout=0.01))
+
+        # the consumer is woken without data
+        interrupter = threading.Timer(0.05, ring_buffer.interrupt)
+        interrupter.start()
+        start_time = time.time()
+        self.assertFalse(ring_buffer.wait(timeout=5))
+        self.assertLess(time.time() - start_time, 5)
+        interrupter.join()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -5,7 +5,11 @@ import shutil
 import unittest
 
 from odie.core.ConfigurationManager import SettingLoader
+from odie.core.ConfigurationManager.SettingLoader import SettingInvalidException
 from odie.core.Models.RecognitionOptions import RecognitionOptions
+from odie.core.Models.OrderMatching import OrderMatching
+from odie.core.Models.TtsCacheOptions import TtsCacheOptions
+from odie.core.Models.TranscodeCacheOptions import TranscodeCacheOptions
 from odie.core.Models import Singleton
 from odie.core.Models import Resources
 from odie.core.Models.Postgres import Postgres
@@ -131,6 +135,9 @@ class TestSettingLoader(unittest.TestCase):
         }
         settings_object.machine = platform.machine()
         settings_object.recognition_options = RecognitionOptions()
+        settings_object.order_matching = OrderMatching()
+        settings_object.tts_cache = TtsCacheOptions()
+        settings_object.transcode_cache = TranscodeCacheOptions()
         postgres = Postgres(database='odie',
                             user='admin',
                             password='secret',
@@ -210,6 +217,15 @@ class TestSettingLoader(unittest.TestCase):
         sl = SettingLoader(file_path=self.settings_file_to_test)
         self.assertEqual(expected_rest_api, sl._get_rest_api(self.settings_dict))
 
+        # session ttl
+        settings_dict = dict(self.settings_dict)
+        settings_dict["rest_api"] = dict(self.settings_dict["rest_api"], session_ttl=60)
+        self.assertEqual(sl._get_rest_api(settings_dict).session_ttl, 60)
+
+        settings_dict["rest_api"]["session_ttl"] = 0
+        with self.assertRaises(SettingInvalidException):
+            sl._get_rest_api(settings_dict)
+
     def test_get_cache_path(self):
         expected_cache_path = '/tmp/odie_tts_cache'
         sl = SettingLoader(file_path=self.settings_file_to_test)
@@ -246,6 +262,18 @@ class TestSettingLoader(unittest.TestCase):
         sl = SettingLoader(file_path=self.settings_file_to_test)
         self.assertEqual(expected_result, sl._get_postgres(self.settings_dict))
 
+        # connection pool options
+        settings_dict = {'postgres': {'host': 'localhost', 'port': 5432, 'database': 'odie', 'user': 'admin',
+                                      'password': 'secret', 'pool_min_size': 2, 'pool_max_size': 8,
+                                      'health_check_interval': 60, 'connection_timeout': 5}}
+        expected_result = Postgres(host='localhost', port=5432, database='odie', user='admin', password='secret',
+                                   pool_min_size=2, pool_max_size=8, health_check_interval=60, connection_timeout=5)
+        self.assertEqual(expected_result, sl._get_postgres(settings_dict))
+
+        settings_dict['postgres']['pool_min_size'] = 10
+        with self.assertRaises(SettingInvalidException):
+            sl._get_postgres(settings_dict)
+
     def test_get_alphabot(self):
         expected_result = {'enable': False}
         sl = SettingLoader(file_path=self.settings_file_to_test)
@@ -257,6 +285,77 @@ class TestSettingLoader(unittest.TestCase):
         sl = SettingLoader(file_path=self.settings_file_to_test)
         self.assertEqual([expected_result], sl._get_cloud(self.settings_dict))
 
+    def test_get_order_matching(self):
+        sl = SettingLoader(file_path=self.settings_file_to_test)
+        # default engine
+        self.assertEqual(OrderMatching(), sl._get_order_matching(self.settings_dict))
+
+        settings_dict = {'order_matching': {'engine': 'bm25', 'top_k': 2, 'threshold': 0.5}}
+        expected_result = OrderMatching(engine='bm25', top_k=2, threshold=0.5)
+        self.assertEqual(expected_result, sl._get_order_matching(settings_dict))
+
+        # invalid values
+        with self.assertRaises(SettingInvalidException):
+            sl._get_order_matching({'order_matching': {'engine': 'unknown'}})
+        with self.assertRaises(SettingInvalidException):
+            sl._get_order_matching({'order_matching': {'top_k': 0}})
+        with self.assertRaises(SettingInvalidException):
+            sl._get_order_matching({'order_matching': {'top_k': True}})
+        with self.assertRaises(SettingInvalidException):
+            sl._get_order_matching({'order_matching': {'threshold': 'high'}})
+
+    def test_get_tts_cache(self):
+        sl = SettingLoader(file_path=self.settings_file_to_test)
+        # default options
+        self.assertEqual(TtsCacheOptions(), sl._get_tts_cache(self.settings_dict))
+
+        settings_dict = {'tts_cache': {'max_size': 20, 'warm_up': False, 'warm_up_workers': 4}}
+        expected_result = TtsCacheOptions(max_size=20, warm_up=False, warm_up_workers=4)
+        self.assertEqual(expected_result, sl._get_tts_cache(settings_dict))
+
+        # invalid values
+        with self.assertRaises(SettingInvalidException):
+            sl._get_tts_cache({'tts_cache': {'max_size': 0}})
+        with self.assertRaises(SettingInvalidException):
+            sl._get_tts_cache({'tts_cache': {'warm_up': 'yes'}})
+        with self.assertRaises(SettingInvalidException):
+            sl._get_tts_cache({'tts_cache': {'warm_up_workers': 0}})
+
+    def test_get_transcode_cache(self):
+        sl = SettingLoader(file_path=self.settings_file_to_test)
+        # default options
+        self.assertEqual(TranscodeCacheOptions(), sl._get_transcode_cache(self.settings_dict))
+
+        settings_dict = {'transcode_cache': {'max_size': 20, 'memory_size': 0, 'preload_sounds': False}}
+        expected_result = TranscodeCacheOptions(max_size=20, memory_size=0, preload_sounds=False)
+        self.assertEqual(expected_result, sl._get_transcode_cache(settings_dict))
+
+        # invalid values
+        with self.assertRaises(SettingInvalidException):
+            sl._get_transcode_cache({'transcode_cache': {'max_size': 0}})
+        with self.assertRaises(SettingInvalidException):
+            sl._get_transcode_cache({'transcode_cache': {'memory_size': -1}})
+        with self.assertRaises(SettingInvalidException):
+            sl._get_transcode_cache({'transcode_cache': {'preload_sounds': 'yes'}})
+
+    def test_get_recognition_options(self):
+        sl = SettingLoader(file_path=self.settings_file_to_test)
+        # default options
+        self.assertEqual(RecognitionOptions(), sl._get_recognition_options(self.settings_dict))
+
+        settings_dict = {'recognition_options': {'energy_threshold': 300,
+                                                 'adjust_for_ambient_noise_second': 1,
+                                                 'pre_roll_second': 0.5,
+                                                 'ambient_noise_refresh_second': 30}}
+        expected_result = RecognitionOptions(energy_threshold=300, adjust_for_ambient_noise_second=1,
+                                             pre_roll_second=0.5, ambient_noise_refresh_second=30)
+        self.assertEqual(expected_result, sl._get_recognition_options(settings_dict))
+
+        with self.assertRaises(SettingInvalidException):
+            sl._get_recognition_options({'recognition_options': {'pre_roll_second': -1}})
+        with self.assertRaises(SettingInvalidException):
+            sl._get_recognition_options({'recognition_options': {'ambient_noise_refresh_second': 0}})
+
 
 if __name__ == '__main__':
     unittest.main()
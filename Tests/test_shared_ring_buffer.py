@@ -0,0 +1,58 @@
+import multiprocessing
+import unittest
+
+from odie.core.SharedRingBuffer import SharedRingBuffer
+
+
+def write_chunks(shared_ring_buffer, chunks):
+    for chunk in chunks:
+        shared_ring_buffer.extend(chunk)
+
+
+class TestSharedRingBuffer(unittest.TestCase):
+    """
+    Class to test SharedRingBuffer
+    """
+
+    def test_extend_read(self):
+        shared_ring_buffer = SharedRingBuffer(size=8)
+        reader = shared_ring_buffer.reader()
+        self.assertEqual(reader.read(timeout=0.01), b"")
+
+        shared_ring_buffer.extend(b"abc")
+        shared_ring_buffer.extend(b"de")
+        self.assertEqual(reader.read(timeout=0.01), b"abcde")
+        # the data wraps around the end of the array
+        shared_ring_buffer.extend(b"fghij")
+        self.assertEqual(reader.read(timeout=0.01), b"fghij")
+        self.assertEqual(shared_ring_buffer.get_position(), 10)
+
+    def test_overflow(self):
+        shared_ring_buffer = SharedRingBuffer(size=8)
+        reader = shared_ring_buffer.reader()
+        shared_ring_buffer.extend(b"abcdef")
+        shared_ring_buffer.extend(b"ghij")
+        # the oldest bytes are dropped
+        self.assertEqual(reader.read(timeout=0.01), b"cdefghij")
+
+        shared_ring_buffer.extend(b"0123456789")
+        self.assertEqual(reader.read(timeout=0.01), b"23456789")
+
+    def test_other_process(self):
+        shared_ring_buffer = SharedRingBuffer(size=64)
+        reader = shared_ring_buffer.reader()
+        chunks = [b"abcd", b"efgh", b"ijkl"]
+        writer = multiprocessing.Process(target=write_chunks, args=(shared_ring_buffer, chunks))
+        writer.start()
+
+        data = b""
+        for _ in range(10):
+            data += reader.read(timeout=1)
+            if len(data) == 12:
+                break
+        writer.join()
+        self.assertEqual(data, b"abcdefghijkl")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,164 @@
+import sys
+import time
+import unittest
+
+import mock
+import numpy as np
+
+from odie_cloud.speech.AudioFeatures import AudioFeatures
+from odie_cloud.speech.BeamSearch import CtcPrefixBeamSearch
+from odie_cloud.speech.StreamingRecognition import StreamingRecognition, StreamingSessions
+
+ALPHABET = "_'ABCDEFGHIJKLMNOPQRSTUVWXYZ "
+
+AUDIO_CONFIG = {
+    "type": "audio",
+    "sample_freq_hz": 16000,
+    "max_duration": "30 seconds",
+    "frame_length": "25 milliseconds",
+    "frame_stride": "10 milliseconds",
+    "feature_type": "mfsc",
+    "num_filters": 13
+}
+
+
+class FakeScheduler(object):
+    """
+    Scheduler of a model giving the characters of a sentence on its first frames, then blanks
+    """
+
+    def __init__(self, sentence):
+        self.inputs = list()
+        self.labels = list()
+        for char in sentence:
+            self.labels += [ALPHABET.index(char), 0]
+
+    def submit(self, inputs):
+        self.inputs.append(inputs)
+        features, valid_percent = inputs
+        number_of_frames = int(features.shape[1] * valid_percent / 100)
+        probabilities = np.full((len(ALPHABET), number_of_frames), 0.1 / (len(ALPHABET) - 1))
+        for frame in range(number_of_frames):
+            label = self.labels[frame] if frame < len(self.labels) else 0
+            probabilities[label, frame] = 0.9
+        return probabilities
+
+
+class TestStreamingRecognition(unittest.TestCase):
+    """
+    Class to test StreamingRecognition
+    """
+
+    def setUp(self):
+        self.inference = mock.Mock(audio_features=AudioFeatures(AUDIO_CONFIG), scheduler=FakeScheduler("HELLO WORLD"))
+        self.decoder = CtcPrefixBeamSearch(ALPHABET, space_index=ALPHABET.index(" "), lm_path=None)
+        self.recognition = StreamingRecognition(self.inference, self.decoder, lookahead_second=0.2)
+        # one second of quiet, then two seconds of speech
+        random_state = np.random.RandomState(0)
+        samples = np.concatenate([random_state.randn(16000) * 10, random_state.randn(32000) * 3000])
+        self.samples = samples.astype("<i2")
+        self.audio_data = self.samples.tobytes()
+
+    def test_add_audio(self):
+        # the lookahead frames are not decoded
+        result = self.recognition.add_audio(self.audio_data[:48000])
+        self.assertEqual(len(self.inference.scheduler.inputs), 1)
+        # 148 frames in 1.5 second
+        self.assertEqual(self.decoder.time_steps, 148 - int(0.2 * 148 / 1.5))
+        self.assertEqual(result["partial"], "HELLO WORLD")
+        result = self.recognition.add_audio(self.audio_data[48000:])
+        self.assertEqual(self.decoder.time_steps, 298 - int(0.2 * 298 / 3))
+        self.assertEqual(result["partial"], "HELLO WORLD")
+
+        # the frames received so far are scaled like a whole utterance
+        for (features, valid_percent), end in zip(self.inference.scheduler.inputs, (24000, 48000)):
+            expected_features, expected_valid_percent = self.inference.audio_features.compute(self.samples[:end])
+            np.testing.assert_array_equal(features, expected_features)
+            self.assertEqual(valid_percent, expected_valid_percent)
+
+        self.assertEqual(self.recognition.finish(), "HELLO WORLD")
+        self.assertEqual(self.decoder.time_steps, 298)
+        self.assertEqual(len(self.inference.scheduler.inputs), 2)
+
+        # without audio
+        decoder = CtcPrefixBeamSearch(ALPHABET, space_index=ALPHABET.index(" "), lm_path=None)
+        self.assertEqual(StreamingRecognition(self.inference, decoder).finish(), "")
+
+    def test_predict_beam(self):
+        # the model is not loaded: neon is only needed by Inference.load
+        neon_modules = ["neon", "neon.backends", "neon.models", "neon.data", "neon.data.aeon_shim",
+                        "neon.data.dataloader_transformers"]
+        with mock.patch.dict(sys.modules, dict((name, mock.Mock()) for name in neon_modules)):
+            from odie_cloud.speech.inference import Inference
+        inference = Inference("model.prm", decoder="prefix_beam_search", lm_path=None)
+
+        # the final transcription of a stream is the one of the whole audio
+        inference.scheduler = FakeScheduler("HELLO WORLD")
+        with mock.patch("odie_cloud.speech.AudioFeatures.decode_audio", return_value=(self.samples, 16000)):
+            expected_result = inference.predict_beam(b"audio")
+        self.assertEqual(expected_result, "HELLO WORLD")
+        stream = inference.create_stream()
+        for start in range(0, len(self.audio_data), 6400):
+            stream.add_audio(self.audio_data[start:start + 6400])
+        self.assertEqual(stream.finish(), expected_result)
+        # with the features of the batch recognition
+        np.testing.assert_array_equal(inference.scheduler.inputs[-1][0], inference.scheduler.inputs[0][0])
+
+    def test_invalid_audio(self):
+        with self.assertRaises(ValueError):
+            self.recognition.add_audio(b"\x00\x00\x00")
+        # longer than the max_duration of the model
+        with self.assertRaises(ValueError):
+            self.recognition.add_audio(b"\x00\x00" * 16000 * 31)
+        self.assertEqual(self.recognition.get_duration(), 0)
+
+
+class TestStreamingSessions(unittest.TestCase):
+    """
+    Class to test StreamingSessions
+    """
+
+    def setUp(self):
+        self.sessions = StreamingSessions(ttl=60)
+
+    def test_session(self):
+        recognition = mock.Mock()
+        stream_id = self.sessions.create(recognition)
+        self.assertEqual(len(self.sessions), 1)
+        with self.sessions.session(stream_id) as session_recognition:
+            self.assertIs(session_recognition, recognition)
+
+        with self.assertRaises(KeyError):
+            with self.sessions.session("unknown"):
+                pass
+
+        # end of the stream
+        self.sessions.remove(stream_id)
+        self.assertEqual(len(self.sessions), 0)
+        with self.assertRaises(KeyError):
+            with self.sessions.session(stream_id):
+                pass
+        # already removed
+        self.sessions.remove(stream_id)
+
+    def test_expiry(self):
+        stream_id = self.sessions.create(mock.Mock())
+        self.sessions._sessions[stream_id].last_used = time.time() - 61
+        with self.assertRaises(KeyError):
+            with self.sessions.session(stream_id):
+                pass
+        self.assertEqual(len(self.sessions), 0)
+
+        # a stream is not removed while used
+        stream_id = self.sessions.create(mock.Mock())
+        with self.sessions.session(stream_id):
+            self.sessions._sessions[stream_id].last_used = time.time() - 61
+            self.sessions.create(mock.Mock())
+            self.assertEqual(len(self.sessions), 2)
+        # the end of the request refreshes the stream
+        self.sessions.create(mock.Mock())
+        self.assertEqual(len(self.sessions), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
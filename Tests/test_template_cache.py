@@ -0,0 +1,69 @@
+import os
+import tempfile
+import time
+import unittest
+
+from odie.core.Utils.TemplateCache import TemplateCache
+
+
+class TestTemplateCache(unittest.TestCase):
+    """
+    Class to test TemplateCache
+    """
+
+    def setUp(self):
+        TemplateCache.clean()
+
+    def tearDown(self):
+        TemplateCache.clean()
+
+    def test_get_template(self):
+        template = TemplateCache.get_template("hello {{ name }}")
+        self.assertEqual(template.render(name="odie"), "hello odie")
+
+        # compiled once
+        self.assertIs(TemplateCache.get_template("hello {{ name }}"), template)
+        self.assertEqual((TemplateCache.hits, TemplateCache.misses), (1, 1))
+
+    def test_render(self):
+        self.assertEqual(TemplateCache.render("hello {{ name }}", {"name": "odie"}), "hello odie")
+        self.assertEqual(TemplateCache.render("hello {{ name }}", name="you"), "hello you")
+
+    def test_max_size(self):
+        max_size = TemplateCache.max_size
+        TemplateCache.max_size = 2
+        try:
+            template1 = TemplateCache.get_template("{{ one }}")
+            TemplateCache.get_template("{{ two }}")
+            # template1 is now the most recently used
+            TemplateCache.get_template("{{ one }}")
+            TemplateCache.get_template("{{ three }}")
+
+            self.assertIs(TemplateCache.get_template("{{ one }}"), template1)
+            self.assertEqual(len(TemplateCache._templates), 2)
+            self.assertNotIn(("source", "{{ two }}"), TemplateCache._templates)
+        finally:
+            TemplateCache.max_size = max_size
+
+    def test_get_file_template(self):
+        file_descriptor, file_path = tempfile.mkstemp()
+        os.close(file_descriptor)
+        try:
+            with open(file_path, "w") as template_file:
+                template_file.write("hello {{ name }}")
+            template = TemplateCache.get_file_template(file_path)
+            self.assertEqual(template.render(name="odie"), "hello odie")
+            self.assertIs(TemplateCache.get_file_template(file_path), template)
+
+            # a modified file is compiled again
+            with open(file_path, "w") as template_file:
+                template_file.write("goodbye {{ name }}")
+            modification_time = time.time() + 10
+            os.utime(file_path, (modification_time, modification_time))
+            self.assertEqual(TemplateCache.get_file_template(file_path).render(name="odie"), "goodbye odie")
+        finally:
+            os.remove(file_path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+import os
+import shutil
+import tempfile
+import unittest
+import wave
+
+import mock
+
+from odie.core.TranscodeCache import TranscodeCache
+
+
+def fake_avconv(command, stdout=None, stderr=None):
+    # avconv -y -i <source> <destination>
+    with open(command[4], "wb") as wav_file:
+        wav_file.write(b"RIFF----WAVE converted " + os.path.basename(command[3]).encode())
+
+
+class TestTranscodeCache(unittest.TestCase):
+    """
+    Class to test TranscodeCache
+    """
+
+    def setUp(self):
+        TranscodeCache.clean()
+        self.folder = tempfile.mkdtemp()
+        self.cache_path = os.path.join(self.folder, "transcode")
+
+    def tearDown(self):
+        TranscodeCache.clean()
+        shutil.rmtree(self.folder)
+
+    def _write_file(self, name, content):
+        file_path = os.path.join(self.folder, name)
+        with open(file_path, "wb") as audio_file:
+            audio_file.write(content)
+        return file_path
+
+    def test_get_wav(self):
+        TranscodeCache.load(self.cache_path)
+        mp3_path = self._write_file("sound.mp3", b"ID3 mp3 content")
+
+        with mock.patch("odie.core.TranscodeCache.subprocess.call", side_effect=fake_avconv) as mock_call:
+            wav_path = TranscodeCache.get_wav(mp3_path)
+            self.assertEqual(os.path.dirname(wav_path), self.cache_path)
+            with open(wav_path, "rb") as wav_file:
+                self.assertEqual(wav_file.read(), b"RIFF----WAVE converted sound.mp3")
+            # the source is not modified
+            with open(mp3_path, "rb") as mp3_file:
+                self.assertEqual(mp3_file.read(), b"ID3 mp3 content")
+
+            # converted once, the same content at another path uses the same file
+            self.assertEqual(TranscodeCache.get_wav(mp3_path), wav_path)
+            self.assertEqual(TranscodeCache.get_wav(self._write_file("copy.mp3", b"ID3 mp3 content")), wav_path)
+            mock_call.assert_called_once()
+
+        self.assertEqual(TranscodeCache.get_stats(), {'hits': 2, 'misses': 1, 'memory_hits': 0, 'files': 1,
+                                                      'size': 32, 'memory_used': 0})
+
+    def test_get_wav_already_wav(self):
+        TranscodeCache.load(self.cache_path)
+        wav_path = os.path.join(self.folder, "sound.wav")
+        wave_file = wave.open(wav_path, "wb")
+        wave_file.setsampwidth(2)
+        wave_file.setnchannels(1)
+        wave_file.setframerate(16000)
+        wave_file.writeframes(b"\x00\x00")
+        wave_file.close()
+
+        with mock.patch("odie.core.TranscodeCache.subprocess.call") as mock_call:
+            self.assertEqual(TranscodeCache.get_wav(wav_path), wav_path)
+            mock_call.assert_not_called()
+
+    def test_get_wav_conversion_failed(self):
+        TranscodeCache.load(self.cache_path)
+        mp3_path = self._write_file("sound.mp3", b"ID3 mp3 content")
+        with mock.patch("odie.core.TranscodeCache.subprocess.call"):
+            self.assertEqual(TranscodeCache.get_wav(mp3_path), mp3_path)
+        self.assertEqual(os.listdir(self.cache_path), [])
+
+        # avconv is not installed
+        with mock.patch("odie.core.TranscodeCache.subprocess.call", side_effect=OSError()):
+            with self.assertRaises(OSError):
+                TranscodeCache.get_wav(mp3_path)
+        self.assertEqual(os.listdir(self.cache_path), [])
+
+    def test_memory(self):
+        TranscodeCache.load(self.cache_path, memory_size=1)
+        wav_path = self._write_file("sound.wav", b"RIFF----WAVE content")
+
+        wav = TranscodeCache.get_wav(wav_path)
+        self.assertEqual(wav.read(), b"RIFF----WAVE content")
+        # read from memory
+        with mock.patch.object(TranscodeCache, "is_wav") as mock_is_wav:
+            self.assertEqual(TranscodeCache.get_wav(wav_path).read(), b"RIFF----WAVE content")
+            mock_is_wav.assert_not_called()
+        self.assertEqual(TranscodeCache.get_stats()["memory_hits"], 1)
+
+        # the least recently used are removed from the memory
+        big_wav_path = self._write_file("big.wav", b"RIFF----WAVE" + b"0" * (1024 * 1024 - 12))
+        TranscodeCache.get_wav(big_wav_path)
+        self.assertEqual(TranscodeCache.get_stats()["memory_used"], 1024 * 1024)
+
+    def test_eviction(self):
+        TranscodeCache.load(self.cache_path, max_size=1)
+        with mock.patch("odie.core.TranscodeCache.subprocess.call") as mock_call:
+            def write_converted_file(command, stdout=None, stderr=None):
+                with open(command[4], "wb") as wav_file:
+                    wav_file.write(b"0" * 600 * 1024)
+            mock_call.side_effect = write_converted_file
+            wav_path1 = TranscodeCache.get_wav(self._write_file("1.mp3", b"1"))
+            wav_path2 = TranscodeCache.get_wav(self._write_file("2.mp3", b"2"))
+
+        self.assertFalse(os.path.exists(wav_path1))
+        self.assertTrue(os.path.exists(wav_path2))
+        self.assertEqual(TranscodeCache.get_stats()["size"], 600 * 1024)
+
+    def test_preload(self):
+        with mock.patch.object(TranscodeCache, "get_wav") as mock_get_wav:
+            with mock.patch("odie.core.TranscodeCache.threading.Thread") as mock_thread:
+                TranscodeCache.preload(["sound1.wav", "sound2.wav"])
+                # run the preload thread
+                mock_thread.call_args[1]["target"]()
+                mock_get_wav.assert_has_calls([mock.call("sound1.wav"), mock.call("sound2.wav")])
+
+                # a file is preloaded once
+                TranscodeCache.preload(["sound1.wav"])
+                mock_thread.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
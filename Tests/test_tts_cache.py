@@ -0,0 +1,136 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import mock
+
+from odie.core.Models import Action, Brain, Neuron
+from odie.core.Models.Settings import Settings
+from odie.core.Models.Tts import Tts
+from odie.core.TTS.TTSCache import TTSCache
+from odie.core.TTS.TTSWarmUp import TTSWarmUp
+
+
+class TestTTSCache(unittest.TestCase):
+    """
+    Class to test TTSCache
+    """
+
+    def setUp(self):
+        TTSCache.clean()
+        self.cache_path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        TTSCache.clean()
+        shutil.rmtree(self.cache_path)
+
+    def _write_file(self, name, size, modification_time=None):
+        file_path = os.path.join(self.cache_path, name)
+        with open(file_path, "wb") as audio_file:
+            audio_file.write(b"0" * size)
+        if modification_time is not None:
+            os.utime(file_path, (modification_time, modification_time))
+        return file_path
+
+    def test_load(self):
+        # the files are ordered by access time
+        file_path2 = self._write_file("2.tts", 10, modification_time=2000)
+        file_path1 = self._write_file("1.tts", 10, modification_time=1000)
+        self._write_file("not_audio.txt", 10)
+
+        TTSCache.load(self.cache_path, max_size=1)
+        self.assertEqual(list(TTSCache._files), [file_path1, file_path2])
+        self.assertEqual(TTSCache.get_stats(), {'hits': 0, 'misses': 0, 'files': 2, 'size': 20,
+                                                'max_size': 1024 * 1024})
+
+    def test_is_cached(self):
+        TTSCache.load(self.cache_path)
+        file_path = os.path.join(self.cache_path, "1.tts")
+
+        self.assertFalse(TTSCache.is_cached(file_path))
+        self._write_file("1.tts", 10, modification_time=1000)
+        TTSCache.add(file_path)
+        self.assertTrue(TTSCache.is_cached(file_path))
+
+        # the access time is kept on the file
+        self.assertGreater(os.path.getmtime(file_path), 1000)
+        self.assertEqual(TTSCache.get_stats(), {'hits': 1, 'misses': 1, 'files': 1, 'size': 10, 'max_size': None})
+
+    def test_eviction(self):
+        file_path1 = self._write_file("1.tts", 400 * 1024, modification_time=1000)
+        file_path2 = self._write_file("2.tts", 400 * 1024, modification_time=2000)
+        TTSCache.load(self.cache_path, max_size=1)
+
+        # file1 is now the most recently used
+        self.assertTrue(TTSCache.is_cached(file_path1))
+        file_path3 = self._write_file("3.tts", 400 * 1024)
+        TTSCache.add(file_path3)
+
+        self.assertTrue(os.path.exists(file_path1))
+        self.assertFalse(os.path.exists(file_path2))
+        self.assertTrue(os.path.exists(file_path3))
+        self.assertEqual(TTSCache.get_stats()["size"], 800 * 1024)
+
+        # a file bigger than the cache is kept until the next one
+        file_path4 = self._write_file("4.tts", 2 * 1024 * 1024)
+        TTSCache.add(file_path4)
+        self.assertEqual(list(TTSCache._files), [file_path4])
+
+
+class TestTTSWarmUp(unittest.TestCase):
+    """
+    Class to test TTSWarmUp
+    """
+
+    def setUp(self):
+        self.settings = Settings(default_tts_name="pico2wave",
+                                 ttss=[Tts(name="pico2wave", parameters={"cache": True, "language": "en-US"}),
+                                       Tts(name="acapela", parameters={"cache": False})],
+                                 random_wake_up_answers=["yes sir", "I'm listening"],
+                                 on_ready_answers="odie is ready")
+        neuron1 = Neuron(name="neuron1", actions=[
+            Action(name="say", parameters={"message": ["hello", "hello {{ name }}", "yes sir"]}),
+            Action(name="say", parameters={"message": "in french", "tts": {"pico2wave": {"language": "fr-FR"}}}),
+            Action(name="say", parameters={"message": "not cached", "tts": {"acapela": {}}})
+        ])
+        neuron2 = Neuron(name="neuron2", actions=[
+            Action(name="systemdate", parameters={"say_template": "it is {{ hours }}"}),
+            Action(name="kill_switch", parameters={"say_template": ["goodbye"]}),
+            Action(name="sleep", parameters={"seconds": 1})
+        ])
+        self.brain = Brain(neurons=[neuron1, neuron2])
+
+    def test_get_sentences_by_tts(self):
+        sentences_by_tts = TTSWarmUp.get_sentences_by_tts(self.brain, self.settings)
+        self.assertEqual([(tts.name, tts.parameters, sentences) for tts, sentences in sentences_by_tts], [
+            ("pico2wave", {"cache": True, "language": "en-US"},
+             ["yes sir", "I'm listening", "odie is ready", "hello", "goodbye"]),
+            ("pico2wave", {"cache": True, "language": "fr-FR"}, ["in french"]),
+            ("acapela", {"cache": False}, ["not cached"])
+        ])
+        # the settings are not modified
+        self.assertEqual(self.settings.ttss[0].parameters, {"cache": True, "language": "en-US"})
+
+        # the messages of a streaming tts are cached sentence by sentence
+        settings = Settings(default_tts_name="pico2wave",
+                            ttss=[Tts(name="pico2wave", parameters={"cache": True, "streaming": True})],
+                            on_ready_answers=["odie is ready. How are you?", "hello"])
+        sentences_by_tts = TTSWarmUp.get_sentences_by_tts(None, settings)
+        self.assertEqual(sentences_by_tts[0][1], ["odie is ready.", "How are you?", "hello"])
+
+    def test_warm_up(self):
+        with mock.patch("odie.core.TTS.TTSWarmUp.Utils.get_dynamic_class_instantiation") as mock_instantiation:
+            mock_instantiation.return_value.generate.side_effect = [None, None, None, None, Exception(), None]
+            warm_up = TTSWarmUp(brain=self.brain, settings=self.settings, workers=2)
+            warm_up.warm_up()
+
+            # the tts without cache is not warmed up
+            generated_sentences = sorted(call[0][0] for call in mock_instantiation.return_value.generate.call_args_list)
+            self.assertEqual(generated_sentences,
+                             sorted(["yes sir", "I'm listening", "odie is ready", "hello", "goodbye", "in french"]))
+            self.assertEqual((warm_up.generated, warm_up.failed), (5, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -43,6 +43,8 @@ class TestTTSModule(unittest.TestCase):
         self.assertEqual(self.TTSMod._get_path_to_store_audio(),
                          expected_result,
                          "fail test_get_path_to_store_audio, expected path not corresponding to result")
+        self.assertEqual(self.TTSMod._get_path_to_store_audio(file_index=2),
+                         "/tmp/odie/tests/TTSModule/tests/default/69c692c4997cdddef3dd473a96fa811e-2.tts")
 
     def test_generate_and_play(self):
         """
@@ -94,34 +96,62 @@ class TestTTSModule(unittest.TestCase):
             # Remove the tmp file
             FileManager.remove_file(file_path)
 
-    def test_is_file_already_in_cache(self):
+    def test_split_sentences(self):
         """
-        Test if file is already stored in cache
+        Test the split of a text into sentences
         """
+        words = "Hello. How are you? I'm fine!  Version 1.2 is out\nsecond line\n\n"
+        self.assertEqual(TTSModule.split_sentences(words),
+                         ["Hello.", "How are you?", "I'm fine!", "Version 1.2 is out", "second line"])
+        self.assertEqual(TTSModule.split_sentences("odie"), ["odie"])
 
-        base_cache_path = "/tmp/odie/tests/TTSModule/tests/default/"
-        md5_word = "69c692c4997cdddef3dd473a96fa811e"
-        file_path = os.path.join(base_cache_path, "69c692c4997cdddef3dd473a96fa811e.tts")
+    def test_generate_and_play_streaming(self):
+        """
+        Test that each sentence is generated and played
+        """
+        self.TTSMod.settings = Settings(cache_path="/tmp/odie/tests")
+        self.TTSMod.streaming = True
+        self.TTSMod.cache = False
+        generated_words = list()
+
+        def generate_audio_file():
+            generated_words.append(self.TTSMod.words)
+            FileManager.write_in_file(self.TTSMod.file_path, self.TTSMod.words)
+
+        played_words = list()
+
+        def play_audio(file_path=None):
+            with open(file_path) as audio_file:
+                played_words.append(audio_file.read())
+
+        with mock.patch.object(self.TTSMod, "play_audio", side_effect=play_audio):
+            self.TTSMod.generate_and_play(words="Hello. How are you? Fine",
+                                          generate_audio_function_from_child=generate_audio_file)
+        self.assertEqual(generated_words, ["Hello.", "How are you?", "Fine"])
+        self.assertEqual(played_words, ["Hello.", "How are you?", "Fine"])
+        # without cache, the files are removed once played
+        for index, words in enumerate(generated_words):
+            self.TTSMod.words = words
+            self.assertFalse(os.path.exists(self.TTSMod._get_path_to_store_audio(file_index=index)))
+
+        # a repeated sentence has its own file
+        generated_words[:] = []
+        played_words[:] = []
+        with mock.patch.object(self.TTSMod, "play_audio", side_effect=play_audio):
+            self.TTSMod.generate_and_play(words="Yes. Yes. Yes.",
+                                          generate_audio_function_from_child=generate_audio_file)
+        self.assertEqual(generated_words, ["Yes.", "Yes.", "Yes."])
+        self.assertEqual(played_words, ["Yes.", "Yes.", "Yes."])
+        self.TTSMod.words = "Yes."
+        self.assertFalse(os.path.exists(self.TTSMod._get_path_to_store_audio(file_index=1)))
+
+        # an error of the generation is raised by the say
+        failing_generate_audio_file = mock.Mock(side_effect=[None, ValueError()])
+        with mock.patch.object(self.TTSMod, "play_audio"):
+            with self.assertRaises(ValueError):
+                self.TTSMod.generate_and_play(words="Hello. How are you?",
+                                              generate_audio_function_from_child=failing_generate_audio_file)
 
-        if os.path.isfile(file_path):
-            # Remove the file
-            FileManager.remove_file(file_path)
-        # Create a tmp file
-        if not os.path.exists(base_cache_path):
-            os.makedirs(base_cache_path)
-        tmp_path = os.path.join(base_cache_path, md5_word+".tts")
-        FileManager.write_in_file(tmp_path, "[odie-test] test_is_file_already_in_cache")
-
-        # Test true
-        self.assertTrue(TTSModule._is_file_already_in_cache(base_cache_path=base_cache_path, file_path=file_path),
-                        "Fail retrieving the cached file. The file does not exist but it should !")
-
-        # Remove the tmp file
-        FileManager.remove_file(tmp_path)
-
-        # Test False
-        self.assertFalse(TTSModule._is_file_already_in_cache(base_cache_path=base_cache_path, file_path=file_path),
-                         "Fail asserting that the file does not exist.")
 
 if __name__ == '__main__':
     unittest.main()
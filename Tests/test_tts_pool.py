@@ -0,0 +1,63 @@
+import unittest
+
+import mock
+
+from odie.core.Models.Tts import Tts
+from odie.core.TTS.TTSPool import TTSPool
+
+
+class TestTTSPool(unittest.TestCase):
+    """
+    Class to test TTSPool
+    """
+
+    def setUp(self):
+        TTSPool.clean()
+        self.tts = Tts(name="pico2wave", parameters={"cache": True, "language": "en-US"})
+
+    def tearDown(self):
+        TTSPool.clean()
+
+    def test_get_tts(self):
+        with mock.patch("odie.core.TTS.TTSPool.Utils.get_dynamic_class_instantiation",
+                        side_effect=lambda **kwargs: mock.Mock()) as mock_instantiation:
+            with TTSPool.get_tts(self.tts, resources_dir="/tmp/tts") as tts_instance1:
+                mock_instantiation.assert_called_once_with(package_name="tts",
+                                                           module_name="pico2wave",
+                                                           parameters={"cache": True, "language": "en-US"},
+                                                           resources_dir="/tmp/tts")
+            # the instance is reused
+            with TTSPool.get_tts(self.tts, resources_dir="/tmp/tts") as tts_instance:
+                self.assertIs(tts_instance, tts_instance1)
+                # an instance in use is not shared
+                with TTSPool.get_tts(self.tts, resources_dir="/tmp/tts") as tts_instance2:
+                    self.assertIsNot(tts_instance2, tts_instance1)
+            self.assertEqual(mock_instantiation.call_count, 2)
+
+            # parameters overridden by an action get their own instance
+            overridden_tts = Tts(name="pico2wave", parameters={"cache": True, "language": "fr-FR"})
+            with TTSPool.get_tts(overridden_tts, resources_dir="/tmp/tts") as tts_instance:
+                self.assertNotIn(tts_instance, [tts_instance1, tts_instance2])
+            self.assertEqual(TTSPool.get_stats(), {'hits': 1, 'misses': 3, 'idle': 3})
+
+    def test_max_idle(self):
+        with mock.patch("odie.core.TTS.TTSPool.Utils.get_dynamic_class_instantiation",
+                        side_effect=lambda **kwargs: mock.Mock()):
+            with TTSPool.get_tts(self.tts):
+                with TTSPool.get_tts(self.tts):
+                    with TTSPool.get_tts(self.tts):
+                        pass
+        self.assertEqual(TTSPool.get_stats()["idle"], TTSPool.max_idle)
+
+    def test_instance_failed(self):
+        with mock.patch("odie.core.TTS.TTSPool.Utils.get_dynamic_class_instantiation"):
+            with self.assertRaises(ValueError):
+                with TTSPool.get_tts(self.tts) as tts_instance:
+                    tts_instance.say.side_effect = ValueError()
+                    tts_instance.say("hello")
+        # an instance that failed is not reused
+        self.assertEqual(TTSPool.get_stats()["idle"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
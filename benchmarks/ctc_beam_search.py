@@ -0,0 +1,118 @@
+"""
+Benchmark of the CTC prefix beam search against the beam search decoder of odie_cloud.
+
+The fixtures are probability matrices of recorded utterances saved as .npy files of shape (time-steps, 29), like the
+probs_t_c matrix decoded by Inference.predict_beam. The expected transcription of a fixture is read from the .txt
+file with the same name, if it exists. Without fixture folder, utterances are synthesized from sentences.
+
+Usage:
+    python benchmarks/ctc_beam_search.py [--fixtures folder] [--lm lm.binary] [--skip-beam-search] [--orders file]
+                                         [--signal 8]
+
+The decoders are also run with the vocabulary of the orders of a brain (one order per line in the orders file, the
+sentences of the synthesized utterances by default). Lower the signal of the synthesized utterances to make them
+harder to decode.
+"""
+import argparse
+import glob
+import os
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.insert(0, os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)))
+
+from odie_cloud.speech.BeamSearch import CtcBeamSearch, CtcPrefixBeamSearch
+from odie_cloud.speech.BrainVocabulary import BrainVocabulary
+from odie_cloud.speech.decoder import DEFAULT_LM_PATH
+
+ALPHABET = "_'ABCDEFGHIJKLMNOPQRSTUVWXYZ "
+
+SENTENCES = ["turn on the light", "what time is it", "play some music in the kitchen",
+             "what is the weather like tomorrow", "remind me to buy milk", "move forward and turn left"]
+
+
+def synthesize(sentence, seed=42, frames_per_char=3, signal=8):
+    """
+    Probability matrix of a sentence: each character is the most probable for a few frames, followed by blanks
+    """
+    random_state = np.random.RandomState(seed)
+    frames = list()
+    for char in sentence.upper():
+        frames.extend([ALPHABET.index(char)] * frames_per_char)
+        frames.extend([0] * random_state.randint(1, 4))
+    logits = random_state.normal(0, 1, (len(frames), len(ALPHABET)))
+    logits[np.arange(len(frames)), frames] += signal
+    probs = np.exp(logits)
+    return probs / probs.sum(axis=1, keepdims=True)
+
+
+def get_fixtures(folder, signal=8):
+    if folder is None:
+        return [(synthesize(sentence, seed=index, signal=signal), sentence) for index, sentence in enumerate(SENTENCES)]
+    fixtures = list()
+    for matrix_path in sorted(glob.glob(os.path.join(folder, "*.npy"))):
+        transcript_path = os.path.splitext(matrix_path)[0] + ".txt"
+        transcript = None
+        if os.path.isfile(transcript_path):
+            with open(transcript_path) as transcript_file:
+                transcript = transcript_file.read().strip()
+        fixtures.append((np.load(matrix_path), transcript))
+    return fixtures
+
+
+def run(name, decoder, fixtures, number=1):
+    errors = 0
+    characters = 0
+    for probs, transcript in fixtures:
+        result = decoder.decode(probs, ALPHABET)
+        if transcript is not None:
+            errors += decoder.cer(result.lower(), transcript.lower())
+            characters += len(transcript)
+    duration = timeit.timeit(lambda: [decoder.decode(probs, ALPHABET) for probs, _ in fixtures], number=number)
+    time_steps = sum(probs.shape[0] for probs, _ in fixtures)
+    cer = "%.3f" % (float(errors) / characters) if characters else "n/a"
+    print("%-28s %10.2f ms per utterance %8.3f ms per time-step   CER %s" % (
+        name, duration * 1000 / (number * len(fixtures)), duration * 1000 / (number * time_steps), cer))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--fixtures", help="folder of the .npy probability matrices")
+    parser.add_argument("--lm", default=DEFAULT_LM_PATH, help="path of the kenlm model")
+    parser.add_argument("--skip-beam-search", action="store_true", help="do not run the slow beam search decoder")
+    parser.add_argument("--orders", help="file of the orders of the brain, one order per line")
+    parser.add_argument("--signal", type=float, default=8, help="logit of the spoken characters of the synthesized "
+                                                                 "utterances")
+    args = parser.parse_args()
+
+    fixtures = get_fixtures(args.fixtures, signal=args.signal)
+    orders = SENTENCES
+    if args.orders is not None:
+        with open(args.orders) as orders_file:
+            orders = [line.strip() for line in orders_file if line.strip()]
+    vocabulary = BrainVocabulary(orders, ALPHABET)
+    print("%d words in the vocabulary of %d orders, strict: %s" % (len(vocabulary), len(orders), vocabulary.strict))
+    print("%d utterances, %d time-steps" % (len(fixtures), sum(probs.shape[0] for probs, _ in fixtures)))
+
+    space_index = ALPHABET.index(" ")
+    if not args.skip_beam_search:
+        beam_search = CtcBeamSearch(ALPHABET, space_index=space_index, lm_path=args.lm)
+        run("beam search", beam_search, fixtures)
+        beam_search = CtcBeamSearch(ALPHABET, space_index=space_index, lm_path=args.lm, vocabulary=vocabulary)
+        run("beam search (vocabulary)", beam_search, fixtures)
+    for beam_width in (8, 16, 32):
+        prefix_beam_search = CtcPrefixBeamSearch(ALPHABET, space_index=space_index, lm_path=args.lm,
+                                                 beam_width=beam_width)
+        run("prefix beam search (%d)" % beam_width, prefix_beam_search, fixtures, number=3)
+    run("prefix beam search (no LM)", CtcPrefixBeamSearch(ALPHABET, space_index=space_index, lm_path=None),
+        fixtures, number=3)
+    for beam_width in (8, 16):
+        prefix_beam_search = CtcPrefixBeamSearch(ALPHABET, space_index=space_index, lm_path=args.lm,
+                                                 beam_width=beam_width, vocabulary=vocabulary)
+        run("prefix beam search (%d, voc)" % beam_width, prefix_beam_search, fixtures, number=3)
+
+
+if __name__ == '__main__':
+    main()
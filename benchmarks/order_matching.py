@@ -0,0 +1,81 @@
+"""
+Benchmark of the order matching engines against the linear scan of the brain.
+
+Usage:
+    python benchmarks/order_matching.py [number_of_neurons]
+"""
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)))
+
+from odie.core.Models import Brain, Neuron
+from odie.core.Models.Cue import Cue
+from odie.core.OrderAnalyser import OrderAnalyser
+
+VOCABULARY = ["turn", "on", "off", "the", "light", "kitchen", "bedroom", "what", "time", "is", "it", "play",
+              "music", "stop", "open", "close", "door", "window", "weather", "today", "tomorrow", "set", "alarm",
+              "for", "me", "please", "tell", "joke", "volume", "up", "down", "move", "forward", "back", "left",
+              "right", "camera", "photo", "read", "news", "call", "mum", "dad", "remind", "to", "buy", "milk"]
+
+
+def get_brain(number_of_neurons, seed=42):
+    random.seed(seed)
+    neurons = list()
+    for index in range(number_of_neurons):
+        words = random.sample(VOCABULARY, random.randint(2, 6))
+        words.append("word%d" % index)
+        if index % 10 == 0:
+            words.append("{{ parameter }}")
+        order = " ".join(words)
+        neurons.append(Neuron(name="neuron-%d" % index, actions=[], cues=[Cue(name="order", parameters=order)]))
+    return Brain(neurons=neurons)
+
+
+def get_user_orders(brain, number_of_orders=200, seed=42):
+    random.seed(seed)
+    user_orders = list()
+    for neuron in random.sample(brain.neurons, number_of_orders):
+        order = neuron.cues[0].parameters.replace("{{ parameter }}", "value")
+        user_orders.append(" ".join(order.split() + random.sample(VOCABULARY, 2)))
+    return user_orders
+
+
+def linear_scan(brain, user_order):
+    return [neuron for neuron in brain.neurons for cue in neuron.cues
+            if cue.name == "order" and OrderAnalyser.spelt_order_match_brain_order_via_table(cue.parameters, user_order)]
+
+
+def main():
+    number_of_neurons = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    brain = get_brain(number_of_neurons)
+    user_orders = get_user_orders(brain)
+
+    build_time = timeit.timeit(lambda: brain.get_order_index(), number=1)
+    order_index = brain.get_order_index()
+    for engine in ("bm25", "tfidf"):
+        order_index.get_ranker(engine)
+
+    # the index must return the same neurons as the linear scan
+    for user_order in user_orders:
+        expected = linear_scan(brain, user_order)
+        assert [entry.neuron for entry in order_index.get_matching_entries(user_order)] == expected
+
+    matchers = [
+        ("linear scan", lambda user_order: linear_scan(brain, user_order)),
+        ("subset index", order_index.get_matching_entries),
+        ("bm25 top 1", lambda user_order: order_index.get_ranker("bm25").rank(user_order, top_k=1)),
+        ("tfidf top 1", lambda user_order: order_index.get_ranker("tfidf").rank(user_order, top_k=1)),
+    ]
+
+    print("%d neurons, %d user orders, index built in %.1f ms" % (number_of_neurons, len(user_orders),
+                                                                    build_time * 1000))
+    for name, matcher in matchers:
+        duration = timeit.timeit(lambda: [matcher(user_order) for user_order in user_orders], number=3)
+        print("%-14s %8.3f ms per order" % (name, duration * 1000 / (3 * len(user_orders))))
+
+
+if __name__ == '__main__':
+    main()
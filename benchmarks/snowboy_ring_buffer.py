@@ -0,0 +1,149 @@
+"""
+Benchmark of the RingBuffer of the snowboy wakeon against the deque of bytes it replaces.
+
+The audio is the one captured by snowboy: 16 kHz, 16 bits, mono, written by chunks of 2048 frames. The first
+measure is the cost of the buffer alone, the second one runs the capture in real time with the consumer loop of
+HotwordDetector (the detection itself is not run) and measures the CPU used by the process.
+
+Usage:
+    python benchmarks/snowboy_ring_buffer.py [seconds_of_real_time_capture]
+"""
+import collections
+import os
+import sys
+import threading
+import time
+import timeit
+
+sys.path.insert(0, os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)))
+
+from odie.core.RingBuffer import RingBuffer
+
+SAMPLE_RATE = 16000
+SAMPLE_WIDTH = 2
+FRAMES_PER_BUFFER = 2048
+# size of the buffer of HotwordDetector: 5 seconds of audio
+BUFFER_SIZE = SAMPLE_RATE * SAMPLE_WIDTH * 5
+# sleep time of the polling loop of HotwordDetector
+SLEEP_TIME = 0.03
+# maximum time HotwordDetector waits for audio with the RingBuffer, set by Snowboy
+WAIT_TIMEOUT = 1
+
+CHUNK = os.urandom(FRAMES_PER_BUFFER * SAMPLE_WIDTH)
+CHUNKS_PER_SECOND = float(SAMPLE_RATE) / FRAMES_PER_BUFFER
+
+
+def process_time():
+    """CPU time of the process in seconds"""
+    if hasattr(time, "process_time"):
+        return time.process_time()
+    times = os.times()
+    return times[0] + times[1]
+
+
+class DequeRingBuffer(object):
+    """The previous ring buffer of snowboydecoder"""
+    def __init__(self, size=4096):
+        self._buf = collections.deque(maxlen=size)
+
+    def extend(self, data):
+        self._buf.extend(data)
+
+    def get(self):
+        tmp = bytes(bytearray(self._buf))
+        self._buf.clear()
+        return tmp
+
+
+def buffer_cost(ring_buffer):
+    """
+    CPU time in ms to write and read one second of audio, one read per chunk
+    """
+    number_of_chunks = 1000
+
+    def run():
+        for _ in range(number_of_chunks):
+            ring_buffer.extend(CHUNK)
+            ring_buffer.get()
+    duration = min(timeit.repeat(run, number=1, repeat=3))
+    return duration * 1000 * CHUNKS_PER_SECOND / number_of_chunks
+
+
+def polling_consumer(ring_buffer, stop_event):
+    """The consumer loop of HotwordDetector before the RingBuffer"""
+    wake_ups = 0
+    while not stop_event.is_set():
+        wake_ups += 1
+        data = ring_buffer.get()
+        if len(data) == 0:
+            time.sleep(SLEEP_TIME)
+            continue
+    return wake_ups
+
+
+def waiting_consumer(ring_buffer, stop_event):
+    """The consumer loop of HotwordDetector with the RingBuffer"""
+    wake_ups = 0
+    while not stop_event.is_set():
+        wake_ups += 1
+        if not ring_buffer.wait(WAIT_TIMEOUT):
+            continue
+        ring_buffer.get()
+    return wake_ups
+
+
+def real_time_cost(ring_buffer, consumer, seconds):
+    """
+    CPU time in ms used per second of audio captured in real time
+    :return: the CPU time of the process, the CPU time of the consumer thread (None if it cannot be measured) and
+    the number of wake ups of the consumer per second
+    """
+    stop_event = threading.Event()
+    consumer_stats = dict()
+
+    def run_consumer():
+        thread_time = getattr(time, "thread_time", None)
+        start_thread_time = thread_time() if thread_time else None
+        consumer_stats["wake_ups"] = consumer(ring_buffer, stop_event)
+        if thread_time:
+            consumer_stats["cpu_time"] = thread_time() - start_thread_time
+
+    consumer_thread = threading.Thread(target=run_consumer)
+    consumer_thread.start()
+
+    start_cpu_time = process_time()
+    start_time = time.time()
+    for index in range(int(seconds * CHUNKS_PER_SECOND)):
+        # the audio callback of the input stream
+        time.sleep(max(0, start_time + index / CHUNKS_PER_SECOND - time.time()))
+        ring_buffer.extend(CHUNK)
+    cpu_time = process_time() - start_cpu_time
+    stop_event.set()
+    if isinstance(ring_buffer, RingBuffer):
+        ring_buffer.interrupt()
+    consumer_thread.join()
+    consumer_cpu_time = consumer_stats.get("cpu_time")
+    return (cpu_time * 1000 / seconds,
+            consumer_cpu_time * 1000 / seconds if consumer_cpu_time is not None else None,
+            consumer_stats["wake_ups"] / seconds)
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    print("buffer alone, CPU ms per second of audio")
+    print("%-22s %8.3f" % ("deque of bytes", buffer_cost(DequeRingBuffer(BUFFER_SIZE))))
+    print("%-22s %8.3f" % ("RingBuffer", buffer_cost(RingBuffer(BUFFER_SIZE))))
+
+    print("real time capture during %s seconds, CPU ms per second of audio" % seconds)
+    print("%-22s %8s %8s %8s" % ("", "process", "consumer", "wake ups"))
+    for name, ring_buffer, consumer in [("deque, polling", DequeRingBuffer(BUFFER_SIZE), polling_consumer),
+                                        ("RingBuffer, waiting", RingBuffer(BUFFER_SIZE), waiting_consumer)]:
+        cpu_time, consumer_cpu_time, wake_ups = real_time_cost(ring_buffer, consumer, seconds)
+        print("%-22s %8.3f %8s %8.1f" % (name, cpu_time,
+                                         "%.3f" % consumer_cpu_time if consumer_cpu_time is not None else "-",
+                                         wake_ups))
+
+
+if __name__ == '__main__':
+    main()
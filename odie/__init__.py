@@ -2,7 +2,6 @@
 # coding: utf8
 import argparse
 import logging
-import time
 
 from odie.core import ShellGui
 from odie.core import Utils
@@ -18,6 +17,7 @@ import sys
 
 from odie.core.ResourcesManager import ResourcesManager
 from odie.core.NeuronLauncher import NeuronLauncher
+from odie.core.TTS.TTSWarmUp import TTSWarmUp
 
 logging.basicConfig()
 logger = logging.getLogger("odie")
@@ -145,9 +145,11 @@ def main():
         if settings.postgres:
             pg = settings.postgres
             from odie.postgres.PostgreManager import PostgresManager as PgManager
-            Bsaved = PgManager.save_brain_table(pg=pg, brain=brain)
-            if Bsaved:
-                Utils.print_info("postgresql brain saved successfully")
+            brain_sync = PgManager.save_brain_table(pg=pg, brain=brain)
+            if brain_sync:
+                Utils.print_info("postgresql brain saved successfully: %s neurons added, %s updated, %s removed, "
+                                 "%s unchanged" % (brain_sync.added, brain_sync.updated, brain_sync.removed,
+                                                   brain_sync.unchanged))
         else:
             Utils.print_danger("no PostgreSQL configuration found")
 
@@ -167,6 +169,9 @@ def main():
                                                           is_api_call=False)
 
         if (parser.run_neuron is None) and (parser.run_order is None):
+            if settings.tts_cache is not None and settings.tts_cache.warm_up:
+                # generate in background the sentences odie will say
+                TTSWarmUp(brain=brain, settings=settings, workers=settings.tts_cache.warm_up_workers).start()
             # start rest api
             start_rest_api(settings, brain)
             start_odie(settings, brain)
@@ -296,8 +301,8 @@ def start_odie(settings, brain):
                 cue_instance.daemon = True
                 cue_instance.start()
 
-        while True:  # keep main thread alive
-            time.sleep(0.1)
+        while True:  # keep main thread alive, sleep until a signal is received
+            signal.pause()
 
     except (KeyboardInterrupt, SystemExit):
         # we need to switch GPIO pin to default status if we are using a Rpi
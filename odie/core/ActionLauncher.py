@@ -1,11 +1,12 @@
 import logging
 import six
-import jinja2
 
 from odie.core.Utils.Utils import Utils
+from odie.core.Utils.TemplateCache import TemplateCache
 from odie.core.ConfigurationManager.SettingLoader import SettingLoader
 from odie.core.ActionExceptions import ActionExceptions
 from odie.core.Recordatio import Recordatio
+from odie.core.Models.Action import Action
 
 logging.basicConfig()
 logger = logging.getLogger("odie")
@@ -44,16 +45,19 @@ class ActionLauncher:
         """
         Execute each action from the received action_list.
         Replace parameter if exist in the received dict of parameters_dict
-        :param action: action object to run
+        :param action: action object to run, an Action or an ActionExecution. It is not modified
         :param parameters_dict: dict of parameter to load in each action if expecting a parameter
         :return: List of the instantiated actions (no errors detected)
         """
-        if action.parameters is not None:
+        parameters = action.parameters
+        if parameters is not None:
             try:
-                action.parameters = cls._replace_brackets_by_loaded_parameter(action.parameters, parameters_dict)
+                parameters = cls._replace_brackets_by_loaded_parameter(parameters, parameters_dict)
             except ActionParameterNotAvailable:
                 Utils.print_danger("Missing parameter in action %s. Execution skipped" % action.name)
                 return None
+        # the rendered parameters are given to a new action, the brain action is shared by all the executions
+        action = Action(name=action.name, parameters=parameters)
         try:
             instantiated_action = ActionLauncher.launch_action(action)
         except ActionExceptions as e:
@@ -87,7 +91,7 @@ class ActionLauncher:
                     # add parameters from global variable into the final loaded parameter dict
                     settings = cls.load_settings()
                     loaded_parameters.update(settings.variables)
-                    action_parameters = jinja2.Template(action_parameters).render(loaded_parameters)
+                    action_parameters = TemplateCache.render(action_parameters, loaded_parameters)
                     action_parameters = Utils.encode_text_utf8(action_parameters)
                     return str(action_parameters)
                 else:
@@ -4,7 +4,6 @@ import random
 import sys
 import six
 
-from jinja2 import Template
 
 from odie.core import OrderListener
 from odie.core.ConfigurationManager import SettingLoader, BrainLoader
@@ -15,6 +14,7 @@ from odie.core.ActionExceptions import ActionExceptions
 from odie.core.OrderAnalyser import OrderAnalyser
 from odie.core.Utils.RpiUtils import RpiUtils
 from odie.core.Utils.Utils import Utils
+from odie.core.Utils.TemplateCache import TemplateCache
 
 logging.basicConfig()
 logger = logging.getLogger("odie")
@@ -174,18 +174,17 @@ class ActionModule(object):
             else:
                 logger.debug("[ActionModule] no_voice is False, make Odie speaking")
                 # get the instance of the TTS module
+                # the TTS package imports the players, imported here to avoid a circular import
+                from odie.core.TTS.TTSPool import TTSPool
                 tts_folder = None
                 if self.settings.resources:
                     tts_folder = self.settings.resources.tts_folder
-                tts_module_instance = Utils.get_dynamic_class_instantiation(package_name="tts",
-                                                                            module_name=self.tts.name,
-                                                                            parameters=self.tts.parameters,
-                                                                            resources_dir=tts_folder)
-                # Odie will talk, turn on the LED
-                self.switch_on_led_talking(rpi_settings=self.settings.rpi_settings, on=True)
+                with TTSPool.get_tts(self.tts, resources_dir=tts_folder) as tts_module_instance:
+                    # Odie will talk, turn on the LED
+                    self.switch_on_led_talking(rpi_settings=self.settings.rpi_settings, on=True)
 
-                # generate the audio file and play it
-                tts_module_instance.say(tts_message)
+                    # generate the audio file and play it
+                    tts_module_instance.say(tts_message)
 
                 # Odie has finished to talk, turn off the LED
                 self.switch_on_led_talking(rpi_settings=self.settings.rpi_settings, on=False)
@@ -220,7 +219,7 @@ class ActionModule(object):
         if isinstance(list_say_template, list):
             # then we pick randomly one template
             list_say_template = random.choice(list_say_template)
-        t = Template(list_say_template)
+        t = TemplateCache.get_template(list_say_template)
         return t.render(**message_dict)
 
     @classmethod
@@ -230,8 +229,8 @@ class ActionModule(object):
             raise TemplateFileNotFoundException("Template file %s not found in templates folder"
                                                 % real_file_template_path)
 
-        # load the content of the file as template
-        t = Template(cls._get_content_of_file(real_file_template_path))
+        # load the content of the file as template, the file is only read again when modified
+        t = TemplateCache.get_file_template(real_file_template_path)
         returned_message = t.render(**message_dict)
 
         return returned_message
@@ -254,8 +253,8 @@ class ActionModule(object):
                                        overriding_parameter=overriding_parameter_dict)
         list_neuron_to_process = list()
         list_neuron_to_process.append(matched_neuron)
-        # get the singleton
-        lifo_buffer = LIFOBuffer()
+        # get the LIFO running this action: the singleton or the one of the API session
+        lifo_buffer = LIFOBuffer.get_current()
         lifo_buffer.add_neuron_list_to_lifo(list_neuron_to_process, high_priority=high_priority)
         lifo_buffer.execute(is_api_call=is_api_call)
 
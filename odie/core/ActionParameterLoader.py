@@ -1,4 +1,4 @@
-from odie.core.Utils import Utils
+from odie.core.Models.OrderTemplate import OrderTemplate
 from odie.core.Recordatio import Recordatio
 
 import logging
@@ -10,13 +10,20 @@ logger = logging.getLogger("odie")
 class ActionParameterLoader(object):
 
     @classmethod
-    def get_parameters(cls, neuron_order, user_order):
+    def get_parameters(cls, neuron_order, user_order, order_template=None):
         """
         Class method to get all params coming from a string order. Returns a dict of key/value.
+        :param neuron_order: the order from the brain
+        :param user_order: the order from user
+        :param order_template: the compiled neuron_order. Compiled from neuron_order if not provided
         """
+        if order_template is None:
+            order_template = OrderTemplate(order=neuron_order)
         params = dict()
-        if Utils.is_containing_bracket(neuron_order):
-            params = cls._associate_order_params_to_values(user_order, neuron_order)
+        if order_template.has_brackets:
+            logger.debug("[ActionParameterLoader.get_parameters] user order: %s, "
+                         "order from neuron: %s" % (user_order, neuron_order))
+            params = order_template.get_parameters(user_order)
             logger.debug("[NeuronParameterLoader.get_parameters]Parameters for order: %s" % params)
             # we place the dict of parameters load from order into a cache in Cortex so the user can save it later
             Recordatio.add_parameters_from_order(params)
@@ -34,35 +41,4 @@ class ActionParameterLoader(object):
         """
         logger.debug("[ActionParameterLoader._associate_order_params_to_values] user order: %s, "
                      "order from neuron: %s" % (order, order_to_check))
-
-        list_word_in_order = Utils.remove_spaces_in_brackets(order_to_check).split()
-
-        # get the order, defined by the first words before {{
-        # /!\ Could be empty if order starts with double brace
-        the_order = order_to_check[:order_to_check.find('{{')]
-
-        # remove sentence before order which are sentences not matching anyway
-        # Manage Upper/Lower case
-        truncate_user_sentence = order[order.lower().find(the_order.lower()):]
-        truncate_list_word_said = truncate_user_sentence.split()
-
-        # make dict var:value
-        dict_var = dict()
-        for idx, ow in enumerate(list_word_in_order):
-            if Utils.is_containing_bracket(ow):
-                # remove bracket and grab the next value / stop value
-                var_name = ow.replace("{{", "").replace("}}", "")
-                stop_value = Utils.get_next_value_list(list_word_in_order[idx:])
-                if stop_value is None:
-                    dict_var[var_name] = " ".join(truncate_list_word_said)
-                    break
-                for word_said in truncate_list_word_said:
-                    if word_said.lower() == stop_value.lower():  # Do not consider the case
-                        break
-                    if var_name in dict_var:
-                        dict_var[var_name] += " " + word_said
-                        truncate_list_word_said = truncate_list_word_said[1:]
-                    else:
-                        dict_var[var_name] = word_said
-            truncate_list_word_said = truncate_list_word_said[1:]
-        return dict_var
+        return OrderTemplate(order=order_to_check).get_parameters(order)
@@ -0,0 +1,186 @@
+import logging
+import threading
+import wave
+from abc import ABCMeta, abstractmethod
+
+import six
+from six.moves import queue
+
+logging.basicConfig()
+logger = logging.getLogger("odie")
+
+# number of frames read from the file and written to the stream at a time
+CHUNK = 1024
+
+
+class PlayRequest(object):
+    """
+    A file in the play queue of an AudioOutput
+    """
+
+    def __init__(self, file_path=None):
+        self.file_path = file_path
+        # set once the whole file has been written to the stream
+        self.done = threading.Event()
+        self.error = None
+
+    def wait(self):
+        """
+        Wait the end of the playback, raise the error of the playback if any
+        """
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+
+
+class WaveReader(object):
+    """
+    Reader of the frames of a PCM wav file
+    """
+
+    def __init__(self, file_path):
+        """
+        :param file_path: path of the wav file, or the wav in memory (file object)
+        :raise wave.Error: the file is not a PCM wav file
+        """
+        self._wave_file = wave.open(file_path, 'rb')
+        # (sample width, channels, rate) of the frames
+        self.format = (self._wave_file.getsampwidth(), self._wave_file.getnchannels(), self._wave_file.getframerate())
+
+    def read_frames(self, number_of_frames):
+        """
+        :return: the bytes of the next frames, empty at the end of the file
+        """
+        return self._wave_file.readframes(number_of_frames)
+
+    def close(self):
+        self._wave_file.close()
+
+
+class AudioOutput(six.with_metaclass(ABCMeta, object)):
+    """
+    Mother class of the output streams of the players.
+
+    An AudioOutput keeps one stream open on a device for the life of odie, so the audio library is initialised once.
+    The files to play are put in a queue and played one after the other by a thread: the frames of the wav files are
+    streamed by chunks to the same stream, so the clips queued back to back are played without gap. The stream is
+    only opened again when the format of a file (sample width, channels, rate) is not the format of the stream.
+
+    The players must implement _open_stream and may override _close_stream, and _open_file to read other formats than
+    PCM wav.
+
+    .. seealso:: PlayerModule
+    """
+    # (AudioOutput class, device) -> AudioOutput
+    _outputs = dict()
+    _outputs_lock = threading.Lock()
+
+    def __init__(self, device=None):
+        """
+        :param device: the output device, None for the default device
+        """
+        self.device = device
+        self._play_queue = queue.Queue()
+        self._stream = None
+        # (sample width, channels, rate) of the opened stream
+        self._stream_format = None
+        self._worker = threading.Thread(target=self._play_files)
+        self._worker.daemon = True
+        self._worker.start()
+
+    @classmethod
+    def get_output(cls, device=None):
+        """
+        Return the output of a device, created on first use
+        :param device: the output device, None for the default device
+        :return: the AudioOutput
+        """
+        key = (cls, device)
+        with AudioOutput._outputs_lock:
+            output = AudioOutput._outputs.get(key)
+            if output is None:
+                logger.debug("[AudioOutput] new output %s for device %s" % (cls.__name__, device))
+                output = cls(device=device)
+                AudioOutput._outputs[key] = output
+        return output
+
+    def play(self, file_path, block=True):
+        """
+        Put a wav file in the play queue
+        :param file_path: path of the wav file, or the wav in memory (file object)
+        :param block: wait the end of the playback if True
+        :return: the PlayRequest of the file
+        """
+        play_request = PlayRequest(file_path=file_path)
+        self._play_queue.put(play_request)
+        if block:
+            play_request.wait()
+        return play_request
+
+    def _play_files(self):
+        """
+        Worker: play the files of the queue
+        """
+        while True:
+            play_request = self._play_queue.get()
+            try:
+                self._play_file(play_request.file_path)
+            except Exception as e:
+                logger.debug("[AudioOutput] fail to play %s: %s" % (play_request.file_path, e))
+                play_request.error = e
+                # the stream may be broken, it is opened again for the next file
+                self._reset_stream()
+            finally:
+                play_request.done.set()
+
+    def _play_file(self, file_path):
+        audio_file = self._open_file(file_path)
+        try:
+            stream_format = audio_file.format
+            if self._stream is None or stream_format != self._stream_format:
+                self._reset_stream()
+                logger.debug("[AudioOutput] open stream: %d bytes, %d channels, %d Hz" % stream_format)
+                self._stream = self._open_stream(*stream_format)
+                self._stream_format = stream_format
+
+            data = audio_file.read_frames(CHUNK)
+            while data:
+                self._stream.write(data)
+                data = audio_file.read_frames(CHUNK)
+        finally:
+            audio_file.close()
+
+    def _open_file(self, file_path):
+        """
+        Open a file to play
+        :param file_path: path of the file, or the file in memory (file object)
+        :return: a reader with the format (sample width, channels, rate) of the frames, a read_frames(number_of_frames)
+        and a close method. A WaveReader by default
+        """
+        return WaveReader(file_path)
+
+    def _reset_stream(self):
+        if self._stream is not None:
+            try:
+                self._close_stream(self._stream)
+            except Exception as e:
+                logger.debug("[AudioOutput] fail to close stream: %s" % e)
+        self._stream = None
+        self._stream_format = None
+
+    @abstractmethod
+    def _open_stream(self, sample_width, channels, rate):
+        """
+        Open a stream on the device
+        :param sample_width: number of bytes of a sample
+        :param channels: number of channels
+        :param rate: frame rate
+        :return: a stream with a write(data) method
+        """
+        pass
+
+    def _close_stream(self, stream):
+        """
+        Close a stream opened by _open_stream
+        """
+        stream.close()
@@ -7,6 +7,7 @@ import six
 from odie.core.Models.Cue import Cue
 from .YAMLLoader import YAMLLoader
 from odie.core.Utils import Utils
+from odie.core.Utils.PluginRegistry import PluginRegistry
 from odie.core.ConfigurationManager import SettingLoader
 from odie.core.ConfigurationManager.ConfigurationChecker import ConfigurationChecker
 from odie.core.Models import Singleton
@@ -41,6 +42,8 @@ class BrainLoader(with_metaclass(Singleton, object)):
         # if the returned file path is none, the file doesn't exist
         if self.file_path is None:
             raise BrainNotFound("brain file not found")
+        # the plugins of the resources folder are read again with the new brain
+        PluginRegistry.clean()
         self.yaml_config = self.get_yaml_config()
         self.brain = self.get_brain()
 
@@ -100,6 +103,9 @@ class BrainLoader(with_metaclass(Singleton, object)):
         # check that no neuron have the same name than another
         if not ConfigurationChecker().check_neurons(neurons):
             brain = None
+        else:
+            # index the orders once, so matching a user order does not scan the whole brain
+            brain.get_order_index()
 
         return brain
 
@@ -8,6 +8,10 @@ from odie.core.Models.Resources import Resources
 from odie.core.Models.Postgres import Postgres
 from odie.core.Models.Cloud import Cloud
 from odie.core.Models.RecognitionOptions import RecognitionOptions
+from odie.core.Models.OrderMatching import OrderMatching
+from odie.core.Models.TtsCacheOptions import TtsCacheOptions
+from odie.core.Models.TranscodeCacheOptions import TranscodeCacheOptions
+from odie.core.OrderRanker import RANKERS
 from odie.core.Utils.Utils import Utils
 from odie.core.Models import Singleton
 from odie.core.Models.RestAPI import RestAPI
@@ -125,6 +129,9 @@ class SettingLoader(with_metaclass(Singleton, object)):
         alphabot = self._get_alphabot(settings)
         cloud = self._get_cloud(settings)
         recognition_options = self._get_recognition_options(settings)
+        order_matching = self._get_order_matching(settings)
+        tts_cache = self._get_tts_cache(settings)
+        transcode_cache = self._get_transcode_cache(settings)
 
         # Load the setting singleton with the parameters
         setting_object.default_tts_name = default_tts_name
@@ -150,6 +157,9 @@ class SettingLoader(with_metaclass(Singleton, object)):
         setting_object.alphabot = alphabot
         setting_object.cloud = cloud
         setting_object.recognition_options = recognition_options
+        setting_object.order_matching = order_matching
+        setting_object.tts_cache = tts_cache
+        setting_object.transcode_cache = transcode_cache
 
         return setting_object
 
@@ -538,12 +548,22 @@ class SettingLoader(with_metaclass(Singleton, object)):
                 if "allowed_cors_origin" in rest_api:
                     allowed_cors_origin = rest_api["allowed_cors_origin"]
 
+                session_ttl = 600
+                if "session_ttl" in rest_api:
+                    try:
+                        session_ttl = int(rest_api["session_ttl"])
+                    except (TypeError, ValueError):
+                        raise SettingInvalidException("session_ttl must be an integer")
+                    if session_ttl <= 0:
+                        raise SettingInvalidException("session_ttl must be positive")
+
             except KeyError as e:
                 raise SettingNotFound("%s settings not found" % e)
 
             # config ok, we can return the rest api object
             rest_api_obj = RestAPI(password_protected=password_protected, login=login, password=password,
-                                   active=active, port=port, allowed_cors_origin=allowed_cors_origin)
+                                   active=active, port=port, allowed_cors_origin=allowed_cors_origin,
+                                   session_ttl=session_ttl)
             return rest_api_obj
         else:
             raise NullSettingException("rest_api settings cannot be null")
@@ -828,6 +848,15 @@ class SettingLoader(with_metaclass(Singleton, object)):
                                 database=database,
                                 user=user,
                                 password=password)
+
+            # connection pool options
+            for option in ["pool_min_size", "pool_max_size", "health_check_interval", "connection_timeout"]:
+                if option in pg:
+                    if not isinstance(pg[option], int) or pg[option] < 0:
+                        raise SettingInvalidException("postgres %s must be a positive integer" % option)
+                    setattr(postgres, option, pg[option])
+            if postgres.pool_max_size < 1 or postgres.pool_min_size > postgres.pool_max_size:
+                raise SettingInvalidException("postgres pool_max_size must be at least 1 and pool_min_size")
         except KeyError:
             logger.debug("Postgres not found in settings")
             postgres = None
@@ -886,7 +915,7 @@ class SettingLoader(with_metaclass(Singleton, object)):
         recognition_options = RecognitionOptions()
 
         try:
-            recognition_options_dict = settings["RecognitionOptions"]
+            recognition_options_dict = settings["recognition_options"]
 
             if "energy_threshold" in recognition_options_dict:
                 recognition_options.energy_threshold = recognition_options_dict["energy_threshold"]
@@ -895,6 +924,19 @@ class SettingLoader(with_metaclass(Singleton, object)):
                 recognition_options.adjust_for_ambient_noise_second = recognition_options_dict["adjust_for_ambient_noise_second"]
                 logger.debug("[SettingsLoader] adjust_for_ambient_noise_second set to %s"
                              % recognition_options.adjust_for_ambient_noise_second)
+            if "pre_roll_second" in recognition_options_dict:
+                pre_roll_second = recognition_options_dict["pre_roll_second"]
+                if not isinstance(pre_roll_second, (int, float)) or pre_roll_second < 0:
+                    raise SettingInvalidException("recognition_options pre_roll_second must be a number of seconds")
+                recognition_options.pre_roll_second = pre_roll_second
+                logger.debug("[SettingsLoader] pre_roll_second set to %s" % recognition_options.pre_roll_second)
+            if "ambient_noise_refresh_second" in recognition_options_dict:
+                refresh_second = recognition_options_dict["ambient_noise_refresh_second"]
+                if not isinstance(refresh_second, (int, float)) or refresh_second <= 0:
+                    raise SettingInvalidException("recognition_options ambient_noise_refresh_second must be a "
+                                                  "positive number of seconds")
+                recognition_options.ambient_noise_refresh_second = refresh_second
+                logger.debug("[SettingsLoader] ambient_noise_refresh_second set to %s" % refresh_second)
             return recognition_options
 
         except KeyError:
@@ -902,3 +944,100 @@ class SettingLoader(with_metaclass(Singleton, object)):
 
         logger.debug("[SettingsLoader] recognition_options: %s" % str(recognition_options))
         return recognition_options
+
+    @staticmethod
+    def _get_order_matching(settings):
+        """
+        return the OrderMatching object
+        :param settings: The loaded YAML settings file
+        :return: OrderMatching with the "subset" engine by default if not set
+        """
+        order_matching = OrderMatching()
+
+        try:
+            order_matching_dict = settings["order_matching"]
+        except KeyError:
+            logger.debug("[SettingsLoader] no order_matching defined. Set to default")
+            return order_matching
+
+        if "engine" in order_matching_dict:
+            order_matching.engine = order_matching_dict["engine"]
+            if order_matching.engine != "subset" and order_matching.engine not in RANKERS:
+                raise SettingInvalidException("order_matching engine must be subset or one of: %s"
+                                              % ", ".join(sorted(RANKERS)))
+        if "top_k" in order_matching_dict:
+            order_matching.top_k = order_matching_dict["top_k"]
+            if order_matching.top_k is not None and (isinstance(order_matching.top_k, bool) or
+                                                     not isinstance(order_matching.top_k, int) or
+                                                     order_matching.top_k < 1):
+                raise SettingInvalidException("order_matching top_k must be a positive integer")
+        if "threshold" in order_matching_dict:
+            order_matching.threshold = order_matching_dict["threshold"]
+            if order_matching.threshold is not None and (isinstance(order_matching.threshold, bool) or
+                                                         not isinstance(order_matching.threshold, (int, float))):
+                raise SettingInvalidException("order_matching threshold must be a number")
+
+        logger.debug("[SettingsLoader] order_matching: %s" % str(order_matching))
+        return order_matching
+
+    @staticmethod
+    def _get_tts_cache(settings):
+        """
+        return the TtsCacheOptions object
+        :param settings: The loaded YAML settings file
+        :return: TtsCacheOptions with the default values if not set
+        """
+        tts_cache = TtsCacheOptions()
+
+        try:
+            tts_cache_dict = settings["tts_cache"]
+        except KeyError:
+            logger.debug("[SettingsLoader] no tts_cache defined. Set to default")
+            return tts_cache
+
+        if "max_size" in tts_cache_dict:
+            tts_cache.max_size = tts_cache_dict["max_size"]
+            if not isinstance(tts_cache.max_size, (int, float)) or tts_cache.max_size <= 0:
+                raise SettingInvalidException("tts_cache max_size must be a positive number of MB")
+        if "warm_up" in tts_cache_dict:
+            tts_cache.warm_up = tts_cache_dict["warm_up"]
+            if not isinstance(tts_cache.warm_up, bool):
+                raise SettingInvalidException("tts_cache warm_up must be True or False")
+        if "warm_up_workers" in tts_cache_dict:
+            tts_cache.warm_up_workers = tts_cache_dict["warm_up_workers"]
+            if not isinstance(tts_cache.warm_up_workers, int) or tts_cache.warm_up_workers < 1:
+                raise SettingInvalidException("tts_cache warm_up_workers must be a positive integer")
+
+        logger.debug("[SettingsLoader] tts_cache: %s" % str(tts_cache))
+        return tts_cache
+
+    @staticmethod
+    def _get_transcode_cache(settings):
+        """
+        return the TranscodeCacheOptions object
+        :param settings: The loaded YAML settings file
+        :return: TranscodeCacheOptions with the default values if not set
+        """
+        transcode_cache = TranscodeCacheOptions()
+
+        try:
+            transcode_cache_dict = settings["transcode_cache"]
+        except KeyError:
+            logger.debug("[SettingsLoader] no transcode_cache defined. Set to default")
+            return transcode_cache
+
+        if "max_size" in transcode_cache_dict:
+            transcode_cache.max_size = transcode_cache_dict["max_size"]
+            if not isinstance(transcode_cache.max_size, (int, float)) or transcode_cache.max_size <= 0:
+                raise SettingInvalidException("transcode_cache max_size must be a positive number of MB")
+        if "memory_size" in transcode_cache_dict:
+            transcode_cache.memory_size = transcode_cache_dict["memory_size"]
+            if not isinstance(transcode_cache.memory_size, (int, float)) or transcode_cache.memory_size < 0:
+                raise SettingInvalidException("transcode_cache memory_size must be a number of MB")
+        if "preload_sounds" in transcode_cache_dict:
+            transcode_cache.preload_sounds = transcode_cache_dict["preload_sounds"]
+            if not isinstance(transcode_cache.preload_sounds, bool):
+                raise SettingInvalidException("transcode_cache preload_sounds must be True or False")
+
+        logger.debug("[SettingsLoader] transcode_cache: %s" % str(transcode_cache))
+        return transcode_cache
@@ -1,14 +1,19 @@
 import logging
+import threading
 from six import with_metaclass
 
 from odie.core.Recordatio import Recordatio
 from odie.core.ActionLauncher import ActionLauncher
 from odie.core.Models import Singleton
 from odie.core.Models.APIResponse import APIResponse
+from odie.core.Models.ActionExecution import ActionExecution
 
 logging.basicConfig()
 logger = logging.getLogger("odie")
 
+# the LIFO being executed by each thread, see LIFO.get_current
+_executing = threading.local()
+
 
 class Serialize(Exception):
     """
@@ -25,14 +30,15 @@ class NeuronListAddedToLIFO(Exception):
     pass
 
 
-class LIFOBuffer(with_metaclass(Singleton, object)):
+class LIFO(object):
     """
     This class is a LIFO list of neuron to process where the last neuron list to enter will be the first neuron
     list to be processed.
     This design is needed in order to use Odie from the API. 
     Because we want to return an information when a Action is still processing and waiting for an answer from the user
     like with the Neurotransmitter action.
-    
+
+    The local voice loop uses the LIFOBuffer singleton, each session of the API has its own LIFO, see LIFOSessions.
     """
 
     def __init__(self):
@@ -45,6 +51,17 @@ class LIFOBuffer(with_metaclass(Singleton, object)):
         self.is_running = False
         self.reset_lifo = False
 
+    @staticmethod
+    def get_current():
+        """
+        Return the LIFO executing in the current thread, so the actions add their neurons to the LIFO that runs them
+        :return: the LIFO being executed, the LIFOBuffer of the voice loop if none
+        """
+        current_lifo = getattr(_executing, "lifo", None)
+        if current_lifo is None:
+            return LIFOBuffer()
+        return current_lifo
+
     def set_answer(self, value):
         self.answer = value
 
@@ -104,6 +121,8 @@ class LIFOBuffer(with_metaclass(Singleton, object)):
 
         if not self.is_running:
             self.is_running = True
+            previous_lifo = getattr(_executing, "lifo", None)
+            _executing.lifo = self
 
             try:
                 # we keep looping over the LIFO til we have neuron list to process in it
@@ -124,6 +143,8 @@ class LIFOBuffer(with_metaclass(Singleton, object)):
 
             except Serialize:
                 return self._return_serialized_api_response()
+            finally:
+                _executing.lifo = previous_lifo
 
     def _process_neuron_list(self, neuron_list):
         """
@@ -168,17 +189,18 @@ class LIFOBuffer(with_metaclass(Singleton, object)):
             action = matched_neuron.action_fifo_list[0]
             logger.debug("[LIFOBuffer] number of action to process: %s" % action)
             # from here, we are back into the last action we were processing.
-            if self.answer is not None:  # we give the answer if exist to the first action
-                action.parameters["answer"] = self.answer
-                # the next action should not get this answer
-                self.answer = None
+            # we give the answer if exist to the first action
             # todo fix this when we have a full client/server call. The client would be the voice or api call
-            action.parameters["is_api_call"] = self.is_api_call
-            action.parameters["no_voice"] = self.no_voice
+            action_execution = ActionExecution(action=action,
+                                               answer=self.answer,
+                                               is_api_call=self.is_api_call,
+                                               no_voice=self.no_voice)
+            # the next action should not get this answer
+            self.answer = None
             logger.debug("[LIFOBuffer] process_action_list: is_api_call: %s, no_voice: %s" % (self.is_api_call,
                                                                                               self.no_voice))
             # execute the action
-            instantiated_action = ActionLauncher.start_action(action=action,
+            instantiated_action = ActionLauncher.start_action(action=action_execution,
                                                               parameters_dict=matched_neuron.parameters)
 
             # the status of an execution is "complete" if no action are waiting for an answer
@@ -205,3 +227,10 @@ class LIFOBuffer(with_metaclass(Singleton, object)):
                     raise NeuronListAddedToLIFO
             else:
                 raise Serialize
+
+
+class LIFOBuffer(with_metaclass(Singleton, LIFO)):
+    """
+    The LIFO of the local voice loop, shared by the cues of odie
+    """
+    pass
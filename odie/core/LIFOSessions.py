@@ -0,0 +1,92 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from odie.core.LIFOBuffer import LIFO
+
+logging.basicConfig()
+logger = logging.getLogger("odie")
+
+
+class LIFOSession(object):
+    """
+    A LIFO of the API with the state of its session
+    """
+
+    def __init__(self, session_id=None):
+        self.session_id = session_id
+        self.lifo = LIFO()
+        # only one request of the session is executed at a time
+        self.lock = threading.Lock()
+        # number of requests using the session, a used session is never evicted
+        self.users = 0
+        self.last_used = time.time()
+
+
+class LIFOSessions(object):
+    """
+    This class is the registry of the LIFO of the API sessions.
+
+    Each session has its own LIFO, so the requests of different sessions are executed concurrently and an action
+    waiting for an answer (like the Neurotransmitter action) gets the answer of its own session.
+    The sessions not used for more than ttl seconds are removed.
+
+    .. seealso:: LIFO, RestAPI
+    """
+
+    def __init__(self, ttl=600):
+        """
+        :param ttl: number of seconds a session is kept without being used
+        """
+        self.ttl = ttl
+        # session id -> LIFOSession
+        self._sessions = dict()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def session(self, session_id):
+        """
+        Get the LIFO of a session, created on first use. The other requests of the session wait the end of the block
+
+        :Example:
+
+            with lifo_sessions.session("my-session") as lifo_buffer:
+                lifo_buffer.execute(is_api_call=True)
+
+        :param session_id: id of the session
+        """
+        with self._lock:
+            self._evict_expired()
+            lifo_session = self._sessions.get(session_id)
+            if lifo_session is None:
+                logger.debug("[LIFOSessions] new session %s" % session_id)
+                lifo_session = LIFOSession(session_id=session_id)
+                self._sessions[session_id] = lifo_session
+            lifo_session.users += 1
+
+        try:
+            with lifo_session.lock:
+                yield lifo_session.lifo
+        finally:
+            with self._lock:
+                lifo_session.users -= 1
+                lifo_session.last_used = time.time()
+
+    def remove(self, session_id):
+        """
+        Remove a session, its waiting neurons are lost
+        :param session_id: id of the session
+        """
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def _evict_expired(self):
+        expiration_time = time.time() - self.ttl
+        for session_id, lifo_session in list(self._sessions.items()):
+            if lifo_session.users == 0 and lifo_session.last_used < expiration_time:
+                logger.debug("[LIFOSessions] session %s expired" % session_id)
+                del self._sessions[session_id]
@@ -0,0 +1,176 @@
+import logging
+import threading
+
+from odie.core.ConfigurationManager import SettingLoader
+from odie.core.RingBuffer import RingBuffer
+
+logging.basicConfig()
+logger = logging.getLogger("odie")
+
+# format of the captured audio, the format of the snowboy models
+SAMPLE_RATE = 16000
+CHANNELS = 1
+SAMPLE_WIDTH = 2
+# number of frames written to the consumers at a time
+FRAMES_PER_BUFFER = 1024
+# size of the buffer of a consumer in seconds of audio
+CONSUMER_BUFFER_SECOND = 5
+
+
+class MicrophoneCapture(object):
+    """
+    Always-on capture of the microphone shared by the wakeon and the STT.
+
+    One input stream is opened per audio format and kept open for the life of odie, the wakeon and the STT do not
+    open and close the device anymore. Each consumer reads the captured frames from its own RingBuffer.
+
+    The last pre_roll_second of audio are kept in memory. The wakeon marks the position of the detection of the
+    hotword, a consumer opened with pre_roll gets the audio captured since this mark: the words spoken right after
+    the hotword, while the wake up answer is played and the STT is started, are not lost.
+
+    .. seealso:: RingBuffer, HotwordDetector, SpeechRecognition
+    """
+    # (rate, channels, sample width) -> MicrophoneCapture
+    _captures = dict()
+    _captures_lock = threading.Lock()
+
+    def __init__(self, rate=SAMPLE_RATE, channels=CHANNELS, sample_width=SAMPLE_WIDTH, pre_roll_second=0):
+        """
+        :param rate: frame rate
+        :param channels: number of channels
+        :param sample_width: number of bytes of a sample
+        :param pre_roll_second: seconds of audio kept for the consumers opened after the mark
+        """
+        self.rate = rate
+        self.channels = channels
+        self.sample_width = sample_width
+        self.frame_size = channels * sample_width
+        self.pre_roll_second = pre_roll_second
+        self._lock = threading.Lock()
+        self._consumers = list()
+        self._stream = None
+        self._pyaudio = None
+        # last captured frames, the size is rounded to a whole number of frames
+        self._history = RingBuffer(max(int(pre_roll_second * rate), 1) * self.frame_size)
+        # number of bytes captured since the opening of the stream
+        self._position = 0
+        # position of the detection of the hotword
+        self._mark = None
+
+    @classmethod
+    def get_capture(cls, rate=SAMPLE_RATE, channels=CHANNELS, sample_width=SAMPLE_WIDTH):
+        """
+        Return the capture of a format, created on first use with the pre roll of the settings
+        :param rate: frame rate
+        :param channels: number of channels
+        :param sample_width: number of bytes of a sample
+        :return: the MicrophoneCapture
+        """
+        key = (rate, channels, sample_width)
+        with MicrophoneCapture._captures_lock:
+            capture = MicrophoneCapture._captures.get(key)
+            if capture is None:
+                settings = SettingLoader().settings
+                pre_roll_second = settings.recognition_options.pre_roll_second
+                logger.debug("[MicrophoneCapture] new capture %d Hz, %d channels, %d bytes, pre roll %s seconds"
+                             % (rate, channels, sample_width, pre_roll_second))
+                capture = cls(rate=rate, channels=channels, sample_width=sample_width,
+                              pre_roll_second=pre_roll_second)
+                MicrophoneCapture._captures[key] = capture
+        return capture
+
+    def open_consumer(self, size=None, pre_roll=False):
+        """
+        Start writing the captured frames to a new RingBuffer. The stream is opened with the first consumer
+        :param size: size of the buffer in bytes, CONSUMER_BUFFER_SECOND of audio by default
+        :param pre_roll: if True, the buffer starts with the audio captured since the mark, if any
+        :return: the RingBuffer of the consumer
+        """
+        if size is None:
+            size = int(CONSUMER_BUFFER_SECOND * self.rate) * self.frame_size
+        ring_buffer = RingBuffer(size)
+        with self._lock:
+            if pre_roll and self.pre_roll_second > 0 and self._mark is not None:
+                pre_roll_size = min(self._position - self._mark, len(self._history))
+                logger.debug("[MicrophoneCapture] consumer starts with %s bytes of pre roll" % pre_roll_size)
+                ring_buffer.extend(self._history.peek(pre_roll_size))
+                # the audio since the mark is given once
+                self._mark = None
+            self._consumers.append(ring_buffer)
+            if self._stream is None:
+                logger.debug("[MicrophoneCapture] open stream")
+                self._stream = self._open_stream(self._write_frames)
+        return ring_buffer
+
+    def close_consumer(self, ring_buffer):
+        """
+        Stop writing the captured frames to the RingBuffer of a consumer. The stream is kept open
+        :param ring_buffer: the RingBuffer returned by open_consumer
+        """
+        with self._lock:
+            if ring_buffer in self._consumers:
+                self._consumers.remove(ring_buffer)
+        # wake up the consumer waiting for frames
+        ring_buffer.interrupt()
+
+    def mark(self, pending=0):
+        """
+        Mark the current position of the capture, Eg: the detection of the hotword
+        :param pending: number of bytes captured but not read yet by the consumer that marks
+        """
+        with self._lock:
+            self._mark = max(self._position - pending, 0)
+
+    def close(self):
+        """
+        Close the stream, the consumers are interrupted
+        """
+        with self._lock:
+            consumers = self._consumers
+            self._consumers = list()
+            stream = self._stream
+            self._stream = None
+        for ring_buffer in consumers:
+            ring_buffer.interrupt()
+        if stream is not None:
+            self._close_stream(stream)
+
+    def _write_frames(self, data):
+        """
+        Called by the stream with the captured frames
+        """
+        with self._lock:
+            self._history.extend(data)
+            self._position += len(data)
+            for ring_buffer in self._consumers:
+                ring_buffer.extend(data)
+
+    def _open_stream(self, callback):
+        """
+        Open the input stream of the default device
+        :param callback: function called with the bytes of the captured frames
+        :return: the stream
+        """
+        # imported here, the stream is only opened when the microphone is used
+        import pyaudio
+
+        def audio_callback(in_data, frame_count, time_info, status):
+            callback(in_data)
+            # input only stream, no data to play
+            return None, pyaudio.paContinue
+
+        self._pyaudio = pyaudio.PyAudio()
+        return self._pyaudio.open(input=True, output=False,
+                                  format=self._pyaudio.get_format_from_width(self.sample_width),
+                                  channels=self.channels,
+                                  rate=self.rate,
+                                  frames_per_buffer=FRAMES_PER_BUFFER,
+                                  stream_callback=audio_callback)
+
+    def _close_stream(self, stream):
+        """
+        Close a stream opened by _open_stream
+        """
+        stream.stop_stream()
+        stream.close()
+        self._pyaudio.terminate()
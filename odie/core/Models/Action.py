@@ -2,7 +2,8 @@ class Action(object):
     """
     This Class is representing an Action to perform.
 
-    .. note:: Actions are defined in the brain file
+    .. note:: Actions are defined in the brain file. They are shared by every execution of their neuron and must not
+              be modified, the values of an execution are kept in an ActionExecution
     """
 
     def __init__(self, name=None, parameters={}):
@@ -0,0 +1,67 @@
+from odie.core.Models.Action import Action
+
+
+class ActionExecution(object):
+    """
+    This Class is one execution of an Action of a matched neuron.
+
+    The Action comes from the brain and is shared by every execution of its neuron, it is never modified. The values
+    that only belong to this execution (the answer of the user and the flags of the caller) are kept here and laid
+    over the parameters of the Action when they are read.
+
+    .. note:: Created by the LIFOBuffer each time an action of a MatchedNeuron is processed
+    """
+
+    def __init__(self, action=None, answer=None, is_api_call=False, no_voice=False):
+        """
+        :param action: The Action of the brain to execute
+        :param answer: The answer given by the user to the action, if any
+        :param is_api_call: If true, the execution comes from the API
+        :param no_voice: If true, the generated text will not be processed by the TTS engine
+        """
+        self.action = action
+        self.answer = answer
+        self.is_api_call = is_api_call
+        self.no_voice = no_voice
+
+    @property
+    def name(self):
+        return self.action.name
+
+    @property
+    def parameters(self):
+        """
+        The parameters of the action with the values of this execution, in a new dict.
+        The templates in brackets are not rendered yet, see ActionLauncher.start_action
+        :return: dict of parameters
+        """
+        parameters = dict(self.action.parameters) if self.action.parameters is not None else dict()
+        if self.answer is not None:
+            parameters["answer"] = self.answer
+        parameters["is_api_call"] = self.is_api_call
+        parameters["no_voice"] = self.no_voice
+        return parameters
+
+    def serialize(self):
+        """
+        This method allows to serialize in a proper way this object
+
+        :return: A dict of name and parameters
+        :rtype: Dict
+        """
+        return {
+            'name': self.name,
+            'parameters': self.parameters
+        }
+
+    def __str__(self):
+        # passwords are masked by the Action
+        return str(Action(name=self.name, parameters=self.parameters))
+
+    def __eq__(self, other):
+        """
+        This is used to compare 2 objects
+        :param other:
+        :return:
+        """
+        return self.__dict__ == other.__dict__
@@ -1,3 +1,5 @@
+from odie.core.Models.OrderIndex import OrderIndex
+
 
 class Brain:
     """
@@ -9,6 +11,8 @@ class Brain:
         self.neurons = neurons
         self.brain_file = brain_file
         self.brain_yaml = brain_yaml
+        # inverted index of the orders, built from the neurons
+        self.order_index = None
 
     def get_neuron_by_name(self, neuron_name):
         """
@@ -26,10 +30,23 @@ class Brain:
                 break
         return neuron_launched
 
+    def get_order_index(self):
+        """
+        Get the inverted index of the order cues. The index is built on first call and rebuilt if the neuron list
+        has been replaced since.
+        :return: The index of the orders of the brain
+        :rtype: OrderIndex
+        """
+        if self.order_index is None or self.order_index.neurons is not self.neurons:
+            self.order_index = OrderIndex(neurons=self.neurons)
+        return self.order_index
+
     def __eq__(self, other):
         """
-        This is used to compare 2 objects
+        This is used to compare 2 objects. The order index is derived from the neurons and is not compared.
         :param other:
         :return:
         """
-        return self.__dict__ == other.__dict__
+        self_dict = {key: value for key, value in self.__dict__.items() if key != "order_index"}
+        other_dict = {key: value for key, value in other.__dict__.items() if key != "order_index"}
+        return self_dict == other_dict
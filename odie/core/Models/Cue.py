@@ -1,3 +1,6 @@
+from odie.core.Models.OrderTemplate import OrderTemplate
+
+
 class Cue(object):
     """
     This Class is representing an Cue to analise.
@@ -8,6 +11,19 @@ class Cue(object):
     def __init__(self, name=None, parameters=None):
         self.name = name
         self.parameters = parameters
+        # compiled form of an order cue, see get_order_template
+        self.order_template = None
+
+    def get_order_template(self):
+        """
+        Get the compiled form of the order of this cue. The template is compiled on first call and compiled again if
+        the order has been changed since.
+        :return: The compiled order
+        :rtype: OrderTemplate
+        """
+        if self.order_template is None or self.order_template.order is not self.parameters:
+            self.order_template = OrderTemplate(order=self.parameters)
+        return self.order_template
 
     def serialize(self):
         """
@@ -44,8 +60,10 @@ class Cue(object):
 
     def __eq__(self, other):
         """
-        This is used to compare 2 objects
+        This is used to compare 2 objects. The order template is compiled from the parameters and is not compared.
         :param other:
         :return:
         """
-        return self.__dict__ == other.__dict__
+        self_dict = {key: value for key, value in self.__dict__.items() if key != "order_template"}
+        other_dict = {key: value for key, value in other.__dict__.items() if key != "order_template"}
+        return self_dict == other_dict
@@ -1,5 +1,3 @@
-import copy
-
 from odie.core.ActionParameterLoader import ActionParameterLoader
 
 
@@ -8,25 +6,28 @@ class MatchedNeuron(object):
     This class represent a neuron that has matched an order send by an User.
     """
 
-    def __init__(self, matched_neuron=None, matched_order=None, user_order=None, overriding_parameter=None):
+    def __init__(self, matched_neuron=None, matched_order=None, user_order=None, overriding_parameter=None,
+                 matched_order_template=None):
         """
         :param matched_neuron: The neuron that has matched in the brain.
         :param matched_order: The order from the neuron that have matched.
         :param user_order: The order said by the user.
         :param overriding_parameter: If set, those parameters will over
+        :param matched_order_template: The compiled matched order, if already known. Avoid to parse the order again.
         """
 
-        # create a copy of the neuron. the received neuron come from the brain.
+        # the received neuron come from the brain.
         self.neuron = matched_neuron
         # create a fifo list that contains all actions to process.
-        # Create a copy to be sure when we remove a action from this list it will not be removed from the neuron's
-        # action list
-        self.action_fifo_list = copy.deepcopy(self.neuron.actions)
+        # Create a copy of the list to be sure when we remove a action from this list it will not be removed from the
+        # neuron's action list. The actions themselves are not modified by their execution, see ActionExecution
+        self.action_fifo_list = list(self.neuron.actions)
         self.matched_order = matched_order
         self.parameters = dict()
         if matched_order is not None:
             self.parameters = ActionParameterLoader.get_parameters(neuron_order=self.matched_order,
-                                                                   user_order=user_order)
+                                                                   user_order=user_order,
+                                                                   order_template=matched_order_template)
         if overriding_parameter is not None:
             # we suppose that we don't have any parameters.
             # We replace the current parameter object with the received one
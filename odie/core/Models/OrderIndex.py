@@ -0,0 +1,109 @@
+import collections
+from collections import Counter
+
+
+class OrderIndex(object):
+    """
+    This Class is an inverted index of the order cues of a brain.
+
+    Each order is stored with the multiset of words it requires (brackets removed) and is posted under its rarest
+    word. An order can only match a user sentence that contains all its words, so the order is reachable through any
+    of them: looking up the words said by the user gives every candidate order exactly once, without scanning the
+    whole brain.
+
+    .. note:: Orders without any static word (Eg: "{{ query }}") match every sentence, they are kept apart.
+    """
+
+    # an order cue of the brain. position is (neuron index, cue index) and is used to keep the brain order
+    Entry = collections.namedtuple('OrderIndexEntry', ['position', 'neuron', 'order', 'order_template'])
+
+    def __init__(self, neurons=None):
+        self.neurons = neurons
+        # word -> list of Entry posted under this word, as their rarest word
+        self.postings = dict()
+        # word -> list of Entry containing this word, used to rank the orders
+        self.word_postings = dict()
+        # list of Entry with no static word
+        self.wildcard_entries = list()
+        # word -> number of orders containing the word
+        self.document_frequency = Counter()
+        self.number_of_orders = 0
+        self.average_order_length = 0
+        # name of the ranking engine -> ranker built on this index, see get_ranker
+        self.rankers = dict()
+        self._build()
+
+    def _build(self):
+        """
+        Create the posting lists from the order cues of the neurons
+        """
+        entries = list()
+        document_frequency = self.document_frequency
+        if self.neurons is not None:
+            for neuron_index, neuron in enumerate(self.neurons):
+                for cue_index, cue in enumerate(neuron.cues):
+                    if cue.name == "order":
+                        order_template = cue.get_order_template()
+                        document_frequency.update(order_template.word_counter.keys())
+                        entries.append(self.Entry(position=(neuron_index, cue_index),
+                                                  neuron=neuron,
+                                                  order=cue.parameters,
+                                                  order_template=order_template))
+
+        self.number_of_orders = len(entries)
+        if entries:
+            self.average_order_length = \
+                sum(len(entry.order_template.static_words) for entry in entries) / float(len(entries))
+
+        for entry in entries:
+            required_words = entry.order_template.word_counter
+            for word in required_words:
+                self.word_postings.setdefault(word, list()).append(entry)
+            if not required_words:
+                self.wildcard_entries.append(entry)
+                continue
+            # post the order under its rarest word to keep the candidate lists short
+            rarest_word = min(required_words, key=lambda word: (document_frequency[word], word))
+            self.postings.setdefault(rarest_word, list()).append(entry)
+
+    def get_matching_entries(self, user_order):
+        """
+        Return the index entries whose words are all present in the user order, respecting the number of occurrences
+        :param user_order: the sentence said by the user
+        :return: list of Entry, in the order of the brain
+        """
+        user_words = Counter(user_order.lower().split())
+
+        matching_entries = [entry for entry in self.wildcard_entries]
+        for word in user_words:
+            for entry in self.postings.get(word, ()):
+                if self._is_counter_subset(entry.order_template.word_counter, user_words):
+                    matching_entries.append(entry)
+
+        return sorted(matching_entries, key=lambda entry: entry.position)
+
+    def get_ranker(self, engine):
+        """
+        Get the ranker of the given engine for this index. The ranker is created once per index
+        :param engine: name of the ranking engine. Eg: bm25
+        :return: The ranker
+        :rtype: OrderRanker
+        """
+        if engine not in self.rankers:
+            # imported here, the rankers are built on the index
+            from odie.core.OrderRanker import OrderRanker
+            self.rankers[engine] = OrderRanker.get_ranker(engine=engine, order_index=self)
+        return self.rankers[engine]
+
+    @staticmethod
+    def _is_counter_subset(required_words, user_words):
+        """
+        check if the number of occurrences matches
+        :param required_words: Counter of the words of the order
+        :param user_words: Counter of the words said by the user
+        :return: True if every required word is said at least as many times
+        """
+        for word, occurrence in required_words.items():
+            if occurrence > user_words[word]:
+                return False
+        return True
@@ -0,0 +1,34 @@
+class OrderMatching(object):
+    """
+    This Class is representing the engine used to match a user order with the orders of the brain.
+    .. note:: must be defined in the settings.yml
+    """
+
+    def __init__(self, engine="subset", top_k=None, threshold=None):
+        """
+        :param engine: "subset" fires every neuron whose order words are all said. "bm25" and "tfidf" rank the orders
+        :param top_k: maximum number of neurons to fire when the orders are ranked. All of them if None
+        :param threshold: minimum fraction of its maximum score of a ranked order to fire its neuron, between 0 and 1.
+        The default threshold of the engine if None
+        """
+        self.engine = engine
+        self.top_k = top_k
+        self.threshold = threshold
+
+    def __str__(self):
+        return str(self.serialize())
+
+    def serialize(self):
+        return {
+            'engine': self.engine,
+            'top_k': self.top_k,
+            'threshold': self.threshold
+        }
+
+    def __eq__(self, other):
+        """
+        This is used to compare 2 objects
+        :param other:
+        :return:
+        """
+        return self.__dict__ == other.__dict__
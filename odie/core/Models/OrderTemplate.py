@@ -0,0 +1,87 @@
+import collections
+from collections import Counter
+import six
+
+from odie.core.Utils.Utils import Utils
+
+
+class OrderTemplate(object):
+    """
+    This Class is the compiled form of an order cue.
+
+    Everything that only depends on the order of the brain is computed once here: the static words used to match
+    the user order and the variable slots used to extract the parameters.
+
+    .. note:: Compiled from the Cue with Cue.get_order_template()
+    """
+
+    # a variable of the order: its index in the words of the order, its name and the next word of the order
+    Slot = collections.namedtuple('OrderTemplateSlot', ['position', 'name', 'stop_word'])
+
+    def __init__(self, order=None):
+        self.order = order
+        order_text = order if isinstance(order, six.string_types) else str(order)
+
+        # lowercased words of the order without brackets, and their number of occurrences
+        self.static_words = self.get_split_order_without_bracket(order_text.lower())
+        self.word_counter = Counter(self.static_words)
+
+        self.has_brackets = Utils.is_containing_bracket(order_text)
+
+        # words of the order, variables written without spaces like {{variable}}
+        self.words = Utils.remove_spaces_in_brackets(order_text).split()
+        # first words of the order before any variable. Could be empty if order starts with double brace
+        self.prefix = order_text[:order_text.find('{{')].lower()
+
+        self.slots = list()
+        for position, word in enumerate(self.words):
+            if Utils.is_containing_bracket(word):
+                stop_word = Utils.get_next_value_list(self.words[position:])
+                self.slots.append(self.Slot(position=position,
+                                            name=word.replace("{{", "").replace("}}", ""),
+                                            stop_word=stop_word.lower() if stop_word is not None else None))
+
+    def get_parameters(self, user_order):
+        """
+        Associate the variables of the order to the incoming user order
+        :param user_order: the order from user
+        :type user_order: str
+        :return: the dict corresponding to the key / value of the params
+        """
+        # remove sentence before order which are sentences not matching anyway
+        # Manage Upper/Lower case
+        truncate_list_word_said = user_order[user_order.lower().find(self.prefix):].split()
+
+        # make dict var:value
+        dict_var = dict()
+        slots = iter(self.slots)
+        slot = next(slots, None)
+        for position in range(len(self.words)):
+            if slot is not None and slot.position == position:
+                if slot.stop_word is None:
+                    dict_var[slot.name] = " ".join(truncate_list_word_said)
+                    break
+                for word_said in truncate_list_word_said:
+                    if word_said.lower() == slot.stop_word:  # Do not consider the case
+                        break
+                    if slot.name in dict_var:
+                        dict_var[slot.name] += " " + word_said
+                        truncate_list_word_said = truncate_list_word_said[1:]
+                    else:
+                        dict_var[slot.name] = word_said
+                slot = next(slots, None)
+            truncate_list_word_said = truncate_list_word_said[1:]
+        return dict_var
+
+    @staticmethod
+    def get_split_order_without_bracket(order):
+        """
+        Get an order with bracket inside like: "hello my name is {{ name }}.
+        return a list of string without bracket like ["hello", "my", "name", "is"]
+        :param order: sentence to split
+        :return: list of string without bracket
+        """
+        matches = Utils.find_all_matching_brackets(order)
+        for match in matches:
+            order = order.replace(match, "")
+        return order.split()
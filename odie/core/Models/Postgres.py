@@ -4,12 +4,23 @@ class Postgres(object):
     """
     postgres ojbect
     """
-    def __init__(self, host='localhost', port=5432, database=None, user=None, password=None):
+    def __init__(self, host='localhost', port=5432, database=None, user=None, password=None,
+                 pool_min_size=1, pool_max_size=4, health_check_interval=30, connection_timeout=10):
+        """
+        :param pool_min_size: number of connections opened with the pool
+        :param pool_max_size: maximum number of connections opened at the same time
+        :param health_check_interval: seconds of inactivity after which a connection is checked before being used
+        :param connection_timeout: seconds to wait for a free connection when they are all in use
+        """
         self.host = host
         self.port = port
         self.database = database
         self.user = user
         self.password = password
+        self.pool_min_size = pool_min_size
+        self.pool_max_size = pool_max_size
+        self.health_check_interval = health_check_interval
+        self.connection_timeout = connection_timeout
 
     def __str__(self):
         return str(self.serialize())
@@ -27,7 +38,11 @@ class Postgres(object):
             'port': self.port,
             'database': self.database,
             'user': self.user,
-            'password': self.password
+            'password': self.password,
+            'pool_min_size': self.pool_min_size,
+            'pool_max_size': self.pool_max_size,
+            'health_check_interval': self.health_check_interval,
+            'connection_timeout': self.connection_timeout
         }
 
     def __eq__(self, other):
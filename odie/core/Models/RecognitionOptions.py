@@ -4,9 +4,15 @@ class RecognitionOptions(object):
     .. note:: must be defined in the settings.yml
     """
 
-    def __init__(self, energy_threshold=4000, adjust_for_ambient_noise_second=0):
+    def __init__(self, energy_threshold=4000, adjust_for_ambient_noise_second=0, pre_roll_second=2,
+                 ambient_noise_refresh_second=60):
         self.energy_threshold = energy_threshold
+        # window of a measure of the ambient noise, 0 to use energy_threshold
         self.adjust_for_ambient_noise_second = adjust_for_ambient_noise_second
+        # seconds between two measures of the ambient noise
+        self.ambient_noise_refresh_second = ambient_noise_refresh_second
+        # seconds of audio captured before the start of the STT that are kept for the order
+        self.pre_roll_second = pre_roll_second
 
     def __str__(self):
         return str(self.serialize())
@@ -14,7 +20,9 @@ class RecognitionOptions(object):
     def serialize(self):
         return {
             'energy_threshold': self.energy_threshold,
-            'adjust_for_ambient_noise_second': self.adjust_for_ambient_noise_second
+            'adjust_for_ambient_noise_second': self.adjust_for_ambient_noise_second,
+            'pre_roll_second': self.pre_roll_second,
+            'ambient_noise_refresh_second': self.ambient_noise_refresh_second
         }
 
     def __eq__(self, other):
@@ -8,13 +8,15 @@ class RestAPI(object):
                  login=None, password=None,
                  active=None,
                  port=None,
-                 allowed_cors_origin=None):
+                 allowed_cors_origin=None,
+                 session_ttl=600):
         """
         :param password_protected: If true, the rest api will ask for an authentication
         :param login: login used if auth is activated
         :param password: password used if auth is activated
         :param active: specify if the rest api is loaded on start with odie
         :param allowed_cors_origin: specify allowed origins
+        :param session_ttl: number of seconds an unused API session is kept, with the neurons waiting for an answer
         """
         self.password_protected = password_protected
         self.login = login
@@ -22,6 +24,7 @@ class RestAPI(object):
         self.active = active
         self.port = port
         self.allowed_cors_origin = allowed_cors_origin
+        self.session_ttl = session_ttl
 
     def __str__(self):
         return str(self.serialize())
@@ -40,7 +43,8 @@ class RestAPI(object):
             'password': self.password,
             'active': self.active,
             'port': self.port,
-            'allowed_cors_origin': self.allowed_cors_origin
+            'allowed_cors_origin': self.allowed_cors_origin,
+            'session_ttl': self.session_ttl
         }
 
     def __eq__(self, other):
@@ -31,7 +31,10 @@ class Settings(object):
                  postgres=None,
                  alphabot=None,
                  cloud=None,
-                 recognition_options=None):
+                 recognition_options=None,
+                 order_matching=None,
+                 tts_cache=None,
+                 transcode_cache=None):
 
         self.default_tts_name = default_tts_name
         self.default_stt_name = default_stt_name
@@ -58,6 +61,9 @@ class Settings(object):
         self.alphabot = alphabot
         self.cloud = cloud
         self.recognition_options = recognition_options
+        self.order_matching = order_matching
+        self.tts_cache = tts_cache
+        self.transcode_cache = transcode_cache
 
     def serialize(self):
         """
@@ -92,7 +98,10 @@ class Settings(object):
             'postgres': self.postgres,
             'alphabot': self.alphabot,
             'cloud': self.cloud,
-            'recognition_options': self.recognition_options.serialize() if self.recognition_options is not None else None
+            'recognition_options': self.recognition_options.serialize() if self.recognition_options is not None else None,
+            'order_matching': self.order_matching.serialize() if self.order_matching is not None else None,
+            'tts_cache': self.tts_cache.serialize() if self.tts_cache is not None else None,
+            'transcode_cache': self.transcode_cache.serialize() if self.transcode_cache is not None else None
         }
 
     def __str__(self):
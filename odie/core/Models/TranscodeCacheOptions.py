@@ -0,0 +1,34 @@
+class TranscodeCacheOptions(object):
+    """
+    This Class is representing the options of the cache of the audio files converted to wav by the players.
+    .. note:: must be defined in the settings.yml
+    """
+
+    def __init__(self, max_size=50, memory_size=5, preload_sounds=True):
+        """
+        :param max_size: maximum size of the converted files in MB, the least recently played files are removed first
+        :param memory_size: maximum size in MB of the converted files kept in memory, 0 to always read the files
+        :param preload_sounds: if True, the random_wake_up_sounds and on_ready_sounds are converted and kept in
+        memory when odie starts
+        """
+        self.max_size = max_size
+        self.memory_size = memory_size
+        self.preload_sounds = preload_sounds
+
+    def __str__(self):
+        return str(self.serialize())
+
+    def serialize(self):
+        return {
+            'max_size': self.max_size,
+            'memory_size': self.memory_size,
+            'preload_sounds': self.preload_sounds
+        }
+
+    def __eq__(self, other):
+        """
+        This is used to compare 2 objects
+        :param other:
+        :return:
+        """
+        return self.__dict__ == other.__dict__
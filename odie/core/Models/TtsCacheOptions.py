@@ -0,0 +1,33 @@
+class TtsCacheOptions(object):
+    """
+    This Class is representing the options of the cache of the generated TTS audio files.
+    .. note:: must be defined in the settings.yml
+    """
+
+    def __init__(self, max_size=100, warm_up=True, warm_up_workers=2):
+        """
+        :param max_size: maximum size of the cache in MB, the least recently played files are removed first
+        :param warm_up: if True, the static sentences of the brain and the settings are generated when odie starts
+        :param warm_up_workers: number of sentences generated in parallel by the warm up
+        """
+        self.max_size = max_size
+        self.warm_up = warm_up
+        self.warm_up_workers = warm_up_workers
+
+    def __str__(self):
+        return str(self.serialize())
+
+    def serialize(self):
+        return {
+            'max_size': self.max_size,
+            'warm_up': self.warm_up,
+            'warm_up_workers': self.warm_up_workers
+        }
+
+    def __eq__(self, other):
+        """
+        This is used to compare 2 objects
+        :param other:
+        :return:
+        """
+        return self.__dict__ == other.__dict__
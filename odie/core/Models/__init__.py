@@ -5,4 +5,5 @@ from .Brain import Brain
 from .Cue import Cue
 from .Neuron import Neuron
 from .Action import Action
+from .ActionExecution import ActionExecution
 from .RpiSettings import RpiSettings
@@ -23,12 +23,13 @@ class NeuronNameNotFound(Exception):
 class NeuronLauncher(object):
 
     @classmethod
-    def start_neuron_by_name(cls, name, brain=None, overriding_parameter_dict=None):
+    def start_neuron_by_name(cls, name, brain=None, overriding_parameter_dict=None, lifo_buffer=None):
         """
         Start a neuron by it's name
         :param name: Name (Unique ID) of the neuron to launch
         :param brain: Brain instance
         :param overriding_parameter_dict: parameter to pass to actions
+        :param lifo_buffer: the LIFO to use, the LIFOBuffer singleton if None
         """
         logger.debug("[NeuronLauncher] start_neuron_by_name called with neuron name: %s " % name)
         # check if we have found and launched the neuron
@@ -37,8 +38,9 @@ class NeuronLauncher(object):
         if not neuron:
             raise NeuronNameNotFound("The neuron name \"%s\" does not exist in the brain file" % name)
         else:
-            # get our singleton LIFO
-            lifo_buffer = LIFOBuffer()
+            if lifo_buffer is None:
+                # get our singleton LIFO
+                lifo_buffer = LIFOBuffer()
             list_neuron_to_process = list()
             new_matching_neuron = MatchedNeuron(matched_neuron=neuron,
                                                 matched_order=None,
@@ -49,18 +51,21 @@ class NeuronLauncher(object):
             return lifo_buffer.execute(is_api_call=True)
 
     @classmethod
-    def run_matching_neuron_from_order(cls, order_to_process, brain, settings, is_api_call=False, no_voice=False):
+    def run_matching_neuron_from_order(cls, order_to_process, brain, settings, is_api_call=False, no_voice=False,
+                                       lifo_buffer=None):
         """
         :param order_to_process: the spoken order sent by the user
         :param brain: Brain object
         :param settings: Settings object
         :param is_api_call: if True, the current call come from the API. This info must be known by launched Action
         :param no_voice: If true, the generated text will not be processed by the TTS engine
+        :param lifo_buffer: the LIFO to use, Eg: the one of an API session. The LIFOBuffer singleton if None
         :return: list of matched neuron
         """
 
-        # get our singleton LIFO
-        lifo_buffer = LIFOBuffer()
+        if lifo_buffer is None:
+            # get our singleton LIFO
+            lifo_buffer = LIFOBuffer()
 
         # if the LIFO is not empty, so, the current order is passed to the current processing neuron as an answer
         if len(lifo_buffer.lifo_list) > 0:
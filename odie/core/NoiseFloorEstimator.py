@@ -0,0 +1,132 @@
+import audioop
+import logging
+import threading
+
+from odie.core.ConfigurationManager import SettingLoader
+from odie.core.MicrophoneCapture import MicrophoneCapture
+
+logging.basicConfig()
+logger = logging.getLogger("odie")
+
+# number of frames of a measure of energy
+CHUNK = 1024
+# the threshold is the energy of the ambient noise multiplied by this ratio, like the Recognizer of SpeechRecognition
+DYNAMIC_ENERGY_RATIO = 1.5
+# weight of a new measure in the smoothed threshold
+SMOOTHING = 0.5
+
+
+class NoiseFloorEstimator(threading.Thread):
+    """
+    Background estimation of the energy threshold of the STT from the ambient noise.
+
+    Every refresh_second, the estimator reads window_second of audio from the shared microphone capture while odie
+    is idle (Eg: the Order cue is waiting for the hotword) and updates a smoothed energy threshold. A measure is
+    dropped if odie stops being idle before the end of the window. The STT reads the last threshold instantly
+    instead of calibrating before each order.
+
+    .. seealso:: MicrophoneCapture, SpeechRecognition
+    """
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, capture, window_second=1, refresh_second=60):
+        """
+        :param capture: the MicrophoneCapture to read
+        :param window_second: seconds of audio of a measure
+        :param refresh_second: seconds between two measures
+        """
+        super(NoiseFloorEstimator, self).__init__()
+        self.daemon = True
+        self.capture = capture
+        self.window_second = window_second
+        self.refresh_second = refresh_second
+        self._energy_threshold = None
+        self._lock = threading.Lock()
+        # set while odie is idle, the audio is only measured when set
+        self._idle = threading.Event()
+        self._stop_event = threading.Event()
+
+    @classmethod
+    def get_estimator(cls):
+        """
+        Return the estimator, created and started on first use with the recognition options of the settings
+        :return: the NoiseFloorEstimator
+        """
+        with cls._instance_lock:
+            if cls._instance is None:
+                recognition_options = SettingLoader().settings.recognition_options
+                logger.debug("[NoiseFloorEstimator] window %s seconds, refresh %s seconds"
+                             % (recognition_options.adjust_for_ambient_noise_second,
+                                recognition_options.ambient_noise_refresh_second))
+                cls._instance = cls(MicrophoneCapture.get_capture(),
+                                    window_second=recognition_options.adjust_for_ambient_noise_second,
+                                    refresh_second=recognition_options.ambient_noise_refresh_second)
+                cls._instance.start()
+        return cls._instance
+
+    def get_energy_threshold(self):
+        """
+        Return the smoothed energy threshold
+        :return: the threshold, None if the ambient noise has not been measured yet
+        """
+        with self._lock:
+            return self._energy_threshold
+
+    def update(self, energy_threshold):
+        """
+        Add a measure of the energy threshold to the smoothed threshold
+        :param energy_threshold: the measured threshold
+        """
+        with self._lock:
+            if self._energy_threshold is None:
+                self._energy_threshold = energy_threshold
+            else:
+                self._energy_threshold += SMOOTHING * (energy_threshold - self._energy_threshold)
+            logger.debug("[NoiseFloorEstimator] energy threshold set to %s" % self._energy_threshold)
+
+    def set_idle(self, idle):
+        """
+        Allow or forbid the measure of the audio
+        :param idle: True when the audio is ambient noise only, Eg: while waiting for the hotword
+        """
+        if idle:
+            self._idle.set()
+        else:
+            self._idle.clear()
+
+    def stop(self):
+        self._stop_event.set()
+        self._idle.set()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            self._idle.wait()
+            if self._stop_event.is_set():
+                break
+            energy_threshold = self.measure()
+            if energy_threshold is None:
+                # not idle anymore, measure again at the next idle time
+                continue
+            self.update(energy_threshold)
+            self._stop_event.wait(self.refresh_second)
+
+    def measure(self):
+        """
+        Measure the ambient noise during window_second
+        :return: the energy threshold, None if odie stopped being idle during the measure
+        """
+        chunk_size = CHUNK * self.capture.frame_size
+        number_of_chunks = max(int(self.window_second * self.capture.rate / CHUNK), 1)
+        energies = list()
+        ring_buffer = self.capture.open_consumer()
+        try:
+            while len(energies) < number_of_chunks:
+                if not self._idle.is_set() or self._stop_event.is_set():
+                    return None
+                if not ring_buffer.wait(timeout=1, size=chunk_size):
+                    continue
+                energies.append(audioop.rms(ring_buffer.get(chunk_size), self.capture.sample_width))
+        finally:
+            self.capture.close_consumer(ring_buffer)
+        return sum(energies) / float(len(energies)) * DYNAMIC_ENERGY_RATIO
@@ -5,6 +5,8 @@ import sys
 import six
 
 from odie.core.Models.MatchedNeuron import MatchedNeuron
+from odie.core.Models.OrderTemplate import OrderTemplate
+from odie.core.Models.OrderMatching import OrderMatching
 from odie.core.Utils.Utils import Utils
 from odie.core.ConfigurationManager import SettingLoader
 from odie.postgres.PostgreManager import PostgresManager as PgManager
@@ -44,7 +46,7 @@ class OrderAnalyser:
 
         # We use a named tuple to associate the neuron and the cue of the neuron
         neuron_order_tuple = collections.namedtuple('tuple_neuron_matchingOrder',
-                                                    ['neuron', 'order'])
+                                                    ['neuron', 'order', 'order_template'])
 
         list_match_neuron = list()
 
@@ -52,34 +54,88 @@ class OrderAnalyser:
         if order is None:
             return list_match_neuron
 
-        # test each neuron from the brain
-        for neuron in cls.brain.neurons:
-            # we are only concerned by neuron with a order type of cue
-            for cue in neuron.cues:
-                if cue.name == "order":
-                    if cls.spelt_order_match_brain_order_via_table(cue.parameters, order):
-                        # the order match the neuron, we add it to the returned list
-                        logger.debug("Order found! Run neuron name: %s" % neuron.name)
-                        Utils.print_success("Order matched in the brain. Running neuron \"%s\"" % neuron.name)
-                        list_match_neuron.append(neuron_order_tuple(neuron=neuron, order=cue.parameters))
+        for entry in cls._get_matching_entries(order):
+            # the order match the neuron, we add it to the returned list
+            logger.debug("Order found! Run neuron name: %s" % entry.neuron.name)
+            Utils.print_success("Order matched in the brain. Running neuron \"%s\"" % entry.neuron.name)
+            list_match_neuron.append(neuron_order_tuple(neuron=entry.neuron,
+                                                        order=entry.order,
+                                                        order_template=entry.order_template))
 
         # create a list of MatchedNeuron from the tuple list
         list_neuron_to_process = list()
         for tuple_el in list_match_neuron:
             new_matching_neuron = MatchedNeuron(matched_neuron=tuple_el.neuron,
                                                 matched_order=tuple_el.order,
-                                                user_order=order)
+                                                user_order=order,
+                                                matched_order_template=tuple_el.order_template)
             list_neuron_to_process.append(new_matching_neuron)
 
         return list_neuron_to_process
 
     @classmethod
-    def pg_get_matching_neuron(cls, order):
+    def _get_matching_entries(cls, order):
+        """
+        Return the orders of the brain matching the user order, with the engine set in the settings
+        :param order: The user order
+        :return: list of OrderIndex.Entry
+        """
+        order_index = cls.brain.get_order_index()
+        order_matching = cls._get_order_matching()
+
+        if order_matching.engine == "subset":
+            # only the orders sharing a word with the user order are tested, through the index of the brain
+            return order_index.get_matching_entries(order)
+
+        ranked_orders = cls.get_ranked_orders(order=order,
+                                              brain=cls.brain,
+                                              engine=order_matching.engine,
+                                              top_k=order_matching.top_k,
+                                              threshold=order_matching.threshold)
+        return [ranked_order.entry for ranked_order in ranked_orders]
+
+    @staticmethod
+    def get_ranked_orders(order, brain, engine="bm25", top_k=None, threshold=None):
+        """
+        Return the best orders of the brain for the given order, with their score
+        :param order: The user order
+        :param brain: The loaded brain
+        :param engine: name of the ranking engine. Eg: bm25, tfidf
+        :param top_k: maximum number of orders to return. All of them if None
+        :param threshold: minimum fraction of its maximum score of a returned order. The default threshold of the
+        engine if None
+        :return: list of RankedOrder, from the best score to the worst
+        """
+        ranked_orders = brain.get_order_index().get_ranker(engine).rank(user_order=order,
+                                                                        top_k=top_k,
+                                                                        threshold=threshold)
+        for ranked_order in ranked_orders:
+            logger.debug("[OrderAnalyser] %s score: %s, neuron: %s"
+                         % (engine, ranked_order.score, ranked_order.entry.neuron.name))
+        return ranked_orders
+
+    @staticmethod
+    def _get_order_matching():
+        """
+        Return the OrderMatching from the settings, or the default one
+        :return: OrderMatching
+        """
+        settings = SettingLoader().settings
+        if settings.order_matching is None:
+            return OrderMatching()
+        return settings.order_matching
+
+    @classmethod
+    def pg_get_matching_neuron(cls, order, brain=None, limit=1):
         """
         Return the list of matching neurons from the given order
         :param order: The user order
+        :param brain: The loaded brain. The neurons found in the brain table are taken from it
+        :param limit: maximum number of neurons to return, the best ranked first
         :return: The List of neurons matching the given order
         """
+        if brain is not None:
+            cls.brain = brain
         logger.debug("[OrderAnalyser] PG Received order: %s" % order)
         if isinstance(order, six.binary_type):
             order = order.decode('utf-8')
@@ -99,16 +155,24 @@ class OrderAnalyser:
         for match in matches:
             order = order.replace(match, "")
 
-        pg = cls.settings.postgres
-        connect = PgManager.get_connection(pg.host, pg.database, pg.user, pg.password)
+        pg = SettingLoader().settings.postgres
         try:
-            match = PgManager.search_match_neuron(connect, order)
-            logger.debug("Order found! Run neuron name: %s" % match.name)
-            Utils.print_success("Order matched in the brain. Running neuron \"%s\"" % match.name)
-            list_match_neuron.append(neuron_order_tuple(neuron=match.name, order=match.cues))
-        except:
+            # the connections are pooled: no connection setup for each order
+            with PgManager.get_pool(pg).connection() as connect:
+                rows = PgManager.search_match_neuron(connect, order, limit=limit)
+        except Exception as e:
+            logger.debug("[OrderAnalyser] PG search failed: %s" % e)
             return list_match_neuron
 
+        for name, cue in rows:
+            neuron = cls.brain.get_neuron_by_name(name)
+            if neuron is None:
+                logger.debug("[OrderAnalyser] neuron %s of the brain table is not in the brain" % name)
+                continue
+            logger.debug("Order found! Run neuron name: %s" % name)
+            Utils.print_success("Order matched in the brain. Running neuron \"%s\"" % name)
+            list_match_neuron.append(neuron_order_tuple(neuron=neuron, order=cue))
+
         # create a list of MatchedNeuron from the tuple list
         list_neuron_to_process = list()
         for tuple_el in list_match_neuron:
@@ -152,13 +216,7 @@ class OrderAnalyser:
         :param order: sentence to split
         :return: list of string without bracket
         """
-
-        matches = Utils.find_all_matching_brackets(order)
-        for match in matches:
-            order = order.replace(match, "")
-        # then split
-        split_order = order.split()
-        return split_order
+        return OrderTemplate.get_split_order_without_bracket(order)
 
     @staticmethod
     def _counter_subset(list1, list2):
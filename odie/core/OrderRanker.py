@@ -0,0 +1,215 @@
+# coding: utf8
+import collections
+import math
+from abc import ABCMeta, abstractmethod
+from collections import Counter
+
+import logging
+
+import six
+
+logging.basicConfig()
+logger = logging.getLogger("odie")
+
+
+class OrderRankerNotFound(Exception):
+    """
+    The ranking engine does not exist
+
+    .. seealso:: OrderMatching
+    """
+    pass
+
+
+# an order of the brain with its score against the user order
+RankedOrder = collections.namedtuple('RankedOrder', ['entry', 'score'])
+
+
+class OrderRanker(six.with_metaclass(ABCMeta, object)):
+    """
+    This Class is the base of the ranking engines. A ranker scores the orders of an OrderIndex against a user order.
+
+    The weight of each word in each order is computed once from the index. Ranking a user order only walks the
+    posting lists of the words said by the user and sums the weights.
+
+    The threshold is relative: an order is returned when its score reaches threshold times its maximum score, the
+    score of the order said exactly. So a user order sharing only common words with the brain falls through to the
+    default neuron, whatever the size of the brain. Orders without static word score 0, they are only returned with a
+    threshold of 0.
+
+    .. seealso:: OrderIndex, OrderMatching
+    """
+
+    # minimum fraction of its maximum score of a returned order when no threshold is given
+    default_threshold = 0.5
+
+    def __init__(self, order_index):
+        self.order_index = order_index
+        # word -> list of tuple (entry, weight of the word in the order of the entry)
+        self.weighted_postings = dict()
+        for word, entries in order_index.word_postings.items():
+            self.weighted_postings[word] = [(entry, self.get_order_word_weight(entry, word)) for entry in entries]
+
+    @staticmethod
+    def get_ranker(engine, order_index):
+        """
+        Return the ranker of the given engine, built on the order index
+        :param engine: name of the ranking engine
+        :param order_index: The OrderIndex to rank
+        :return: The ranker
+        :rtype: OrderRanker
+        """
+        try:
+            ranker_class = RANKERS[engine]
+        except KeyError:
+            raise OrderRankerNotFound("The ranking engine %s does not exist. Available engines: %s"
+                                      % (engine, ", ".join(sorted(RANKERS))))
+        return ranker_class(order_index=order_index)
+
+    def rank(self, user_order, top_k=None, threshold=None):
+        """
+        Return the best orders of the index for the user order
+        :param user_order: the sentence said by the user
+        :param top_k: maximum number of orders to return. All of them if None
+        :param threshold: minimum fraction of its maximum score of a returned order, default_threshold if None
+        :return: list of RankedOrder, from the best score to the worst. Equal scores keep the brain order
+        """
+        if threshold is None:
+            threshold = self.default_threshold
+        user_words = Counter(user_order.lower().split())
+
+        # orders without static word are candidates with a null score, only returned without threshold
+        scores = {entry.position: 0.0 for entry in self.order_index.wildcard_entries}
+        entries = {entry.position: entry for entry in self.order_index.wildcard_entries}
+        user_norm = self.get_user_norm(user_words)
+        for word, occurrence in user_words.items():
+            user_weight = self.get_user_word_weight(word, occurrence) / user_norm
+            for entry, weight in self.weighted_postings.get(word, ()):
+                scores[entry.position] = scores.get(entry.position, 0.0) + user_weight * weight
+                entries[entry.position] = entry
+
+        ranked_orders = list()
+        for position, score in scores.items():
+            max_score = self.get_max_score(entries[position])
+            if (score / max_score if max_score else 0.0) >= threshold:
+                ranked_orders.append(RankedOrder(entry=entries[position], score=score))
+
+        ranked_orders.sort(key=lambda ranked_order: (-ranked_order.score, ranked_order.entry.position))
+        if top_k is not None:
+            ranked_orders = ranked_orders[:top_k]
+        return ranked_orders
+
+    @abstractmethod
+    def get_order_word_weight(self, entry, word):
+        """
+        Weight of a word in an order of the index
+        :param entry: the order
+        :param word: a word of the order
+        :return: the weight
+        """
+        pass
+
+    def get_max_score(self, entry):
+        """
+        Score of an order when the user says exactly this order
+        :param entry: the order
+        :return: the maximum score, 0 for an order without static word
+        """
+        return 1.0
+
+    def get_user_word_weight(self, word, occurrence):
+        """
+        Weight of a word of the user order
+        :param word: the word said by the user
+        :param occurrence: number of times the word has been said
+        :return: the weight
+        """
+        return 1.0
+
+    def get_user_norm(self, user_words):
+        """
+        Norm of the user order, the weights of the user words are divided by it
+        :param user_words: Counter of the lowercased words said by the user
+        :return: the norm, never null
+        """
+        return 1.0
+
+
+class Bm25OrderRanker(OrderRanker):
+    """
+    Okapi BM25 ranking. Rare words of the brain weigh more, and short orders are preferred when the same words match.
+    The idf of the words depends on the size of the brain: the threshold applies to the score divided by the sum of
+    the weights of the words of the order, the score of the order said exactly.
+    """
+
+    def __init__(self, order_index, k1=1.2, b=0.75):
+        self.k1 = k1
+        self.b = b
+        number_of_orders = order_index.number_of_orders
+        self.average_order_length = order_index.average_order_length or 1
+        self.idf = dict()
+        for word, frequency in order_index.document_frequency.items():
+            self.idf[word] = math.log(1 + (number_of_orders - frequency + 0.5) / (frequency + 0.5))
+        super(Bm25OrderRanker, self).__init__(order_index=order_index)
+        # position -> sum of the weights of the words of the order
+        self.max_scores = dict()
+        for postings in self.weighted_postings.values():
+            for entry, weight in postings:
+                self.max_scores[entry.position] = self.max_scores.get(entry.position, 0.0) + weight
+
+    def get_order_word_weight(self, entry, word):
+        frequency = entry.order_template.word_counter[word]
+        order_length = len(entry.order_template.static_words)
+        length_norm = self.k1 * (1 - self.b + self.b * order_length / self.average_order_length)
+        return self.idf[word] * frequency * (self.k1 + 1) / (frequency + length_norm)
+
+    def get_max_score(self, entry):
+        return self.max_scores.get(entry.position, 0.0)
+
+
+class TfidfOrderRanker(OrderRanker):
+    """
+    TF-IDF ranking. The score is the cosine similarity of the user order and the order, between 0 and 1. The words
+    said by the user that are not in the brain get the weight of the rarest words, they lower the similarity.
+    """
+
+    default_threshold = 0.5
+
+    def __init__(self, order_index):
+        number_of_orders = order_index.number_of_orders
+        self.idf = dict()
+        for word, frequency in order_index.document_frequency.items():
+            self.idf[word] = math.log((1.0 + number_of_orders) / (1.0 + frequency)) + 1
+        self.unknown_word_idf = math.log(1.0 + number_of_orders) + 1
+        # norm of the weight vector of each order, by position in the index
+        self.order_norms = dict()
+        super(TfidfOrderRanker, self).__init__(order_index=order_index)
+
+    def _get_norm(self, word_counter, unknown_word_idf=0):
+        return math.sqrt(sum((frequency * self.idf.get(word, unknown_word_idf)) ** 2
+                             for word, frequency in word_counter.items()))
+
+    def get_order_word_weight(self, entry, word):
+        if entry.position not in self.order_norms:
+            self.order_norms[entry.position] = self._get_norm(entry.order_template.word_counter)
+        return entry.order_template.word_counter[word] * self.idf[word] / self.order_norms[entry.position]
+
+    def get_max_score(self, entry):
+        """
+        Score of an order when the user says exactly this order
+        :param entry: the order
+        :return: the maximum score, 0 for an order without static word
+        """
+        return 1.0
+
+    def get_user_word_weight(self, word, occurrence):
+        return occurrence * self.idf.get(word, self.unknown_word_idf)
+
+    def get_user_norm(self, user_words):
+        return self._get_norm(user_words, unknown_word_idf=self.unknown_word_idf) or 1.0
+
+
+RANKERS = {
+    "bm25": Bm25OrderRanker,
+    "tfidf": TfidfOrderRanker
+}
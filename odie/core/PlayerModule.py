@@ -3,7 +3,11 @@ import logging
 import os
 import subprocess
 
+from odie.core.ConfigurationManager import SettingLoader
+from odie.core.Models.TranscodeCacheOptions import TranscodeCacheOptions
+from odie.core.TranscodeCache import TranscodeCache, TRANSCODE_FOLDER
 from odie.core.Utils.FileManager import FileManager
+from odie.core.Utils.Utils import Utils
 
 logging.basicConfig()
 logger = logging.getLogger("odie")
@@ -20,10 +24,35 @@ class PlayerModule(object):
         # set parameter from what we receive from the settings
         self.convert = kwargs.get('convert_to_wav', True)
 
+        if self.convert:
+            settings = SettingLoader().settings
+            transcode_cache = settings.transcode_cache
+            if transcode_cache is None:
+                transcode_cache = TranscodeCacheOptions()
+            TranscodeCache.load(os.path.join(settings.cache_path, TRANSCODE_FOLDER),
+                                max_size=transcode_cache.max_size,
+                                memory_size=transcode_cache.memory_size)
+            if transcode_cache.preload_sounds:
+                sounds = list(settings.random_wake_up_sounds or list()) + list(settings.on_ready_sounds or list())
+                sound_paths = [Utils.get_real_file_path(sound) for sound in sounds]
+                TranscodeCache.preload([sound_path for sound_path in sound_paths if sound_path is not None])
+
+    def get_wav(self, file_path):
+        """
+        Return the wav to play for an audio file. With convert_to_wav, the file is converted once by the
+        TranscodeCache, the source file is not modified
+        :param file_path: the audio file to play
+        :return: the path of the wav file, or the wav in memory (file object)
+        """
+        if not self.convert:
+            return file_path
+        return TranscodeCache.get_wav(file_path)
+
     @staticmethod
     def convert_mp3_to_wav(file_path_mp3):
         """ 
         PyAudio, AlsaPlayer, sounddevices  do not support mp3 files 
+        The file is converted in place on each call, get_wav converts it once without modifying it
         MP3 files must be converted to a wave in order to be played
         This function assumes ffmpeg is available on the system
         :param file_path_mp3: the file path to convert from mp3 to wav
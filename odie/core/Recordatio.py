@@ -1,7 +1,7 @@
 import logging
 
-import jinja2
 from odie.core.Utils.Utils import Utils
+from odie.core.Utils.TemplateCache import TemplateCache
 
 from odie.core.Models import Singleton
 from six import with_metaclass
@@ -88,7 +88,7 @@ class Recordatio(with_metaclass(Singleton, object)):
                 # ask the recordatio to save in memory the target "key" if it was in parameters of the action
                 if isinstance(action_parameters, dict):
                     if Utils.is_containing_bracket(value):
-                        value = jinja2.Template(value).render(action_parameters)
+                        value = TemplateCache.render(value, action_parameters)
                     Recordatio.save(key, value)
 
     @classmethod
@@ -109,7 +109,7 @@ class Recordatio(with_metaclass(Singleton, object)):
                 # ask the recordatio to save in memory the target "key" if it was in the order
                 if Utils.is_containing_bracket(value):
                     # if the key exist in the temp dict we can load it with jinja
-                    value = jinja2.Template(value).render(Recordatio.temp)
+                    value = TemplateCache.render(value, Recordatio.temp)
                     if value:
                         Recordatio.save(key, value)
                         order_saved = True
@@ -1,7 +1,7 @@
+import functools
 import logging
 import os
 import threading
-import time
 
 from flask import jsonify
 from flask import request
@@ -11,11 +11,13 @@ from werkzeug.utils import secure_filename
 from odie import CueLauncher
 from odie._version import version_str
 from odie.core.ConfigurationManager import SettingLoader, BrainLoader
-from odie.core.LIFOBuffer import LIFOBuffer
+from odie.core.LIFOSessions import LIFOSessions
 from odie.core.Models.MatchedNeuron import MatchedNeuron
 from odie.core.OrderListener import OrderListener
 from odie.core.RestAPI.utils import requires_auth
 from odie.core.NeuronLauncher import NeuronLauncher
+from odie.core.TTS.TTSCache import TTSCache
+from odie.core.TTS.TTSPool import TTSPool
 from odie.core.Utils.FileManager import FileManager
 from odie.cues.order import Order
 
@@ -24,6 +26,20 @@ logger = logging.getLogger("odie")
 
 UPLOAD_FOLDER = '/tmp/odie/tmp_uploaded_audio'
 ALLOWED_EXTENSIONS = {'mp3', 'wav'}
+# session of the clients that do not send a session_id
+DEFAULT_SESSION_ID = "default"
+
+
+class AnalyserReturn(object):
+    """
+    Result of the Order Analyser for a request on the /neurons/start/audio URL
+    """
+
+    def __init__(self):
+        # api_response sent by the Order Analyser
+        self.api_response = None
+        # set once the order has been processed
+        self.done = threading.Event()
 
 
 class FlaskAPI(threading.Thread):
@@ -45,11 +61,6 @@ class FlaskAPI(threading.Thread):
         sl = SettingLoader()
         self.settings = sl.settings
 
-        # api_response sent by the Order Analyser when using the /neurons/start/audio URL
-        self.api_response = None
-        # boolean used to notify the main process that we get the list of returned neuron
-        self.order_analyser_return = False
-
         # configure the upload folder
         app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
         # create the temp folder
@@ -62,8 +73,8 @@ class FlaskAPI(threading.Thread):
         if self.allowed_cors_origin is not False:
             CORS(app, resources={r"/*": {"origins": allowed_cors_origin}}, supports_credentials=True)
 
-        # no voice flag
-        self.no_voice = False
+        # one LIFO per session of the API, the LIFOBuffer singleton is kept for the voice loop
+        self.lifo_sessions = LIFOSessions(ttl=self.settings.rest_api.session_ttl)
 
         # Add routing rules
         self.app.add_url_rule('/', view_func=self.get_main_page, methods=['GET'])
@@ -75,6 +86,8 @@ class FlaskAPI(threading.Thread):
         self.app.add_url_rule('/shutdown/', view_func=self.shutdown_server, methods=['POST'])
         self.app.add_url_rule('/mute/', view_func=self.get_mute, methods=['GET'])
         self.app.add_url_rule('/mute/', view_func=self.set_mute, methods=['POST'])
+        self.app.add_url_rule('/tts/cache', view_func=self.get_tts_cache, methods=['GET'])
+        self.app.add_url_rule('/order/latencies', view_func=self.get_order_latencies, methods=['GET'])
 
     def run(self):
         self.app.run(host='0.0.0.0', port="%s" % int(self.port), debug=True, threaded=True, use_reloader=False)
@@ -152,6 +165,10 @@ class FlaskAPI(threading.Thread):
         -d '{"no_voice":"true", "parameters": {"parameter1": "value1" }}' \
         http://127.0.0.1:5000/neurons/start/id/say-hello-fr
 
+        Run a neuron in the session of the client, concurrently with the other sessions
+        curl -i -H "Content-Type: application/json" --user admin:secret -X POST  \
+        -d '{"session_id":"my-client"}' http://127.0.0.1:5000/neurons/start/id/say-hello-fr
+
         :param neuron_name: name(id) of the neuron to execute
         :return:
         """
@@ -173,12 +190,12 @@ class FlaskAPI(threading.Thread):
         else:
             # generate a MatchedNeuron from the neuron
             matched_neuron = MatchedNeuron(matched_neuron=neuron_target, overriding_parameter=parameters)
-            # get the current LIFO buffer
-            lifo_buffer = LIFOBuffer()
-            # this is a new call we clean up the LIFO
-            lifo_buffer.clean()
-            lifo_buffer.add_neuron_list_to_lifo([matched_neuron])
-            response = lifo_buffer.execute(is_api_call=True, no_voice=no_voice)
+            # get the LIFO buffer of the session
+            with self.lifo_sessions.session(self.get_session_id_from_request(request)) as lifo_buffer:
+                # this is a new call we clean up the LIFO
+                lifo_buffer.clean()
+                lifo_buffer.add_neuron_list_to_lifo([matched_neuron])
+                response = lifo_buffer.execute(is_api_call=True, no_voice=no_voice)
             data = jsonify(response)
             return data, 201
 
@@ -200,6 +217,10 @@ class FlaskAPI(threading.Thread):
         curl -i --user admin:secret -H "Content-Type: application/json" -X POST \
         -d '{"order":"my order", "no_voice":"true"}' http://localhost:5000/neurons/start/order
 
+        The answer to a neuron waiting for it must be sent in the same session
+        curl -i --user admin:secret -H "Content-Type: application/json" -X POST \
+        -d '{"order":"my order", "session_id":"my-client"}' http://localhost:5000/neurons/start/order
+
         :return:
         """
         if not request.get_json() or 'order' not in request.get_json():
@@ -212,11 +233,13 @@ class FlaskAPI(threading.Thread):
             # get the order
             order_to_run = order["order"]
             logger.debug("[FlaskAPI] run_neuron_by_order: order to run -> %s" % order_to_run)
-            api_response = NeuronLauncher.run_matching_neuron_from_order(order_to_run,
-                                                                         self.brain,
-                                                                         self.settings,
-                                                                         is_api_call=True,
-                                                                         no_voice=no_voice)
+            with self.lifo_sessions.session(self.get_session_id_from_request(request)) as lifo_buffer:
+                api_response = NeuronLauncher.run_matching_neuron_from_order(order_to_run,
+                                                                             self.brain,
+                                                                             self.settings,
+                                                                             is_api_call=True,
+                                                                             no_voice=no_voice,
+                                                                             lifo_buffer=lifo_buffer)
 
             data = jsonify(api_response)
             return data, 201
@@ -239,7 +262,7 @@ class FlaskAPI(threading.Thread):
         :return:
         """
         # get no_voice_flag if present
-        self.no_voice = self.str_to_bool(request.form.get("no_voice"))
+        no_voice = self.str_to_bool(request.form.get("no_voice"))
 
         # check if the post request has the file part
         if 'file' not in request.files:
@@ -266,16 +289,20 @@ class FlaskAPI(threading.Thread):
         logger.debug("[FlaskAPI] run_neuron_by_audio: with file path %s" % audio_path)
         if not self.allowed_file(audio_path):
             audio_path = self._convert_to_wav(audio_file_path=audio_path)
-        ol = OrderListener(callback=self.audio_analyser_callback, audio_file_path=audio_path)
-        ol.start()
-        ol.join()
-        # wait the Order Analyser processing. We need to wait in this thread to keep the context
-        while not self.order_analyser_return:
-            time.sleep(0.1)
-        self.order_analyser_return = False
-        if self.api_response is not None and self.api_response:
-            data = jsonify(self.api_response)
-            self.api_response = None
+        # filled by the Order Analyser, each request has its own
+        analyser_return = AnalyserReturn()
+        with self.lifo_sessions.session(self.get_session_id_from_request(request)) as lifo_buffer:
+            ol = OrderListener(callback=functools.partial(self.audio_analyser_callback,
+                                                          no_voice=no_voice,
+                                                          lifo_buffer=lifo_buffer,
+                                                          analyser_return=analyser_return),
+                               audio_file_path=audio_path)
+            ol.start()
+            ol.join()
+            # wait the Order Analyser processing. We need to wait in this thread to keep the context
+            analyser_return.done.wait()
+        if analyser_return.api_response is not None and analyser_return.api_response:
+            data = jsonify(analyser_return.api_response)
             logger.debug("[FlaskAPI] run_neuron_by_audio: data %s" % data)
             return data, 201
         else:
@@ -310,6 +337,34 @@ class FlaskAPI(threading.Thread):
         func()
         return "Shutting down..."
 
+    @requires_auth
+    def get_tts_cache(self):
+        """
+        Return the counters of the TTS cache and of the pool of TTS engines
+        Curl test
+        curl -i --user admin:secret  -X GET  http://127.0.0.1:5000/tts/cache
+        """
+        return jsonify(tts_cache=TTSCache.get_stats(), tts_pool=TTSPool.get_stats()), 200
+
+    @requires_auth
+    def get_order_latencies(self):
+        """
+        Return the latency histogram of the transitions of the voice order state machine and of the detections
+        of the wakeon
+        Curl test
+        curl -i --user admin:secret  -X GET  http://127.0.0.1:5000/order/latencies
+        """
+        cue_order = CueLauncher.get_order_instance()
+        if cue_order is not None:
+            return jsonify(latencies=cue_order.get_transition_latencies(),
+                           wakeon_latencies=cue_order.get_wakeon_latencies()), 200
+
+        # if no Order instance
+        data = {
+            "error": "No voice order running"
+        }
+        return jsonify(error=data), 400
+
     @requires_auth
     def get_mute(self):
         """
@@ -361,27 +416,32 @@ class FlaskAPI(threading.Thread):
         }
         return jsonify(error=data), 400
 
-    def audio_analyser_callback(self, order):
+    def audio_analyser_callback(self, order, no_voice=False, lifo_buffer=None, analyser_return=None):
         """
         Callback of the OrderListener. Called after the processing of the audio file
         This method will
         - call the Order Analyser to analyse the  order and launch corresponding neuron as usual.
         - get a list of launched neuron.
-        - give the list to the main process via self.launched_neurons
-        - notify that the processing is over via order_analyser_return
+        - give the list to the main process via analyser_return.api_response
+        - notify that the processing is over via analyser_return.done
         :param order: string order to analyse
+        :param no_voice: the no_voice flag of the request
+        :param lifo_buffer: the LIFO of the session of the request
+        :param analyser_return: the AnalyserReturn of the request
+        :type analyser_return: AnalyserReturn
         :return:
         """
         logger.debug("[FlaskAPI] audio_analyser_callback: order to process -> %s" % order)
-        api_response = NeuronLauncher.run_matching_neuron_from_order(order,
-                                                                     self.brain,
-                                                                     self.settings,
-                                                                     is_api_call=True,
-                                                                     no_voice=self.no_voice)
-        self.api_response = api_response
-
-        # this boolean will notify the main process that the order have been processed
-        self.order_analyser_return = True
+        try:
+            analyser_return.api_response = NeuronLauncher.run_matching_neuron_from_order(order,
+                                                                                         self.brain,
+                                                                                         self.settings,
+                                                                                         is_api_call=True,
+                                                                                         no_voice=no_voice,
+                                                                                         lifo_buffer=lifo_buffer)
+        finally:
+            # notify the main process that the order have been processed
+            analyser_return.done.set()
 
     def get_boolean_flag_from_request(self, http_request, boolean_flag_to_find):
         """
@@ -402,6 +462,21 @@ class FlaskAPI(threading.Thread):
         logger.debug("[FlaskAPI] boolean_flag: %s" % boolean_flag)
         return boolean_flag
 
+    @staticmethod
+    def get_session_id_from_request(http_request):
+        """
+        Get the "session_id" of the client from the json or the form of the request
+        :param http_request:
+        :return: the session id, DEFAULT_SESSION_ID if not given
+        """
+        session_id = http_request.form.get("session_id")
+        received_json = http_request.get_json(force=True, silent=True, cache=True)
+        if isinstance(received_json, dict) and received_json.get("session_id") is not None:
+            session_id = received_json["session_id"]
+        if session_id is None:
+            return DEFAULT_SESSION_ID
+        return str(session_id)
+
     @staticmethod
     def str_to_bool(s):
         if isinstance(s, bool):  # do not convert if already a boolean
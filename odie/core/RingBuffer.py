@@ -0,0 +1,126 @@
+import threading
+import time
+
+
+class RingBuffer(object):
+    """
+    Fixed size buffer of audio bytes, written by the audio callback of an input stream and read by a consumer thread.
+
+    The bytes are kept in a bytearray allocated once: a write is at most two slice copies, a read is one copy of the
+    available bytes. When the buffer is full the oldest bytes are dropped. The consumer waits on a condition variable,
+    it is woken as soon as new frames are written instead of polling the buffer.
+    """
+
+    def __init__(self, size=4096):
+        """
+        :param size: maximum number of bytes kept in the buffer
+        """
+        self.size = size
+        self._buf = bytearray(size)
+        self._view = memoryview(self._buf)
+        # index of the oldest byte and number of bytes in the buffer
+        self._start = 0
+        self._length = 0
+        # set by interrupt to wake up the consumer without data
+        self._interrupted = False
+        self._condition = threading.Condition()
+
+    def extend(self, data):
+        """
+        Adds data to the end of buffer, the oldest bytes are dropped if the buffer is full
+        :param data: bytes to add
+        """
+        data = memoryview(data)
+        data_length = len(data)
+        if data_length == 0:
+            return
+        with self._condition:
+            if data_length >= self.size:
+                # only the last bytes fit in the buffer
+                data = data[data_length - self.size:]
+                data_length = self.size
+                self._start = 0
+                self._length = 0
+            overflow = self._length + data_length - self.size
+            if overflow > 0:
+                self._start = (self._start + overflow) % self.size
+                self._length -= overflow
+
+            end = (self._start + self._length) % self.size
+            first_part_length = min(data_length, self.size - end)
+            self._view[end:end + first_part_length] = data[:first_part_length]
+            self._view[:data_length - first_part_length] = data[first_part_length:]
+            self._length += data_length
+            self._condition.notify_all()
+
+    def get(self, size=None):
+        """
+        Retrieves data from the beginning of buffer and removes it
+        :param size: maximum number of bytes to retrieve, None for all the bytes
+        :return: the bytes of the buffer
+        """
+        with self._condition:
+            length = self._length if size is None else min(size, self._length)
+            data = self._copy(self._start, length)
+            if length == self._length:
+                self._start = 0
+            else:
+                self._start = (self._start + length) % self.size
+            self._length -= length
+        return data
+
+    def peek(self, size=None):
+        """
+        Retrieves the last bytes of the buffer without removing them
+        :param size: maximum number of bytes to retrieve, None for all the bytes
+        :return: the bytes
+        """
+        with self._condition:
+            length = self._length if size is None else min(size, self._length)
+            return self._copy((self._start + self._length - length) % self.size, length)
+
+    def wait(self, timeout=None, size=1):
+        """
+        Wait until the buffer contains data, or until interrupt is called
+        :param timeout: maximum time to wait in seconds, None to wait forever
+        :param size: number of bytes to wait for
+        :return: True if the buffer contains size bytes
+        """
+        size = min(size, self.size)
+        end_time = time.time() + timeout if timeout is not None else None
+        with self._condition:
+            while self._length < size and not self._interrupted:
+                remaining_time = end_time - time.time() if end_time is not None else None
+                if remaining_time is not None and remaining_time <= 0:
+                    break
+                self._condition.wait(remaining_time)
+            self._interrupted = False
+            return self._length >= size
+
+    def interrupt(self):
+        """
+        Wake up the consumer waiting for data, Eg: to let it check if it has to stop
+        """
+        with self._condition:
+            self._interrupted = True
+            self._condition.notify_all()
+
+    def clear(self):
+        """
+        Drop the data of the buffer
+        """
+        with self._condition:
+            self._start = 0
+            self._length = 0
+
+    def __len__(self):
+        return self._length
+
+    def _copy(self, start, length):
+        """
+        Copy bytes of the buffer. Must be called with the lock
+        """
+        end = start + length
+        if end <= self.size:
+            return self._view[start:end].tobytes()
+        return self._view[start:].tobytes() + self._view[:end - self.size].tobytes()
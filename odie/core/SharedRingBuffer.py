@@ -0,0 +1,108 @@
+import ctypes
+import multiprocessing
+
+
+class SharedRingBuffer(object):
+    """
+    Ring buffer of bytes in shared memory, written by one process and read by another one.
+
+    The bytes are written in a RawArray allocated once, the positions are counted in bytes written since the
+    creation. The writer publishes the start of a write before copying the bytes and the end of the write after,
+    so a reader that is too late drops the bytes being overwritten instead of reading mixed audio. The reader keeps
+    its own position (SharedRingBufferReader) and waits on an Event set after each write.
+
+    The buffer must be created before the reader process is started.
+
+    .. seealso:: RingBuffer
+    """
+
+    def __init__(self, size=4096):
+        """
+        :param size: maximum number of bytes kept in the buffer
+        """
+        self.size = size
+        self._buf = multiprocessing.RawArray(ctypes.c_char, size)
+        # number of bytes written once the current write is complete
+        self._write_start = multiprocessing.RawValue(ctypes.c_ulonglong, 0)
+        # number of bytes written
+        self._write_end = multiprocessing.RawValue(ctypes.c_ulonglong, 0)
+        self._data_event = multiprocessing.Event()
+
+    def extend(self, data):
+        """
+        Adds data to the end of buffer, the oldest bytes are overwritten if the buffer is full. A single writer
+        :param data: bytes to add
+        """
+        data = bytes(data)
+        position = self._write_end.value
+        if len(data) > self.size:
+            # only the last bytes fit in the buffer
+            position += len(data) - self.size
+            data = data[len(data) - self.size:]
+        self._write_start.value = position + len(data)
+
+        offset = position % self.size
+        first_part_length = min(len(data), self.size - offset)
+        address = ctypes.addressof(self._buf)
+        ctypes.memmove(address + offset, data, first_part_length)
+        ctypes.memmove(address, data[first_part_length:], len(data) - first_part_length)
+
+        self._write_end.value = position + len(data)
+        self._data_event.set()
+
+    def interrupt(self):
+        """
+        Wake up the reader waiting for data, Eg: to let it check if it has to stop
+        """
+        self._data_event.set()
+
+    def get_position(self):
+        """
+        :return: number of bytes written in the buffer
+        """
+        return self._write_end.value
+
+    def reader(self):
+        """
+        :return: a SharedRingBufferReader starting at the current position
+        """
+        return SharedRingBufferReader(self)
+
+
+class SharedRingBufferReader(object):
+    """
+    Position of a reader of a SharedRingBuffer. A single reader by buffer
+    """
+
+    def __init__(self, shared_ring_buffer):
+        self.shared_ring_buffer = shared_ring_buffer
+        self.position = shared_ring_buffer.get_position()
+
+    def read(self, timeout=None):
+        """
+        Wait for data and retrieves the bytes written since the last read. The bytes overwritten before being read
+        are dropped
+        :param timeout: maximum time to wait in seconds, None to wait forever
+        :return: the bytes, empty if no data has been written before the timeout
+        """
+        shared_ring_buffer = self.shared_ring_buffer
+        size = shared_ring_buffer.size
+        if shared_ring_buffer.get_position() == self.position:
+            shared_ring_buffer._data_event.wait(timeout)
+        # cleared before reading: a write during the read sets it again
+        shared_ring_buffer._data_event.clear()
+
+        end = shared_ring_buffer.get_position()
+        start = max(self.position, end - size)
+        offset = start % size
+        first_part_length = min(end - start, size - offset)
+        address = ctypes.addressof(shared_ring_buffer._buf)
+        data = ctypes.string_at(address + offset, first_part_length) + \
+            ctypes.string_at(address, end - start - first_part_length)
+
+        # drop the beginning if a write started overwriting it during the copy
+        overwritten_length = shared_ring_buffer._write_start.value - size - start
+        if overwritten_length > 0:
+            data = data[overwritten_length:]
+        self.position = end
+        return data
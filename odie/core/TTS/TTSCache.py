@@ -0,0 +1,157 @@
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+logging.basicConfig()
+logger = logging.getLogger("odie")
+
+# generated audio files in the cache path
+CACHE_FILE_EXTENSION = ".tts"
+
+
+class TTSCache(object):
+    """
+    Class used to bound the size of the generated audio files of the TTS.
+
+    The files of the cache path are tracked with their size, from the least to the most recently played. When the
+    cache is bigger than max_size, the least recently played files are removed. The access time is kept on the file
+    (its modification time is updated on each hit) so the order survives a restart of odie.
+
+    The number of hits and misses can be read with get_stats.
+    """
+    _lock = threading.Lock()
+    hits = 0
+    misses = 0
+    cache_path = None
+    # maximum size of the cache in bytes, None for no limit
+    max_size = None
+    # file path -> size, the least recently used first
+    _files = OrderedDict()
+    _size = 0
+
+    def __init__(self):
+        pass
+
+    @classmethod
+    def load(cls, cache_path, max_size=None):
+        """
+        Track the files of a cache path. The folder is only scanned the first time
+        :param cache_path: the cache path of the settings
+        :param max_size: maximum size of the cache in MB, None for no limit
+        """
+        with cls._lock:
+            cls.max_size = int(max_size * 1024 * 1024) if max_size is not None else None
+            if cls.cache_path == cache_path:
+                return
+            cls.cache_path = cache_path
+            cls._files = OrderedDict()
+            cls._size = 0
+
+            cached_files = list()
+            for root, _, file_names in os.walk(cache_path):
+                for file_name in file_names:
+                    if file_name.endswith(CACHE_FILE_EXTENSION):
+                        file_path = os.path.join(root, file_name)
+                        try:
+                            file_stat = os.stat(file_path)
+                        except OSError:
+                            continue
+                        cached_files.append((file_stat.st_mtime, file_path, file_stat.st_size))
+            for _, file_path, size in sorted(cached_files):
+                cls._files[file_path] = size
+                cls._size += size
+            logger.debug("[TTSCache] %s files in cache, %s bytes" % (len(cls._files), cls._size))
+            cls._evict()
+
+    @classmethod
+    def is_cached(cls, file_path):
+        """
+        Check if an audio file has already been generated and count the hit or the miss
+        :param file_path: path of the audio file
+        :return: True if the file is in the cache
+        """
+        try:
+            size = os.path.getsize(file_path)
+            exist_in_cache = True
+        except OSError:
+            exist_in_cache = False
+        with cls._lock:
+            if exist_in_cache:
+                cls.hits += 1
+                cls._size += size - cls._files.pop(file_path, 0)
+                cls._files[file_path] = size
+            else:
+                cls.misses += 1
+                cls._size -= cls._files.pop(file_path, 0)
+        if exist_in_cache:
+            try:
+                # keep the access time on the file
+                os.utime(file_path, None)
+            except OSError:
+                pass
+        return exist_in_cache
+
+    @classmethod
+    def add(cls, file_path):
+        """
+        Track a generated audio file, then remove the least recently used files if the cache is too big
+        :param file_path: path of the generated audio file
+        """
+        try:
+            size = os.path.getsize(file_path)
+        except OSError:
+            logger.debug("[TTSCache] file not generated: %s" % file_path)
+            return
+        with cls._lock:
+            cls._size -= cls._files.pop(file_path, 0)
+            cls._files[file_path] = size
+            cls._size += size
+            cls._evict(keep=file_path)
+
+    @classmethod
+    def get_stats(cls):
+        """
+        Return the counters of the cache
+        :return: dict with the hits, the misses, the number of files and the size in bytes
+        """
+        with cls._lock:
+            return {
+                'hits': cls.hits,
+                'misses': cls.misses,
+                'files': len(cls._files),
+                'size': cls._size,
+                'max_size': cls.max_size
+            }
+
+    @classmethod
+    def clean(cls):
+        """
+        Forget the tracked files and reset the counters. The files are not removed
+        """
+        with cls._lock:
+            cls.cache_path = None
+            cls._files = OrderedDict()
+            cls._size = 0
+            cls.hits = 0
+            cls.misses = 0
+
+    @classmethod
+    def _evict(cls, keep=None):
+        """
+        Remove the least recently used files while the cache is too big. Must be called with the lock
+        :param keep: path of a file never removed, Eg: the file about to be played
+        """
+        if cls.max_size is None:
+            return
+        for file_path in list(cls._files):
+            if cls._size <= cls.max_size:
+                break
+            if file_path == keep:
+                continue
+            logger.debug("[TTSCache] removing %s" % file_path)
+            cls._size -= cls._files.pop(file_path)
+            try:
+                os.remove(file_path)
+            except OSError:
+                pass
@@ -2,18 +2,26 @@
 import hashlib
 import logging
 import os
+import re
 import subprocess
+import threading
+import time
 
 import six
+from six.moves import queue
 
 from odie.core.ConfigurationManager import SettingLoader
 from odie.core.PlayerLauncher import PlayerLauncher
+from odie.core.TTS.TTSCache import TTSCache
 from odie.core.Utils.FileManager import FileManager
 from odie.core import Utils
 
 logging.basicConfig()
 logger = logging.getLogger("odie")
 
+# end of a sentence: a punctuation followed by a space, or a new line
+SENTENCE_SEPARATOR = re.compile(r"(?<=[.!?;:])\s+|\n+")
+
 
 class MissingTTSParameter(Exception):
     """
@@ -51,6 +59,8 @@ class TTSModule(object):
         self.cache = kwargs.get('cache', False)
         self.language = kwargs.get('language', "default")
         self.voice = kwargs.get('voice', "default")
+        # streaming: the next sentence is generated while the current one is played
+        self.streaming = kwargs.get('streaming', False)
         # the name of the TSS is the name of the Tss module that have instantiated TTSModule
         self.tts_caller_name = self.__class__.__name__
 
@@ -73,46 +83,143 @@ class TTSModule(object):
                                                                                                      self.language,
                                                                                                      self.voice))
 
-    def play_audio(self):
+    def play_audio(self, file_path=None):
         """
         Play the audio file
+        :param file_path: the audio file to play, the last generated file if None
         """
         # Mplayer.play(self.file_path)
-        self.player.play(self.file_path)
+        self.player.play(file_path if file_path is not None else self.file_path)
 
     def generate_and_play(self, words, generate_audio_function_from_child=None):
         """
-        Generate an audio file from <words> if not already in cache and call the Player to play it
+        Generate an audio file from <words> if not already in cache and call the Player to play it.
+        In streaming mode, the sentences are generated one by one and the next sentence is generated while the
+        current one is played. The time to first audio is logged
         :param words: Sentence text from which we want to generate an audio file
         :type words: String
         :param generate_audio_function_from_child: The child function to generate a file if necessary
         :type generate_audio_function_from_child; Callback function
 
+        .. raises:: TtsGenerateAudioFunctionNotFound
+        """
+        start_time = time.time()
+        sentences = self.split_sentences(words) if self.streaming else list()
+        if len(sentences) > 1:
+            self._generate_and_play_sentences(sentences, generate_audio_function_from_child, start_time)
+            return
+
+        self.generate(words, generate_audio_function_from_child)
+        logger.debug("[TTSModule] time to first audio: %.3f s" % (time.time() - start_time))
+
+        # then play the generated audio file
+        self.play_audio()
+
+        # if the user don't want to keep the cache we remove the file
+        if not self.cache:
+            FileManager.remove_file(self.file_path)
+
+    def _generate_and_play_sentences(self, sentences, generate_audio_function_from_child, start_time):
+        """
+        Generate the sentences in a thread while the main thread plays them. Each sentence has its own file in the
+        cache. Without cache, the file of a sentence is named after its index too: a repeated sentence is not
+        generated again in the file being played. The generation is at most one sentence ahead of the playback
+        :param sentences: list of sentences to say
+        :param generate_audio_function_from_child: The child function to generate a file if necessary
+        :param start_time: time of the beginning of the say
+        """
+        generated_files = queue.Queue(maxsize=1)
+        stop_event = threading.Event()
+
+        def generate_sentences():
+            # self.words and self.file_path are only used by this thread until the end of the playback
+            try:
+                for index, sentence in enumerate(sentences):
+                    if stop_event.is_set():
+                        return
+                    generated_files.put(self.generate(sentence, generate_audio_function_from_child,
+                                                      file_index=None if self.cache else index))
+            except Exception as e:
+                generated_files.put(e)
+                return
+            generated_files.put(None)
+
+        generator = threading.Thread(target=generate_sentences)
+        generator.daemon = True
+        generator.start()
+
+        first_audio = True
+        try:
+            while True:
+                file_path = generated_files.get()
+                if file_path is None:
+                    break
+                if isinstance(file_path, Exception):
+                    raise file_path
+                if first_audio:
+                    logger.debug("[TTSModule] time to first audio: %.3f s, %s sentences" % (time.time() - start_time,
+                                                                                          len(sentences)))
+                    first_audio = False
+                self.play_audio(file_path)
+                if not self.cache:
+                    FileManager.remove_file(file_path)
+        finally:
+            stop_event.set()
+            # unblock the generator if it is waiting for the playback and remove the files not played
+            while generator.is_alive() or not generated_files.empty():
+                try:
+                    file_path = generated_files.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                if not self.cache and isinstance(file_path, six.string_types):
+                    FileManager.remove_file(file_path)
+
+    @staticmethod
+    def split_sentences(words):
+        """
+        Split a text into sentences
+        :param words: the text to split
+        :return: list of sentences, without empty sentence
+        """
+        return [sentence.strip() for sentence in SENTENCE_SEPARATOR.split(words) if sentence.strip()]
+
+    def generate(self, words, generate_audio_function_from_child=None, file_index=None):
+        """
+        Generate an audio file from <words> if not already in cache, without playing it
+        :param words: Sentence text from which we want to generate an audio file
+        :type words: String
+        :param generate_audio_function_from_child: The child function to generate a file if necessary. The
+        _generate_audio_file method of the child if None
+        :type generate_audio_function_from_child; Callback function
+        :param file_index: added to the name of the file when not None, to generate the same words in several files
+        :return: the path of the audio file
+
         .. raises:: TtsGenerateAudioFunctionNotFound
         """
+        if generate_audio_function_from_child is None:
+            generate_audio_function_from_child = getattr(self, "_generate_audio_file", None)
         if generate_audio_function_from_child is None:
             raise TtsGenerateAudioFunctionNotFound
 
         self.words = words
         # we can generate the file path from info we have
-        self.file_path = self._get_path_to_store_audio()
+        self.file_path = self._get_path_to_store_audio(file_index=file_index)
 
         if not self.cache:
             # no cache, we need to generate the file
             generate_audio_function_from_child()
         else:
+            tts_cache_options = self.settings.tts_cache
+            TTSCache.load(self.settings.cache_path,
+                          max_size=tts_cache_options.max_size if tts_cache_options is not None else None)
             # we check if the file already exist. If not we generate it with the TTS engine
-            if not self._is_file_already_in_cache(self.base_cache_path, self.file_path):
+            FileManager.create_directory(self.base_cache_path)
+            if not TTSCache.is_cached(self.file_path):
                 generate_audio_function_from_child()
+                TTSCache.add(self.file_path)
+        return self.file_path
 
-        # then play the generated audio file
-        self.play_audio()
-
-        # if the user don't want to keep the cache we remove the file
-        if not self.cache:
-            FileManager.remove_file(self.file_path)
-
-    def _get_path_to_store_audio(self):
+    def _get_path_to_store_audio(self, file_index=None):
         """
         Get a sentence (a text) an return the full path of the file
 
@@ -122,9 +229,13 @@ class TTSModule(object):
         E.g:
         /tmp/odie/acapela/fr/abcd12345.tts
 
+        :param file_index: added to the name of the file when not None. E.g: /tmp/odie/acapela/fr/abcd12345-1.tts
         :return: path String
         """
-        md5 = self.generate_md5_from_words(self.words)+".tts"
+        md5 = self.generate_md5_from_words(self.words)
+        if file_index is not None:
+            md5 += "-%d" % file_index
+        md5 += ".tts"
         self.base_cache_path = os.path.join(self.settings.cache_path, self.tts_caller_name, self.language, self.voice)
 
         returned_path = os.path.join(self.base_cache_path, md5)
@@ -141,20 +252,3 @@ class TTSModule(object):
         if isinstance(words, six.text_type):
             words = words.encode('utf-8')
         return hashlib.md5(words).hexdigest()
-
-    @staticmethod
-    def _is_file_already_in_cache(base_cache_path, file_path):
-        """
-        Return true if the file to generate has already been generated before
-        """
-        # generate sub folder
-        FileManager.create_directory(base_cache_path)
-
-        # check if the audio file exist
-        exist_in_cache = os.path.exists(file_path)
-
-        if exist_in_cache:
-            logger.debug("TTSModule, File already in cache: %s" % file_path)
-        else:
-            logger.debug("TTSModule, File not yet in cache: %s" % file_path)
-        return exist_in_cache
\ No newline at end of file
@@ -0,0 +1,104 @@
+import json
+import logging
+import threading
+from contextlib import contextmanager
+
+from odie.core.Utils.Utils import Utils
+
+logging.basicConfig()
+logger = logging.getLogger("odie")
+
+
+class TTSPool(object):
+    """
+    Class used to reuse the instances of the TTS engines between the actions.
+
+    A TTS engine is identified by its name, its parameters (the parameters of the settings overridden by the "tts"
+    parameter of the action) and the resources folder. An instance keeps the sentence being generated, so it is used
+    by one action at a time: an instance is taken from the pool for a sentence, then given back. A new instance is
+    created when all the instances of the engine are in use, at most max_idle instances are kept by engine.
+
+    The number of hits and misses can be read with get_stats.
+    """
+    # maximum number of unused instances kept by engine
+    max_idle = 2
+
+    # key of the engine -> list of unused instances
+    _idle = dict()
+    _lock = threading.Lock()
+    hits = 0
+    misses = 0
+
+    def __init__(self):
+        pass
+
+    @classmethod
+    @contextmanager
+    def get_tts(cls, tts, resources_dir=None):
+        """
+        Get an instance of a TTS engine, given back to the pool at the end of the block
+
+        :Example:
+
+            with TTSPool.get_tts(tts, resources_dir=tts_folder) as tts_module_instance:
+                tts_module_instance.say("hello")
+
+        :param tts: the Tts to instantiate
+        :param resources_dir: the resource directory to check for external TTS
+        """
+        key = cls.get_key(tts, resources_dir=resources_dir)
+        instance = None
+        with cls._lock:
+            idle_instances = cls._idle.get(key)
+            if idle_instances:
+                instance = idle_instances.pop()
+                cls.hits += 1
+            else:
+                cls.misses += 1
+
+        if instance is None:
+            logger.debug("[TTSPool] new instance of tts %s" % tts.name)
+            instance = Utils.get_dynamic_class_instantiation(package_name="tts",
+                                                             module_name=tts.name,
+                                                             parameters=tts.parameters,
+                                                             resources_dir=resources_dir)
+        yield instance
+
+        # an instance that failed is not reused
+        with cls._lock:
+            idle_instances = cls._idle.setdefault(key, list())
+            if len(idle_instances) < cls.max_idle:
+                idle_instances.append(instance)
+
+    @staticmethod
+    def get_key(tts, resources_dir=None):
+        """
+        Return the key of a TTS engine
+        :param tts: the Tts
+        :param resources_dir: the resource directory to check for external TTS
+        :return: tuple (name, parameters, resources_dir)
+        """
+        return tts.name, json.dumps(tts.parameters, sort_keys=True, default=str), resources_dir
+
+    @classmethod
+    def get_stats(cls):
+        """
+        Return the counters of the pool
+        :return: dict with the hits, the misses and the number of unused instances
+        """
+        with cls._lock:
+            return {
+                'hits': cls.hits,
+                'misses': cls.misses,
+                'idle': sum(len(idle_instances) for idle_instances in cls._idle.values())
+            }
+
+    @classmethod
+    def clean(cls):
+        """
+        Remove all the instances and reset the counters
+        """
+        with cls._lock:
+            cls._idle = dict()
+            cls.hits = 0
+            cls.misses = 0
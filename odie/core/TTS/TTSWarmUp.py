@@ -0,0 +1,174 @@
+import json
+import logging
+import threading
+from collections import OrderedDict
+
+import six
+from six.moves import queue
+
+from odie.core.Models.Tts import Tts
+from odie.core.TTS.TTSModule import TTSModule
+from odie.core.Utils.Utils import Utils
+
+logging.basicConfig()
+logger = logging.getLogger("odie")
+
+
+class TTSWarmUp(threading.Thread):
+    """
+    Generate in background the audio files of the sentences known when odie starts, so they are already in the
+    cache the first time they are said.
+
+    The sentences without variable are read from the "say" actions and the "say_template" parameters of the brain,
+    and from the random_wake_up_answers and on_ready_answers of the settings. Only the TTS with "cache: True" are
+    warmed up. Each worker uses its own instance of the TTS module. The messages said by a TTS with "streaming: True"
+    are split into sentences like TTSModule.generate_and_play, each sentence being cached on its own.
+
+    .. seealso:: TTSCache, TtsCacheOptions
+    """
+
+    def __init__(self, brain=None, settings=None, workers=2):
+        """
+        :param brain: the loaded brain
+        :param settings: the loaded settings
+        :param workers: number of sentences generated in parallel
+        """
+        super(TTSWarmUp, self).__init__()
+        self.daemon = True
+        self.brain = brain
+        self.settings = settings
+        self.workers = workers
+        # number of sentences generated and failed
+        self.generated = 0
+        self.failed = 0
+        self._lock = threading.Lock()
+
+    def run(self):
+        self.warm_up()
+
+    def warm_up(self):
+        """
+        Generate the audio file of each static sentence
+        """
+        sentences_by_tts = self.get_sentences_by_tts(self.brain, self.settings)
+        jobs = queue.Queue()
+        for tts, sentences in sentences_by_tts:
+            if not tts.parameters.get("cache", False):
+                logger.debug("[TTSWarmUp] cache disabled for tts %s" % tts.name)
+                continue
+            for sentence in sentences:
+                jobs.put((tts, sentence))
+
+        workers = list()
+        for _ in range(self.workers):
+            worker = threading.Thread(target=self._generate_sentences, args=(jobs,))
+            worker.daemon = True
+            worker.start()
+            workers.append(worker)
+        for worker in workers:
+            worker.join()
+        logger.debug("[TTSWarmUp] %s sentences generated, %s failed" % (self.generated, self.failed))
+
+    def _generate_sentences(self, jobs):
+        """
+        Worker: generate the sentences of the jobs until there is no more
+        :param jobs: Queue of tuple (Tts, sentence)
+        """
+        # the TTS modules keep the sentence being generated, each worker has its own instances
+        tts_instances = dict()
+        while True:
+            try:
+                tts, sentence = jobs.get_nowait()
+            except queue.Empty:
+                return
+
+            tts_key = id(tts)
+            try:
+                if tts_key not in tts_instances:
+                    tts_instances[tts_key] = self._get_tts_instance(tts)
+                tts_instances[tts_key].generate(sentence)
+                with self._lock:
+                    self.generated += 1
+            except Exception as e:
+                # the warm up must never stop odie, the sentence will be generated when said
+                logger.debug("[TTSWarmUp] fail to generate \"%s\" with %s: %s" % (sentence, tts.name, e))
+                with self._lock:
+                    self.failed += 1
+
+    def _get_tts_instance(self, tts):
+        tts_folder = None
+        if self.settings.resources:
+            tts_folder = self.settings.resources.tts_folder
+        return Utils.get_dynamic_class_instantiation(package_name="tts",
+                                                     module_name=tts.name,
+                                                     parameters=tts.parameters,
+                                                     resources_dir=tts_folder)
+
+    @classmethod
+    def get_sentences_by_tts(cls, brain, settings):
+        """
+        List the static sentences of the brain and the settings with the TTS that says them
+        :param brain: the loaded brain
+        :param settings: the loaded settings
+        :return: list of tuple (Tts, list of sentences), without duplicates
+        """
+        # key of the TTS -> (Tts, sentences)
+        sentences_by_tts = OrderedDict()
+
+        def add_sentences(tts, messages):
+            if tts is None:
+                return
+            if isinstance(messages, six.string_types):
+                messages = [messages]
+            if not isinstance(messages, list):
+                return
+            tts_key = (tts.name, json.dumps(tts.parameters, sort_keys=True, default=str))
+            _, sentences = sentences_by_tts.setdefault(tts_key, (tts, list()))
+            for message in messages:
+                if not isinstance(message, six.string_types) or not message or Utils.is_containing_bracket(message):
+                    continue
+                message_sentences = [message]
+                if tts.parameters.get("streaming", False):
+                    message_sentences = TTSModule.split_sentences(message)
+                    if len(message_sentences) < 2:
+                        # a single sentence is generated from the whole message
+                        message_sentences = [message]
+                for sentence in message_sentences:
+                    if sentence not in sentences:
+                        sentences.append(sentence)
+
+        default_tts = cls._get_tts(settings)
+        add_sentences(default_tts, settings.random_wake_up_answers)
+        add_sentences(default_tts, settings.on_ready_answers)
+
+        if brain is not None:
+            for neuron in brain.neurons:
+                for action in neuron.actions:
+                    if not isinstance(action.parameters, dict):
+                        continue
+                    tts = cls._get_tts(settings, action.parameters.get("tts"))
+                    if action.name == "say":
+                        add_sentences(tts, action.parameters.get("message"))
+                    add_sentences(tts, action.parameters.get("say_template"))
+
+        return [(tts, sentences) for tts, sentences in sentences_by_tts.values() if sentences]
+
+    @staticmethod
+    def _get_tts(settings, override_tts=None):
+        """
+        Get the TTS used by an action, like ActionModule does, without modifying the settings
+        :param settings: the loaded settings
+        :param override_tts: the "tts" parameter of the action. Eg: {"pico2wave": {"language": "fr-FR"}}
+        :return: the Tts, None if not found
+        """
+        tts_name = settings.default_tts_name
+        override_parameters = dict()
+        if isinstance(override_tts, dict):
+            for tts_name, override_parameters in override_tts.items():
+                break
+        tts = next((tts for tts in settings.ttss or list() if tts.name == tts_name), None)
+        if tts is None:
+            return None
+        parameters = dict(tts.parameters or dict())
+        parameters.update(override_parameters or dict())
+        return Tts(name=tts.name, parameters=parameters)
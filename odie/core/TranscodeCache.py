@@ -0,0 +1,288 @@
+import hashlib
+import io
+import logging
+import os
+import subprocess
+import tempfile
+import threading
+from collections import OrderedDict
+
+logging.basicConfig()
+logger = logging.getLogger("odie")
+
+# folder of the converted files in the cache path
+TRANSCODE_FOLDER = "transcode"
+CONVERTED_FILE_EXTENSION = ".wav"
+
+
+class TranscodeCache(object):
+    """
+    Class used to convert the audio files to wav once.
+
+    The converted file is named with the hash of the content of the source file, so the same sound is converted once
+    whatever its path, and the source file is never modified. The wav files are not converted. The converted files
+    are tracked with their size, from the least to the most recently played, and the least recently played are removed
+    when the cache is bigger than max_size. The most recently played wav, up to memory_size, are kept in memory.
+
+    The number of hits, misses (conversions) and memory hits can be read with get_stats.
+
+    .. seealso:: PlayerModule, TranscodeCacheOptions
+    """
+    _lock = threading.Lock()
+    hits = 0
+    misses = 0
+    memory_hits = 0
+    cache_path = None
+    # maximum size of the converted files in bytes, None for no limit
+    max_size = None
+    # maximum size of the wav kept in memory in bytes
+    memory_size = 0
+    # converted file path -> size, the least recently used first
+    _files = OrderedDict()
+    _size = 0
+    # hash of the source -> content of the wav, the least recently used first
+    _memory = OrderedDict()
+    _memory_used = 0
+    # (path, modification time, size) of a source -> hash of its content
+    _hashes = OrderedDict()
+    max_hashes = 1024
+    # source files already preloaded
+    _preloaded = set()
+
+    def __init__(self):
+        pass
+
+    @classmethod
+    def load(cls, cache_path, max_size=None, memory_size=0):
+        """
+        Track the converted files of a folder. The folder is only scanned the first time
+        :param cache_path: folder of the converted files
+        :param max_size: maximum size of the converted files in MB, None for no limit
+        :param memory_size: maximum size of the wav kept in memory in MB
+        """
+        with cls._lock:
+            cls.max_size = int(max_size * 1024 * 1024) if max_size is not None else None
+            cls.memory_size = int(memory_size * 1024 * 1024)
+            cls._evict_memory()
+            if cls.cache_path == cache_path:
+                return
+            cls.cache_path = cache_path
+            cls._files = OrderedDict()
+            cls._size = 0
+
+            converted_files = list()
+            if os.path.isdir(cache_path):
+                for file_name in os.listdir(cache_path):
+                    if file_name.endswith(CONVERTED_FILE_EXTENSION):
+                        file_path = os.path.join(cache_path, file_name)
+                        try:
+                            file_stat = os.stat(file_path)
+                        except OSError:
+                            continue
+                        converted_files.append((file_stat.st_mtime, file_path, file_stat.st_size))
+            for _, file_path, size in sorted(converted_files):
+                cls._files[file_path] = size
+                cls._size += size
+            logger.debug("[TranscodeCache] %s converted files, %s bytes" % (len(cls._files), cls._size))
+            cls._evict()
+
+    @classmethod
+    def get_wav(cls, file_path):
+        """
+        Return the wav version of an audio file, converted on first use
+        :param file_path: path of the audio file
+        :return: the wav in memory (file object), or the path of the wav file
+        """
+        content_hash = cls._get_hash(file_path)
+        with cls._lock:
+            wav_content = cls._memory.pop(content_hash, None)
+            if wav_content is not None:
+                cls.memory_hits += 1
+                # move to the end, most recently used
+                cls._memory[content_hash] = wav_content
+                return io.BytesIO(wav_content)
+
+        if cls.is_wav(file_path):
+            wav_path = file_path
+        else:
+            wav_path = cls._get_converted_file(file_path, content_hash)
+            if wav_path == file_path:
+                # not converted
+                return file_path
+
+        if 0 < os.path.getsize(wav_path) <= cls.memory_size:
+            with open(wav_path, "rb") as wav_file:
+                wav_content = wav_file.read()
+            with cls._lock:
+                cls._memory_used += len(wav_content) - len(cls._memory.pop(content_hash, b""))
+                cls._memory[content_hash] = wav_content
+                cls._evict_memory()
+            return io.BytesIO(wav_content)
+        return wav_path
+
+    @classmethod
+    def preload(cls, file_paths):
+        """
+        Convert audio files and keep them in memory in a background thread. A file is only preloaded once
+        :param file_paths: list of path of audio files
+        """
+        with cls._lock:
+            file_paths = [file_path for file_path in file_paths if file_path not in cls._preloaded]
+            cls._preloaded.update(file_paths)
+        if not file_paths:
+            return
+
+        def preload_files():
+            for file_path in file_paths:
+                try:
+                    cls.get_wav(file_path)
+                except Exception as e:
+                    logger.debug("[TranscodeCache] fail to preload %s: %s" % (file_path, e))
+
+        preload_thread = threading.Thread(target=preload_files)
+        preload_thread.daemon = True
+        preload_thread.start()
+
+    @staticmethod
+    def is_wav(file_path):
+        """
+        Check the header of a file
+        :param file_path: path of the audio file
+        :return: True if the file is a wav
+        """
+        with open(file_path, "rb") as audio_file:
+            header = audio_file.read(12)
+        return header[0:4] == b"RIFF" and header[8:12] == b"WAVE"
+
+    @classmethod
+    def get_stats(cls):
+        """
+        Return the counters of the cache
+        :return: dict with the hits, the misses, the memory hits, the number and size of the converted files and
+        the size of the wav in memory
+        """
+        with cls._lock:
+            return {
+                'hits': cls.hits,
+                'misses': cls.misses,
+                'memory_hits': cls.memory_hits,
+                'files': len(cls._files),
+                'size': cls._size,
+                'memory_used': cls._memory_used
+            }
+
+    @classmethod
+    def clean(cls):
+        """
+        Forget the tracked files, the wav in memory and reset the counters. The files are not removed
+        """
+        with cls._lock:
+            cls.cache_path = None
+            cls._files = OrderedDict()
+            cls._size = 0
+            cls._memory = OrderedDict()
+            cls._memory_used = 0
+            cls._hashes = OrderedDict()
+            cls._preloaded = set()
+            cls.hits = 0
+            cls.misses = 0
+            cls.memory_hits = 0
+
+    @classmethod
+    def _get_hash(cls, file_path):
+        """
+        Hash of the content of a file, the file is only read again when it has been modified
+        """
+        file_stat = os.stat(file_path)
+        key = (file_path, getattr(file_stat, "st_mtime_ns", file_stat.st_mtime), file_stat.st_size)
+        with cls._lock:
+            content_hash = cls._hashes.get(key)
+        if content_hash is not None:
+            return content_hash
+
+        sha1 = hashlib.sha1()
+        with open(file_path, "rb") as audio_file:
+            for block in iter(lambda: audio_file.read(65536), b""):
+                sha1.update(block)
+        content_hash = sha1.hexdigest()
+        with cls._lock:
+            cls._hashes[key] = content_hash
+            while len(cls._hashes) > cls.max_hashes:
+                cls._hashes.popitem(last=False)
+        return content_hash
+
+    @classmethod
+    def _get_converted_file(cls, file_path, content_hash):
+        """
+        Return the path of the converted file, convert the source if not already done
+        """
+        converted_path = os.path.join(cls.cache_path, content_hash + CONVERTED_FILE_EXTENSION)
+        if os.path.exists(converted_path):
+            with cls._lock:
+                cls.hits += 1
+                cls._files[converted_path] = cls._files.pop(converted_path, os.path.getsize(converted_path))
+            try:
+                # keep the access time on the file
+                os.utime(converted_path, None)
+            except OSError:
+                pass
+            return converted_path
+
+        with cls._lock:
+            cls.misses += 1
+        if not os.path.exists(cls.cache_path):
+            os.makedirs(cls.cache_path)
+        logger.debug("[TranscodeCache] converting %s" % file_path)
+        # convert in a temporary file, moved once complete
+        fd, tmp_file_wav = tempfile.mkstemp(suffix=CONVERTED_FILE_EXTENSION, dir=cls.cache_path)
+        os.close(fd)
+        fnull = open(os.devnull, 'w')
+        try:
+            subprocess.call(['avconv', '-y', '-i', file_path, tmp_file_wav], stdout=fnull, stderr=fnull)
+        except Exception:
+            # Eg: avconv is not installed, the temporary file is not in the size of the cache
+            os.remove(tmp_file_wav)
+            raise
+        finally:
+            fnull.close()
+        if os.path.getsize(tmp_file_wav) == 0:
+            os.remove(tmp_file_wav)
+            logger.debug("[TranscodeCache] fail to convert %s, played as is" % file_path)
+            return file_path
+        os.rename(tmp_file_wav, converted_path)
+
+        with cls._lock:
+            size = os.path.getsize(converted_path)
+            cls._size += size - cls._files.pop(converted_path, 0)
+            cls._files[converted_path] = size
+            cls._evict(keep=converted_path)
+        return converted_path
+
+    @classmethod
+    def _evict(cls, keep=None):
+        """
+        Remove the least recently used files while the cache is too big. Must be called with the lock
+        :param keep: path of a file never removed, Eg: the file about to be played
+        """
+        if cls.max_size is None:
+            return
+        for file_path in list(cls._files):
+            if cls._size <= cls.max_size:
+                break
+            if file_path == keep:
+                continue
+            logger.debug("[TranscodeCache] removing %s" % file_path)
+            cls._size -= cls._files.pop(file_path)
+            try:
+                os.remove(file_path)
+            except OSError:
+                pass
+
+    @classmethod
+    def _evict_memory(cls):
+        """
+        Remove the least recently used wav from the memory. Must be called with the lock
+        """
+        while cls._memory and cls._memory_used > cls.memory_size:
+            _, wav_content = cls._memory.popitem(last=False)
+            cls._memory_used -= len(wav_content)
@@ -0,0 +1,96 @@
+import threading
+
+# upper bounds of the buckets of the histogram in milliseconds, the last bucket is for the greater latencies
+DEFAULT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+
+class LatencyHistogram(object):
+    """
+    Class used to count latencies by name in buckets of milliseconds.
+
+    Eg: the Order cue records, for each transition of its state machine ("source->destination"), the time between
+    the event that triggers the transition and the entry in the next state.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        """
+        :param buckets: sorted upper bounds of the buckets in milliseconds
+        """
+        self.buckets = tuple(buckets)
+        # name -> {"count", "total", "max", "buckets"}
+        self._latencies = dict()
+        self._lock = threading.Lock()
+
+    def add(self, name, seconds):
+        """
+        Record a latency
+        :param name: name of the measure, Eg: "waiting_for_wakeon_callback->stopping_wakeon"
+        :param seconds: the latency in seconds
+        """
+        milliseconds = seconds * 1000
+        with self._lock:
+            latency = self._latencies.get(name)
+            if latency is None:
+                latency = {
+                    "count": 0,
+                    "total": 0.0,
+                    "max": 0.0,
+                    "buckets": [0] * (len(self.buckets) + 1)
+                }
+                self._latencies[name] = latency
+            latency["count"] += 1
+            latency["total"] += milliseconds
+            latency["max"] = max(latency["max"], milliseconds)
+            latency["buckets"][self._get_bucket_index(milliseconds)] += 1
+
+    def get_stats(self):
+        """
+        Return the histogram of each recorded name
+        :return: dict name -> count, mean, max, p50 and p99 in milliseconds, and the number of latencies per bucket.
+        The buckets are named with their upper bound, "+Inf" for the last one
+        """
+        bucket_names = ["%s" % upper_bound for upper_bound in self.buckets] + ["+Inf"]
+        stats = dict()
+        with self._lock:
+            for name, latency in self._latencies.items():
+                stats[name] = {
+                    "count": latency["count"],
+                    "mean": latency["total"] / latency["count"],
+                    "max": latency["max"],
+                    "p50": self._get_percentile(latency, 0.5),
+                    "p99": self._get_percentile(latency, 0.99),
+                    "buckets": dict(zip(bucket_names, latency["buckets"]))
+                }
+        return stats
+
+    def clean(self):
+        """
+        Forget the recorded latencies
+        """
+        with self._lock:
+            self._latencies = dict()
+
+    def _get_bucket_index(self, milliseconds):
+        for index, upper_bound in enumerate(self.buckets):
+            if milliseconds <= upper_bound:
+                return index
+        return len(self.buckets)
+
+    def _get_percentile(self, latency, quantile):
+        """
+        Estimate a percentile from the buckets, interpolated linearly inside the bucket that contains it
+        :param latency: the recorded latencies of a name
+        :param quantile: the percentile between 0 and 1, Eg: 0.99
+        :return: the percentile in milliseconds, at most the max latency
+        """
+        rank = quantile * latency["count"]
+        lower_bound = 0.0
+        cumulated_count = 0
+        for index, count in enumerate(latency["buckets"]):
+            upper_bound = self.buckets[index] if index < len(self.buckets) else latency["max"]
+            if count > 0 and cumulated_count + count >= rank:
+                percentile = lower_bound + (upper_bound - lower_bound) * (rank - cumulated_count) / count
+                return min(percentile, latency["max"])
+            cumulated_count += count
+            lower_bound = upper_bound
+        return latency["max"]
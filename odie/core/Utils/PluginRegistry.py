@@ -0,0 +1,150 @@
+import imp
+import logging
+import os
+import threading
+import time
+
+from odie.core.Utils.Utils import ModuleNotFoundError
+
+logging.basicConfig()
+logger = logging.getLogger("odie")
+
+
+class PluginRegistry(object):
+    """
+    Class used to resolve the class of a plugin once.
+
+    A plugin (action, tts, stt, player, cue, wakeon) is identified by its package, its module name and the resources
+    folder. The resources folder is checked first, then the packages of odie. The resolved classes are kept until
+    clean is called, the BrainLoader cleans the registry when the brain is loaded so the plugins of the resources
+    folder are read again.
+
+    The resolve time and the instantiation times of each plugin can be read with get_stats.
+    """
+    # (package name, module name, resources dir) -> class
+    _classes = dict()
+    # "package.module" -> timings of the plugin
+    _stats = dict()
+    _lock = threading.Lock()
+
+    def __init__(self):
+        pass
+
+    @classmethod
+    def get_class(cls, package_name, module_name, resources_dir=None):
+        """
+        Return the class of a plugin, resolved on first use
+        :param package_name: name of the package where we will find the module to load (actions, tts, stt, cues)
+        :param module_name: name of the module from the package_name to load. Eg: Snowboy
+        :param resources_dir: the resource directory to check for external resources
+        :return: the class of the plugin
+        """
+        key = (package_name, module_name, resources_dir)
+        with cls._lock:
+            klass = cls._classes.get(key)
+        if klass is not None:
+            return klass
+
+        start_time = time.time()
+        klass = cls._resolve_class(package_name, module_name, resources_dir)
+        resolve_time = time.time() - start_time
+        with cls._lock:
+            cls._classes[key] = klass
+            cls._get_plugin_stats(package_name, module_name)["resolve_time"] = resolve_time
+        return klass
+
+    @classmethod
+    def instantiate(cls, package_name, module_name, parameters=None, resources_dir=None):
+        """
+        Instantiate a plugin with its parameters
+        :param package_name: name of the package of the plugin
+        :param module_name: name of the module of the plugin
+        :param parameters: dict parameters to send as argument to the module
+        :param resources_dir: the resource directory to check for external resources
+        :return: the plugin instance
+        """
+        klass = cls.get_class(package_name, module_name, resources_dir=resources_dir)
+
+        start_time = time.time()
+        if not parameters:
+            instance = klass()
+        elif isinstance(parameters, dict):
+            instance = klass(**parameters)
+        else:
+            instance = klass(parameters)
+        instantiate_time = time.time() - start_time
+
+        with cls._lock:
+            plugin_stats = cls._get_plugin_stats(package_name, module_name)
+            plugin_stats["instances"] += 1
+            plugin_stats["instantiate_time"] += instantiate_time
+        return instance
+
+    @classmethod
+    def get_stats(cls):
+        """
+        Return the timings of the plugins
+        :return: dict "package.module" -> dict with the resolve_time, the number of instances and the total
+        instantiate_time in seconds
+        """
+        with cls._lock:
+            return dict((name, dict(plugin_stats)) for name, plugin_stats in cls._stats.items())
+
+    @classmethod
+    def clean(cls):
+        """
+        Forget the resolved classes and the timings
+        """
+        with cls._lock:
+            cls._classes = dict()
+            cls._stats = dict()
+
+    @classmethod
+    def _get_plugin_stats(cls, package_name, module_name):
+        """
+        Must be called with the lock
+        """
+        name = "%s.%s" % (package_name, module_name.lower())
+        return cls._stats.setdefault(name, {"resolve_time": 0, "instances": 0, "instantiate_time": 0})
+
+    @staticmethod
+    def _resolve_class(package_name, module_name, resources_dir=None):
+        """
+        Load the module of a plugin and return its class
+
+        from my_package.my_module import my_class
+        mod = __import__('my_package.my_module', fromlist=['my_class'])
+        klass = getattr(mod, 'my_class')
+        """
+        if '.' in module_name:
+            composite_action_module = module_name.strip().split(".")
+            package_path = "odie.actions" + "." + composite_action_module[0].lower() + "." + composite_action_module[1].lower()
+            action_module_name = composite_action_module[1]
+            logger.debug("[PluginRegistry] package path : %s" % package_path)
+            if resources_dir is not None:
+                action_resource_path = resources_dir + \
+                                       os.sep + composite_action_module[0].lower() + os.sep + \
+                                       action_module_name.lower()+".py"
+                if os.path.exists(action_resource_path):
+                    imp.load_source(action_module_name.capitalize(), action_resource_path)
+                    package_name = action_module_name.capitalize()
+        else:
+            package_path = "odie." + package_name + "." + module_name.lower() + "." + module_name.lower()
+            logger.debug("[PluginRegistry] package path : %s" % package_path)
+            if resources_dir is not None:
+                neuron_resource_path = resources_dir + os.sep + module_name.lower() \
+                                       + os.sep + module_name.lower() + ".py"
+                if os.path.exists(neuron_resource_path):
+                    imp.load_source(module_name.capitalize(), neuron_resource_path)
+                    package_path = module_name.capitalize()
+                    logger.debug("[PluginRegistry] loading path : %s, as package %s" % (
+                        neuron_resource_path, package_path))
+
+        mod = __import__(package_path, fromlist=[module_name.capitalize()])
+
+        try:
+            return getattr(mod, module_name.capitalize())
+        except AttributeError:
+            logger.debug("Error: No module named %s " % module_name.capitalize())
+            raise ModuleNotFoundError(
+                "The module %s does not exist in package %s" % (module_name.capitalize(), package_name))
@@ -0,0 +1,94 @@
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+import jinja2
+
+logging.basicConfig()
+logger = logging.getLogger("odie")
+
+
+class TemplateCache(object):
+    """
+    Class used to compile the jinja templates once.
+
+    Templates are compiled by a shared jinja2 Environment and kept in a bounded LRU. String templates are keyed by their
+    source, file templates by their path and modification time so an edited file is compiled again.
+    """
+    # maximum number of compiled templates kept
+    max_size = 512
+
+    environment = jinja2.Environment()
+    # key -> compiled template, the least recently used first
+    _templates = OrderedDict()
+    _lock = threading.Lock()
+    hits = 0
+    misses = 0
+
+    def __init__(self):
+        pass
+
+    @classmethod
+    def get_template(cls, source):
+        """
+        Return the compiled template of a string
+        :param source: the jinja template. Eg: "hello {{ name }}"
+        :return: the compiled template
+        :rtype: jinja2.Template
+        """
+        return cls._get_or_compile(("source", source), lambda: source)
+
+    @classmethod
+    def get_file_template(cls, file_path):
+        """
+        Return the compiled template of a file. The file is only read again when it has been modified
+        :param file_path: path of the template file
+        :return: the compiled template
+        :rtype: jinja2.Template
+        """
+        key = ("file", file_path, os.path.getmtime(file_path))
+        return cls._get_or_compile(key, lambda: cls._read_file(file_path))
+
+    @classmethod
+    def render(cls, source, *args, **kwargs):
+        """
+        Render a string template with the given variables, same arguments as jinja2.Template.render
+        :param source: the jinja template
+        :return: the rendered string
+        """
+        return cls.get_template(source).render(*args, **kwargs)
+
+    @classmethod
+    def clean(cls):
+        """
+        Remove all the compiled templates
+        """
+        with cls._lock:
+            cls._templates.clear()
+            cls.hits = 0
+            cls.misses = 0
+
+    @classmethod
+    def _get_or_compile(cls, key, get_source):
+        with cls._lock:
+            template = cls._templates.get(key)
+            if template is not None:
+                cls.hits += 1
+                # move to the end, most recently used
+                cls._templates[key] = cls._templates.pop(key)
+                return template
+            cls.misses += 1
+
+        logger.debug("[TemplateCache] compiling template %s" % str(key[1:]))
+        template = cls.environment.from_string(get_source())
+        with cls._lock:
+            cls._templates[key] = template
+            while len(cls._templates) > cls.max_size:
+                cls._templates.popitem(last=False)
+        return template
+
+    @staticmethod
+    def _read_file(file_path):
+        with open(file_path, 'r') as content_file:
+            return content_file.read()
@@ -1,7 +1,6 @@
 import logging
 import os
 import inspect
-import imp
 import sys
 import re
 import six
@@ -106,55 +105,19 @@ class Utils(object):
         mod = __import__('my_package.my_module', fromlist=['my_class'])
         klass = getattr(mod, 'my_class')
 
+        The class is resolved once by the PluginRegistry, then only instantiated.
+
         :param package_name: name of the package where we will find the module to load (neurons, tts, stt, trigger)
         :param module_name: name of the module from the package_name to load. This one is capitalized. Eg: Snowboy
         :param parameters:  dict parameters to send as argument to the module
         :param resources_dir: the resource directory to check for external resources
         :return:
         """
-        composite_action_module = []
-        if '.' in module_name:
-            composite_action_module = module_name.strip().split(".")
-            package_path = "odie.actions" + "." + composite_action_module[0].lower() + "." + composite_action_module[1].lower()
-            action_module_name = composite_action_module[1]
-            logger.debug("[Utils]-> get_dynamic_class_instantiation : package path : %s" % (package_path))
-            if resources_dir is not None:
-                action_resource_path = resources_dir + \
-                                       os.sep + composite_action_module[0].lower() + os.sep + \
-                                       action_module_name.lower()+".py"
-                if os.path.exists(action_resource_path):
-                    imp.load_source(action_module_name.capitalize(), action_resource_path)
-                    package_name = action_module_name.capitalize()
-        else:
-            package_path = "odie." + package_name + "." + module_name.lower() + "." + module_name.lower()
-            logger.debug("[Utils]-> get_dynamic_class_instantiation : package path : %s" % (package_path))
-            if resources_dir is not None:
-                neuron_resource_path = resources_dir + os.sep + module_name.lower() \
-                                       + os.sep + module_name.lower() + ".py"
-                if os.path.exists(neuron_resource_path):
-                    imp.load_source(module_name.capitalize(), neuron_resource_path)
-                    package_path = module_name.capitalize()
-                    logger.debug("[Utils]-> get_dynamic_class_instantiation : loading path : %s, as package %s" % (
-                        neuron_resource_path, package_path))
-
-        mod = __import__(package_path, fromlist=[module_name.capitalize()])
-
-        try:
-            klass = getattr(mod, module_name.capitalize())
-        except AttributeError:
-            logger.debug("Error: No module named %s " % module_name.capitalize())
-            raise ModuleNotFoundError(
-                "The module %s does not exist in package %s" % (module_name.capitalize(), package_name))
-
-        if klass is not None:
-            # run the plugin
-            if not parameters:
-                return klass()
-            elif isinstance(parameters, dict):
-                return klass(**parameters)
-            else:
-                return klass(parameters)
-        return None
+        from odie.core.Utils.PluginRegistry import PluginRegistry
+        return PluginRegistry.instantiate(package_name=package_name,
+                                          module_name=module_name,
+                                          parameters=parameters,
+                                          resources_dir=resources_dir)
 
     ##################
     #
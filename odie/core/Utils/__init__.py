@@ -1,2 +1,5 @@
 from odie.core.Utils.Utils import Utils
-from odie.core.Utils.FileManager import FileManager
\ No newline at end of file
+from odie.core.Utils.FileManager import FileManager
+from odie.core.Utils.TemplateCache import TemplateCache
+from odie.core.Utils.PluginRegistry import PluginRegistry
+from odie.core.Utils.LatencyHistogram import LatencyHistogram
@@ -1,11 +1,13 @@
 import logging
 import random
-from threading import Thread
-from time import sleep
+import time
+from threading import Event, Thread
 
+from odie.core.Utils.LatencyHistogram import LatencyHistogram
 from odie.core.Utils.RpiUtils import RpiUtils
 
 from odie.core.NeuronLauncher import NeuronLauncher
+from odie.core.NoiseFloorEstimator import NoiseFloorEstimator
 
 from odie.core.OrderListener import OrderListener
 
@@ -50,12 +52,16 @@ class Order(Thread):
 
         # save an instance of the wakeon
         self.wakeon_instance = None
-        self.wakeon_callback_called = False
+        # set by the wakeon callback, time of the detection of the hotword
+        self.wakeon_callback_event = Event()
+        self.wakeon_callback_time = None
         self.is_wakeon_muted = False
 
         # save the current order listener
         self.order_listener = None
-        self.order_listener_callback_called = False
+        # set by the order listener callback, time of the reception of the order
+        self.order_listener_callback_event = Event()
+        self.order_listener_callback_time = None
 
         # boolean used to know id we played the on ready notification at least one time
         self.on_ready_notification_played_once = False
@@ -63,8 +69,18 @@ class Order(Thread):
         # rpi setting for led and mute button
         self.init_rpi_utils()
 
+        # measure the ambient noise while waiting for the hotword, the STT does not calibrate before each order
+        self.noise_floor_estimator = None
+        if self.settings.recognition_options.adjust_for_ambient_noise_second > 0:
+            self.noise_floor_estimator = NoiseFloorEstimator.get_estimator()
+
+        # latency of each transition, from the event that triggers the transition to the entry in the next state
+        self.transition_latencies = LatencyHistogram()
+        self._transition_requested_time = None
+
         # Initialize the state machine
         self.machine = Machine(model=self, states=Order.states, initial='init', queued=True)
+        self._previous_state = self.state
 
         # define transitions
         self.machine.add_transition('start_wakeon', ['init', 'analysing_order'], 'starting_wakeon')
@@ -88,25 +104,25 @@ class Order(Thread):
         self.machine.on_enter_analysing_order('analysing_order_thread')
 
     def run(self):
-        self.start_wakeon()
+        self._trigger(self.start_wakeon)
 
     def start_wakeon_process(self):
         """
         This function will start the wakeon thread that listen for the hotword
         """
-        logger.debug("[MainController] Entering state: %s" % self.state)
+        self._enter_state()
+        self.wakeon_callback_event.clear()
         self.wakeon_instance = WakeonLauncher.get_wakeon(settings=self.settings, callback=self.wakeon_callback)
-        self.wakeon_callback_called = False
         self.wakeon_instance.daemon = True
         # Wait that the odie wakeon is pronounced by the user
         self.wakeon_instance.start()
-        self.next_state()
+        self._trigger(self.next_state)
 
     def play_ready_sound_process(self):
         """
         Play a sound when Odie is ready to be awaken at the first start
         """
-        logger.debug("[MainController] Entering state: %s" % self.state)
+        self._enter_state()
         if (not self.on_ready_notification_played_once and self.settings.play_on_ready_notification == "once") or \
                 self.settings.play_on_ready_notification == "always":
             # we remember that we played the notification one time
@@ -117,35 +133,35 @@ class Order(Thread):
             elif self.settings.on_ready_sounds is not None:
                 random_sound_to_play = self._get_random_sound(self.settings.on_ready_sounds)
                 self.player_instance.play(random_sound_to_play)
-        self.next_state()
+        self._trigger(self.next_state)
 
     def waiting_for_wakeon_callback_thread(self):
         """
         Method to print in debug that the main process is waiting for a wakeon detection
         """
-        logger.debug("[MainController] Entering state: %s" % self.state)
+        self._enter_state()
         if self.is_wakeon_muted:  # the user asked to mute inside the mute action
             Utils.print_info("Odie is muted")
             self.wakeon_instance.pause()
         else:
             Utils.print_info("Waiting for wakeon detection")
-        # this loop is used to keep the main thread alive
-        while not self.wakeon_callback_called:
-            sleep(0.1)
-        self.next_state()
+        if self.noise_floor_estimator is not None:
+            self.noise_floor_estimator.set_idle(True)
+        self.wakeon_callback_event.wait()
+        if self.noise_floor_estimator is not None:
+            self.noise_floor_estimator.set_idle(False)
+        self._trigger(self.next_state, requested_time=self.wakeon_callback_time)
 
     def waiting_for_order_listener_callback_thread(self):
         """
         Method to print in debug that the main process is waiting for an order to analyse
         """
-        logger.debug("[MainController] Entering state: %s" % self.state)
-        # this loop is used to keep the main thread alive
-        while not self.order_listener_callback_called:
-            sleep(0.1)
+        self._enter_state()
+        self.order_listener_callback_event.wait()
         if self.settings.rpi_settings:
             if self.settings.rpi_settings.pin_led_listening:
                 RpiUtils.switch_pin_to_off(self.settings.rpi_settings.pin_led_listening)
-        self.next_state()
+        self._trigger(self.next_state, requested_time=self.order_listener_callback_time)
 
     def wakeon_callback(self):
         """
@@ -153,42 +169,43 @@ class Order(Thread):
         The user can speak out loud his order during this time.
         """
         logger.debug("[MainController] Wakeon callback called, switching to the next state")
-        self.wakeon_callback_called = True
+        self.wakeon_callback_time = time.time()
+        self.wakeon_callback_event.set()
 
     def stop_wakeon_process(self):
         """
         The wakeon has been awaken, we don't needed it anymore
         :return:
         """
-        logger.debug("[MainController] Entering state: %s" % self.state)
+        self._enter_state()
         self.wakeon_instance.stop()
-        self.next_state()
+        self._trigger(self.next_state)
 
     def start_order_listener_thread(self):
         """
         Start the STT engine thread
         """
-        logger.debug("[MainController] Entering state: %s" % self.state)
+        self._enter_state()
         # start listening for an order
-        self.order_listener_callback_called = False
+        self.order_listener_callback_event.clear()
         self.order_listener = OrderListener(callback=self.order_listener_callback)
         self.order_listener.daemon = True
         self.order_listener.start()
-        self.next_state()
+        self._trigger(self.next_state)
 
     def play_wake_up_answer_thread(self):
         """
         Play a sound or make Odie say something to notify the user that she has been awaken and now
         waiting for order
         """
-        logger.debug("[MainController] Entering state: %s" % self.state)
+        self._enter_state()
         # if random wake answer sentence are present, we play this
         if self.settings.random_wake_up_answers is not None:
             Say(message=self.settings.random_wake_up_answers)
         else:
             random_sound_to_play = self._get_random_sound(self.settings.random_wake_up_sounds)
             self.player_instance.play(random_sound_to_play)
-        self.next_state()
+        self._trigger(self.next_state)
 
     def order_listener_callback(self, order):
         """
@@ -198,20 +215,59 @@ class Order(Thread):
         """
         logger.debug("[MainController] Order listener callback called. Order to process: %s" % order)
         self.order_to_process = order
-        self.order_listener_callback_called = True
+        self.order_listener_callback_time = time.time()
+        self.order_listener_callback_event.set()
 
     def analysing_order_thread(self):
         """
         Start the order analyser with the caught order to process
         """
+        self._enter_state()
         logger.debug("[MainController] order in analysing_order_thread %s" % self.order_to_process)
         NeuronLauncher.run_matching_neuron_from_order(self.order_to_process,
                                                       self.brain,
                                                       self.settings,
                                                       is_api_call=False)
 
-        # return to the state "unpausing_wakeon"
-        self.start_wakeon()
+        # return to the state "starting_wakeon"
+        self._trigger(self.start_wakeon)
+
+    def _trigger(self, trigger, requested_time=None):
+        """
+        Call a trigger of the state machine, the latency of the transition is measured from requested_time
+        :param trigger: the trigger method, Eg: self.next_state
+        :param requested_time: time of the event that triggers the transition, now by default
+        """
+        self._transition_requested_time = requested_time if requested_time is not None else time.time()
+        trigger()
+
+    def _enter_state(self):
+        """
+        Record the latency of the transition to the current state
+        """
+        logger.debug("[MainController] Entering state: %s" % self.state)
+        if self._transition_requested_time is not None:
+            self.transition_latencies.add("%s->%s" % (self._previous_state, self.state),
+                                          time.time() - self._transition_requested_time)
+            self._transition_requested_time = None
+        self._previous_state = self.state
+
+    def get_wakeon_latencies(self):
+        """
+        Return the latency histogram of the detections of the wakeon, if the wakeon measures it
+        :return: dict, empty if not measured
+        """
+        get_detection_latencies = getattr(self.wakeon_instance, "get_detection_latencies", None)
+        if get_detection_latencies is None:
+            return dict()
+        return get_detection_latencies()
+
+    def get_transition_latencies(self):
+        """
+        Return the latency histogram of the transitions of the state machine
+        :return: dict "source->destination" -> count, mean and max in milliseconds, and the buckets
+        """
+        return self.transition_latencies.get_stats()
 
     @staticmethod
     def _get_random_sound(random_wake_up_sounds):
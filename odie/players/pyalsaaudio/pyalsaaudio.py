@@ -1,8 +1,8 @@
 # -*- coding: utf-8 -*-
 import alsaaudio
 import logging
-import wave
 
+from odie.core.AudioOutput import AudioOutput
 from odie.core.PlayerModule import PlayerModule
 
 logging.basicConfig()
@@ -32,6 +32,26 @@ def bits_to_samplefmt(bits):
         raise ValueError('Unsupported format')
 
 
+class PyalsaaudioOutput(AudioOutput):
+    """
+    Output PCM of an ALSA device
+    """
+
+    def _open_stream(self, sample_width, channels, rate):
+        stream = alsaaudio.PCM(type=alsaaudio.PCM_PLAYBACK,
+                               mode=alsaaudio.PCM_NORMAL,
+                               device=self.device)
+        # Set attributes
+        stream.setchannels(channels)
+        stream.setrate(rate)
+        bits = sample_width * 8
+        stream.setformat(bits_to_samplefmt(bits))
+        stream.setperiodsize(CHUNK)
+
+        logger.debug("[PyAlsaAudioPlayer] %d channels, %d sampling rate, %d bit" % (channels, rate, bits))
+        return stream
+
+
 class Pyalsaaudio(PlayerModule):
     """
     This Class is representing the Player Object used to play the all sound of the system.
@@ -61,29 +81,7 @@ class Pyalsaaudio(PlayerModule):
 
     def play(self, file_path):
 
-        if self.convert:
-            self.convert_mp3_to_wav(file_path_mp3=file_path)
-        f = wave.open(file_path, 'rb')
-        pcm_type = alsaaudio.PCM_PLAYBACK
-        stream = alsaaudio.PCM(type=pcm_type,
-                               mode=alsaaudio.PCM_NORMAL,
-                               device=self.device)
-        # Set attributes
-        stream.setchannels(f.getnchannels())
-        stream.setrate(f.getframerate())
-        bits = f.getsampwidth()*8
-        stream.setformat(bits_to_samplefmt(bits))        
-        stream.setperiodsize(CHUNK)
-        
-        logger.debug("[PyAlsaAudioPlayer] %d channels, %d sampling rate, %d bit" % (f.getnchannels(),
-                                                                                    f.getframerate(),
-                                                                                    bits))
-        
-        data = f.readframes(CHUNK)
-        while data:
-            # Read data from stdin
-            stream.write(data)
-            data = f.readframes(CHUNK)
-     
-        f.close()
-        stream.close()
+        # converted once, the wav of the frequently played sounds is read from memory
+        file_path = self.get_wav(file_path)
+        # the PCM of the device stays open between the sounds
+        PyalsaaudioOutput.get_output(device=self.device).play(file_path)
@@ -1,15 +1,35 @@
 # -*- coding: utf-8 -*-
 import logging
-import wave
 
 import pyaudio
 
+from odie.core.AudioOutput import AudioOutput, CHUNK
 from odie.core.PlayerModule import PlayerModule
 
 logging.basicConfig()
 logger = logging.getLogger("odie")
 
-CHUNK = 1024
+
+class PyaudioOutput(AudioOutput):
+    """
+    Output stream of a device opened with PyAudio. PortAudio is initialised once per device
+    """
+
+    def __init__(self, device=None):
+        self.pyaudio = pyaudio.PyAudio()
+        super(PyaudioOutput, self).__init__(device=device)
+
+    def _open_stream(self, sample_width, channels, rate):
+        return self.pyaudio.open(format=self.pyaudio.get_format_from_width(sample_width),
+                                 channels=channels,
+                                 rate=rate,
+                                 frames_per_buffer=CHUNK,
+                                 output_device_index=self.device,
+                                 output=True)
+
+    def _close_stream(self, stream):
+        stream.stop_stream()
+        stream.close()
 
 
 class Pyaudioplayer(PlayerModule):
@@ -21,6 +41,8 @@ class Pyaudioplayer(PlayerModule):
         super(Pyaudioplayer, self).__init__(**kwargs)
         logger.debug("[Pyaudioplayer.__init__] instance")
         logger.debug("[Pyaudioplayer.__init__] args : %s " % str(kwargs))
+        # index of the output device, None for the default device
+        self.device = kwargs.get('device', None)
 
     def play(self, file_path):
         """
@@ -28,34 +50,9 @@ class Pyaudioplayer(PlayerModule):
         :param file_path: The file path of the sound to play. Must be wav format
         :type file_path: str              
         """
-        if self.convert:
-            self.convert_mp3_to_wav(file_path_mp3=file_path)
-        # open the wave file
-        wf = wave.open(file_path, 'rb')
-
-        # instantiate PyAudio
-        p = pyaudio.PyAudio()
-
-        # open stream (2)
-        stream = p.open(format=p.get_format_from_width(wf.getsampwidth()),
-                        channels=wf.getnchannels(),
-                        rate=wf.getframerate(),
-                        # frames_per_buffer=CHUNK,
-                        output=True)
-
-        # read data
-        data = wf.readframes(CHUNK)
+        # converted once, the wav of the frequently played sounds is read from memory
+        file_path = self.get_wav(file_path)
 
         logger.debug("Pyplayer file: %s" % str(file_path))
-
-        # play stream (3)
-        while len(data) > 0:
-            stream.write(data)
-            data = wf.readframes(CHUNK)
-
-        # stop stream (4)
-        stream.stop_stream()
-        stream.close()
-
-        # close PyAudio
-        p.terminate()
+        # the stream of the device stays open between the sounds
+        PyaudioOutput.get_output(device=self.device).play(file_path)
@@ -1,9 +1,11 @@
 # -*- coding: utf-8 -*-
 import logging
+import wave
 
 import sounddevice as sd
 import soundfile as sf
 
+from odie.core.AudioOutput import AudioOutput, CHUNK
 from odie.core.PlayerModule import PlayerModule
 
 logging.basicConfig()
@@ -11,6 +13,56 @@ logger = logging.getLogger("odie")
 
 FS = 48000
 
+# sample width of the wav file -> sounddevice dtype
+SAMPLE_WIDTH_DTYPES = {1: 'uint8',
+                       2: 'int16',
+                       3: 'int24',
+                       4: 'int32'}
+
+
+class SoundfileReader(object):
+    """
+    Reader of the frames of a file in any format of libsndfile, as 16 bits samples
+    """
+
+    def __init__(self, file_path):
+        self._sound_file = sf.SoundFile(file_path)
+        self.format = (2, self._sound_file.channels, self._sound_file.samplerate)
+
+    def read_frames(self, number_of_frames):
+        return bytes(self._sound_file.buffer_read(number_of_frames, dtype='int16'))
+
+    def close(self):
+        self._sound_file.close()
+
+
+class SounddeviceOutput(AudioOutput):
+    """
+    Output stream of a device opened with sounddevice. The files that are not PCM wav are read with soundfile
+    """
+
+    def _open_file(self, file_path):
+        try:
+            return super(SounddeviceOutput, self)._open_file(file_path)
+        except (wave.Error, EOFError):
+            # Eg: FLAC, OGG or float wav
+            if hasattr(file_path, "seek"):
+                file_path.seek(0)
+            return SoundfileReader(file_path)
+
+    def _open_stream(self, sample_width, channels, rate):
+        stream = sd.RawOutputStream(samplerate=rate,
+                                    channels=channels,
+                                    dtype=SAMPLE_WIDTH_DTYPES[sample_width],
+                                    blocksize=CHUNK,
+                                    device=self.device)
+        stream.start()
+        return stream
+
+    def _close_stream(self, stream):
+        stream.stop()
+        stream.close()
+
 
 class Sounddeviceplayer(PlayerModule):
     """
@@ -21,11 +73,12 @@ class Sounddeviceplayer(PlayerModule):
         super(Sounddeviceplayer, self).__init__(**kwargs)
         logger.debug("[Sounddeviceplayer.__init__] instance")
         logger.debug("[Sounddeviceplayer.__init__] args : %s " % str(kwargs))
+        # name or index of the output device, None for the default device
+        self.device = kwargs.get('device', None)
 
     def play(self, file_path):
 
-        if self.convert:
-            self.convert_mp3_to_wav(file_path_mp3=file_path)
-        data, fs = sf.read(file_path)
-        sd.play(data, fs)
-        sd.wait()
+        # converted once, the wav of the frequently played sounds is read from memory
+        file_path = self.get_wav(file_path)
+        # the wav file is streamed by chunks to the stream of the device, which stays open between the sounds
+        SounddeviceOutput.get_output(device=self.device).play(file_path)
@@ -1,19 +1,77 @@
+import atexit
+import collections
+import hashlib
+import json
 import logging
-import pandas as pd
+import re
+import threading
+
 from sqlalchemy import create_engine
 import psycopg2
+from psycopg2.extras import execute_values
+
+from odie.postgres.PostgresPool import PostgresPool
 
 logging.basicConfig()
 logger = logging.getLogger("odie")
 
+# full text search of the orders, prepared once on each pooled connection
+SEARCH_MATCH_NEURON_STATEMENT = "PREPARE search_match_neuron (text, integer) AS " \
+                                "SELECT name, cue FROM brain " \
+                                "WHERE to_tsvector('english', cue) @@ to_tsquery('english', $1) " \
+                                "ORDER BY ts_rank_cd(to_tsvector('english', cue), to_tsquery('english', $1)) DESC " \
+                                "LIMIT $2;"
+# error code of PostgreSQL when executing a statement that is not prepared
+INVALID_SQL_STATEMENT_NAME = "26000"
+
+# result of a brain table synchronisation: number of neurons added, updated, removed, left untouched,
+# and number of rows deleted and inserted
+BrainTableSync = collections.namedtuple('BrainTableSync', ['added', 'updated', 'removed', 'unchanged',
+                                                           'deleted_rows', 'inserted_rows'])
+
 
 class PostgresManager(object):
     """
     Class used to manage PostgreSQL
     """
+    # settings of the pool -> PostgresPool
+    _pools = dict()
+    _pools_lock = threading.Lock()
+
     def __init__(self):
         pass
 
+    @classmethod
+    def get_pool(cls, pg):
+        """
+        Return the connection pool of the given PostgreSQL settings. The pool is created on first call and closed
+        when odie exits.
+        :param pg: the PostgreSQL settings
+        :type pg: Postgres
+        :return: the pool
+        :rtype: PostgresPool
+        """
+        key = tuple(sorted(pg.serialize().items()))
+        with cls._pools_lock:
+            if key not in cls._pools:
+                if not cls._pools:
+                    atexit.register(cls.close_pools)
+                logger.debug("[PostgresManager] creating connection pool to %s:%s" % (pg.host, pg.port))
+                cls._pools[key] = PostgresPool(pg, prepared_statements={
+                    "search_match_neuron": SEARCH_MATCH_NEURON_STATEMENT
+                })
+            return cls._pools[key]
+
+    @classmethod
+    def close_pools(cls):
+        """
+        Close all the connections of the pools
+        """
+        with cls._pools_lock:
+            for pg_pool in cls._pools.values():
+                pg_pool.close()
+            cls._pools = dict()
+
     # @staticmethod
     def get_connection(host, database, user, password):
         """
@@ -61,73 +119,153 @@ class PostgresManager(object):
         """
         try:
             cur = con.cursor()
-            cur.execute("CREATE INDEX order_idx ON brain USING GIN (to_tsvector('english', order));")
+            cur.execute("CREATE INDEX IF NOT EXISTS order_idx ON brain USING GIN (to_tsvector('english', cue));")
+            con.commit()
             return True
         except:
             logger.debug("postgresql failed to create index brain")
             return False
 
-    def search_match_neuron(con=None, term=None):
+    @staticmethod
+    def get_tsquery(term):
+        """
+        Build a to_tsquery expression matching any word of the term. Eg: "hello world" -> "hello | world"
+        :param term: the sentence said by the user
+        :return: the tsquery expression, empty if the term has no word
+        """
+        return " | ".join(re.findall(r"\w+", term.lower(), re.UNICODE))
+
+    @staticmethod
+    def search_match_neuron(con=None, term=None, limit=1):
         """
         this function use full text search to recover of the neurons from the brain table that matches the term
+        :param con: a connection borrowed from the pool, see get_pool. The search statement is prepared on it
+        :param term: the sentence said by the user
+        :param limit: maximum number of neurons to return, the best ranked first
+        :return: list of tuple (name, cue)
         """
+        tsquery = PostgresManager.get_tsquery(term)
+        if not tsquery:
+            return list()
         try:
             cur = con.cursor()
-            # con.execute("SELECT name FROM brain
-            #             WHERE to_tsvector('english', order) @@ to_tsquery('english', '{}')
-            #             ORDER BY ts_rank_cd(to_tsvector('english', order), to_tsquery('english', '{}') )
-            #             DESC LIMIT 1;".format(term))
-            # testing simple execution
-            con.execute("SELECT name, cues FROM brain WHERE to_tsvector('english', order) @@ to_tsquery('english', '{}')LIMIT 1;".format(term))
+            cur.execute("EXECUTE search_match_neuron (%s, %s);", (tsquery, limit))
             return cur.fetchall()
-        except:
-            logger.debug("postgresql failed to retreive neuron from brain")
+        except psycopg2.Error as e:
+            con.rollback()
+            if e.pgcode != INVALID_SQL_STATEMENT_NAME:
+                logger.debug("postgresql failed to retreive neuron from brain: %s" % e)
+                return list()
+
+        # the statement was not prepared when the connection was opened, the brain table did not exist yet
+        try:
+            cur = con.cursor()
+            cur.execute(SEARCH_MATCH_NEURON_STATEMENT)
+            cur.execute("EXECUTE search_match_neuron (%s, %s);", (tsquery, limit))
+            return cur.fetchall()
+        except psycopg2.Error as e:
+            logger.debug("postgresql failed to retreive neuron from brain: %s" % e)
+            con.rollback()
             return list()
 
-    def save_brain_table(pg=None, brain=None):
+    @staticmethod
+    def save_brain_table(pg=None, brain=None, incremental=True):
         """
-        function to create the brain table in postgres.
-        if the table exists it gets dropped and recreated with the new brain.
+        function to save the brain in the brain table of postgres, one row per order cue.
+        In incremental mode only the neurons added, changed or removed since the last save are written, the table and
+        its order_idx index are kept. Otherwise the table gets dropped and recreated with the new brain.
         :param pg: the PostgreSQL settings
         :type pg: object
         :param brain: the brain to be saved
         :type brain: brain object
+        :param incremental: False to drop and recreate the table
+        :return: the BrainTableSync report, False if the brain could not be saved
         """
+        try:
+            with PostgresManager.get_pool(pg).connection() as con:
+                cur = con.cursor()
+                if not incremental or not PostgresManager._is_brain_table_up_to_date(cur):
+                    logger.debug("[CreateBrainTable] dropping brain table")
+                    cur.execute("DROP TABLE IF EXISTS brain;")
+                cur.execute("CREATE TABLE IF NOT EXISTS brain "
+                            "(name TEXT NOT NULL, cue TEXT NOT NULL, neuron_hash TEXT NOT NULL);")
+                cur.execute("CREATE INDEX IF NOT EXISTS brain_name_idx ON brain (name);")
+                cur.execute("CREATE INDEX IF NOT EXISTS order_idx ON brain USING GIN (to_tsvector('english', cue));")
 
-        engine = PostgresManager.create_engine(pg.host, pg.port, pg.database, pg.user, pg.password)
+                cur.execute("SELECT DISTINCT name, neuron_hash FROM brain;")
+                saved_hashes = dict(cur.fetchall())
+                brain_sync = PostgresManager._sync_brain_rows(cur, brain, saved_hashes)
+            logger.debug("[CreateBrainTable] %s" % str(brain_sync))
+            return brain_sync
+        except Exception as e:
+            logger.debug("postgresql failed to insert brain: %s" % e)
+            return False
 
-        # name of postgres table and python dictionary
-        try:
-            logger.debug("[CreateBrainTable] begins with brain")
-            braindict = {}
-            neuron_names = []
-            neuron_cues = []
-            n_number = 0
-            for neuron in brain.neurons:
-                brain_insert = neuron.serialize()
-                logger.debug("[CreateBrainTable] neuron serialized: {}".format(brain_insert))
-                neuron_names.append(brain_insert['name'])
-                logger.debug("[CreateBrainTable] name: {}".format(neuron_names))
-                logger.debug("[CreateBrainTable] cues: {}".format(brain_insert['cues']))
-
-                for cue in brain_insert['cues']:
-                    for key in cue:
-                        logger.debug("[CreateBrainTable] cue dict: {}, {}".format(key, cue[key]))
-                        if key == 'order' or key == 'Order':
-                            neuron_cues.append(cue[key])
-                n_number += 1
-            for neuron in range(n_number):
-                braindict[neuron] = {'name': neuron_names[neuron], 'cue': neuron_cues[neuron]}
-            logger.debug("[CreateBrainTable] this is the df brain: {} , {}".format(braindict.keys(), braindict.values()))
-            dfLoad = pd.DataFrame.from_dict(braindict)
-            logger.debug("[CreateBrainTable] df created: {}".format(dfLoad.head()))
-            dfLoad.to_sql(name="brain", con=engine, if_exists="replace", index=False)
-            con = PostgresManager.get_connection(pg.host, pg.database, pg.user, pg.password)
-            idx_success = PostgresManager.create_text_search_index(con)
-            if idx_success:
-                return True
+    @staticmethod
+    def get_neuron_hash(neuron):
+        """
+        Hash of the serialised neuron, used to find the neurons changed since the last save
+        :param neuron: the neuron
+        :return: the hexadecimal digest
+        """
+        serialized_neuron = json.dumps(neuron.serialize(), sort_keys=True, default=str)
+        return hashlib.sha1(serialized_neuron.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _is_brain_table_up_to_date(cur):
+        """
+        Check that the brain table, if any, has been created by the incremental save
+        :param cur: the cursor
+        :return: False if the table has to be recreated
+        """
+        cur.execute("SELECT column_name FROM information_schema.columns WHERE table_name = 'brain';")
+        columns = [row[0] for row in cur.fetchall()]
+        return not columns or "neuron_hash" in columns
+
+    @staticmethod
+    def _sync_brain_rows(cur, brain, saved_hashes):
+        """
+        Write the rows of the neurons that are new or changed and delete the removed ones, in one statement each
+        :param cur: the cursor
+        :param brain: the brain to be saved
+        :param saved_hashes: dict of neuron name -> neuron hash in the table
+        :return: the BrainTableSync report
+        """
+        added = updated = unchanged = 0
+        names_to_delete = list()
+        rows_to_insert = list()
+        brain_names = set()
+        for neuron in brain.neurons:
+            orders = [cue.parameters for cue in neuron.cues if cue.name in ("order", "Order")]
+            if not orders:
+                # the neuron can not be found by an order
+                continue
+            brain_names.add(neuron.name)
+            neuron_hash = PostgresManager.get_neuron_hash(neuron)
+            saved_hash = saved_hashes.get(neuron.name)
+            if saved_hash == neuron_hash:
+                unchanged += 1
+                continue
+            if saved_hash is None:
+                added += 1
             else:
-                return False
-        except:
-            logger.debug("postgresql failed to insert brain")
-            return False
+                updated += 1
+                names_to_delete.append(neuron.name)
+            rows_to_insert.extend((neuron.name, str(order), neuron_hash) for order in orders)
+
+        removed_names = [name for name in saved_hashes if name not in brain_names]
+        names_to_delete.extend(removed_names)
+
+        deleted_rows = 0
+        if names_to_delete:
+            cur.execute("DELETE FROM brain WHERE name = ANY(%s);", (names_to_delete,))
+            deleted_rows = cur.rowcount
+        if rows_to_insert:
+            execute_values(cur, "INSERT INTO brain (name, cue, neuron_hash) VALUES %s;", rows_to_insert)
+
+        return BrainTableSync(added=added,
+                              updated=updated,
+                              removed=len(removed_names),
+                              unchanged=unchanged,
+                              deleted_rows=deleted_rows,
+                              inserted_rows=len(rows_to_insert))
@@ -0,0 +1,157 @@
+import logging
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+
+import psycopg2
+from psycopg2 import pool
+
+logging.basicConfig()
+logger = logging.getLogger("odie")
+
+
+class PostgresPoolExhausted(Exception):
+    """
+    No connection has been released by the other threads in time
+
+    .. seealso:: PostgresPool
+    """
+    pass
+
+
+class PostgresPool(object):
+    """
+    Bounded pool of PostgreSQL connections, built from the Postgres settings.
+
+    Connections are opened once and reused. A connection idle for more than health_check_interval seconds is checked
+    before being handed out, and replaced if the server dropped it. Every connection prepares the statements given in
+    prepared_statements when opened, so they are planned once per connection instead of once per query.
+
+    .. seealso:: Postgres, PostgresManager
+    """
+
+    def __init__(self, postgres, prepared_statements=None):
+        """
+        :param postgres: the PostgreSQL settings
+        :type postgres: Postgres
+        :param prepared_statements: dict of statement name -> "PREPARE" statement to run on each new connection
+        """
+        self.postgres = postgres
+        self.prepared_statements = prepared_statements if prepared_statements is not None else dict()
+        self.health_check_interval = postgres.health_check_interval
+        self.connection_timeout = postgres.connection_timeout
+
+        self._pool = pool.ThreadedConnectionPool(minconn=postgres.pool_min_size,
+                                                 maxconn=postgres.pool_max_size,
+                                                 host=postgres.host,
+                                                 port=postgres.port,
+                                                 dbname=postgres.database,
+                                                 user=postgres.user,
+                                                 password=postgres.password)
+        # the psycopg2 pool raises when it is exhausted, the semaphore makes the callers wait instead
+        self._available = threading.BoundedSemaphore(postgres.pool_max_size)
+        self._lock = threading.Lock()
+        # connection -> time of the last release, for the connections already prepared. Keyed by the connection
+        # itself: the id of a connection closed by the psycopg2 pool can be reused by a new one
+        self._last_used = weakref.WeakKeyDictionary()
+
+    @contextmanager
+    def connection(self):
+        """
+        Borrow a healthy connection from the pool. The transaction is committed when the block succeeds and rolled
+        back otherwise, then the connection goes back to the pool.
+
+        :Example:
+
+            with pg_pool.connection() as con:
+                cur = con.cursor()
+
+        .. raises:: PostgresPoolExhausted
+        """
+        if not self._available.acquire(timeout=self.connection_timeout):
+            raise PostgresPoolExhausted("No PostgreSQL connection available after %s seconds"
+                                        % self.connection_timeout)
+        try:
+            con = self._get_healthy_connection()
+            broken = False
+            try:
+                yield con
+                con.commit()
+            except (psycopg2.OperationalError, psycopg2.InterfaceError):
+                broken = True
+                raise
+            except Exception:
+                con.rollback()
+                raise
+            finally:
+                self._release(con, broken=broken)
+        finally:
+            self._available.release()
+
+    def close(self):
+        """
+        Close every connection of the pool
+        """
+        with self._lock:
+            self._last_used = weakref.WeakKeyDictionary()
+            self._pool.closeall()
+
+    def _get_healthy_connection(self):
+        """
+        Get a connection from the pool, replacing it while the server does not answer
+        :return: an open connection with the statements prepared
+        """
+        while True:
+            con = self._pool.getconn()
+            with self._lock:
+                last_used = self._last_used.get(con)
+            if last_used is None:
+                # new connection
+                self._prepare(con)
+                return con
+            if not con.closed and (time.time() - last_used < self.health_check_interval or self._ping(con)):
+                return con
+            logger.debug("[PostgresPool] dropping a broken connection")
+            self._release(con, broken=True)
+
+    def _prepare(self, con):
+        """
+        Prepare the statements on a new connection. A statement that can not be prepared yet, because the table it
+        reads does not exist, is skipped: the user of the statement has to prepare it later.
+        :param con: the new connection
+        """
+        for name, statement in self.prepared_statements.items():
+            logger.debug("[PostgresPool] preparing statement %s" % name)
+            try:
+                cur = con.cursor()
+                cur.execute(statement)
+                cur.close()
+                con.commit()
+            except psycopg2.Error as e:
+                logger.debug("[PostgresPool] statement %s not prepared: %s" % (name, e))
+                con.rollback()
+
+    @staticmethod
+    def _ping(con):
+        try:
+            cur = con.cursor()
+            cur.execute("SELECT 1;")
+            cur.close()
+            con.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def _release(self, con, broken=False):
+        close = broken or bool(con.closed)
+        with self._lock:
+            if close:
+                self._last_used.pop(con, None)
+            else:
+                self._last_used[con] = time.time()
+        self._pool.putconn(con, close=close)
+        if con.closed:
+            # the psycopg2 pool closes the connections above its minimum size
+            with self._lock:
+                self._last_used.pop(con, None)
@@ -1 +1,2 @@
-from odie.postgres.PostgreManager import PostgresManager
\ No newline at end of file
+from odie.postgres.PostgreManager import PostgresManager
+from odie.postgres.PostgresPool import PostgresPool
@@ -1,16 +1,68 @@
-from threading import Thread
-from time import sleep
+from threading import Event, Thread
 
 import logging
 import speech_recognition as sr
 
 from odie import Utils, SettingLoader
+from odie.core.MicrophoneCapture import MicrophoneCapture
+from odie.core.NoiseFloorEstimator import NoiseFloorEstimator
 from odie.core.Utils.RpiUtils import RpiUtils
 
 logging.basicConfig()
 logger = logging.getLogger("odie")
 
 
+class MicrophoneCaptureStream(object):
+    """
+    Stream of a MicrophoneCaptureSource, read by the Recognizer
+    """
+
+    def __init__(self, capture, ring_buffer):
+        self.capture = capture
+        self.ring_buffer = ring_buffer
+
+    def read(self, frame_count):
+        """
+        Wait for the captured frames
+        :param frame_count: number of frames to read
+        :return: the bytes of the frames, empty once the stream is closed
+        """
+        size = frame_count * self.capture.frame_size
+        self.ring_buffer.wait(size=size)
+        return self.ring_buffer.get(size)
+
+    def close(self):
+        self.capture.close_consumer(self.ring_buffer)
+
+
+class MicrophoneCaptureSource(sr.AudioSource):
+    """
+    Audio source of the Recognizer reading the microphone shared with the wakeon, instead of opening the device
+
+    .. seealso:: MicrophoneCapture
+    """
+
+    def __init__(self, pre_roll=False, chunk_size=1024):
+        """
+        :param pre_roll: if True, the audio starts with the audio captured since the detection of the hotword
+        :param chunk_size: number of frames read at a time
+        """
+        self.capture = MicrophoneCapture.get_capture()
+        self.pre_roll = pre_roll
+        self.SAMPLE_RATE = self.capture.rate
+        self.SAMPLE_WIDTH = self.capture.sample_width
+        self.CHUNK = chunk_size
+        self.stream = None
+
+    def __enter__(self):
+        self.stream = MicrophoneCaptureStream(self.capture, self.capture.open_consumer(pre_roll=self.pre_roll))
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stream.close()
+        self.stream = None
+
+
 class SpeechRecognition(Thread):
 
     def __init__(self, audio_file=None):
@@ -19,10 +71,11 @@ class SpeechRecognition(Thread):
         """
         super(SpeechRecognition, self).__init__()
         self.recognizer = sr.Recognizer()
-        self.microphone = sr.Microphone()
+        self.microphone = None
         self.callback = None
         self.stop_thread = None
-        self.kill_yourself = False
+        # set to stop listening the microphone
+        self.kill_yourself = Event()
         self.audio_stream = None
 
         # get global configuration
@@ -31,24 +84,34 @@ class SpeechRecognition(Thread):
 
         if audio_file is None:
             # audio file not set, we need to capture a sample from the microphone
-            with self.microphone as source:
-                if self.settings.recognition_options.adjust_for_ambient_noise_second > 0:
-                    # threshold is calculated from capturing ambient sound
+            # the order starts with the audio captured since the detection of the hotword
+            self.microphone = MicrophoneCaptureSource(pre_roll=True)
+            if self.settings.recognition_options.adjust_for_ambient_noise_second > 0:
+                # threshold is calculated from the ambient sound captured in background
+                noise_floor_estimator = NoiseFloorEstimator.get_estimator()
+                energy_threshold = noise_floor_estimator.get_energy_threshold()
+                if energy_threshold is not None:
+                    logger.debug("[SpeechRecognition] threshold calculated in background")
+                    self.recognizer.energy_threshold = energy_threshold
+                else:
+                    # the ambient noise has not been measured yet
                     logger.debug("[SpeechRecognition] threshold calculated by "
                                  "capturing ambient noise during %s seconds" %
                                  self.settings.recognition_options.adjust_for_ambient_noise_second)
                     Utils.print_info("[SpeechRecognition] capturing ambient sound during %s seconds" %
                                      self.settings.recognition_options.adjust_for_ambient_noise_second)
-                    self.recognizer.adjust_for_ambient_noise(source,
-                                                             duration=self.settings.
-                                                             recognition_options.adjust_for_ambient_noise_second)
-                else:
-                    # threshold is defined manually
-                    logger.debug("[SpeechRecognition] threshold defined by settings: %s" %
-                                 self.settings.recognition_options.energy_threshold)
-                    self.recognizer.energy_threshold = self.settings.recognition_options.energy_threshold
+                    with MicrophoneCaptureSource() as source:
+                        self.recognizer.adjust_for_ambient_noise(source,
+                                                                 duration=self.settings.recognition_options.
+                                                                 adjust_for_ambient_noise_second)
+                    noise_floor_estimator.update(self.recognizer.energy_threshold)
+            else:
+                # threshold is defined manually
+                logger.debug("[SpeechRecognition] threshold defined by settings: %s" %
+                             self.settings.recognition_options.energy_threshold)
+                self.recognizer.energy_threshold = self.settings.recognition_options.energy_threshold
 
-                Utils.print_info("Threshold set to: %s" % self.recognizer.energy_threshold)
+            Utils.print_info("Threshold set to: %s" % self.recognizer.energy_threshold)
         else:
             # audio file provided
             with sr.AudioFile(audio_file) as source:
@@ -65,8 +128,7 @@ class SpeechRecognition(Thread):
                 if self.settings.rpi_settings.pin_led_listening:
                     RpiUtils.switch_pin_to_on(self.settings.rpi_settings.pin_led_listening)
             self.stop_thread = self.recognizer.listen_in_background(self.microphone, self.callback)
-            while not self.kill_yourself:
-                sleep(0.1)
+            self.kill_yourself.wait()
             logger.debug("kill the speech recognition process")
             self.stop_thread()
         else:
@@ -79,7 +141,7 @@ class SpeechRecognition(Thread):
         self.start()
 
     def stop_listening(self):
-        self.kill_yourself = True
+        self.kill_yourself.set()
 
     def set_callback(self, callback):
         """
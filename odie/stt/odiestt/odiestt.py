@@ -1,16 +1,31 @@
 import logging
+import threading
+import time
 
+import six
 import speech_recognition as sr
 
 from odie.core import Utils
+from odie.core.ConfigurationManager import BrainLoader
 from odie.stt.Utils import SpeechRecognition
-from odie.stt.odiestt.recognizer import Recognizer
+from odie.stt.odiestt.recognizer import Recognizer, RequestError
 
 logging.basicConfig()
 logger = logging.getLogger("odie")
 
+# seconds before sending a vocabulary again after a failure, doubled after each failure up to the maximum
+VOCABULARY_RETRY_SECOND = 30
+VOCABULARY_MAX_RETRY_SECOND = 3600
+
 
 class Odiestt(SpeechRecognition):
+    # host -> id of the brain vocabulary sent to the host
+    _sent_vocabularies = dict()
+    # host -> tuple (number of failures, time of the next try) of the vocabularies that could not be sent
+    _vocabulary_failures = dict()
+    # hosts a vocabulary is being sent to
+    _sending_vocabularies = set()
+    _sent_vocabularies_lock = threading.Lock()
 
     def __init__(self, callback=None, **kwargs):
         """
@@ -29,6 +44,9 @@ class Odiestt(SpeechRecognition):
         self.language = kwargs.get('language', "en-US")
         self.host = kwargs.get('host', "192.168.1.112:5000")
         self.show_all = kwargs.get('show_all', False)
+        # send the orders of the brain to the host, the recognition is biased toward their words
+        self.vocabulary = kwargs.get('vocabulary', False)
+        self.brain_id = self._get_vocabulary() if self.vocabulary else None
 
         # start listening in the background
         self.set_callback(self.OdieSTT_callback)
@@ -44,7 +62,10 @@ class Odiestt(SpeechRecognition):
         try:
             captured_audio = rz.recognize_odie(audio,
                                                key=self.key,
-                                               language=self.language, host=self.host)
+                                               language=self.language, host=self.host, brain_id=self.brain_id)
+            if self.brain_id is not None and not rz.vocabulary_known:
+                # the host has been restarted, the orders are sent again with the next order
+                self._forget_vocabulary()
             Utils.print_success("Odie Speech Recognition thinks you said %s" % captured_audio)
             self._analyse_audio(captured_audio)
 
@@ -60,6 +81,72 @@ class Odiestt(SpeechRecognition):
         # stop listening for an audio
         self.stop_listening()
 
+    def _get_vocabulary(self):
+        """
+        Get the id of the brain vocabulary known by the host. When the host does not know the orders of the brain,
+        they are sent in the background and the recognitions are not biased until then
+        :return: the id of the brain vocabulary, None if the host does not know it yet
+        """
+        orders = self.get_brain_orders(BrainLoader().get_brain())
+        if not orders:
+            return None
+        brain_id = Recognizer.get_brain_id(orders)
+        with self._sent_vocabularies_lock:
+            if self._sent_vocabularies.get(self.host) == brain_id:
+                return brain_id
+            if self.host in self._sending_vocabularies:
+                return None
+            failures, next_try = self._vocabulary_failures.get(self.host, (0, 0))
+            if time.time() < next_try:
+                return None
+            self._sending_vocabularies.add(self.host)
+        sender = threading.Thread(target=self._send_vocabulary, args=(self.host, orders, brain_id))
+        sender.daemon = True
+        sender.start()
+        return None
+
+    @classmethod
+    def _send_vocabulary(cls, host, orders, brain_id):
+        """
+        Send the orders of the brain to the host. After a failure, the next try waits VOCABULARY_RETRY_SECOND, doubled
+        after each failure
+        """
+        try:
+            Recognizer().send_vocabulary(orders, brain_id, host=host)
+        except RequestError as e:
+            with cls._sent_vocabularies_lock:
+                failures = cls._vocabulary_failures.get(host, (0, 0))[0] + 1
+                retry_second = min(VOCABULARY_RETRY_SECOND * 2 ** (failures - 1), VOCABULARY_MAX_RETRY_SECOND)
+                cls._vocabulary_failures[host] = (failures, time.time() + retry_second)
+                cls._sending_vocabularies.discard(host)
+            logger.debug("[OdieSTT] vocabulary not sent to %s, next try in %s seconds: %s" % (host, retry_second, e))
+            return
+        with cls._sent_vocabularies_lock:
+            cls._sent_vocabularies[host] = brain_id
+            cls._vocabulary_failures.pop(host, None)
+            cls._sending_vocabularies.discard(host)
+
+    def _forget_vocabulary(self):
+        with self._sent_vocabularies_lock:
+            self._sent_vocabularies.pop(self.host, None)
+
+    @staticmethod
+    def get_brain_orders(brain):
+        """
+        List the orders of the brain
+        :param brain: the loaded brain
+        :return: list of the orders, without duplicates, in the order of the brain
+        """
+        orders = list()
+        if brain is None:
+            return orders
+        for neuron in brain.neurons:
+            for cue in neuron.cues:
+                if cue.name == "order" and isinstance(cue.parameters, six.string_types) and \
+                        cue.parameters not in orders:
+                    orders.append(cue.parameters)
+        return orders
+
     def _analyse_audio(self, audio_to_text):
         """
         Confirm the audio exists and run it in a Callback
@@ -1,4 +1,5 @@
 """Library for performing speech recognition, with support for several engines and APIs, online and offline."""
+import hashlib
 import logging
 import json
 from speech_recognition import AudioData, AudioSource
@@ -40,8 +41,36 @@ class Recognizer(AudioSource):
         self.operation_timeout = 10  # seconds after an internal operation (e.g., an API request) starts before it times out, or ``None`` for no timeout
         self.phrase_threshold = 0.3  # minimum seconds of speaking audio before we consider the speaking audio a phrase - values below this are ignored (for filtering out clicks and pops)
         self.non_speaking_duration = 0.5  # seconds of non-speaking audio to keep on both sides of the recording
+        self.vocabulary_known = False  # True if the last recognition has been biased by the vocabulary of the brain
 
-    def recognize_odie(self, audio_data, key=None, language="en-US", host='192.168.1.112:5000'):
+    @staticmethod
+    def get_brain_id(orders):
+        """
+        Id of the vocabulary of a brain, the same for every client running the same orders
+        :param orders: the orders of the brain
+        :return: md5 of the orders
+        """
+        return hashlib.md5("\n".join(orders).encode('utf-8')).hexdigest()
+
+    def send_vocabulary(self, orders, brain_id, host='192.168.1.112:5000'):
+        """
+        Send the orders of the brain to the Odie Speech Recognition API, the recognitions sent with the brain_id are
+        then biased toward the words of the orders.
+        Raises a ``RequestError`` exception if the orders could not be sent.
+        :param orders: the orders of the brain
+        :param brain_id: id of the vocabulary, see get_brain_id
+        :param host: the Odie Speech Recognition API
+        """
+        url = "http://" + host + "/speech/vocabulary"
+        logger.debug("[OdieSTT recognizer] sending %d orders of the brain %s" % (len(orders), brain_id))
+        try:
+            request = requests.post(url, json={"brain_id": brain_id, "orders": orders}, timeout=self.operation_timeout)
+        except Exception as e:
+            raise RequestError("vocabulary connection failed: {}".format(str(e)))
+        if request.status_code not in [200, 201]:
+            raise RequestError("vocabulary request failed with: {}".format(request.status_code))
+
+    def recognize_odie(self, audio_data, key=None, language="en-US", host='192.168.1.112:5000', brain_id=None):
         """
         Performs speech recognition on ``audio_data`` (an ``AudioData`` instance), using the Odie Speech Recognition API.
 
@@ -50,6 +79,8 @@ class Recognizer(AudioSource):
 
         To obtain your own API key, contact Andrea Balzano at andrea.balzano@live.it
 
+        The ``brain_id`` of the orders sent with ``send_vocabulary`` biases the recognition toward the orders of the brain.
+
         The recognition language is determined by ``language``, an RFC5646 language tag like
         ``"en-US"`` (US English) or ``"fr-FR"`` (International French), defaulting to US English.
         A list of supported language tags can be found in this `StackOverflow answer <http://stackoverflow.com/a/14302134>`__.
@@ -77,11 +108,15 @@ class Recognizer(AudioSource):
 
         files = {'file': ('recognition.flac', flac_data, 'audio/x-flac')}
         payload = {"lang": language}
+        if brain_id is not None:
+            payload["brain_id"] = brain_id
         # obtain audio transcription results
         try:
             request = requests.post(url, files=files, data=payload, timeout=self.operation_timeout)
             logger.debug("[OdieSTT recognizer] request back, response: {}".format(request.json()))
-            response = json.loads(request.text)["result"]
+            response_json = json.loads(request.text)
+            response = response_json["result"]
+            self.vocabulary_known = response_json.get("vocabulary", False)
             err_code = request.status_code
         except HTTPError as e:
             raise RequestError("recognition request failed: {}".format(e.reason))
@@ -44,11 +44,19 @@ class Snowboy(Thread):
         if not os.path.isfile(self.pmdl_path):
             raise SnowboyModelNotFounfd("The snowboy model file %s does not exist" % self.pmdl_path)
 
-        self.detector = snowboydecoder.HotwordDetector(self.pmdl_path,
-                                                        sensitivity=self.sensitivity,
-                                                        detected_callback=self.callback,
-                                                        interrupt_check=self.interrupt_callback,
-                                                        sleep_time=0.03)
+        # run the detector in a dedicated process, out of the GIL of odie, started once and kept between the waits
+        self.process = kwargs.get('process', False)
+        if self.process:
+            # imported here, the process mode is optional
+            from odie.wakeon.snowboy.snowboyprocess import HotwordDetectorProcess
+            detector_class = HotwordDetectorProcess
+        else:
+            detector_class = snowboydecoder.HotwordDetector
+        self.detector = detector_class(self.pmdl_path,
+                                       sensitivity=self.sensitivity,
+                                       detected_callback=self.callback,
+                                       interrupt_check=self.interrupt_callback,
+                                       sleep_time=1)
 
     def interrupt_callback(self):
         """
@@ -90,6 +98,15 @@ class Snowboy(Thread):
         self.interrupted = True
         self.detector.terminate()
 
+    @staticmethod
+    def get_detection_latencies():
+        """
+        Return the latency histogram of the detections, from the arrival of the audio that contains the hotword to
+        the call of the callback, by detector mode ("thread" or "process")
+        :return: dict mode -> count, mean and max in milliseconds, and the buckets
+        """
+        return snowboydecoder.detection_latencies.get_stats()
+
     @staticmethod
     def _ignore_stderr():
         """
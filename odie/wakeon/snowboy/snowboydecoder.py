@@ -1,8 +1,8 @@
 #!/usr/bin/env python
-import collections
 from threading import Thread
 
-import pyaudio
+from odie.core.MicrophoneCapture import MicrophoneCapture
+from odie.core.Utils.LatencyHistogram import LatencyHistogram
 from . import snowboydetect
 import time
 import os
@@ -16,21 +16,42 @@ RESOURCE_FILE = os.path.join(TOP_DIR, "resources/common.res")
 DETECT_DING = os.path.join(TOP_DIR, "resources/ding.wav")
 DETECT_DONG = os.path.join(TOP_DIR, "resources/dong.wav")
 
+# time between the arrival of the audio that contains the hotword and the call of the callback, by detector mode
+detection_latencies = LatencyHistogram()
 
-class RingBuffer(object):
-    """Ring buffer to hold audio from PortAudio"""
-    def __init__(self, size=4096):
-        self._buf = collections.deque(maxlen=size)
 
-    def extend(self, data):
-        """Adds data to the end of buffer"""
-        self._buf.extend(data)
-
-    def get(self):
-        """Retrieves data from the beginning of buffer and clears it"""
-        tmp = bytes(bytearray(self._buf))
-        self._buf.clear()
-        return tmp
+def create_detector(decoder_model, resource=RESOURCE_FILE, sensitivity=[], audio_gain=1):
+    """
+    Load the snowboy models
+    :param decoder_model: decoder model file path, a string or a list of strings
+    :param resource: resource file path.
+    :param sensitivity: decoder sensitivity, a float of a list of floats.
+    :param audio_gain: multiply input volume by this factor.
+    :return: the SnowboyDetect
+    """
+    tm = type(decoder_model)
+    ts = type(sensitivity)
+    if tm is not list:
+        decoder_model = [decoder_model]
+    if ts is not list:
+        sensitivity = [sensitivity]
+    model_str = ",".join(decoder_model)
+
+    detector = snowboydetect.SnowboyDetect(
+        resource_filename=resource.encode(), model_str=model_str.encode())
+    detector.SetAudioGain(audio_gain)
+    num_hotwords = detector.NumHotwords()
+
+    if len(decoder_model) > 1 and len(sensitivity) == 1:
+        sensitivity = sensitivity*num_hotwords
+    if len(sensitivity) != 0:
+        assert num_hotwords == len(sensitivity), \
+            "number of hotwords in decoder_model (%d) and sensitivity " \
+            "(%d) does not match" % (num_hotwords, len(sensitivity))
+    sensitivity_str = ",".join([str(t) for t in sensitivity])
+    if len(sensitivity) != 0:
+        detector.SetSensitivity(sensitivity_str.encode())
+    return detector
 
 
 class HotwordDetector(Thread):
@@ -56,50 +77,22 @@ class HotwordDetector(Thread):
         self.kill_received = False
         self.paused = False
 
-        def audio_callback(in_data, frame_count, time_info, status):
-            self.ring_buffer.extend(in_data)
-            play_data = chr(0) * len(in_data)
-            return play_data, pyaudio.paContinue
-
-        tm = type(decoder_model)
-        ts = type(sensitivity)
-        if tm is not list:
-            decoder_model = [decoder_model]
-        if ts is not list:
-            sensitivity = [sensitivity]
-        model_str = ",".join(decoder_model)
-
-        self.detector = snowboydetect.SnowboyDetect(
-            resource_filename=resource.encode(), model_str=model_str.encode())
-        self.detector.SetAudioGain(audio_gain)
+        self.detector = create_detector(decoder_model, resource=resource, sensitivity=sensitivity,
+                                        audio_gain=audio_gain)
         self.num_hotwords = self.detector.NumHotwords()
 
-        if len(decoder_model) > 1 and len(sensitivity) == 1:
-            sensitivity = sensitivity*self.num_hotwords
-        if len(sensitivity) != 0:
-            assert self.num_hotwords == len(sensitivity), \
-                "number of hotwords in decoder_model (%d) and sensitivity " \
-                "(%d) does not match" % (self.num_hotwords, len(sensitivity))
-        sensitivity_str = ",".join([str(t) for t in sensitivity])
-        if len(sensitivity) != 0:
-            self.detector.SetSensitivity(sensitivity_str.encode())
-
-        self.ring_buffer = RingBuffer(
-            self.detector.NumChannels() * self.detector.SampleRate() * 5)
-        self.audio = pyaudio.PyAudio()
-        self.stream_in = self.audio.open(
-            input=True, output=False,
-            format=self.audio.get_format_from_width(
-                self.detector.BitsPerSample() / 8),
-            channels=self.detector.NumChannels(),
+        # the microphone is shared with the STT, the stream stays open
+        self.capture = MicrophoneCapture.get_capture(
             rate=self.detector.SampleRate(),
-            frames_per_buffer=2048,
-            stream_callback=audio_callback)
+            channels=self.detector.NumChannels(),
+            sample_width=self.detector.BitsPerSample() // 8)
+        self.ring_buffer = self.capture.open_consumer(
+            size=self.detector.NumChannels() * self.detector.SampleRate() * 5)
 
     def run(self):
         """
-        Start the voice detector. For every `sleep_time` second it checks the
-        audio buffer for triggering keywords. If detected, then call
+        Start the voice detector. It wakes up when new audio is written in the
+        buffer and checks it for triggering keywords. If detected, then call
         corresponding function in `detected_callback`, which can be a single
         function (single model) or a list of callback functions (multiple
         models). Every loop it also calls `interrupt_check` -- if it returns
@@ -110,7 +103,9 @@ class HotwordDetector(Thread):
                                   `decoder_model`.
         :param interrupt_check: a function that returns True if the main loop
                                 needs to stop.
-        :param float sleep_time: how much time in second every loop waits.
+        :param float sleep_time: maximum time in second waiting for audio before
+                                 checking `interrupt_check` again. `terminate`
+                                 wakes up the detector immediately.
         :return: None
         """
         if self.interrupt_check():
@@ -130,35 +125,41 @@ class HotwordDetector(Thread):
         logger.debug("detecting...")
 
         while not self.kill_received:
-            if not self.paused:
-                if self.interrupt_check():
-                    logger.debug("detect voice break")
-                    break
-                data = self.ring_buffer.get()
-                if len(data) == 0:
-                    time.sleep(self.sleep_time)
-                    continue
-
-                ans = self.detector.RunDetection(data)
-                if ans == -1:
-                    logger.warning("Error initializing streams or reading audio data")
-                elif ans > 0:
-                    message = "Keyword " + str(ans) + " detected at time: "
-                    message += time.strftime("%Y-%m-%d %H:%M:%S",
-                                             time.localtime(time.time()))
-                    logger.debug(message)
-                    callback = self.detected_callback[ans-1]
-                    if callback is not None:
-                        callback()
+            if self.interrupt_check():
+                logger.debug("detect voice break")
+                break
+            # wake up as soon as frames are captured
+            if not self.ring_buffer.wait(self.sleep_time):
+                continue
+            if self.paused:
+                # the audio captured while paused is not analysed
+                self.ring_buffer.clear()
+                continue
+            data = self.ring_buffer.get()
+            data_time = time.time()
+
+            ans = self.detector.RunDetection(data)
+            if ans == -1:
+                logger.warning("Error initializing streams or reading audio data")
+            elif ans > 0:
+                message = "Keyword " + str(ans) + " detected at time: "
+                message += time.strftime("%Y-%m-%d %H:%M:%S",
+                                         time.localtime(time.time()))
+                logger.debug(message)
+                # the STT gets the audio captured from here
+                self.capture.mark(pending=len(self.ring_buffer))
+                callback = self.detected_callback[ans-1]
+                detection_latencies.add("thread", time.time() - data_time)
+                if callback is not None:
+                    callback()
 
         logger.debug("[Snowboy] process finished.")
 
     def terminate(self):
         """
-        Terminate audio stream. Users cannot call start() again to detect.
+        Stop reading the microphone, the shared stream stays open. Users cannot call start() again to detect.
+        The detector waiting for audio is woken up, so it checks interrupt_check.
         :return: None
         """
-        self.stream_in.stop_stream()
-        self.stream_in.close()
-        self.audio.terminate()
+        self.capture.close_consumer(self.ring_buffer)
         logger.debug("[Snowboy] Audio stream cleaned.")
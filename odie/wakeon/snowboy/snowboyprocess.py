@@ -0,0 +1,238 @@
+import logging
+import multiprocessing
+import time
+from threading import Lock, Thread
+
+from odie.core.MicrophoneCapture import MicrophoneCapture
+from odie.core.SharedRingBuffer import SharedRingBuffer
+from odie.wakeon.snowboy.snowboydecoder import RESOURCE_FILE, create_detector, detection_latencies
+
+logging.basicConfig()
+logger = logging.getLogger("odie")
+
+
+def run_detection(decoder_model, resource, sensitivity, audio_gain, shared_ring_buffer, paused, stop_event,
+                  connection, sleep_time):
+    """
+    Main function of the detector process: read the audio of the shared ring buffer and send the detections
+    (hotword index, time of the audio, position read in the buffer) over the connection
+    """
+    detector = create_detector(decoder_model, resource=resource, sensitivity=sensitivity, audio_gain=audio_gain)
+    reader = shared_ring_buffer.reader()
+    connection.send(("ready", detector.NumHotwords()))
+    while not stop_event.is_set():
+        data = reader.read(timeout=sleep_time)
+        if len(data) == 0 or paused.value:
+            # the audio captured while paused is not analysed
+            continue
+        data_time = time.time()
+        ans = detector.RunDetection(data)
+        if ans > 0:
+            connection.send(("detected", ans, data_time, reader.position))
+    connection.close()
+
+
+class DetectorProcess(object):
+    """
+    A snowboy detector running in a child process, started once for the life of odie.
+
+    The process loads the models once. It reads the audio of a SharedRingBuffer and sends the detections back over a
+    pipe. Each wait of the hotword is a HotwordDetectorProcess attached to the process: it writes the captured audio
+    in the buffer and gets the detections. Between two waits, the process is paused and the audio is not analysed.
+
+    .. seealso:: HotwordDetectorProcess
+    """
+    # (decoder model, resource, sensitivity, audio gain) -> DetectorProcess
+    _processes = dict()
+    _processes_lock = Lock()
+
+    def __init__(self, decoder_model, resource, sensitivity, audio_gain, buffer_size, sleep_time):
+        self.shared_ring_buffer = SharedRingBuffer(buffer_size)
+        self._paused = multiprocessing.Value('b', True)
+        self._stop_event = multiprocessing.Event()
+        self._connection, child_connection = multiprocessing.Pipe(duplex=False)
+        self.process = multiprocessing.Process(target=run_detection,
+                                               args=(decoder_model, resource, sensitivity, audio_gain,
+                                                     self.shared_ring_buffer, self._paused, self._stop_event,
+                                                     child_connection, sleep_time))
+        self.process.daemon = True
+        self.process.start()
+        # only the detector process writes in the pipe
+        child_connection.close()
+        self.num_hotwords = 1
+        # the attached HotwordDetectorProcess, None between two waits of the hotword
+        self.listener = None
+        self._listener_lock = Lock()
+        self._receiver = Thread(target=self._receive_detections)
+        self._receiver.daemon = True
+        self._receiver.start()
+
+    @classmethod
+    def get_process(cls, decoder_model, resource, sensitivity, audio_gain, buffer_size, sleep_time):
+        """
+        Return the detector process of a model, started on first use
+        :return: the DetectorProcess
+        """
+        key = (repr(decoder_model), resource, repr(sensitivity), audio_gain)
+        with cls._processes_lock:
+            detector_process = cls._processes.get(key)
+            if detector_process is None or not detector_process.process.is_alive():
+                logger.debug("[Snowboy] starting the detector process of %s" % decoder_model)
+                detector_process = cls(decoder_model, resource, sensitivity, audio_gain, buffer_size, sleep_time)
+                cls._processes[key] = detector_process
+        return detector_process
+
+    @property
+    def paused(self):
+        return bool(self._paused.value)
+
+    @paused.setter
+    def paused(self, paused):
+        self._paused.value = paused
+
+    def attach(self, listener):
+        """
+        Start analysing the audio written by a listener, the previous listener is detached
+        :param listener: the HotwordDetectorProcess
+        """
+        with self._listener_lock:
+            self.listener = listener
+            self.paused = False
+
+    def detach(self, listener):
+        """
+        Stop analysing the audio of a listener, the process is paused until the next listener
+        :param listener: the HotwordDetectorProcess
+        """
+        with self._listener_lock:
+            if self.listener is listener:
+                self.listener = None
+                self.paused = True
+
+    def write(self, listener, data):
+        """
+        Write the audio of a listener in the shared ring buffer, the audio of a detached listener is dropped
+        """
+        with self._listener_lock:
+            if self.listener is listener:
+                self.shared_ring_buffer.extend(data)
+
+    def stop(self):
+        """
+        Stop the detector process
+        """
+        self._stop_event.set()
+        self.shared_ring_buffer.interrupt()
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.process.terminate()
+
+    def _receive_detections(self):
+        """
+        Give the detections sent by the detector process to the attached listener
+        """
+        while True:
+            try:
+                message = self._connection.recv()
+            except (EOFError, IOError):
+                # the detector process is stopped
+                break
+            if message[0] == "ready":
+                self.num_hotwords = message[1]
+                continue
+
+            _, ans, data_time, position = message
+            with self._listener_lock:
+                listener = self.listener
+            # the audio written before the listener was attached belongs to a previous wait of the hotword
+            if listener is not None and position > listener.start_position:
+                listener.on_detection(ans, data_time, position)
+
+
+class HotwordDetectorProcess(Thread):
+    """
+    Wait of the hotword with the snowboy decoder running in a dedicated process, out of the GIL of odie.
+
+    The thread reads the shared microphone capture and writes the audio in the SharedRingBuffer read by the
+    DetectorProcess, which stays alive between two waits. The detections come back over a pipe and the callbacks are
+    called in a thread of odie. It has the interface of HotwordDetector: paused, start, join and terminate.
+
+    :param decoder_model: decoder model file path, a string or a list of strings
+    :param resource: resource file path.
+    :param sensitivity: decoder sensitivity, a float of a list of floats.
+    :param audio_gain: multiply input volume by this factor.
+    """
+    def __init__(self, decoder_model, resource=RESOURCE_FILE, sensitivity=[], audio_gain=1, detected_callback=None,
+                 interrupt_check=lambda: False, sleep_time=0.03):
+
+        super(HotwordDetectorProcess, self).__init__()
+        self.detected_callback = detected_callback
+        self.interrupt_check = interrupt_check
+        self.sleep_time = sleep_time
+        self.kill_received = False
+
+        # the format of the snowboy models
+        self.capture = MicrophoneCapture.get_capture()
+        buffer_size = self.capture.rate * self.capture.frame_size * 5
+        self.detector_process = DetectorProcess.get_process(decoder_model, resource, sensitivity, audio_gain,
+                                                            buffer_size, sleep_time)
+        self.shared_ring_buffer = self.detector_process.shared_ring_buffer
+        self.ring_buffer = self.capture.open_consumer(size=buffer_size)
+        # the detections of the audio written before this wait are ignored
+        self.start_position = self.shared_ring_buffer.get_position()
+        self.detector_process.attach(self)
+
+    @property
+    def paused(self):
+        return self.detector_process.paused
+
+    @paused.setter
+    def paused(self, paused):
+        self.detector_process.paused = paused
+
+    def run(self):
+        """
+        Write the captured audio in the shared ring buffer until `interrupt_check` returns True
+        """
+        logger.debug("[Snowboy] detecting in process %s..." % self.detector_process.process.pid)
+        while not self.kill_received:
+            if self.interrupt_check():
+                logger.debug("detect voice break")
+                break
+            if not self.ring_buffer.wait(self.sleep_time):
+                continue
+            self.detector_process.write(self, self.ring_buffer.get())
+
+        self.detector_process.detach(self)
+        logger.debug("[Snowboy] detection finished.")
+
+    def terminate(self):
+        """
+        Stop reading the microphone and pause the detector process, which is kept for the next wait. Users cannot
+        call start() again to detect.
+        :return: None
+        """
+        self.kill_received = True
+        self.detector_process.detach(self)
+        self.capture.close_consumer(self.ring_buffer)
+        logger.debug("[Snowboy] Audio stream cleaned.")
+
+    def on_detection(self, ans, data_time, position):
+        """
+        Call the callback of a detection sent by the detector process
+        :param ans: index of the detected hotword, from 1
+        :param data_time: time of the reception of the audio by the detector process
+        :param position: position read in the shared ring buffer at the detection
+        """
+        logger.debug("Keyword %s detected at time: %s" % (ans, time.strftime("%Y-%m-%d %H:%M:%S",
+                                                                               time.localtime(time.time()))))
+        # the STT gets the audio captured from here
+        pending = len(self.ring_buffer) + self.shared_ring_buffer.get_position() - position
+        self.capture.mark(pending=pending)
+        detection_latencies.add("process", time.time() - data_time)
+        callbacks = self.detected_callback if type(self.detected_callback) is list else [self.detected_callback]
+        if len(callbacks) == 1 and self.detector_process.num_hotwords > 1:
+            callbacks *= self.detector_process.num_hotwords
+        callback = callbacks[ans - 1]
+        if callback is not None:
+            callback()
@@ -1,6 +1,8 @@
 import logging
 import os
 import threading
+
+import six
 from odie.core.Utils.FileManager import FileManager
 
 from odie.core.ConfigurationManager import SettingLoader
@@ -18,6 +20,7 @@ from odie._version import version_str
 # cloud Models requirements
 import tensorflow as tf
 from odie_cloud.speech.inference import Inference
+from odie_cloud.speech.StreamingRecognition import StreamingSessions
 import math
 import numpy as np
 from odie_cloud.tensorflow_serving_client.client import TensorflowServingClient as TFClient
@@ -49,7 +52,6 @@ model_config_list: {
                     }
 /serving/bazel-bin/tensorflow_serving/model_servers/tensorflow_model_server --port=9000 --model_config_file=/serving/model_config/model_config.conf
 '''
-AUDIO_UPLOAD_FOLDER = '/tmp/odie_cloud/tmp_uploaded_audio'
 VIDEO_UPLOAD_FOLDER = '/tmp/odie_cloud/tmp_uploaded_video'
 FAIL_UPLOAD_FOLDER = '/tmp/odie_cloud/tmp_uploaded_failed_interactions'
 ALLOWED_EXTENSIONS = {'mp3', 'wav', 'flac', 'jpg'}
@@ -81,11 +83,9 @@ class CloudFlaskAPI(threading.Thread):
         # configure the upload folder
         app.config['UPLOAD_VIDEO'] = VIDEO_UPLOAD_FOLDER
         app.config['UPLOAD_FAIL'] = FAIL_UPLOAD_FOLDER
-        app.config['UPLOAD_AUDIO'] = AUDIO_UPLOAD_FOLDER
         # create the temp folder
         FileManager.create_directory(VIDEO_UPLOAD_FOLDER)
         FileManager.create_directory(FAIL_UPLOAD_FOLDER)
-        FileManager.create_directory(AUDIO_UPLOAD_FOLDER)
 
         # Flask configuration remove default Flask behaviour to encode to ASCII
         self.app.url_map.strict_slashes = False
@@ -105,12 +105,40 @@ class CloudFlaskAPI(threading.Thread):
         self.app.add_url_rule('/caption', view_func=self.run_caption, methods=['POST'])
         self.app.add_url_rule('/shutdown/', view_func=self.shutdown_server, methods=['POST'])
         self.app.add_url_rule('/speech/recognize', view_func=self.run_speech_recognition, methods=['POST'])
+        self.app.add_url_rule('/speech/ready', view_func=self.get_speech_readiness, methods=['GET'])
+        self.app.add_url_rule('/speech/stats', view_func=self.get_speech_stats, methods=['GET'])
+        self.app.add_url_rule('/speech/vocabulary', view_func=self.set_speech_vocabulary, methods=['POST'])
+        self.app.add_url_rule('/speech/stream', view_func=self.start_speech_stream, methods=['POST'])
+        self.app.add_url_rule('/speech/stream/<stream_id>', view_func=self.run_speech_stream, methods=['POST'])
+        self.app.add_url_rule('/speech/stream/<stream_id>/end', view_func=self.end_speech_stream, methods=['POST'])
 
         logger.debug("[CloudFlaskAPI] getting OdieSTT model")
         for cl_object in self.settings.cloud:
             if cl_object.category == 'speech':
-                speech_model = cl_object.parameters['model']
-        self.dp = Inference(speech_model)
+                speech_parameters = dict(cl_object.parameters)
+                speech_model = speech_parameters.pop('model')
+        replicas = speech_parameters.pop('replicas', 1)
+        max_batch_size = speech_parameters.pop('max_batch_size', 1)
+        batch_window_second = speech_parameters.pop('batch_window_second', 0.01)
+        stream_lookahead_second = speech_parameters.pop('stream_lookahead_second', 0.2)
+        stream_ttl = speech_parameters.pop('stream_ttl', 60)
+        vocabulary_boost = speech_parameters.pop('vocabulary_boost', 2.0)
+        # the other parameters configure the decoder
+        self.dp = Inference(speech_model, replicas=replicas, max_batch_size=max_batch_size,
+                            batch_window_second=batch_window_second,
+                            stream_lookahead_second=stream_lookahead_second,
+                            vocabulary_boost=vocabulary_boost, **speech_parameters)
+        self.speech_streams = StreamingSessions(ttl=stream_ttl)
+        # the model is loaded once and kept in memory, /speech/ready answers once the warm-up inference is done
+        speech_loader = threading.Thread(target=self._load_speech_model)
+        speech_loader.daemon = True
+        speech_loader.start()
+
+    def _load_speech_model(self):
+        try:
+            self.dp.load()
+        except Exception as e:
+            logger.error("[CloudFlaskAPI] cannot load the speech model: %s" % e, exc_info=True)
 
     def run(self):
         self.app.run(host='0.0.0.0', port="%s" % int(self.port), debug=True, threaded=True, use_reloader=False)
@@ -384,6 +412,151 @@ class CloudFlaskAPI(threading.Thread):
         data = jsonify(data)
         return data, 201
 
+    @requires_auth
+    def get_speech_readiness(self):
+        """
+        Tell if the speech model is loaded and warmed up
+        test with curl:
+        curl -i --user admin:secret -X GET http://127.0.0.1:5000/speech/ready
+        """
+        if not self.dp.ready.is_set():
+            data = {
+                "ready": False
+            }
+            return jsonify(data), 503
+        data = {
+            "ready": True,
+            "replicas": self.dp.replicas
+        }
+        return jsonify(data), 200
+
+    @requires_auth
+    def get_speech_stats(self):
+        """
+        Get the latencies (p50, p99) and the throughput of the batches of the speech model
+        test with curl:
+        curl -i --user admin:secret -X GET http://127.0.0.1:5000/speech/stats
+        """
+        data = self.dp.scheduler.get_stats()
+        data["max_batch_size"] = self.dp.scheduler.max_batch_size
+        data["batch_window_second"] = self.dp.scheduler.window_second
+        return jsonify(data), 200
+
+    @requires_auth
+    def set_speech_vocabulary(self):
+        """
+        Bias the speech recognition of the clients of a brain toward its orders. The clients send the brain_id with the
+        audio to recognize. An empty list of orders removes the vocabulary of the brain
+        test with curl:
+        curl -i --user admin:secret -H "Content-Type: application/json" -X POST \
+        -d '{"brain_id":"b1", "orders":["turn on the light", "what time is it"]}' http://127.0.0.1:5000/speech/vocabulary
+        """
+        received_json = request.get_json(silent=True, force=True)
+        if not isinstance(received_json, dict) or not isinstance(received_json.get("orders"), list):
+            data = {
+                "error": "No orders provided"
+            }
+            return jsonify(error=data), 400
+        brain_id = received_json.get("brain_id")
+        if not isinstance(brain_id, six.string_types) or not brain_id:
+            data = {
+                "error": "No brain_id provided"
+            }
+            return jsonify(error=data), 400
+        orders = [order for order in received_json["orders"] if isinstance(order, six.string_types)]
+        vocabulary = self.dp.set_vocabulary(brain_id, orders)
+        data = {
+            "brain_id": brain_id,
+            "orders": len(orders),
+            "words": len(vocabulary) if vocabulary is not None else 0,
+            "strict": vocabulary.strict if vocabulary is not None else False
+        }
+        return jsonify(data), 201
+
+    @requires_auth
+    def start_speech_stream(self):
+        """
+        Start a streaming recognition, the audio is then sent by chunks of raw 16 bits mono samples. The optional
+        brain_id selects the vocabulary sent to /speech/vocabulary
+        test with curl:
+        curl -i --user admin:secret -X POST -d "rate=16000&brain_id=b1" http://127.0.0.1:5000/speech/stream
+        """
+        if not self.dp.ready.is_set():
+            data = {
+                "error": "speech model not ready"
+            }
+            return jsonify(error=data), 503
+        rate = request.form.get("rate", 16000)
+        try:
+            rate = int(rate)
+        except ValueError:
+            rate = 0
+        if rate <= 0:
+            data = {
+                "error": "rate non valid"
+            }
+            return jsonify(error=data), 400
+        brain_id = request.form.get("brain_id")
+        stream_id = self.speech_streams.create(self.dp.create_stream(rate=rate, brain_id=brain_id))
+        data = {
+            "stream_id": stream_id,
+            "vocabulary": self.dp.get_vocabulary(brain_id) is not None
+        }
+        return jsonify(data), 201
+
+    @requires_auth
+    def run_speech_stream(self, stream_id):
+        """
+        Send a chunk of audio of a stream and get the partial transcription
+        test with curl:
+        curl -i --user admin:secret -X POST --data-binary @chunk.raw http://127.0.0.1:5000/speech/stream/<stream_id>
+        :param stream_id: id returned by /speech/stream
+        :return: the "stable" words, that will not change anymore, and the best "partial" transcription
+        """
+        try:
+            with self.speech_streams.session(stream_id) as recognition:
+                data = recognition.add_audio(request.get_data())
+        except KeyError:
+            data = {
+                "error": "stream not found: %s" % stream_id
+            }
+            return jsonify(error=data), 404
+        except ValueError as e:
+            data = {
+                "error": str(e)
+            }
+            return jsonify(error=data), 400
+        return jsonify(data), 200
+
+    @requires_auth
+    def end_speech_stream(self, stream_id):
+        """
+        Send the last chunk of audio of a stream, if any, and get the final transcription
+        test with curl:
+        curl -i --user admin:secret -X POST http://127.0.0.1:5000/speech/stream/<stream_id>/end
+        :param stream_id: id returned by /speech/stream
+        """
+        try:
+            with self.speech_streams.session(stream_id) as recognition:
+                recognition.add_audio(request.get_data())
+                response = recognition.finish()
+        except KeyError:
+            data = {
+                "error": "stream not found: %s" % stream_id
+            }
+            return jsonify(error=data), 404
+        except ValueError as e:
+            data = {
+                "error": str(e)
+            }
+            return jsonify(error=data), 400
+        finally:
+            self.speech_streams.remove(stream_id)
+        data = {
+            "result": response
+        }
+        return jsonify(data), 201
+
     @requires_auth
     def run_speech_recognition(self):
         """
@@ -392,6 +565,9 @@ class CloudFlaskAPI(threading.Thread):
         The recognition language is determined by ``language``,
         an RFC5646 language tag like ``"en-US"`` (US English) or ``"fr-FR"`` (International French), defaulting to US English.
 
+        The optional brain_id field selects the vocabulary sent to /speech/vocabulary, the "vocabulary" of the response
+        tells if it has been used: the client sends its orders again when the server does not know them anymore.
+
         Test with curl
         curl -i --user admin:secret -H "Content-Type: audio/x-flac" -X POST /
         -d '{"client":"odie","lang":"eng","key":"asdfg12345"}' http://localhost:5000/speech/recognize
@@ -400,6 +576,12 @@ class CloudFlaskAPI(threading.Thread):
         logger.debug("[CloudFlaskAPI] run_speech_recognition")
         assert request.path == '/speech/recognize'
         assert request.method == 'POST'
+        if not self.dp.ready.is_set():
+            logger.debug("[CloudFlaskAPI] the speech model is not loaded yet")
+            data = {
+                "error": "speech model not ready"
+            }
+            return jsonify(error=data), 503
         # check if the post request has the file part
         if 'file' not in request.files:
             logger.debug("[CloudFlaskAPI] no file in request.files")
@@ -417,53 +599,42 @@ class CloudFlaskAPI(threading.Thread):
                 "error": "file non valid"
             }
             return jsonify(error=data), 400
-        # if user does not select file, browser also
-        # save the file
+        # the audio is decoded in memory, it is only written to disk when the recognition fails
         filename = secure_filename(uploaded_file.filename)
-        base_path = os.path.join(self.app.config['UPLOAD_AUDIO'])
-        audio_path = os.path.join(base_path, filename)
-        # file_path = splitext(file_path)[0]+".wav"
-        logger.debug("[CloudFlaskAPI] saving file to: {}".format(audio_path))
-        uploaded_file.save(audio_path)
-        if not self.allowed_file(audio_path):
-            audio_path = self._convert_to_wav(audio_file_path=audio_path)
+        audio_data = uploaded_file.read()
+        brain_id = request.form.get("brain_id")
 
         logger.debug("[CloudFlaskAPI] calling deepspeech")
         try:
-            response = self.dp.predict_beam(audio_path)
+            response = self.dp.predict_beam(audio_data, brain_id=brain_id)
             if response != "":
                 data = {
-                    "result": response
+                    "result": response,
+                    "vocabulary": self.dp.get_vocabulary(brain_id) is not None
                 }
                 return jsonify(data), 201
             else:
                 data = {"result": "predicted empty string"}
-                base_path = os.path.join(self.app.config['UPLOAD_FAIL'])
-                uploaded_file.save(os.path.join(base_path, filename))
+                self._save_failed_audio(filename, audio_data)
                 return jsonify(error=data), 404
+        except ValueError as e:
+            logger.debug("[CloudFlaskAPI] %s" % e)
+            data = {"result": str(e)}
+            return jsonify(error=data), 400
         except Exception as e:
             data = {"result": str(e)}
             logger.error(e, exc_info=True)
-            base_path = os.path.join(self.app.config['UPLOAD_FAIL'])
-            uploaded_file.save(os.path.join(base_path, filename))
+            self._save_failed_audio(filename, audio_data)
             return jsonify(error=data), 404
 
-    @staticmethod
-    def _convert_to_wav(audio_file_path):
+    def _save_failed_audio(self, filename, audio_data):
         """
-        If not already .wav, convert an incoming audio file to wav format. Using system avconv (raspberry)
-        :param audio_file_path: the current full file path
-        :return: Wave file path
+        Keep the audio of a failed recognition
+        :param filename: secured name of the uploaded file
+        :param audio_data: bytes of the uploaded file
         """
-        # Not allowed so convert into wav using avconv (raspberry)
-        base = os.path.splitext(audio_file_path)[0]
-        extension = os.path.splitext(audio_file_path)[1]
-        if extension != ".wav":
-            current_file_path = audio_file_path
-            audio_file_path = base + ".wav"
-            os.system("avconv -y -i " + current_file_path + " " + audio_file_path)  # --> deprecated
-            # subprocess.call(['avconv', '-y', '-i', audio_path, new_file_path], shell=True) # Not working ...
-        return audio_file_path
+        with open(os.path.join(self.app.config['UPLOAD_FAIL'], filename), 'wb') as failed_file:
+            failed_file.write(audio_data)
 
     @requires_auth
     def shutdown_server(self):
@@ -1 +0,0 @@
-from .CloudFlaskAPI import CloudFlaskAPI
\ No newline at end of file
@@ -0,0 +1,183 @@
+import io
+import logging
+import re
+
+import numpy as np
+
+logging.basicConfig()
+logger = logging.getLogger("odie")
+
+# floor of the mel energies, avoids log(0) on digital silence
+MIN_ENERGY = np.finfo(np.float32).eps
+
+# seconds of a unit of the durations of the Aeon configuration
+DURATION_UNITS = {
+    "second": 1.0,
+    "seconds": 1.0,
+    "millisecond": 0.001,
+    "milliseconds": 0.001
+}
+
+
+def parse_duration(duration):
+    """
+    Parse a duration of the Aeon configuration
+    :param duration: a string Eg: "25 milliseconds", "30 seconds"
+    :return: the duration in seconds
+    """
+    match = re.match(r"^\s*([0-9.]+)\s*([a-z]+)\s*$", duration)
+    if match is None or match.group(2) not in DURATION_UNITS:
+        raise ValueError("Duration not supported: %s" % duration)
+    return float(match.group(1)) * DURATION_UNITS[match.group(2)]
+
+
+def decode_audio(audio):
+    """
+    Decode a WAV or FLAC audio in memory
+    :param audio: the bytes of the file, a file-like object or a path
+    :return: tuple (float samples of the mono signal in the range of 16 bits samples, sample rate)
+    :raise ValueError: the format of the audio is not supported
+    """
+    # imported here, only the uploaded files are decoded: the streams send raw samples
+    import soundfile
+
+    if isinstance(audio, bytes):
+        audio = io.BytesIO(audio)
+    try:
+        samples, rate = soundfile.read(audio, dtype="int16", always_2d=True)
+    except RuntimeError as e:
+        raise ValueError("Audio format not supported: %s" % e)
+    # mix the channels
+    return samples.astype(np.float32).mean(axis=1), rate
+
+
+def resample(samples, rate, target_rate):
+    """
+    Band-limited resampling of a signal, the spectrum is truncated or zero-padded
+    :param samples: the samples
+    :param rate: the sample rate of the samples
+    :param target_rate: the sample rate to convert to
+    :return: the resampled samples
+    """
+    if rate == target_rate or len(samples) == 0:
+        return samples
+    length = int(round(len(samples) * float(target_rate) / rate))
+    spectrum = np.fft.rfft(samples)
+    resampled_spectrum = np.zeros(length // 2 + 1, dtype=spectrum.dtype)
+    number_of_bins = min(len(spectrum), len(resampled_spectrum))
+    resampled_spectrum[:number_of_bins] = spectrum[:number_of_bins]
+    return np.fft.irfft(resampled_spectrum, length) * (float(length) / len(samples))
+
+
+def hz_to_mel(hz):
+    return 2595 * np.log10(1 + hz / 700.0)
+
+
+def mel_to_hz(mel):
+    return 700 * (10 ** (mel / 2595.0) - 1)
+
+
+def create_filterbank(num_filters, fft_size, sample_freq_hz):
+    """
+    Triangular mel filters between 0 and the Nyquist frequency, like the filterbank of Aeon
+    :param num_filters: number of bands
+    :param fft_size: size of the FFT of a frame
+    :param sample_freq_hz: sample rate
+    :return: matrix (fft_size // 2 + 1, num_filters)
+    """
+    mel_points = np.linspace(hz_to_mel(0.0), hz_to_mel(sample_freq_hz / 2.0), num_filters + 2)
+    bins = np.floor((fft_size + 1) * mel_to_hz(mel_points) / sample_freq_hz).astype(int)
+    filterbank = np.zeros((fft_size // 2 + 1, num_filters), dtype=np.float32)
+    for j in range(num_filters):
+        for i in range(bins[j], bins[j + 1]):
+            filterbank[i, j] = (i - bins[j]) / float(bins[j + 1] - bins[j])
+        for i in range(bins[j + 1], bins[j + 2]):
+            filterbank[i, j] = (bins[j + 2] - i) / float(bins[j + 2] - bins[j + 1])
+    return filterbank
+
+
+class AudioFeatures(object):
+    """
+    Compute the MFSC features of the speech model in memory, as the Aeon dataloader would for its audio configuration.
+
+    The frames of the signal are windowed (hann) and their power spectrum is projected on the mel filterbank, the log
+    energies of the valid frames are scaled to 0-255 and rounded like the uint8 output of Aeon. The features are
+    padded with zeros to max_duration, transposed to (bands, time) and the bands are flipped.
+
+    .. seealso:: odie_cloud.speech.DataLoader.inference_config
+    """
+
+    def __init__(self, audio_config):
+        """
+        :param audio_config: the "audio" etl configuration of Aeon, Eg: DataLoader.audio_config(13, 30)
+        """
+        if audio_config.get("feature_type") != "mfsc":
+            raise ValueError("Feature type not supported: %s" % audio_config.get("feature_type"))
+        self.sample_freq_hz = audio_config["sample_freq_hz"]
+        self.num_filters = audio_config["num_filters"]
+        self.frame_length = int(parse_duration(audio_config["frame_length"]) * self.sample_freq_hz)
+        self.frame_stride = int(parse_duration(audio_config["frame_stride"]) * self.sample_freq_hz)
+        self.max_samples = int(parse_duration(audio_config["max_duration"]) * self.sample_freq_hz)
+        self.time_steps = self.get_number_of_frames(self.max_samples)
+        self.window = np.hanning(self.frame_length).astype(np.float32)
+        self.filterbank = create_filterbank(self.num_filters, self.frame_length, self.sample_freq_hz)
+        # shape of the input of the model, with the batch on the last axis
+        self.shape = (1, self.num_filters, self.time_steps)
+
+    def get_number_of_frames(self, number_of_samples):
+        if number_of_samples < self.frame_length:
+            return 0
+        return (number_of_samples - self.frame_length) // self.frame_stride + 1
+
+    def get_features(self, audio):
+        """
+        Decode an audio and compute its features
+        :param audio: the bytes of a WAV or FLAC file, a file-like object or a path
+        :return: tuple (uint8 features (num_filters, time_steps), length of the utterance in percent of time_steps)
+        """
+        samples, rate = decode_audio(audio)
+        return self.compute(resample(samples, rate, self.sample_freq_hz))
+
+    def compute(self, samples):
+        """
+        Compute the features of a signal at sample_freq_hz
+        :param samples: the samples, truncated to max_duration
+        :return: tuple (uint8 features (num_filters, time_steps), length of the utterance in percent of time_steps)
+        """
+        samples = np.asarray(samples, dtype=np.float32)[:self.max_samples]
+        log_energies = self.get_log_energies(samples, 0, self.get_number_of_frames(len(samples)))
+        # min-max scaling of the valid frames
+        if len(log_energies):
+            return self.scale(log_energies, log_energies.min(), log_energies.max())
+        return self.scale(log_energies, 0, 0)
+
+    def get_log_energies(self, samples, start, end):
+        """
+        Compute the log mel energies of some frames of a signal
+        :param samples: the samples at sample_freq_hz
+        :param start: index of the first frame
+        :param end: index after the last frame, at most get_number_of_frames(len(samples))
+        :return: float matrix (end - start, num_filters)
+        """
+        if end <= start:
+            return np.zeros((0, self.num_filters), dtype=np.float32)
+        indexes = np.arange(self.frame_length)[None, :] + self.frame_stride * np.arange(start, end)[:, None]
+        spectrum = np.abs(np.fft.rfft(samples[indexes] * self.window, self.frame_length))
+        energies = np.dot(spectrum * spectrum / spectrum.shape[1], self.filterbank)
+        return np.log(np.maximum(energies, MIN_ENERGY))
+
+    def scale(self, log_energies, minimum, maximum):
+        """
+        Scale the log mel energies of the valid frames to uint8 and pad them to time_steps
+        :param log_energies: float matrix (number of frames, num_filters), at most time_steps frames
+        :param minimum: log energy scaled to 0, the lower energies are clipped
+        :param maximum: log energy scaled to 255, the higher energies are clipped
+        :return: tuple (uint8 features (num_filters, time_steps), length of the utterance in percent of time_steps)
+        """
+        number_of_frames = len(log_energies)
+        features = np.zeros((self.time_steps, self.num_filters), dtype=np.uint8)
+        if number_of_frames > 0 and maximum > minimum:
+            scaled = (np.clip(log_energies, minimum, maximum) - minimum) * (255.0 / (maximum - minimum))
+            features[:number_of_frames] = np.rint(scaled)
+        valid_percent = 100.0 * number_of_frames / self.time_steps
+        return np.flipud(features.T), valid_percent
@@ -0,0 +1,159 @@
+import logging
+import threading
+import time
+
+from six.moves import queue
+
+from odie.core.Utils.LatencyHistogram import LatencyHistogram
+
+logging.basicConfig()
+logger = logging.getLogger("odie")
+
+
+class BatchRequest(object):
+    """
+    The inputs of an utterance waiting for its forward pass
+    """
+    def __init__(self, inputs):
+        self.inputs = inputs
+        self.submitted_time = time.time()
+        # probs[c, t] matrix of the characters, set by the worker
+        self.probabilities = None
+        self.error = None
+        self.done = threading.Event()
+
+
+class BatchScheduler(object):
+    """
+    Micro-batching of the concurrent speech recognition requests.
+
+    The requests are queued and each resident replica of the model has a worker thread. A worker waits for a request,
+    then collects the requests received during window_second, up to max_batch_size, and runs one forward pass for
+    the whole batch. The output of each request is given back to its caller, which decodes it in its own thread.
+
+    The latency of the requests ("request": queue + forward pass) and of the forward passes ("batch") are recorded
+    in a LatencyHistogram, get_stats returns them with the throughput counters to tune the window.
+
+    .. seealso:: Inference
+    """
+
+    def __init__(self, predict_batch, max_batch_size=8, window_second=0.01):
+        """
+        :param predict_batch: function(model, list of inputs) returning the probabilities of each inputs. Called from
+        the worker threads, concurrently when there are several models
+        :param max_batch_size: maximum number of requests of a forward pass, the batch size of the backend
+        :param window_second: maximum time to wait for other requests after the first request of a batch
+        """
+        self.predict_batch = predict_batch
+        self.max_batch_size = max_batch_size
+        self.window_second = window_second
+        self.latencies = LatencyHistogram()
+        self._requests = queue.Queue()
+        self._workers = list()
+        self._lock = threading.Lock()
+        self._start_time = None
+        self.request_count = 0
+        self.batch_count = 0
+
+    def start(self, models):
+        """
+        Start a worker for each replica of the model
+        :param models: the loaded models
+        """
+        self._start_time = time.time()
+        for model in models:
+            worker = threading.Thread(target=self._run, args=(model,))
+            worker.daemon = True
+            worker.start()
+            self._workers.append(worker)
+        logger.debug("[BatchScheduler] %d workers, batches of %d requests, window of %s seconds"
+                     % (len(self._workers), self.max_batch_size, self.window_second))
+
+    def stop(self):
+        """
+        Stop the workers once the queued requests are processed
+        """
+        for _ in self._workers:
+            self._requests.put(None)
+        for worker in self._workers:
+            worker.join()
+        self._workers = list()
+
+    def submit(self, inputs):
+        """
+        Wait for the forward pass of an utterance
+        :param inputs: the inputs of the model for the utterance, Eg: its features
+        :return: the probs[c, t] matrix of the characters
+        """
+        request = BatchRequest(inputs)
+        self._requests.put(request)
+        request.done.wait()
+        self.latencies.add("request", time.time() - request.submitted_time)
+        if request.error is not None:
+            raise request.error
+        return request.probabilities
+
+    def get_stats(self):
+        """
+        Return the latencies and the throughput counters
+        :return: dict with the latencies of the requests and of the batches in milliseconds (count, mean, max, p50,
+        p99), the number of requests and batches, the mean batch size and the number of requests per second
+        """
+        with self._lock:
+            request_count = self.request_count
+            batch_count = self.batch_count
+        elapsed_time = time.time() - self._start_time if self._start_time is not None else 0
+        return {
+            "latencies": self.latencies.get_stats(),
+            "requests": request_count,
+            "batches": batch_count,
+            "mean_batch_size": float(request_count) / batch_count if batch_count else 0,
+            "requests_per_second": request_count / elapsed_time if elapsed_time > 0 else 0
+        }
+
+    def _collect(self):
+        """
+        Wait for a request and collect the next ones until the end of the window or the max batch size
+        :return: tuple (list of BatchRequest, True if the scheduler is stopped)
+        """
+        request = self._requests.get()
+        if request is None:
+            return list(), True
+        batch = [request]
+        end_time = time.time() + self.window_second
+        while len(batch) < self.max_batch_size:
+            remaining_time = end_time - time.time()
+            try:
+                if remaining_time > 0:
+                    request = self._requests.get(timeout=remaining_time)
+                else:
+                    # the window is over, only take the requests already queued
+                    request = self._requests.get_nowait()
+            except queue.Empty:
+                break
+            if request is None:
+                return batch, True
+            batch.append(request)
+        return batch, False
+
+    def _run(self, model):
+        stopped = False
+        while not stopped:
+            batch, stopped = self._collect()
+            if not batch:
+                continue
+            start_time = time.time()
+            try:
+                outputs = self.predict_batch(model, [request.inputs for request in batch])
+                for request, probabilities in zip(batch, outputs):
+                    request.probabilities = probabilities
+            except Exception as e:
+                logger.error("[BatchScheduler] forward pass of %d requests failed: %s" % (len(batch), e))
+                for request in batch:
+                    request.error = e
+            self.latencies.add("batch", time.time() - start_time)
+            with self._lock:
+                self.request_count += len(batch)
+                self.batch_count += 1
+            for request in batch:
+                request.done.set()
@@ -1,9 +1,10 @@
 from __future__ import division
 from __future__ import print_function
+import heapq
 import logging
-from autocorrect import spell
-from odie_cloud.speech.decoder import Decoder
+from odie_cloud.speech.decoder import Decoder, DEFAULT_LM_PATH, kenlm
 import math
+import numpy as np
 
 
 logging.basicConfig()
@@ -45,6 +46,9 @@ class CtcBeamSearch(Decoder):
             beamState.entries[y] = BeamEntry()
 
     def lm_words(self, sentence):
+        "factor of the probability of a sentence with the language model, 1 without language model"
+        if self.LM is None:
+            return 1.0
         words = ['<s>'] + sentence.split() + ['</s>']
         probs = 0
         for i, (prob, length, oov) in enumerate(self.LM.full_scores(sentence)):
@@ -57,9 +61,36 @@ class CtcBeamSearch(Decoder):
             logger.debug('[CtcBeamSearch] probs: {} score multiplier: {}'.format(probs, score_multiplier))
         return probs
 
+    def vocabulary_factor(self, y, k):
+        """
+        Factor of the probability of extending labelling y to y+k with the brain vocabulary: 0 if the extension leaves
+        the vocabulary of a strict vocabulary, exp(boost) if it completes a word of the vocabulary
+        """
+        if k == self.blank_index:
+            return 1.0
+        labels = [label for label in y if label != self.blank_index]
+        # characters of the current word
+        word = labels
+        if self.space_index in labels:
+            word = labels[len(labels) - labels[::-1].index(self.space_index):]
+        if k != self.space_index:
+            if self.vocabulary.strict and self.vocabulary.get_node(word + [k]) is None:
+                return 0.0
+            return 1.0
+        if not word:
+            return 1.0
+        boost = self.vocabulary.get_word_boost(self.vocabulary.get_node(word))
+        if boost is None:
+            return 0.0 if self.vocabulary.strict else 1.0
+        return math.exp(boost)
+
     def calcExtPr(self, k, y, t, mat, beamState, classes):
         "probability for extending labelling y to y+k"
 
+        vocabulary_factor = self.vocabulary_factor(y, k) if self.vocabulary is not None else 1.0
+        if not vocabulary_factor:
+            return 0.0
+
         # language model (kenlm 5-gram)
         sentence = ""
         for char in y:
@@ -67,7 +98,7 @@ class CtcBeamSearch(Decoder):
         sentence = sentence + str(classes[k])
         sentence = sentence.replace("_", "").lower()
         logger.debug("[CtcBeamSearch] ngram to score: {}".format(sentence))
-        LmProb = self.lm_words(sentence)
+        LmProb = self.lm_words(sentence) * vocabulary_factor
         if len(y) and y[-1] == k:
             prb = mat[t, k]*beamState.entries[y].prBlank*LmProb
             logger.debug("[CtcBeamSearch] blank score: {0:.15f}".format(prb))
@@ -122,6 +153,9 @@ class CtcBeamSearch(Decoder):
                 for k in range(maxC):
                     newY = y+(k,)
                     prNonBlank = self.calcExtPr(k, y, t, mat, last, classes)
+                    if self.vocabulary is not None and prNonBlank == 0:
+                        # out of the vocabulary of the brain
+                        continue
 
                     # save result
                     self.addLabelling(curr, newY)
@@ -144,8 +178,249 @@ class CtcBeamSearch(Decoder):
         logger.debug("[ctcBeamSearch] output: {}".format(res))
         string = self.process_string(res, remove_repetitions=False)
         logger.debug("[ctcBeamSearch] string: {}".format(string))
-        correct = ''
-        for word in string.split():
-            correct = correct + spell(word) + ' '
+        correct = self.correct_spelling(string)
         logger.debug("[ctcBeamSearch] autocorrect: {}".format(correct))
-        return correct.rstrip()
+        return correct
+
+
+def log_add(a, b):
+    "log(exp(a) + exp(b)) of two log-probabilities"
+    if a == -float("inf"):
+        return b
+    if b == -float("inf"):
+        return a
+    if a > b:
+        return a + math.log1p(math.exp(b - a))
+    return b + math.log1p(math.exp(a - b))
+
+
+class CtcPrefixBeamSearch(Decoder):
+    """
+    CTC prefix beam search in log-space, with the language model applied at word boundaries.
+
+    Each prefix (labelling without blank) keeps the log-probability of the paths ending with a blank and with a
+    non-blank. At each time-step, the characters under prune_threshold are skipped and the extensions of a prefix
+    are computed for all the remaining characters at once. The prefixes are ranked with:
+
+        log P(acoustic) + lm_weight * log P(words) + word_bonus * number of words + vocabulary boosts
+
+    With a BrainVocabulary, each prefix keeps the trie node of its current word: the extensions out of a strict
+    vocabulary are pruned, and the boost of a word of the vocabulary is added as soon as the current word is in the
+    trie, then kept if the word is completed.
+
+    The language model is only queried when a word is completed, and the kenlm.State of each sequence of words is
+    cached, so a word is scored once per decoding whatever the number of prefixes sharing it.
+
+    The prefixes are kept between calls of advance, so an utterance can be decoded incrementally as its frames are
+    received (get_partial, get_stable), then finish gives the final transcription.
+
+    Arguments:
+        beam_width (int, optional): number of prefixes kept at each time-step. Defaults to 16.
+        lm_weight (float, optional): weight of the language model. Defaults to 0.8.
+        word_bonus (float, optional): bonus added for each word, balances the cost of the language model.
+            Defaults to 1.0.
+        prune_threshold (float, optional): characters with a lower probability in a frame are not
+            considered. Defaults to 0.001.
+        vocabulary (BrainVocabulary, optional): vocabulary of the orders of the brain. Defaults to None.
+    """
+
+    def __init__(self, alphabet, blank_index=0, space_index=1, lm_path=DEFAULT_LM_PATH, beam_width=16,
+                 lm_weight=0.8, word_bonus=1.0, prune_threshold=0.001, vocabulary=None):
+        super(CtcPrefixBeamSearch, self).__init__(alphabet, blank_index=blank_index, space_index=space_index,
+                                                  lm_path=lm_path, vocabulary=vocabulary)
+        self.beam_width = beam_width
+        self.lm_weight = lm_weight
+        self.word_bonus = word_bonus
+        self.log_prune_threshold = math.log(prune_threshold) if prune_threshold > 0 else self.NEG_INF
+        # the language model is lower case
+        self.lm_chars = [char.lower() for char in alphabet]
+        self.reset()
+
+    def lm_score(self, words):
+        "natural log-probability of a sequence of words, from the cached state of its prefix"
+        if self.LM is None:
+            return 0.0
+        if words in self.lm_states:
+            return self.lm_states[words][1]
+        if words:
+            self.lm_score(words[:-1])
+            state, score = self.lm_states[words[:-1]]
+        else:
+            state, score = kenlm.State(), 0.0
+            self.LM.BeginSentenceWrite(state)
+            self.lm_states[words] = (state, score)
+            return score
+        out_state = kenlm.State()
+        # kenlm scores are log10
+        score += self.LM.BaseScore(state, words[-1], out_state) * math.log(10)
+        self.lm_states[words] = (out_state, score)
+        return score
+
+    def lm_end_score(self, words):
+        "natural log-probability of a complete sentence"
+        if self.LM is None:
+            return 0.0
+        score = self.lm_score(words)
+        return score + self.LM.BaseScore(self.lm_states[words][0], "</s>", kenlm.State()) * math.log(10)
+
+    def extend_words(self, words, char):
+        """
+        Language state of a prefix extended with a character
+        :param words: tuple (completed words, current word, trie node of the current word, boost of the completed
+        words) of the prefix
+        :param char: index of the new character
+        :return: the language state of the new prefix, None if the extension is out of the vocabulary
+        """
+        completed, current, node, boost = words
+        strict = self.vocabulary is not None and self.vocabulary.strict
+        if char != self.space_index:
+            if node is not None:
+                node = node.get(char)
+            if node is None and strict:
+                return None
+            return completed, current + self.lm_chars[char], node, boost
+        if not current:
+            return words
+        word_boost = self.vocabulary.get_word_boost(node) if self.vocabulary is not None else None
+        if word_boost is None and strict:
+            return None
+        completed = completed + (current,)
+        # the new word is scored now, while its prefix state is in the cache
+        self.lm_score(completed)
+        return completed, "", self.get_vocabulary_root(), boost + (word_boost or 0.0)
+
+    def get_vocabulary_root(self):
+        return self.vocabulary.root if self.vocabulary is not None else None
+
+    def score(self, probs, words):
+        "ranking score of a prefix"
+        completed, current, node, boost = words
+        if current and node is not None:
+            # the current word may become a word of the vocabulary
+            boost += self.vocabulary.boost
+        return log_add(*probs) + self.lm_weight * self.lm_score(completed) + self.word_bonus * len(completed) + \
+            boost
+
+    def reset(self):
+        "start a new decoding"
+        # tuple of words -> (kenlm.State after the words, log-probability of the words)
+        self.lm_states = {}
+        # prefix -> [log prob ending with a blank, log prob ending with a non-blank]
+        self.beams = {(): [0.0, self.NEG_INF]}
+        # prefix -> (completed words, current word, trie node of the current word, boost of the completed words)
+        self.prefix_words = {(): ((), "", self.get_vocabulary_root(), 0.0)}
+        self.time_steps = 0
+
+    def advance(self, mat):
+        """
+        Decode the next time-steps, the prefixes are kept for the following ones
+
+        Arguments:
+            mat (ndarray): probs[t, c] is the probability of character c at the next time-steps t
+        """
+        maxT, maxC = mat.shape
+        blank = self.blank_index
+        log_mat = np.log(np.maximum(mat, 1e-30))
+        beams = self.beams
+        prefix_words = self.prefix_words
+
+        for t in range(maxT):
+            frame = log_mat[t]
+            chars = np.flatnonzero(frame >= self.log_prune_threshold)
+            chars = chars[chars != blank]
+            next_beams = {}
+
+            for prefix, (pr_blank, pr_non_blank) in beams.items():
+                pr_total = log_add(pr_blank, pr_non_blank)
+
+                # the prefix stays the same with a blank, or with a repetition of its last character
+                entry = next_beams.setdefault(prefix, [self.NEG_INF, self.NEG_INF])
+                entry[0] = log_add(entry[0], pr_total + frame[blank])
+                if prefix:
+                    entry[1] = log_add(entry[1], pr_non_blank + frame[prefix[-1]])
+
+                if not len(chars):
+                    continue
+                # extensions with all the characters of the frame, a repeated character needs a blank in between
+                if prefix:
+                    pr_extensions = np.where(chars == prefix[-1], pr_blank, pr_total) + frame[chars]
+                else:
+                    pr_extensions = pr_total + frame[chars]
+                for char, pr_extension in zip(chars.tolist(), pr_extensions.tolist()):
+                    new_prefix = prefix + (char,)
+                    if new_prefix not in prefix_words:
+                        prefix_words[new_prefix] = self.extend_words(prefix_words[prefix], char)
+                    if prefix_words[new_prefix] is None:
+                        # out of the vocabulary of the brain
+                        continue
+                    entry = next_beams.setdefault(new_prefix, [self.NEG_INF, self.NEG_INF])
+                    entry[1] = log_add(entry[1], pr_extension)
+
+            best = heapq.nlargest(self.beam_width, next_beams.items(),
+                                  key=lambda item: self.score(item[1], prefix_words[item[0]]))
+            beams = dict(best)
+            prefix_words = dict((prefix, prefix_words[prefix]) for prefix in beams)
+
+        self.beams = beams
+        self.prefix_words = prefix_words
+        self.time_steps += maxT
+
+    def to_string(self, prefix):
+        "transcription of a prefix"
+        string = self.process_string(self.convert_to_string(prefix), remove_repetitions=False)
+        return ' '.join(string.split())
+
+    def get_partial(self):
+        "best transcription of the time-steps decoded so far, the end of the sentence is not scored"
+        best_prefix = max(self.beams, key=lambda prefix: self.score(self.beams[prefix], self.prefix_words[prefix]))
+        return self.to_string(best_prefix)
+
+    def get_stable(self):
+        """
+        Completed words shared by all the prefixes: all the next prefixes extend them, the final transcription
+        starts with these words
+        """
+        prefixes = list(self.beams)
+        length = 0
+        for chars in zip(*prefixes):
+            if any(char != chars[0] for char in chars):
+                break
+            length += 1
+        common_prefix = prefixes[0][:length]
+        # only the completed words, up to the last space
+        while common_prefix and common_prefix[-1] != self.space_index:
+            common_prefix = common_prefix[:-1]
+        return self.to_string(common_prefix)
+
+    def finish(self):
+        "best transcription of the decoded time-steps, the end of the sentence is scored"
+        def final_score(prefix):
+            completed, current, node, boost = self.prefix_words[prefix]
+            if current:
+                completed = completed + (current,)
+                if self.vocabulary is not None:
+                    word_boost = self.vocabulary.get_word_boost(node)
+                    if word_boost is None and self.vocabulary.strict:
+                        # the last word is not a word of the vocabulary
+                        return self.NEG_INF
+                    boost += word_boost or 0.0
+            return log_add(*self.beams[prefix]) + self.lm_weight * self.lm_end_score(completed) + \
+                self.word_bonus * len(completed) + boost
+
+        best_prefix = max(self.beams, key=final_score)
+        string = self.to_string(best_prefix)
+        logger.debug("[CtcPrefixBeamSearch] {0} time-steps, {1} cached LM states: {2}".format(
+            self.time_steps, len(self.lm_states), string))
+        return string
+
+    def decode(self, mat, classes=None):
+        """
+        Returns the best transcription of a matrix of character probabilities
+
+        Arguments:
+            mat (ndarray): probs[t, c] is the probability of character c at time t
+            classes (string, optional): unused, the alphabet of the decoder is used
+        """
+        self.reset()
+        self.advance(mat)
+        return self.finish()
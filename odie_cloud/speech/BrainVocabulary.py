@@ -0,0 +1,98 @@
+import logging
+import re
+
+logging.basicConfig()
+logger = logging.getLogger("odie")
+
+# key of a trie node giving the boost of the word ending at this node
+WORD_END = -1
+# parameters of the orders, Eg: "{{ query }}"
+PARAMETER_PATTERN = re.compile(r"{{.*?}}")
+# punctuation of the orders, not spoken
+PUNCTUATION = ".,;:!?\"()"
+
+
+class BrainVocabulary(object):
+    """
+    Vocabulary of the orders of a brain, used to prune and bias the beam search decoders.
+
+    The words of the orders are stored in a prefix trie of the character indexes of the alphabet: a node is a dict
+    character index -> child node, and WORD_END gives the boost of the word ending at the node (the word-boost table).
+    A prefix of the decoder keeps the node of its current word, so an extension is checked with one dict lookup.
+
+    When the orders only contain words of the trie, the extensions leaving the trie are pruned (strict). When an
+    order has a parameter (Eg: "{{ query }}") or a word that cannot be spelled with the alphabet, any word can be
+    said: the words of the trie are only boosted.
+
+    .. seealso:: CtcPrefixBeamSearch, CtcBeamSearch
+    """
+
+    def __init__(self, orders, alphabet, boost=2.0):
+        """
+        :param orders: the orders of the brain
+        :param alphabet: the alphabet of the decoder
+        :param boost: log-probability added for each word of the vocabulary
+        """
+        self.alphabet = alphabet
+        self.boost = boost
+        self.strict = True
+        self.number_of_words = 0
+        self.root = dict()
+        self.char_to_int = dict()
+        for index, char in enumerate(alphabet):
+            self.char_to_int[char] = index
+            self.char_to_int.setdefault(char.lower(), index)
+            self.char_to_int.setdefault(char.upper(), index)
+        for order in orders:
+            self.add_order(order)
+        logger.debug("[BrainVocabulary] %d words from %d orders, strict: %s"
+                     % (self.number_of_words, len(orders), self.strict))
+
+    def add_order(self, order):
+        """
+        Add the words of an order
+        :param order: the order, Eg: "turn on the light of the {{ room }}"
+        """
+        if PARAMETER_PATTERN.search(order):
+            self.strict = False
+        for word in PARAMETER_PATTERN.sub(" ", order).split():
+            word = word.strip(PUNCTUATION)
+            if not word:
+                continue
+            chars = [self.char_to_int.get(char) for char in word]
+            if None in chars:
+                # the word cannot be recognized, Eg: a number, it is said with other words
+                self.strict = False
+                continue
+            node = self.root
+            for char in chars:
+                node = node.setdefault(char, dict())
+            if WORD_END not in node:
+                self.number_of_words += 1
+            node[WORD_END] = self.boost
+
+    def get_node(self, labels):
+        """
+        Get the node of a word or of the beginning of a word
+        :param labels: the character indexes of the word
+        :return: the node, None if no word of the vocabulary starts with these characters
+        """
+        node = self.root
+        for label in labels:
+            node = node.get(label)
+            if node is None:
+                return None
+        return node
+
+    @staticmethod
+    def get_word_boost(node):
+        """
+        :param node: a node of the trie, or None
+        :return: the boost of the word ending at the node, None if no word of the vocabulary ends at the node
+        """
+        if node is None:
+            return None
+        return node.get(WORD_END)
+
+    def __len__(self):
+        return self.number_of_words
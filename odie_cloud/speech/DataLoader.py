@@ -7,23 +7,27 @@ logging.basicConfig()
 logger = logging.getLogger("odie")
 
 
+def audio_config(nbands, max_utt_len):
+    """ Aeon configuration of the audio features, also used by AudioFeatures"""
+
+    return {"type": "audio",
+            "sample_freq_hz": 16000,
+            "max_duration": "{} seconds".format(max_utt_len),
+            "frame_length": "25 milliseconds",
+            "frame_stride": "10 milliseconds",
+            "feature_type": "mfsc",
+            "emit_length": True,
+            "num_filters": nbands}
+
+
 def inference_config(manifest_file, batch_size, nbands, max_utt_len):
     """ Aeon configuration for inference with only audio files"""
 
-    audio_config = {"type": "audio",
-                    "sample_freq_hz": 16000,
-                    "max_duration": "{} seconds".format(max_utt_len),
-                    "frame_length": "25 milliseconds",
-                    "frame_stride": "10 milliseconds",
-                    "feature_type": "mfsc",
-                    "emit_length": True,
-                    "num_filters": nbands}
-
     return {'manifest_filename': manifest_file,
             'manifest_root': os.path.dirname(manifest_file),
             'batch_size': batch_size,
             'block_size': batch_size,
-            'etl': [audio_config,]}
+            'etl': [audio_config(nbands, max_utt_len),]}
 
 
 def wrap_dataloader(dl, target=True):
@@ -0,0 +1,204 @@
+import logging
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+import numpy as np
+
+from odie_cloud.speech.AudioFeatures import resample
+
+logging.basicConfig()
+logger = logging.getLogger("odie")
+
+
+class StreamingRecognition(object):
+    """
+    Incremental recognition of an utterance received by chunks.
+
+    Each chunk of raw audio is resampled and appended to the utterance, and only the log mel energies of its new
+    frames are computed. The min-max scaling of the features is computed again over all the frames received so far,
+    like AudioFeatures.compute scales a whole utterance: the model always gets the features it was trained on.
+
+    The model is bidirectional, so the features of the utterance go through the batch scheduler for each chunk. The
+    input of the model is padded to the maximum duration, a forward pass costs the same for every chunk. The beam
+    search advances over the frames not decoded yet to give the partial transcriptions. The last lookahead_second of
+    frames are not decoded before the next chunk: their probabilities change the most with the next chunks. At the
+    end of the stream, the probabilities of the whole utterance are decoded again, the final transcription is the one
+    of a batch recognition of the same audio with the prefix beam search.
+
+    .. seealso:: Inference, CtcPrefixBeamSearch
+    """
+
+    def __init__(self, inference, decoder, rate=16000, lookahead_second=0.2):
+        """
+        :param inference: the loaded Inference
+        :param decoder: the CtcPrefixBeamSearch of the stream
+        :param rate: sample rate of the chunks, 16 bits mono samples
+        :param lookahead_second: seconds of frames at the end of the audio not decoded before the next chunk
+        """
+        self.inference = inference
+        self.decoder = decoder
+        self.rate = rate
+        self.lookahead_second = lookahead_second
+        audio_features = self.inference.audio_features
+        self._number_of_samples = 0
+        # samples at the rate of the model, and log mel energies of the frames computed so far
+        self._samples = np.zeros(audio_features.max_samples, dtype=np.float32)
+        self._length = 0
+        self._log_energies = np.zeros((audio_features.time_steps, audio_features.num_filters), dtype=np.float32)
+        self._number_of_frames = 0
+        # probs[c, t] matrix of the last forward pass
+        self._probabilities = None
+        self.decoder.reset()
+
+    def get_duration(self):
+        """
+        :return: seconds of audio received
+        """
+        return self._number_of_samples / float(self.rate)
+
+    def add_audio(self, audio_data):
+        """
+        Append a chunk of audio and decode the frames before the lookahead
+        :param audio_data: raw 16 bits little endian mono samples
+        :return: dict with the "stable" words, shared by all the hypotheses, and the best "partial" transcription
+        """
+        if len(audio_data) % 2:
+            raise ValueError("The chunks must contain 16 bits samples")
+        if len(audio_data):
+            audio_features = self.inference.audio_features
+            max_duration = audio_features.max_samples / float(audio_features.sample_freq_hz)
+            if self.get_duration() + len(audio_data) / 2.0 / self.rate > max_duration:
+                raise ValueError("The stream is longer than %s seconds" % max_duration)
+            self._append(np.frombuffer(audio_data, dtype="<i2").astype(np.float32))
+            if self._number_of_frames > 0:
+                self._forward()
+                frames_per_second = self._probabilities.shape[1] / self.get_duration()
+                self._decode_until(self._probabilities.shape[1] - int(self.lookahead_second * frames_per_second))
+        return {
+            "stable": self.decoder.get_stable(),
+            "partial": self.decoder.get_partial()
+        }
+
+    def finish(self):
+        """
+        Decode the whole utterance at the end of the stream
+        :return: the final transcription
+        """
+        if self._probabilities is None:
+            return self.decoder.finish()
+        # the frames decoded with the previous chunks had the probabilities of a shorter utterance
+        return self.decoder.decode(np.transpose(self._probabilities, (1, 0)))
+
+    def _append(self, samples):
+        """
+        Append the samples of a chunk and compute the log mel energies of the new frames
+        """
+        audio_features = self.inference.audio_features
+        self._number_of_samples += len(samples)
+        samples = resample(samples, self.rate, audio_features.sample_freq_hz)[:len(self._samples) - self._length]
+        self._samples[self._length:self._length + len(samples)] = samples
+        self._length += len(samples)
+        number_of_frames = audio_features.get_number_of_frames(self._length)
+        self._log_energies[self._number_of_frames:number_of_frames] = audio_features.get_log_energies(
+            self._samples[:self._length], self._number_of_frames, number_of_frames)
+        self._number_of_frames = number_of_frames
+
+    def _forward(self):
+        # min-max scaling of all the frames, like a whole utterance
+        log_energies = self._log_energies[:self._number_of_frames]
+        features = self.inference.audio_features.scale(log_energies, log_energies.min(), log_energies.max())
+        self._probabilities = self.inference.scheduler.submit(features)
+
+    def _decode_until(self, end):
+        """
+        Advance the beam search over the frames before end
+        """
+        start = self.decoder.time_steps
+        if end > start:
+            self.decoder.advance(np.transpose(self._probabilities[:, start:end], (1, 0)))
+
+
+class StreamingSession(object):
+    """
+    A streaming recognition with the state of its session
+    """
+
+    def __init__(self, stream_id, recognition):
+        self.stream_id = stream_id
+        self.recognition = recognition
+        # the chunks of a stream are decoded one at a time, in order
+        self.lock = threading.Lock()
+        self.users = 0
+        self.last_used = time.time()
+
+
+class StreamingSessions(object):
+    """
+    This class is the registry of the streaming recognitions of the cloud API.
+
+    A stream is identified by the id returned by create. The streams not used for more than ttl seconds are removed.
+
+    .. seealso:: StreamingRecognition, LIFOSessions
+    """
+
+    def __init__(self, ttl=60):
+        """
+        :param ttl: number of seconds a stream is kept without receiving audio
+        """
+        self.ttl = ttl
+        # stream id -> StreamingSession
+        self._sessions = dict()
+        self._lock = threading.Lock()
+
+    def create(self, recognition):
+        """
+        Register a new stream
+        :param recognition: the StreamingRecognition of the stream
+        :return: the id of the stream
+        """
+        stream_id = uuid.uuid4().hex
+        with self._lock:
+            self._evict_expired()
+            self._sessions[stream_id] = StreamingSession(stream_id, recognition)
+        logger.debug("[StreamingSessions] new stream %s" % stream_id)
+        return stream_id
+
+    @contextmanager
+    def session(self, stream_id):
+        """
+        Get the recognition of a stream, the other requests of the stream wait the end of the block
+        :param stream_id: id of the stream
+        :raise KeyError: the stream does not exist or has expired
+        """
+        with self._lock:
+            self._evict_expired()
+            streaming_session = self._sessions[stream_id]
+            streaming_session.users += 1
+
+        try:
+            with streaming_session.lock:
+                yield streaming_session.recognition
+        finally:
+            with self._lock:
+                streaming_session.users -= 1
+                streaming_session.last_used = time.time()
+
+    def remove(self, stream_id):
+        """
+        Remove a stream
+        :param stream_id: id of the stream
+        """
+        with self._lock:
+            self._sessions.pop(stream_id, None)
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def _evict_expired(self):
+        expiration_time = time.time() - self.ttl
+        for stream_id, streaming_session in list(self._sessions.items()):
+            if streaming_session.users == 0 and streaming_session.last_used < expiration_time:
+                logger.debug("[StreamingSessions] stream %s expired" % stream_id)
+                del self._sessions[stream_id]
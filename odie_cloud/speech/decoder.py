@@ -15,16 +15,31 @@
 # ----------------------------------------------------------------------------
 import logging
 import numpy as np
-import Levenshtein as Lev
 import math
 import collections
-from autocorrect import spell
-import kenlm
+import threading
+
+# optional: without kenlm the decoders run without language model, without autocorrect the transcriptions are not
+# corrected. Levenshtein is only needed by the error rates wer and cer
+try:
+    import kenlm
+except ImportError:
+    kenlm = None
+try:
+    import Levenshtein as Lev
+except ImportError:
+    Lev = None
+try:
+    from autocorrect import spell
+except ImportError:
+    spell = None
 
 
 logging.basicConfig()
 logger = logging.getLogger("odie")
 
+DEFAULT_LM_PATH = '/home/drea/odie_cloud/tensorflow/DeepSpeech/data/lm/lm.binary'
+
 
 class Decoder(object):
     """
@@ -35,9 +50,16 @@ class Decoder(object):
         alphabet (string): mapping from integers to characters.
         blank_index (int, optional): index for the blank '_' character. Defaults to 0.
         space_index (int, optional): index for the space ' ' character. Defaults to 28.
+        lm_path (string, optional): path of the kenlm language model, None to decode without
+            language model. Defaults to DEFAULT_LM_PATH.
+        vocabulary (BrainVocabulary, optional): vocabulary of the brain, the decoders that support it prune
+            and boost their extensions with it. Defaults to None.
     """
+    # path -> kenlm.Model, a language model is loaded once and shared by the decoders (read only)
+    _language_models = dict()
+    _language_models_lock = threading.Lock()
 
-    def __init__(self, alphabet, blank_index=0, space_index=1):
+    def __init__(self, alphabet, blank_index=0, space_index=1, lm_path=DEFAULT_LM_PATH, vocabulary=None):
         # e.g. alphabet = "_'ABCDEFGHIJKLMNOPQRSTUVWXYZ#"
         self.alphabet = alphabet
         self.int_to_char = dict([(i, c) for (i, c) in enumerate(alphabet)])
@@ -45,9 +67,28 @@ class Decoder(object):
         self.blank_index = blank_index
         self.space_index = space_index
         self.NEG_INF = -float("inf")
+        self.vocabulary = vocabulary
         # self.LM = kenlm.Model('/home/drea/odie_cloud/deepspeech/4-gram.arpa')
-        self.LM = kenlm.Model('/home/drea/odie_cloud/tensorflow/DeepSpeech/data/lm/lm.binary')
-        logger.debug("[Decoder] {0}-gram model".format(self.LM.order))
+        self.LM = None
+        if lm_path is not None:
+            self.LM = self.get_language_model(lm_path)
+
+    @classmethod
+    def get_language_model(cls, lm_path):
+        """
+        Return the kenlm model of a path, loaded on first use
+        :param lm_path: path of the kenlm language model
+        :return: the kenlm.Model
+        """
+        with cls._language_models_lock:
+            language_model = cls._language_models.get(lm_path)
+            if language_model is None:
+                if kenlm is None:
+                    raise ImportError("kenlm is required to decode with the language model %s" % lm_path)
+                language_model = kenlm.Model(lm_path)
+                logger.debug("[Decoder] {0}-gram model".format(language_model.order))
+                cls._language_models[lm_path] = language_model
+        return language_model
 
     def convert_to_string(self, sequence):
         "Given a numeric sequence, returns the corresponding string"
@@ -79,6 +120,17 @@ class Decoder(object):
 
         return string
 
+    def correct_spelling(self, string):
+        """
+        Correct each word of a transcription with autocorrect, the words are kept as is without autocorrect
+
+        Arguments:
+            string (string): space-separated sentence
+        """
+        if spell is None:
+            return ' '.join(string.split())
+        return ' '.join(spell(word) for word in string.split())
+
     def log_sum(self, list_of_probs):
         """
         Computes the sum of log-probabilities.
@@ -143,8 +195,6 @@ class ArgMaxDecoder(Decoder):
         string = self.convert_to_string(np.argmax(probs, axis=0))
         string = self.process_string(string, remove_repetitions=True)
         logger.debug("[ArgMaxDecoder] string: {}".format(string))
-        correct = ''
-        for word in string.split():
-            correct = correct + spell(word) + ' '
+        correct = self.correct_spelling(string)
         logger.debug("[ArgMaxDecoder] autocorrect: {}".format(correct))
-        return correct.rstrip()
+        return correct
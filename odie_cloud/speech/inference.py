@@ -1,26 +1,155 @@
-import os
 import logging
-import tempfile
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
 import numpy as np
 
 from neon.backends import gen_backend
 from neon.models import Model
-from odie_cloud.speech.DataLoader import make_inference_loader
-from odie_cloud.speech.BeamSearch import CtcBeamSearch
+from odie_cloud.speech.AudioFeatures import AudioFeatures
+from odie_cloud.speech.DataLoader import audio_config
+from odie_cloud.speech.BatchScheduler import BatchScheduler
+from odie_cloud.speech.BeamSearch import CtcBeamSearch, CtcPrefixBeamSearch
+from odie_cloud.speech.BrainVocabulary import BrainVocabulary
+from odie_cloud.speech.decoder import ArgMaxDecoder
+from odie_cloud.speech.StreamingRecognition import StreamingRecognition
 
 
 logging.basicConfig()
 logger = logging.getLogger("odie")
 
+# seconds of silence of the warm-up inference
+WARM_UP_SECOND = 1
+# features of the model
+NBANDS = 13
+MAX_UTT_LEN = 30
+# number of brain vocabularies kept, the least recently used is removed first
+MAX_VOCABULARIES = 100
+
 
 class Inference(object):
-    def __init__(self, model_file):
+    def __init__(self, model_file, decoder="beam_search", replicas=1, max_batch_size=1, batch_window_second=0.01,
+                 stream_lookahead_second=0.2, vocabulary_boost=2.0,
+                 **decoder_parameters):
+        """
+        The backend and the model are not loaded here: call load once at startup, the ready Event is set once
+        the replicas are loaded and warmed up.
+
+        :param model_file: path of the neon model
+        :param decoder: "beam_search" or "prefix_beam_search"
+        :param replicas: number of resident instances of the model. They share the backend: their forward passes
+        are serialized, a replica collects its next batch while another one runs
+        :param max_batch_size: maximum number of requests of a forward pass
+        :param batch_window_second: maximum time to wait for other requests to batch with a request
+        :param stream_lookahead_second: seconds at the end of a stream not decoded before its next chunk
+        :param vocabulary_boost: log-probability added by the decoders for each word of the orders of the brain
+        :param decoder_parameters: parameters of the prefix beam search. Eg: beam_width, lm_weight, word_bonus,
+        prune_threshold
+        """
         logger.debug("[DeepSpeech] initializing")
         self.alphabet = "_'ABCDEFGHIJKLMNOPQRSTUVWXYZ "
         self.nout = len(self.alphabet)
-        self.batch_size = 1
+        self.batch_size = max(int(max_batch_size), 1)
         self.model_file = model_file
-        self.beam_search_decoder = CtcBeamSearch(self.alphabet, space_index=self.alphabet.index(" "))
+        self.decoder = decoder
+        self.decoder_parameters = decoder_parameters
+        self.replicas = max(int(replicas), 1)
+        self.stream_lookahead_second = stream_lookahead_second
+        self.vocabulary_boost = vocabulary_boost
+        # brain id -> BrainVocabulary of the orders sent by the clients running this brain
+        self.vocabularies = OrderedDict()
+        self._vocabularies_lock = threading.Lock()
+        self.argmax_decoder = ArgMaxDecoder(self.alphabet, space_index=self.alphabet.index(" "), lm_path=None)
+        self.audio_features = AudioFeatures(audio_config(NBANDS, MAX_UTT_LEN))
+        self.be = None
+        # the neon backend is not thread safe and its GPU context is bound to the thread that created it
+        self._backend_lock = threading.Lock()
+        self.models = list()
+        self.scheduler = BatchScheduler(self.predict_batch, max_batch_size=self.batch_size,
+                                        window_second=batch_window_second)
+        self.ready = threading.Event()
+
+    def create_decoder(self, brain_id=None):
+        """
+        Return a new beam search decoder, a decoder keeps the state of the current decoding
+        :param brain_id: id of the brain of the client, its vocabulary biases the decoder
+        """
+        vocabulary = self.get_vocabulary(brain_id)
+        if self.decoder == "prefix_beam_search":
+            return CtcPrefixBeamSearch(self.alphabet, space_index=self.alphabet.index(" "),
+                                       vocabulary=vocabulary, **self.decoder_parameters)
+        return CtcBeamSearch(self.alphabet, space_index=self.alphabet.index(" "), vocabulary=vocabulary)
+
+    def set_vocabulary(self, brain_id, orders):
+        """
+        Bias the next decodings of the clients of a brain toward its orders
+        :param brain_id: id of the brain, sent by its clients with the audio to recognize
+        :param orders: the orders of the brain, an empty list to decode any sentence
+        :return: the BrainVocabulary, None without order
+        """
+        vocabulary = None
+        if orders:
+            vocabulary = BrainVocabulary(orders, self.alphabet, boost=self.vocabulary_boost)
+        # the decoders being used keep the previous vocabulary
+        with self._vocabularies_lock:
+            self.vocabularies.pop(brain_id, None)
+            if vocabulary is not None:
+                self.vocabularies[brain_id] = vocabulary
+                while len(self.vocabularies) > MAX_VOCABULARIES:
+                    self.vocabularies.popitem(last=False)
+        return vocabulary
+
+    def get_vocabulary(self, brain_id):
+        """
+        :param brain_id: id of a brain, or None
+        :return: the BrainVocabulary of the brain, None if the brain has not sent its orders
+        """
+        if brain_id is None:
+            return None
+        with self._vocabularies_lock:
+            vocabulary = self.vocabularies.pop(brain_id, None)
+            if vocabulary is not None:
+                # most recently used
+                self.vocabularies[brain_id] = vocabulary
+        return vocabulary
+
+    def create_stream(self, rate=16000, brain_id=None):
+        """
+        Start the recognition of an utterance received by chunks, decoded with the prefix beam search
+        :param rate: sample rate of the chunks
+        :param brain_id: id of the brain of the client, its vocabulary biases the decoder
+        :return: the StreamingRecognition
+        """
+        decoder_parameters = self.decoder_parameters if self.decoder == "prefix_beam_search" else dict()
+        decoder = CtcPrefixBeamSearch(self.alphabet, space_index=self.alphabet.index(" "),
+                                      vocabulary=self.get_vocabulary(brain_id), **decoder_parameters)
+        return StreamingRecognition(self, decoder, rate=rate, lookahead_second=self.stream_lookahead_second)
+
+    def load(self):
+        """
+        Generate the backend, load the replicas of the model and run a warm-up inference on each of them, then start
+        the batch scheduler. Called once at startup, the ready Event is set at the end
+        """
+        logger.debug("[DeepSpeech] generating backend")
+        try:
+            self.be = gen_backend('gpu', batch_size=self.batch_size)
+        except:
+            logger.debug("[DeepSpeech] gpu backend failed, using mkl")
+            self.be = gen_backend('mkl', batch_size=self.batch_size)
+
+        silence = self.audio_features.compute(np.zeros(int(WARM_UP_SECOND * self.audio_features.sample_freq_hz)))
+        for index in range(self.replicas):
+            logger.debug("[DeepSpeech] loading replica %d of the model" % (index + 1))
+            model = Model(self.model_file)
+            model.initialize(self.audio_features.shape)
+            probabilities = self.predict_batch(model, [silence])[0]
+            transcript = self.create_decoder().decode(np.transpose(probabilities, (1, 0)), self.alphabet)
+            logger.debug("[DeepSpeech] warm-up inference of replica %d: '%s'" % (index + 1, transcript))
+            self.models.append(model)
+        self.scheduler.start(self.models)
+        self.ready.set()
+        logger.debug("[DeepSpeech] ready with %d replicas" % self.replicas)
 
     def softmax(self, x):
         return (np.reciprocal(np.sum(
@@ -32,85 +161,74 @@ class Inference(object):
         return self.softmax(outputs.get()).reshape(
             (nout, -1, be.bsz)).transpose((2, 0, 1))
 
-    def predict_beam(self, audio_files):
-        eval_manifest = tempfile.mktemp(prefix="manifest_", suffix=".tsv")
-        logger.debug("[DeepSpeech] generating backend")
-        try:
-            be = gen_backend('gpu', batch_size=self.batch_size)
-        except:
-            logger.debug("[DeepSpeech] gpu backend failed, using mkl")
-            be = gen_backend('mkl', batch_size=self.batch_size)
-        logger.debug("[DeepSpeech] calling dataloader")
-        eval_set = self.setup_dataloader(be, audio_files, eval_manifest)
-        model = Model(self.model_file)
-        if not model.initialized:
-            logger.debug("[DeepSpeech] initializing")
-            model.initialize(eval_set)
+    @contextmanager
+    def _backend_context(self):
+        """
+        Use the backend from the current thread: the forward passes are serialized and the CUDA context of the GPU
+        backend is made current in the thread (the batch scheduler workers are not the thread of gen_backend)
+        """
+        with self._backend_lock:
+            cuda_context = getattr(self.be, "ctx", None)
+            if cuda_context is not None:
+                cuda_context.push()
+            try:
+                yield self.be
+            finally:
+                if cuda_context is not None:
+                    cuda_context.pop()
+
+    def predict_batch(self, model, inputs):
+        """
+        Run one forward pass of the model on a batch of utterances
+        :param model: the initialized neon model
+        :param inputs: list of tuple (features, length in percent) computed by AudioFeatures, at most batch_size
+        :return: the list of probs[c, t] matrix of the characters of each utterance
+        """
+        logger.debug("[DeepSpeech] predicting a batch of %d utterances" % len(inputs))
+        # the columns of the missing utterances stay empty, their outputs are dropped
+        audio = np.zeros((int(np.prod(self.audio_features.shape)), self.batch_size), dtype=np.float32)
+        audio_len = np.zeros(self.batch_size, dtype=np.float32)
+        for index, (features, length) in enumerate(inputs):
+            audio[:, index] = features.ravel()
+            audio_len[index] = length
+        with self._backend_context() as be:
+            output = self.get_outputs(model, be, be.array(audio), self.nout)
+        strided_tmax = output.shape[-1]
+        logger.debug("[DeepSpeech] adjusting output")
+        utt_lens = strided_tmax * audio_len / 100
+        return [output[index, :, :int(utt_lens[index])] for index in range(len(inputs))]
+
+    def predict_beam(self, audio, brain_id=None):
+        """
+        Transcript an audio with the beam search decoder
+        :param audio: the bytes of a WAV or FLAC file, a file-like object or a path
+        :param brain_id: id of the brain of the client, its vocabulary biases the decoder
+        :return: the transcript
+        """
+        inputs = self.audio_features.get_features(audio)
         try:
-            for file in eval_set:
-                audio = file[0]
-                audio_len = file[1]
-                logger.debug("[DeepSpeech] predicting")
-                output = self.get_outputs(model, model.be, audio, self.nout)
-                strided_tmax = output.shape[-1]
-                logger.debug("[DeepSpeech] adjusting output")
-                utt_lens = strided_tmax * audio_len.get().ravel() / 100
-                logger.debug("[DeepSpeech] transcripting with BeamSearch LM")
-                out = output[0, :, :int(utt_lens[0])]
-                probs_t_c = np.transpose(out, (1, 0))
-                transcript = self.beam_search_decoder.decode(probs_t_c, self.alphabet)
+            out = self.scheduler.submit(inputs)
+            logger.debug("[DeepSpeech] transcripting with BeamSearch LM")
+            probs_t_c = np.transpose(out, (1, 0))
+            transcript = self.create_decoder(brain_id).decode(probs_t_c, self.alphabet)
         except:
             return 'error" model failed'
-        finally:
-            be.cleanup_backend()
-            be = None
         return transcript
 
-    def predict(self, audio_files):
-        eval_manifest = tempfile.mktemp(prefix="manifest_", suffix=".tsv")
-        logger.debug("[DeepSpeech] generating backend")
-        try:
-            be = gen_backend('gpu', batch_size=self.batch_size)
-        except:
-            logger.debug("[DeepSpeech] gpu backend failed, using mkl")
-            be = gen_backend('mkl', batch_size=self.batch_size)
-        logger.debug("[DeepSpeech] calling dataloader")
-        eval_set = self.setup_dataloader(be, audio_files, eval_manifest)
-        model = Model(self.model_file)
-        if not model.initialized:
-            logger.debug("[DeepSpeech] initializing")
-            model.initialize(eval_set)
-
+    def predict(self, audio):
+        """
+        Transcript an audio with the argmax decoder
+        :param audio: the bytes of a WAV or FLAC file, a file-like object or a path
+        :return: the transcript
+        """
+        inputs = self.audio_features.get_features(audio)
         try:
-            for file in eval_set:
-                audio = file[0]
-                audio_len = file[1]
-                logger.debug("[DeepSpeech] predicting")
-                output = self.get_outputs(model, model.be, audio, self.nout)
-                strided_tmax = output.shape[-1]
-                logger.debug("[DeepSpeech] adjusting output")
-                utt_lens = strided_tmax * audio_len.get().ravel() / 100
-                logger.debug("[DeepSpeech] transcripting with ArgMaxDecoder")
-                transcript = self.argmax_decoder.decode(output[0, :, :int(utt_lens[0])])
+            out = self.scheduler.submit(inputs)
+            logger.debug("[DeepSpeech] transcripting with ArgMaxDecoder")
+            transcript = self.argmax_decoder.decode(out)
         except:
             return 'error" model failed'
-        finally:
-            be.cleanup_backend()
-            be = None
         # spell = Corrector()
         # logger.debug("[DeepSpeech] transcript pre spell check: {}".format(transcript))
         # new_transcript = spell.correction(spell.word(transcript))
         return transcript
-
-    def setup_dataloader(self, be, audio_files, eval_manifest):
-        with open(eval_manifest, "w") as fh:
-            fh.write("@FILE\n")
-            if not os.path.isfile(audio_files):
-                raise IOError("Audio file does not exist: {}".format(audio_files))
-            fh.write("{}\n".format(audio_files))
-        # Setup required dataloader parameters
-        nbands = 13
-        max_utt_len = 30
-        logger.debug("[DeepSpeech] manifest created")
-        eval_set = make_inference_loader(eval_manifest, nbands, max_utt_len, backend_obj=be)
-        return eval_set